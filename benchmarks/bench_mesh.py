@@ -0,0 +1,45 @@
+import shutil
+import tempfile
+
+from odysis import Mesh
+
+from .generators import GENERATORS, write_grid
+from .utils import traced_peak
+
+KINDS = sorted(GENERATORS.keys())
+SIZES = [10000, 100000, 1000000, 10000000]
+
+
+class MeshFromVTK(object):
+    params = (KINDS, SIZES)
+    param_names = ['kind', 'nb_cells']
+    timeout = 3600
+
+    def setup(self, kind, nb_cells):
+        self.directory = tempfile.mkdtemp()
+        self.path = write_grid(GENERATORS[kind](nb_cells), self.directory, kind)
+        self.mesh = Mesh.from_vtk(self.path)
+
+    def teardown(self, kind, nb_cells):
+        self.mesh.close()
+        shutil.rmtree(self.directory)
+
+    def time_from_vtk(self, kind, nb_cells):
+        Mesh.from_vtk(self.path).close()
+
+    def time_reload(self, kind, nb_cells):
+        self.mesh.reload(self.path)
+
+    def time_reload_all(self, kind, nb_cells):
+        self.mesh.reload(
+            self.path, reload_vertices=True, reload_triangles=True,
+            reload_data=True, reload_tetrahedrons=True
+        )
+
+    def track_from_vtk_memory(self, kind, nb_cells):
+        return traced_peak(lambda: Mesh.from_vtk(self.path).close())
+    track_from_vtk_memory.unit = 'bytes'
+
+    def track_reload_memory(self, kind, nb_cells):
+        return traced_peak(self.mesh.reload, self.path)
+    track_reload_memory.unit = 'bytes'
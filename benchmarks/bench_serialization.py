@@ -0,0 +1,28 @@
+import numpy as np
+
+from odysis.serialization import array_to_binary
+
+from .utils import traced_peak
+
+DTYPES = ['float32', 'float64', 'int64', 'uint32']
+SIZES = [10000, 1000000, 100000000]
+
+
+class ArrayToBinary(object):
+    params = (DTYPES, SIZES)
+    param_names = ['dtype', 'size']
+
+    def setup(self, dtype, size):
+        self.array = np.arange(size).astype(dtype)
+        # Every other value of a twice bigger array, to hit the copy path
+        self.strided = np.arange(2 * size).astype(dtype)[::2]
+
+    def time_array_to_binary(self, dtype, size):
+        array_to_binary(self.array)
+
+    def time_array_to_binary_strided(self, dtype, size):
+        array_to_binary(self.strided)
+
+    def track_array_to_binary_memory(self, dtype, size):
+        return traced_peak(array_to_binary, self.array)
+    track_array_to_binary_memory.unit = 'bytes'
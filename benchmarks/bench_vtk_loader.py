@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+
+from odysis.vtk_loader import (
+    load_vtk, append_filter,
+    get_ugrid_vertices, get_ugrid_triangles,
+    get_ugrid_tetrahedrons, get_ugrid_data
+)
+
+from .generators import GENERATORS, write_grid
+from .utils import traced_peak
+
+KINDS = sorted(GENERATORS.keys())
+SIZES = [10000, 100000, 1000000, 10000000]
+
+
+class LoadVTK(object):
+    params = (KINDS, SIZES)
+    param_names = ['kind', 'nb_cells']
+    timeout = 3600
+
+    def setup(self, kind, nb_cells):
+        self.directory = tempfile.mkdtemp()
+        self.path = write_grid(GENERATORS[kind](nb_cells), self.directory, kind)
+
+    def teardown(self, kind, nb_cells):
+        shutil.rmtree(self.directory)
+
+    def time_load_vtk(self, kind, nb_cells):
+        load_vtk(self.path)
+
+    def track_load_vtk_memory(self, kind, nb_cells):
+        return traced_peak(load_vtk, self.path)
+    track_load_vtk_memory.unit = 'bytes'
+
+
+class Extraction(object):
+    params = (KINDS, SIZES)
+    param_names = ['kind', 'nb_cells']
+    timeout = 3600
+
+    def setup(self, kind, nb_cells):
+        grid = GENERATORS[kind](nb_cells)
+        # Same conversion as load_vtk for structured grids
+        self.grid = grid if kind != 'structured' else append_filter(grid)
+
+    def time_get_ugrid_vertices(self, kind, nb_cells):
+        get_ugrid_vertices(self.grid)
+
+    def time_get_ugrid_triangles(self, kind, nb_cells):
+        get_ugrid_triangles(self.grid)
+
+    def time_get_ugrid_tetrahedrons(self, kind, nb_cells):
+        get_ugrid_tetrahedrons(self.grid)
+
+    def time_get_ugrid_data(self, kind, nb_cells):
+        get_ugrid_data(self.grid)
+
+    def track_get_ugrid_vertices_memory(self, kind, nb_cells):
+        return traced_peak(get_ugrid_vertices, self.grid)
+    track_get_ugrid_vertices_memory.unit = 'bytes'
+
+    def track_get_ugrid_triangles_memory(self, kind, nb_cells):
+        return traced_peak(get_ugrid_triangles, self.grid)
+    track_get_ugrid_triangles_memory.unit = 'bytes'
+
+    def track_get_ugrid_tetrahedrons_memory(self, kind, nb_cells):
+        return traced_peak(get_ugrid_tetrahedrons, self.grid)
+    track_get_ugrid_tetrahedrons_memory.unit = 'bytes'
+
+    def track_get_ugrid_data_memory(self, kind, nb_cells):
+        return traced_peak(get_ugrid_data, self.grid)
+    track_get_ugrid_data_memory.unit = 'bytes'
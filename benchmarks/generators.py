@@ -0,0 +1,179 @@
+"""Deterministic synthetic meshes, built in memory with VTK.
+
+All generators take an approximate number of cells and return a grid with
+the same two point data arrays: a ``pressure`` scalar and a ``velocity``
+vector.
+"""
+import os.path as osp
+
+import numpy as np
+
+import vtk
+from vtk.util.numpy_support import (
+    numpy_to_vtk, numpy_to_vtkIdTypeArray
+)
+
+# Hexahedron corners (as voxel offsets) in VTK ordering
+_HEX_CORNERS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
+])
+
+# Conforming split of a hexahedron in 6 tetrahedrons around the 0-6 diagonal
+_HEX_TO_TETRAS = np.array([
+    [0, 1, 2, 6], [0, 2, 3, 6], [0, 3, 7, 6],
+    [0, 7, 4, 6], [0, 4, 5, 6], [0, 5, 1, 6]
+])
+
+
+def _side(nb_voxels, dimensions=3):
+    return max(int(np.ceil(nb_voxels ** (1. / dimensions))), 1)
+
+
+def _lattice_points(nx, ny, nz):
+    """Points of a regular lattice, x varying fastest like in VTK."""
+    z, y, x = np.meshgrid(
+        np.linspace(0., 1., nz), np.linspace(0., 1., ny), np.linspace(0., 1., nx),
+        indexing='ij'
+    )
+    return np.column_stack((x.ravel(), y.ravel(), z.ravel()))
+
+
+def _voxels(side):
+    """Point ids of the corners of each voxel of a side**3 voxels lattice."""
+    n = side + 1
+    i, j, k = np.meshgrid(np.arange(side), np.arange(side), np.arange(side), indexing='ij')
+    origins = np.column_stack((i.ravel(), j.ravel(), k.ravel()))
+    corners = origins[:, np.newaxis, :] + _HEX_CORNERS[np.newaxis, :, :]
+    return corners[..., 0] + n * (corners[..., 1] + n * corners[..., 2])
+
+
+def _add_point_data(grid, points):
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+
+    pressure = numpy_to_vtk(np.sin(4 * x) * np.cos(4 * y) + z, deep=1)
+    pressure.SetName('pressure')
+    grid.GetPointData().AddArray(pressure)
+
+    velocity = numpy_to_vtk(np.column_stack((-y, x, 0.1 * z)), deep=1)
+    velocity.SetName('velocity')
+    grid.GetPointData().AddArray(velocity)
+
+
+def _unstructured_grid(points, cells):
+    """Create a vtkUnstructuredGrid.
+
+    ``cells`` is a list of (vtk_cell_type, (N, nb_points) connectivity).
+    """
+    types = np.concatenate([
+        np.full(len(connectivity), cell_type, dtype=np.uint8)
+        for cell_type, connectivity in cells
+    ])
+    sizes = np.concatenate([
+        np.full(len(connectivity), connectivity.shape[1], dtype=np.int64)
+        for _, connectivity in cells
+    ])
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    connectivity = np.concatenate([c.ravel() for _, c in cells]).astype(np.int64)
+
+    cell_array = vtk.vtkCellArray()
+    cell_array.SetData(
+        numpy_to_vtkIdTypeArray(offsets, deep=1),
+        numpy_to_vtkIdTypeArray(connectivity, deep=1)
+    )
+
+    vtk_points = vtk.vtkPoints()
+    vtk_points.SetData(numpy_to_vtk(points, deep=1))
+
+    grid = vtk.vtkUnstructuredGrid()
+    grid.SetPoints(vtk_points)
+    grid.SetCells(
+        numpy_to_vtk(types, deep=1, array_type=vtk.VTK_UNSIGNED_CHAR),
+        cell_array
+    )
+    _add_point_data(grid, points)
+
+    return grid
+
+
+def hexahedron_grid(nb_cells):
+    side = _side(nb_cells)
+    points = _lattice_points(side + 1, side + 1, side + 1)
+    return _unstructured_grid(points, [(vtk.VTK_HEXAHEDRON, _voxels(side))])
+
+
+def tetrahedron_grid(nb_cells):
+    side = _side(nb_cells / len(_HEX_TO_TETRAS))
+    points = _lattice_points(side + 1, side + 1, side + 1)
+    tetras = _voxels(side)[:, _HEX_TO_TETRAS].reshape(-1, 4)
+    return _unstructured_grid(points, [(vtk.VTK_TETRA, tetras)])
+
+
+def mixed_grid(nb_cells):
+    """Hexahedrons in one half of the cube, tetrahedrons in the other."""
+    side = _side(nb_cells / ((1. + len(_HEX_TO_TETRAS)) / 2.))
+    points = _lattice_points(side + 1, side + 1, side + 1)
+    voxels = _voxels(side)
+    half = len(voxels) // 2
+    tetras = voxels[half:][:, _HEX_TO_TETRAS].reshape(-1, 4)
+    return _unstructured_grid(points, [
+        (vtk.VTK_HEXAHEDRON, voxels[:half]),
+        (vtk.VTK_TETRA, tetras)
+    ])
+
+
+def surface_grid(nb_cells):
+    """Triangulated wavy sheet, without any 3-D cell."""
+    side = _side(nb_cells / 2., dimensions=2)
+    points = _lattice_points(side + 1, side + 1, 1)
+    points[:, 2] = 0.1 * np.sin(6 * points[:, 0]) * np.sin(6 * points[:, 1])
+
+    i, j = np.meshgrid(np.arange(side), np.arange(side), indexing='ij')
+    first = (i + (side + 1) * j).ravel()
+    quads = np.column_stack((first, first + 1, first + side + 2, first + side + 1))
+    triangles = np.concatenate((quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]))
+
+    return _unstructured_grid(points, [(vtk.VTK_TRIANGLE, triangles)])
+
+
+def structured_grid(nb_cells):
+    """Curvilinear vtkStructuredGrid, loaded through vtkAppendFilter by load_vtk."""
+    side = _side(nb_cells)
+    points = _lattice_points(side + 1, side + 1, side + 1)
+    points[:, 0] += 0.05 * np.sin(6 * points[:, 1])
+
+    vtk_points = vtk.vtkPoints()
+    vtk_points.SetData(numpy_to_vtk(points, deep=1))
+
+    grid = vtk.vtkStructuredGrid()
+    grid.SetDimensions(side + 1, side + 1, side + 1)
+    grid.SetPoints(vtk_points)
+    _add_point_data(grid, points)
+
+    return grid
+
+
+GENERATORS = {
+    'tetrahedron': tetrahedron_grid,
+    'hexahedron': hexahedron_grid,
+    'mixed': mixed_grid,
+    'structured': structured_grid,
+    'surface': surface_grid
+}
+
+
+def write_grid(grid, directory, name):
+    """Write the grid in a file that load_vtk can read, return its path."""
+    if isinstance(grid, vtk.vtkStructuredGrid):
+        path = osp.join(directory, name + '.vtk')
+        writer = vtk.vtkStructuredGridWriter()
+        writer.SetFileTypeToBinary()
+    else:
+        path = osp.join(directory, name + '.vtu')
+        writer = vtk.vtkXMLUnstructuredGridWriter()
+
+    writer.SetFileName(path)
+    writer.SetInputData(grid)
+    writer.Write()
+
+    return path
@@ -0,0 +1,16 @@
+import tracemalloc
+
+
+def traced_peak(function, *args, **kwargs):
+    """Peak of memory allocated by the function call, in bytes.
+
+    Contrary to asv ``peakmem_`` benchmarks, which report the peak RSS of the
+    whole process, the memory allocated by ``setup`` is not counted. Memory
+    allocated by VTK itself is not traced.
+    """
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,139 @@
+/**
+ * Deterministic synthetic meshes for the benchmarks, using the same typed
+ * arrays and data description as a processed DataBlock
+ * **/
+
+// Conforming split of a hexahedron in 6 tetrahedrons around the 0-6 diagonal
+const HEX_TO_TETRAS = [
+  [0, 1, 2, 6], [0, 2, 3, 6], [0, 3, 7, 6],
+  [0, 7, 4, 6], [0, 4, 5, 6], [0, 5, 1, 6]
+];
+
+// Hexahedron corners as voxel offsets
+const HEX_CORNERS = [
+  [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+  [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
+];
+
+/**
+ * Compute the min and max of an array
+ * @param {Float32Array} array - The array
+ */
+function range (array) {
+  let min = array[0], max = min;
+  for (let i = 1, len = array.length; i < len; i++) {
+    if (array[i] < min) { min = array[i]; }
+    if (array[i] > max) { max = array[i]; }
+  }
+  return [min, max];
+}
+
+/**
+ * Create a data component description
+ * @param {Float32Array} array - The component values
+ * @param {string} shaderName - The name of the component in shaders
+ */
+function component (array, shaderName) {
+  let [min, max] = range(array);
+  return {
+    array: array,
+    initialArray: array,
+    min: min,
+    max: max,
+    shaderName: shaderName
+  };
+}
+
+/**
+ * Create a cube of side**3 voxels, each voxel being split in 6
+ * tetrahedrons
+ * @param {number} side - Number of voxels along each axis
+ * @return {Object} coordArray, tetraArray, facesArray (skin triangles) and
+ * data, like a DataBlock
+ */
+function tetraCube (side) {
+  let n = side + 1;
+  let id = (i, j, k) => { return i + n * (j + n * k); };
+
+  // Vertices and data
+  let nbVertices = n * n * n;
+  let coordArray = new Float32Array(3 * nbVertices);
+  let pressure = new Float32Array(nbVertices);
+  let vx = new Float32Array(nbVertices);
+  let vy = new Float32Array(nbVertices);
+  let vz = new Float32Array(nbVertices);
+  for (let k = 0; k < n; k++) {
+    for (let j = 0; j < n; j++) {
+      for (let i = 0; i < n; i++) {
+        let v = id(i, j, k);
+        let x = i / side, y = j / side, z = k / side;
+        coordArray[3 * v] = x;
+        coordArray[3 * v + 1] = y;
+        coordArray[3 * v + 2] = z;
+
+        pressure[v] = Math.sin(4 * x) * Math.cos(4 * y) + z;
+        vx[v] = -y;
+        vy[v] = x;
+        vz[v] = 0.1 * z;
+      }
+    }
+  }
+
+  // Tetrahedrons
+  let tetraArray = new Uint32Array(4 * HEX_TO_TETRAS.length * side * side * side);
+  let t = 0;
+  for (let k = 0; k < side; k++) {
+    for (let j = 0; j < side; j++) {
+      for (let i = 0; i < side; i++) {
+        let corners = HEX_CORNERS.map((c) => {
+          return id(i + c[0], j + c[1], k + c[2]);
+        });
+        HEX_TO_TETRAS.forEach((tetra) => {
+          tetra.forEach((corner) => { tetraArray[t++] = corners[corner]; });
+        });
+      }
+    }
+  }
+
+  // Skin triangles, two per quad on each of the 6 faces of the cube
+  let faces = [];
+  for (let axis = 0; axis < 3; axis++) {
+    [0, side].forEach((position) => {
+      let point = (u, v) => {
+        let ijk = [0, 0, 0];
+        ijk[axis] = position;
+        ijk[(axis + 1) % 3] = u;
+        ijk[(axis + 2) % 3] = v;
+        return id(ijk[0], ijk[1], ijk[2]);
+      };
+      for (let v = 0; v < side; v++) {
+        for (let u = 0; u < side; u++) {
+          let a = point(u, v), b = point(u + 1, v),
+            c = point(u + 1, v + 1), d = point(u, v + 1);
+          faces.push(a, b, c, a, c, d);
+        }
+      }
+    });
+  }
+
+  return {
+    coordArray: coordArray,
+    tetraArray: tetraArray,
+    facesArray: new Uint32Array(faces),
+    data: {
+      pressure: {
+        X1: component(pressure, 'scivid1c1')
+      },
+      velocity: {
+        X1: component(vx, 'scivid2c1'),
+        X2: component(vy, 'scivid2c2'),
+        X3: component(vz, 'scivid2c3'),
+        Magnitude: {shaderName: 'd2Magnitude'}
+      }
+    }
+  };
+}
+
+module.exports = {
+  tetraCube: tetraCube
+};
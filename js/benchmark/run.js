@@ -0,0 +1,298 @@
+/**
+ * Headless benchmarks of the compute plug-ins, run with:
+ *
+ *   npm run benchmark -- [--sizes=10,20,40] [--repeat=3] [--filter=slice] [--json]
+ *
+ * Sizes are the number of voxels along each axis of the synthetic cube,
+ * each voxel being split in 6 tetrahedrons. Running node with --expose-gc
+ * (as the npm script does) makes the allocation measures more reliable.
+ * **/
+
+// The plug-ins expect ThreeJS and its nodes to be global, as in the browser
+global.window = global;
+let THREE = require('../lib/src/three');
+
+let TetraMesh = require('../lib/src/BlockUtils/PlugIns/octree/tetraMesh');
+let SliceUtils = require('../lib/src/BlockUtils/PlugIns/SliceUtils');
+let GeometryKernels = require('../lib/src/BlockUtils/PlugIns/GeometryKernels');
+
+let meshes = require('./meshes');
+
+/**
+ * Minimal stand-in for the block using a plug-in utility, its parent being
+ * the synthetic mesh
+ * @param {Object} mesh - Mesh returned by meshes.tetraCube
+ */
+function blockStub (mesh) {
+  return {
+    parentBlock: mesh,
+    coordArray: mesh.coordArray,
+    tetraArray: mesh.tetraArray,
+    getCurrentMaterial: () => {
+      let material = new THREE.MeshBasicMaterial();
+      material._transformNodes = [];
+      return material;
+    }
+  };
+}
+
+/**
+ * Arguments of the contour kernel, as given by IsoSurfaceUtils
+ * @param {Object} mesh - Mesh returned by meshes.tetraCube
+ */
+function contourArgs (mesh) {
+  let velocity = mesh.data.velocity;
+  return {
+    coords: mesh.coordArray,
+    tetras: mesh.tetraArray,
+    dataArrays: [mesh.data.pressure.X1.array,
+      velocity.X1.array, velocity.X2.array, velocity.X3.array]
+  };
+}
+
+/**
+ * Arguments of the vectorField kernel, as given by VectorField
+ * @param {Object} mesh - Mesh returned by meshes.tetraCube
+ * @param {number} pcVectors - percentage of displayed vectors
+ * @param {string} mode - volume or surface mode
+ */
+function vectorFieldArgs (mesh, pcVectors, mode) {
+  let velocity = mesh.data.velocity;
+  return {
+    coords: mesh.coordArray,
+    components: [velocity.X1.array, velocity.X2.array, velocity.X3.array],
+    dataArrays: [mesh.data.pressure.X1.array,
+      velocity.X1.array, velocity.X2.array, velocity.X3.array],
+    faces: mode == 'surface' ? mesh.facesArray : null,
+    sample: null,
+    mode: mode,
+    distribution: 'ordered',
+    pcVectors: pcVectors,
+    lengthFactor: 1
+  };
+}
+
+/**
+ * Values spread over the pressure range, excluding its bounds
+ * @param {Object} mesh - Mesh returned by meshes.tetraCube
+ * @param {number} nb - Number of values
+ */
+function pressureValues (mesh, nb) {
+  let pressure = mesh.data.pressure.X1;
+  let values = [];
+  for (let i = 1; i <= nb; i++) {
+    values.push(pressure.min + i * (pressure.max - pressure.min) / (nb + 1));
+  }
+  return values;
+}
+
+// Each suite creates a state from the mesh, which is given to its benchmarks
+let suites = {
+  octree: {
+    setup: (mesh) => {
+      let tetraMesh = new TetraMesh();
+      tetraMesh.initTetraMesh(mesh.coordArray, mesh.tetraArray, []);
+      return {mesh: mesh, tetraMesh: tetraMesh};
+    },
+    benchmarks: {
+      build: (state) => {
+        new TetraMesh().initTetraMesh(
+          state.mesh.coordArray, state.mesh.tetraArray, []);
+      },
+      intersectPlane: (state) => {
+        for (let i = 1; i < 10; i++) {
+          state.tetraMesh.octree_.intersectPlane([i / 10, 0, 0], [1, 0, 0]);
+        }
+      }
+    }
+  },
+
+  // Octree slicing, used by ClipPlane
+  slice: {
+    setup: (mesh) => {
+      let sliceUtils = new SliceUtils(blockStub(mesh));
+      return {mesh: mesh, sliceUtils: sliceUtils};
+    },
+    benchmarks: {
+      build: (state) => {
+        new SliceUtils(blockStub(state.mesh));
+      },
+      createSlice: (state) => {
+        state.sliceUtils.createSlice(1, 0, 0, 0.5);
+      },
+      createObliqueSlice: (state) => {
+        state.sliceUtils.createSlice(1, 1, 1, 1.5);
+      }
+    }
+  },
+
+  // Kernels run by the WorkerPool for IsoSurface, Threshold and Slice
+  contour: {
+    setup: (mesh) => {
+      return {mesh: mesh, args: contourArgs(mesh)};
+    },
+    benchmarks: {
+      isoSurface: (state) => {
+        let args = Object.assign({}, state.args, {
+          scalars: state.mesh.data.pressure.X1.array,
+          value: pressureValues(state.mesh, 1)[0]
+        });
+        GeometryKernels.contour(args);
+      },
+      sweep: (state) => {
+        // Successive values, as when moving a slider
+        pressureValues(state.mesh, 10).forEach((value) => {
+          GeometryKernels.contour(Object.assign({}, state.args, {
+            scalars: state.mesh.data.pressure.X1.array,
+            value: value
+          }));
+        });
+      },
+      slice: (state) => {
+        GeometryKernels.contour(Object.assign({}, state.args, {
+          normal: [1, 0, 0],
+          value: 0.5
+        }));
+      },
+      obliqueSlice: (state) => {
+        let n = 1 / Math.sqrt(3);
+        GeometryKernels.contour(Object.assign({}, state.args, {
+          normal: [n, n, n],
+          value: 1.5 * n
+        }));
+      }
+    }
+  },
+
+  vectorField: {
+    setup: (mesh) => {
+      return {mesh: mesh};
+    },
+    benchmarks: {
+      volume10: (state) => {
+        GeometryKernels.vectorField(
+          vectorFieldArgs(state.mesh, 0.1, 'volume'));
+      },
+      volume100: (state) => {
+        GeometryKernels.vectorField(
+          vectorFieldArgs(state.mesh, 1, 'volume'));
+      },
+      surface100: (state) => {
+        GeometryKernels.vectorField(
+          vectorFieldArgs(state.mesh, 1, 'surface'));
+      }
+    }
+  }
+};
+
+/**
+ * Run a function, measuring its duration and allocations
+ * @param {function} callback - The function to measure
+ * @return {Object} time in milliseconds, heap and arrayBuffers allocations
+ * in bytes
+ */
+function measure (callback) {
+  if (global.gc) { global.gc(); }
+
+  let before = process.memoryUsage();
+  let start = process.hrtime.bigint();
+  callback();
+  let time = Number(process.hrtime.bigint() - start) / 1e6;
+  let after = process.memoryUsage();
+
+  return {
+    time: time,
+    heap: Math.max(after.heapUsed - before.heapUsed, 0),
+    arrayBuffers: Math.max(after.arrayBuffers - before.arrayBuffers, 0)
+  };
+}
+
+function parseArgs (argv) {
+  let options = {sizes: [10, 20, 40], repeat: 3, filter: '', json: false};
+  argv.forEach((arg) => {
+    let [name, value] = arg.replace(/^--/, '').split('=');
+    switch (name) {
+      case 'sizes':
+        options.sizes = value.split(',').map(Number);
+        break;
+      case 'repeat':
+        options.repeat = Number(value);
+        break;
+      case 'filter':
+        options.filter = value;
+        break;
+      case 'json':
+        options.json = true;
+        break;
+      default:
+        throw new Error(`Unknown option "${arg}"`);
+    }
+  });
+  return options;
+}
+
+function formatMB (bytes) {
+  return (bytes / (1024 * 1024)).toFixed(2);
+}
+
+function run (options) {
+  let results = [];
+
+  if (!options.json) {
+    console.log(['benchmark', 'tetrahedrons', 'time (ms)', 'heap (MB)',
+      'arrayBuffers (MB)'].join('\t'));
+  }
+
+  options.sizes.forEach((size) => {
+    let mesh = meshes.tetraCube(size);
+    let nbTetras = mesh.tetraArray.length / 4;
+
+    Object.keys(suites).forEach((suiteName) => {
+      let suite = suites[suiteName];
+      let state = undefined;
+
+      Object.keys(suite.benchmarks).forEach((benchmarkName) => {
+        let name = suiteName + '.' + benchmarkName;
+        if (name.indexOf(options.filter) === -1) {
+          return;
+        }
+
+        // Lazily set up the suite, as it may be filtered out
+        if (state === undefined) {
+          state = suite.setup(mesh);
+        }
+
+        // Best time over the runs, biggest allocations
+        let result = {name: name, tetrahedrons: nbTetras, time: Infinity,
+          heap: 0, arrayBuffers: 0};
+        for (let i = 0; i < options.repeat; i++) {
+          let measured = measure(() => { suite.benchmarks[benchmarkName](state); });
+          result.time = Math.min(result.time, measured.time);
+          result.heap = Math.max(result.heap, measured.heap);
+          result.arrayBuffers = Math.max(result.arrayBuffers, measured.arrayBuffers);
+        }
+        results.push(result);
+
+        if (!options.json) {
+          console.log([name, nbTetras, result.time.toFixed(2),
+            formatMB(result.heap), formatMB(result.arrayBuffers)].join('\t'));
+        }
+      });
+    });
+  });
+
+  if (options.json) {
+    console.log(JSON.stringify(results, null, 2));
+  }
+
+  return results;
+}
+
+if (require.main === module) {
+  run(parseArgs(process.argv.slice(2)));
+}
+
+module.exports = {
+  suites: suites,
+  run: run
+};
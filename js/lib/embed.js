@@ -3,6 +3,10 @@
 // It differs from the notebook bundle in that it does not need to define a
 // dynamic baseURL for the static assets and may load some css that would
 // already be loaded by the notebook otherwise.
+//
+// The arrays of scenes exported with Scene.export_html are not embedded in
+// the page but fetched from its sidecar file (see src/serialization.js), the
+// page must then be served over HTTP next to its sidecar.
 
 // Export widget models and views, and the npm package version number.
 module.exports = require('./src/odysis.js');
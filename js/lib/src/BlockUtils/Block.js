@@ -57,6 +57,7 @@ class Block {
     this._visible = true;
     this._processed = false;
     this._wireframe = false;
+    this._holdingUpdates = false;
 
     this._position = [0.0, 0.0, 0.0];
     this._rotation = [0.0, 0.0, 0.0];
@@ -484,6 +485,20 @@ class Block {
     });
   }
 
+  /**
+   * Defer processing of parameter changes until releaseUpdates is called
+   */
+  holdUpdates () {
+    this._holdingUpdates = true;
+  }
+
+  /**
+   * Process deferred parameter changes
+   */
+  releaseUpdates () {
+    this._holdingUpdates = false;
+  }
+
   /**
    * Add child block
    * @param {PlugInBlock} childBlock - a block that you want to plug in
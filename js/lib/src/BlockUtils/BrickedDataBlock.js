@@ -0,0 +1,182 @@
+/**
+ * @author: Martin Renou / martin.renou@gmail.com
+ * **/
+
+let THREE = require('../three');
+let Block = require('./Block');
+
+/**
+ * Class that displays a mesh partitioned in spatial bricks, bricks being
+ * loaded and unloaded depending on the camera
+ * @extends Block
+ */
+class BrickedDataBlock extends Block {
+
+  /**
+   * Constructor for BrickedDataBlock
+   * @param {THREE.Scene} scene - ThreeJS scene
+   * @param {number[][]} bricks - bounding box of each brick
+   * [xmin, xmax, ymin, ymax, zmin, zmax]
+   * @param {number[]} boundingBox - bounding box of the whole mesh
+   */
+  constructor (scene, bricks, boundingBox) {
+    super(scene);
+    this.blockType = 'BrickedDataBlock';
+
+    this._processed = false;
+    this._material = undefined;
+
+    this._center = new THREE.Vector3(
+      (boundingBox[0] + boundingBox[1]) / 2,
+      (boundingBox[2] + boundingBox[3]) / 2,
+      (boundingBox[4] + boundingBox[5]) / 2
+    );
+
+    // Bricks bounding boxes, centered like the brick geometries
+    this.bricks = bricks.map((bb) => {
+      return new THREE.Box3(
+        new THREE.Vector3(bb[0], bb[2], bb[4]),
+        new THREE.Vector3(bb[1], bb[3], bb[5])
+      ).translate(this._center.clone().negate());
+    });
+
+    this._brickMeshes = {};
+  }
+
+  /**
+   * Method that initialize BrickedDataBlock
+   */
+  process () {
+    return new Promise((resolve, reject) => {
+      this._processed = true;
+
+      // Material shared by all bricks
+      this._material = new THREE.StandardNodeMaterial();
+      this._material.shading = THREE.FlatShading;
+      this._material.side = THREE.DoubleSide;
+      this._material.color = new THREE.ColorNode(0xEEEEEE);
+      this._material.build();
+
+      resolve();
+    });
+  }
+
+  /**
+   * Whether a brick is currently loaded
+   * @param {number} id - The brick index
+   */
+  hasBrick (id) {
+    return this._brickMeshes[id] !== undefined;
+  }
+
+  /**
+   * Return the indices of loaded bricks
+   */
+  loadedBricks () {
+    return Object.keys(this._brickMeshes).map(Number);
+  }
+
+  /**
+   * Add a brick to the scene
+   * @param {number} id - The brick index
+   * @param {Float32Array} vertices - list of 3-D coordinates of the brick points
+   * @param {Uint32Array} faces - list of indices for the brick triangles
+   * @param {Object} data - object containing the brick data
+   */
+  addBrick (id, vertices, faces, data) {
+    if (this.hasBrick(id)) {
+      this.removeBrick(id);
+    }
+
+    let geometry = new THREE.BufferGeometry();
+    geometry.addAttribute('position', new THREE.BufferAttribute(vertices, 3));
+    geometry.setIndex(new THREE.BufferAttribute(faces, 1));
+
+    // Same attribute names as in DataBlock.initAttributeNodes
+    let d = 0;
+    Object.values(data).forEach((components) => {
+      d++;
+      let c = 0;
+      Object.values(components).forEach((component) => {
+        c++;
+        geometry.addAttribute(
+          'scivid' + d + 'c' + c,
+          new THREE.BufferAttribute(component.array, 1)
+        );
+      });
+    });
+
+    geometry.translate(-this._center.x, -this._center.y, -this._center.z);
+
+    let mesh = new THREE.Mesh(geometry, this._material);
+    mesh.position.fromArray(this._position);
+    mesh.rotation.fromArray(this._rotation);
+    mesh.scale.fromArray(this._scale);
+    mesh.visible = this._visible;
+
+    this._brickMeshes[id] = mesh;
+    this._meshes.push(mesh);
+    this._scene.add(mesh);
+  }
+
+  /**
+   * Remove a brick from the scene and free its buffers
+   * @param {number} id - The brick index
+   */
+  removeBrick (id) {
+    let mesh = this._brickMeshes[id];
+    if (mesh === undefined) {
+      return;
+    }
+
+    this._scene.remove(mesh);
+    mesh.geometry.dispose();
+    this._meshes.splice(this._meshes.indexOf(mesh), 1);
+    delete this._brickMeshes[id];
+  }
+
+  /**
+   * Compute the bricks that should be displayed
+   * @param {THREE.Camera} camera - The camera of the view
+   * @param {number} maxBricks - Maximum number of bricks to display
+   * @return {number[]} indices of the bricks in the camera frustum,
+   * nearest first
+   */
+  visibleBricks (camera, maxBricks) {
+    camera.updateMatrixWorld();
+
+    let frustum = new THREE.Frustum();
+    frustum.setFromMatrix(new THREE.Matrix4().multiplyMatrices(
+      camera.projectionMatrix,
+      camera.matrixWorldInverse
+    ));
+
+    let transform = new THREE.Object3D();
+    transform.position.fromArray(this._position);
+    transform.rotation.fromArray(this._rotation);
+    transform.scale.fromArray(this._scale);
+    transform.updateMatrixWorld(true);
+
+    let cameraPosition = new THREE.Vector3().setFromMatrixPosition(
+      camera.matrixWorld);
+
+    let visible = [];
+    this.bricks.forEach((brick, id) => {
+      let box = brick.clone().applyMatrix4(transform.matrixWorld);
+      if (frustum.intersectsBox(box)) {
+        visible.push({id: id, distance: box.distanceToPoint(cameraPosition)});
+      }
+    });
+
+    visible.sort((a, b) => { return a.distance - b.distance; });
+
+    return visible.slice(0, maxBricks).map((brick) => { return brick.id; });
+  }
+
+  remove () {
+    this.loadedBricks().forEach((id) => { this.removeBrick(id); });
+    super.remove();
+  }
+}
+
+module.exports = BrickedDataBlock;
@@ -133,7 +133,8 @@ class DataBlock extends Block {
 
     this._bufferGeometry.addAttribute('position', this.coordAttribute);
     this._bufferGeometry.setIndex(this.facesAttribute);
-    this._bufferGeometry.center();
+    // Translation applied to center the geometry
+    this._centerOffset = this._bufferGeometry.center();
   }
 
   /**
@@ -141,8 +142,29 @@ class DataBlock extends Block {
    */
   updateVertices (newValue) {
     this.coordAttribute.set(newValue);
-    this.coordAttribute.needsUpdate = true;
-    this._bufferGeometry.center();
+    this._setFullUpdate(this.coordAttribute);
+    this._centerOffset = this._bufferGeometry.center();
+    this.updateChildrenGeometry();
+  }
+
+  /**
+   * Update ranges of the vertices, e.g. after a delta update. The geometry
+   * keeps its current centering, and only the updated range is uploaded
+   * @param {Float32Array} vertices - the new 3-D coordinates of the mesh points
+   * @param {Uint32Array} starts - first updated value of each range
+   * @param {Uint32Array} lengths - number of updated values of each range
+   */
+  updateVertexRanges (vertices, starts, lengths) {
+    let array = this.coordAttribute.array;
+    let offset = [this._centerOffset.x, this._centerOffset.y, this._centerOffset.z];
+
+    for (let i = 0; i < starts.length; i++) {
+      for (let j = starts[i], end = starts[i] + lengths[i]; j < end; j++) {
+        array[j] = vertices[j] + offset[j % 3];
+      }
+    }
+
+    this._setUpdateRange(this.coordAttribute, starts, lengths);
     this.updateChildrenGeometry();
   }
 
@@ -160,13 +182,105 @@ class DataBlock extends Block {
 
             let dataAttr = this._bufferGeometry.getAttribute(component.shaderName);
             dataAttr.set(newComponent.array);
-            dataAttr.needsUpdate = true;
+            this._setFullUpdate(dataAttr);
           }
         });
       });
       this.updateChildrenGeometry();
   }
 
+  /**
+   * Update one component in place, only the given ranges if any. Children
+   * blocks are not updated, so that several components can be updated
+   * before calling updateChildrenGeometry
+   * @param {string} dataName - Name of the data
+   * @param {string} componentName - Name of the component
+   * @param {Float32Array} array - The new values
+   * @param {number} min - The new min
+   * @param {number} max - The new max
+   * @param {Uint32Array} starts - first updated value of each range, all
+   * values are updated if undefined
+   * @param {Uint32Array} lengths - number of updated values of each range
+   */
+  updateComponent (dataName, componentName, array, min, max, starts, lengths) {
+    let component = this.data[dataName][componentName];
+    component.initialArray = array;
+    component.min = min;
+    component.max = max;
+
+    let dataAttr = this._bufferGeometry.getAttribute(component.shaderName);
+    if (starts === undefined) {
+      dataAttr.set(array);
+      this._setFullUpdate(dataAttr);
+      return;
+    }
+
+    // The attribute may share its buffer with the array
+    if (dataAttr.array !== array) {
+      for (let i = 0; i < starts.length; i++) {
+        dataAttr.array.set(array.subarray(starts[i], starts[i] + lengths[i]), starts[i]);
+      }
+    }
+    this._setUpdateRange(dataAttr, starts, lengths);
+  }
+
+  /**
+   * Only upload the span of the updated ranges of an attribute, which
+   * requires a dynamic attribute
+   */
+  _setUpdateRange (attribute, starts, lengths) {
+    if (starts.length === 0) {
+      return;
+    }
+    let last = starts.length - 1;
+    attribute.setDynamic(true);
+    attribute.updateRange.offset = starts[0];
+    attribute.updateRange.count = starts[last] + lengths[last] - starts[0];
+    attribute.needsUpdate = true;
+  }
+
+  _setFullUpdate (attribute) {
+    attribute.updateRange.offset = 0;
+    attribute.updateRange.count = -1;
+    attribute.needsUpdate = true;
+  }
+
+  /**
+   * Replace the whole mesh, e.g. when the full resolution mesh replaces a
+   * coarse level of detail. Data names and components must be the same as
+   * the current ones, so that children blocks keep working
+   * @param {Float32Array} vertices - list of 3-D coordinates of the mesh points
+   * @param {Uint32Array} faces - list of indices for the triangle faces
+   * @param {Object} data - object containing the data
+   * @param {Uint32Array} tetras - list of indices for the tetrahedrons
+   */
+  setMesh (vertices, faces, data, tetras) {
+    this.coordArray = vertices;
+    this.facesArray = faces;
+    this.tetraArray = tetras || [];
+
+    // Keep shader names and nodes of the current data
+    Object.keys(this.data).forEach((dataName) => {
+      Object.keys(this.data[dataName]).forEach((componentName) => {
+        let component = this.data[dataName][componentName];
+
+        if (!component.shaderName.endsWith('Magnitude')) {
+          let newComponent = data[dataName][componentName];
+          component.array = newComponent.array;
+          component.min = newComponent.min;
+          component.max = newComponent.max;
+        } else {
+          // Will be computed again by the next getComponentMin call
+          component.min = undefined;
+          component.max = undefined;
+        }
+      });
+    });
+
+    this.initBufferGeometry();
+    this.updateChildrenGeometry();
+  }
+
   updateChildrenGeometry () {
     this.childrenBlocks.forEach((child) => {
       child.updateGeometry();
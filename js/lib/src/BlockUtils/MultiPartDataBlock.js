@@ -0,0 +1,150 @@
+/**
+ * @author: Martin Renou / martin.renou@gmail.com
+ * **/
+
+let THREE = require('../three');
+let DataBlock = require('./DataBlock');
+
+// Maximum width of the lookup texture, tables of more parts use several rows
+const MAX_TABLE_WIDTH = 1024;
+
+// Texel of a part in the lookup texture
+const partTexel = [
+  '    float row = floor((part + 0.5) / tableSize.x);',
+  '    float column = part - row * tableSize.x;',
+  '    vec4 texel = texture2D(partTable, vec2(',
+  '      (column + 0.5) / tableSize.x, (row + 0.5) / tableSize.y));'];
+
+let partAlpha = new THREE.FunctionNode([
+  'float partAlpha(sampler2D partTable, vec2 tableSize, float part){']
+  .concat(partTexel, [
+  '    return texel.a;',
+  '}']).join('\n')
+);
+
+let partColor = new THREE.FunctionNode([
+  'vec3 partColor(sampler2D partTable, vec2 tableSize, float part, vec3 color, float colorParts){']
+  .concat(partTexel, [
+  '    return mix(color, texel.rgb, colorParts);',
+  '}']).join('\n')
+);
+
+/**
+ * Class displaying many meshes, the parts, merged in shared buffers. A data
+ * gives the part index of each point, which is used to look up the
+ * visibility and color of its part in a small RGBA texture, so that parts
+ * are shown, hidden or colored without touching the merged buffers nor
+ * rebuilding the materials. Effects share the alpha and color nodes of the
+ * parts, and the part data is interpolated like any other data on the
+ * geometries they compute
+ * @extends DataBlock
+ */
+class MultiPartDataBlock extends DataBlock {
+
+  /**
+   * Constructor for MultiPartDataBlock
+   * @param {THREE.Scene} scene - ThreeJS scene
+   * @param {Float32Array} vertices - list of 3-D coordinates of the mesh points
+   * @param {Uint32Array} faces - list of indices for the triangle faces
+   * @param {Object} data - object containing the data, with the part indices
+   * @param {Uint32Array} tetras - list of indices for the tetrahedrons
+   * @param {string} partData - name of the data of the part indices
+   * @param {Uint8Array} partTable - RGBA of each part, A being 0 for hidden
+   * parts
+   * @param {boolean} colorParts - whether parts are displayed with their color
+   */
+  constructor (scene, vertices, faces, data, tetras, partData, partTable, colorParts) {
+    super(scene, vertices, faces, data, tetras);
+    this.blockType = 'MultiPartDataBlock';
+
+    this.partData = partData;
+    this._partTable = partTable;
+    this._colorParts = colorParts;
+  }
+
+  /**
+   * Method that initialize MultiPartDataBlock
+   */
+  process () {
+    return super.process().then(() => {
+      let partNode = this.getComponentNode(this.partData);
+
+      this._tableSizeNode = new THREE.Vector2Node(1, 1);
+      this._tableNode = new THREE.TextureNode(new THREE.DataTexture(
+        new Uint8Array(4), 1, 1, THREE.RGBAFormat, THREE.UnsignedByteType,
+        THREE.UVMapping, THREE.ClampToEdgeWrapping, THREE.ClampToEdgeWrapping,
+        THREE.NearestFilter, THREE.NearestFilter
+      ));
+      this._tableNode.value.generateMipmaps = false;
+      this.setPartTable(this._partTable);
+
+      this._colorPartsNode = new THREE.FloatNode(this._colorParts ? 1 : 0);
+
+      let alphaCall = new THREE.FunctionCallNode(partAlpha);
+      alphaCall.inputs.partTable = this._tableNode;
+      alphaCall.inputs.tableSize = this._tableSizeNode;
+      alphaCall.inputs.part = partNode;
+
+      let colorCall = new THREE.FunctionCallNode(partColor);
+      colorCall.inputs.partTable = this._tableNode;
+      colorCall.inputs.tableSize = this._tableSizeNode;
+      colorCall.inputs.part = partNode;
+      colorCall.inputs.color = new THREE.ColorNode(0xEEEEEE);
+      colorCall.inputs.colorParts = this._colorPartsNode;
+
+      let alpha = new Map();
+      alpha.set('operator', 'MUL');
+      alpha.set('node', alphaCall);
+      this._material._alphaNodes.push(alpha);
+
+      let color = new Map();
+      color.set('operator', 'REPLACE');
+      color.set('node', colorCall);
+      this._material._colorNodes.push(color);
+
+      this.buildMaterials();
+    });
+  }
+
+  /**
+   * Update the visibility and colors of the parts. The texture is updated in
+   * place, so that the materials of this block and of its children do not
+   * need to be rebuilt
+   * @param {Uint8Array} partTable - RGBA of each part, A being 0 for hidden
+   * parts
+   */
+  setPartTable (partTable) {
+    let nbParts = Math.max(partTable.length / 4, 1);
+    let width = Math.min(nbParts, MAX_TABLE_WIDTH);
+    let height = Math.ceil(nbParts / width);
+
+    let texels = new Uint8Array(width * height * 4);
+    texels.set(partTable);
+
+    let texture = this._tableNode.value;
+    texture.image = {data: texels, width: width, height: height};
+    texture.needsUpdate = true;
+
+    this._tableSizeNode.x = width;
+    this._tableSizeNode.y = height;
+    this._partTable = partTable;
+  }
+
+  /**
+   * Get whether parts are displayed with their color
+   * @return {boolean}
+   */
+  get colorParts () { return this._colorParts; }
+
+  /**
+   * Set whether parts are displayed with their color, effects like
+   * ColorMapping replacing it
+   * @param {boolean} colorParts
+   */
+  set colorParts (colorParts) {
+    this._colorParts = colorParts;
+    this._colorPartsNode.number = colorParts ? 1 : 0;
+  }
+}
+
+module.exports = MultiPartDataBlock;
@@ -57,6 +57,9 @@ class PlugInBlock extends Block {
       this.parentBlock._scale[1],
       this.parentBlock._scale[2]];
 
+    // Parameter changes deferred by holdUpdates
+    this._pendingUpdates = new Map();
+
     // Compute setters
     this.setters = setters;
     this.getters = getters;
@@ -78,7 +81,11 @@ class PlugInBlock extends Block {
         set: function (value) {
           this['_' + attrName] = value;
           if (this._processed) {
-            processingMethod.call(that, value);
+            if (this._holdingUpdates) {
+              this._pendingUpdates.set(attrName, processingMethod);
+            } else {
+              processingMethod.call(that, value);
+            }
           }
         },
         configurable: true
@@ -86,6 +93,20 @@ class PlugInBlock extends Block {
     });
   }
 
+  /**
+   * Process deferred parameter changes, once per parameter with its
+   * last value
+   */
+  releaseUpdates () {
+    super.releaseUpdates();
+
+    let pendingUpdates = this._pendingUpdates;
+    this._pendingUpdates = new Map();
+    pendingUpdates.forEach((processingMethod, attrName) => {
+      processingMethod.call(this, this['_' + attrName]);
+    });
+  }
+
   /**
    * Install getters
    *
@@ -722,11 +743,19 @@ class PlugInBlock extends Block {
     }
 
     // Update geometry of this block
+    let updated;
     if (this._updateGeometry !== undefined){
-      this._updateGeometry();
+      updated = this._updateGeometry();
     }
 
-    // Update geometry of each children block
+    // Update geometry of each children block, once the geometry is
+    // computed if it is computed by a worker. A cancelled computation
+    // resolves with false, a newer one will update the children
+    if (updated instanceof Promise) {
+      return updated.then((applied) => {
+        if (applied) { this._updateGeometryCall(); }
+      });
+    }
     this._updateGeometryCall();
   }
 
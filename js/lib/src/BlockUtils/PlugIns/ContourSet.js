@@ -0,0 +1,140 @@
+/**
+ * @author: Martin Renou / martin.renou@gmail.com
+ * **/
+
+let PlugInBlock = require('../PlugInBlock');
+
+/**
+ * ContourSet class
+ *
+ * Display iso-surfaces for several values of a variable. Surfaces are
+ * extracted by the kernel, this block only displays their triangles, with
+ * the data interpolated at their points and a 'level' attribute giving the
+ * index of the value of each point.
+ *
+ * @extends PlugInBlock
+ */
+class ContourSet extends PlugInBlock {
+
+  /**
+   * Validate a parent
+   * return {Boolean} true if the parent is a potential parent for a
+   * ContourSet Block, false otherwise
+   */
+  static validate (parent) {
+    return (parent.tetraArray !== undefined);
+  }
+
+  /**
+   * Constructor for ContourSet block
+   * @param {Block} parentBlock - The block before this ContourSet one
+   */
+  constructor (parentBlock) {
+    let setters = {
+      'surfaces': () => { this.updateGeometry(); }
+    };
+
+    super(parentBlock, setters);
+
+    // {vertices, triangles, levels, data} computed by the kernel
+    this._surfaces = {
+      vertices: new Float32Array(0),
+      triangles: new Uint32Array(0),
+      levels: new Uint32Array(0),
+      data: {}
+    };
+    this._surfaceMesh = undefined;
+
+    this.inputDataDim = 1;
+  }
+
+  _process () {
+    // Remove inherited meshes
+    this.removeMeshes();
+
+    this._surfaceBufferGeometry = new THREE.BufferGeometry();
+    this._surfaceMaterial = this.getCurrentMaterial();
+    this._surfaceMaterial.side = THREE.DoubleSide;
+
+    this._updateGeometry();
+
+    this._surfaceMesh = new THREE.Mesh(
+      this._surfaceBufferGeometry, this._surfaceMaterial);
+
+    // Disable frustum to fix display issues...
+    this._surfaceMesh.frustumCulled = false;
+
+    this.addMesh(this._surfaceMesh);
+  }
+
+  _updateGeometry () {
+    let vertices = this._surfaces.vertices || new Float32Array(0);
+    let triangles = this._surfaces.triangles || new Uint32Array(0);
+    let levels = this._surfaces.levels || new Uint32Array(0);
+    let surfacesData = this._surfaces.data || {};
+    let nbPoints = vertices.length / 3;
+
+    this._surfaceBufferGeometry.setIndex(
+      new THREE.BufferAttribute(triangles, 1)
+    );
+
+    this._surfaceBufferGeometry.removeAttribute('position');
+    this._surfaceBufferGeometry.addAttribute(
+      'position',
+      new THREE.BufferAttribute(vertices, 3)
+    );
+
+    this._surfaceBufferGeometry.removeAttribute('level');
+    this._surfaceBufferGeometry.addAttribute(
+      'level',
+      new THREE.BufferAttribute(new Float32Array(levels), 1)
+    );
+
+    // One buffer per data, interpolated by the kernel, and a new data
+    // description for the children blocks
+    let parentData = this.parentBlock.data;
+    let dataDesc = {};
+    Object.keys(parentData).forEach((dataName) => {
+      dataDesc[dataName] = {};
+      Object.keys(parentData[dataName]).forEach((componentName) => {
+        let component = parentData[dataName][componentName];
+
+        dataDesc[dataName][componentName] = {
+          min: component.min,
+          max: component.max,
+          shaderName: component.shaderName,
+          node: component.node
+        };
+
+        if (!component.shaderName.endsWith('Magnitude')) {
+          let array;
+          if (surfacesData[dataName] !== undefined &&
+              surfacesData[dataName][componentName] !== undefined) {
+            array = surfacesData[dataName][componentName].array;
+          } else {
+            array = new Float32Array(nbPoints);
+          }
+
+          dataDesc[dataName][componentName].initialArray = component.initialArray;
+          dataDesc[dataName][componentName].array = array;
+          dataDesc[dataName][componentName].path = component.path;
+
+          this._surfaceBufferGeometry.removeAttribute(component.shaderName);
+          this._surfaceBufferGeometry.addAttribute(
+            component.shaderName,
+            new THREE.BufferAttribute(array, 1)
+          );
+        }
+      });
+    });
+
+    // Update coordArray, facesArray, data
+    this.data = dataDesc;
+    this.levelArray = levels;
+    this.coordArray = vertices;
+    this.facesArray = triangles;
+    this.tetraArray = undefined;
+  }
+}
+
+module.exports = ContourSet;
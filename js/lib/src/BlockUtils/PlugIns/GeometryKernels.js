@@ -0,0 +1,273 @@
+/**
+ * @author: Martin Renou / martin.renou@gmail.com
+ * **/
+
+/**
+ * Geometry computations of the plug-ins, run by the WorkerPool
+ *
+ * Kernels are run in Web Workers from their source, so they must be
+ * self-contained: no reference to anything outside of their body. They take
+ * an object of arguments and return {result, transfer}, transfer being the
+ * buffers of the result that are moved back to the main thread instead of
+ * being copied.
+ */
+
+/**
+ * Surface where the point values are equal to a value, computed by marching
+ * tetrahedrons. The point values are either given, or are the positions of
+ * the points along a normal, the surface being then a slice
+ * @param {Object} args - {coords, tetras, dataArrays, value} and either
+ * scalars, the point values, or normal, the unit normal of the slice
+ * @return {Object} result holds the positions of the points of the
+ * non-indexed triangles, their indices, the data arrays interpolated at
+ * these points, and the min and max of the point values
+ */
+function contour (args) {
+  let coords = args.coords;
+  let tetras = args.tetras;
+  let dataArrays = args.dataArrays;
+  let value = args.value;
+  let nbPoints = coords.length / 3;
+  let nbTetras = tetras.length / 4;
+
+  let scalars = args.scalars;
+  if (args.normal !== undefined) {
+    let [a, b, c] = args.normal;
+    scalars = new Float64Array(nbPoints);
+    for (let i = 0; i < nbPoints; i++) {
+      scalars[i] = a * coords[3 * i] + b * coords[3 * i + 1] +
+        c * coords[3 * i + 2];
+    }
+  }
+
+  let min = Infinity, max = -Infinity;
+  for (let i = 0; i < nbPoints; i++) {
+    if (scalars[i] < min) { min = scalars[i]; }
+    if (scalars[i] > max) { max = scalars[i]; }
+  }
+
+  // Edges of a tetrahedron as pairs of point ranks, and the edges of the
+  // triangles of each case, a case being the bit mask of the points above
+  // the value
+  let edges = [0, 1, 0, 2, 0, 3, 1, 2, 1, 3, 2, 3];
+  let edge = (a, b) => {
+    [a, b] = [Math.min(a, b), Math.max(a, b)];
+    return a === 0 ? b - 1 : a + b;
+  };
+  let counts = new Uint8Array(16);
+  let table = new Uint8Array(16 * 6);
+  for (let c = 1; c < 15; c++) {
+    let above = [], below = [];
+    for (let i = 0; i < 4; i++) {
+      (c & (1 << i) ? above : below).push(i);
+    }
+
+    if (above.length === 2) {
+      let quad = [
+        edge(above[0], below[0]), edge(above[0], below[1]),
+        edge(above[1], below[1]), edge(above[1], below[0])
+      ];
+      table.set([quad[0], quad[1], quad[2], quad[0], quad[2], quad[3]], 6 * c);
+      counts[c] = 2;
+    } else {
+      let [single, others] = above.length === 1
+        ? [above[0], below] : [below[0], above];
+      table.set(others.map((other) => edge(single, other)), 6 * c);
+      counts[c] = 1;
+    }
+  }
+
+  // Classify the tetrahedrons, and count the triangles
+  let cases = new Uint8Array(nbTetras);
+  let nbTriangles = 0;
+  for (let t = 0; t < nbTetras; t++) {
+    let c = 0;
+    for (let i = 0; i < 4; i++) {
+      if (scalars[tetras[4 * t + i]] >= value) { c |= 1 << i; }
+    }
+    cases[t] = c;
+    nbTriangles += counts[c];
+  }
+
+  let positions = new Float32Array(9 * nbTriangles);
+  let outputArrays = dataArrays.map(() => new Float32Array(3 * nbTriangles));
+  let starts = new Uint32Array(3);
+  let ends = new Uint32Array(3);
+  let ratios = new Float64Array(3);
+  let points = new Float64Array(9);
+  let n = 0;
+  for (let t = 0; t < nbTetras; t++) {
+    let c = cases[t];
+    for (let k = 0; k < counts[c]; k++) {
+      // Points on the edges, whose ends are sorted so that the
+      // tetrahedrons sharing an edge compute the same point
+      for (let j = 0; j < 3; j++) {
+        let e = table[6 * c + 3 * k + j];
+        let p0 = tetras[4 * t + edges[2 * e]];
+        let p1 = tetras[4 * t + edges[2 * e + 1]];
+        if (p0 > p1) { [p0, p1] = [p1, p0]; }
+
+        starts[j] = p0;
+        ends[j] = p1;
+        ratios[j] = (value - scalars[p0]) / (scalars[p1] - scalars[p0]);
+        for (let axis = 0; axis < 3; axis++) {
+          points[3 * j + axis] = coords[3 * p0 + axis] + ratios[j] *
+            (coords[3 * p1 + axis] - coords[3 * p0 + axis]);
+        }
+      }
+
+      // Triangles facing increasing values, the first point of the case
+      // being above the value
+      let above = 4 * t;
+      while (!(c & (1 << (above - 4 * t)))) { above++; }
+      above = tetras[above];
+      let ux = points[3] - points[0], uy = points[4] - points[1],
+        uz = points[5] - points[2];
+      let vx = points[6] - points[0], vy = points[7] - points[1],
+        vz = points[8] - points[2];
+      let flipped = (
+        (uy * vz - uz * vy) * (coords[3 * above] - points[0]) +
+        (uz * vx - ux * vz) * (coords[3 * above + 1] - points[1]) +
+        (ux * vy - uy * vx) * (coords[3 * above + 2] - points[2])
+      ) < 0;
+
+      for (let j = 0; j < 3; j++) {
+        let src = flipped && j > 0 ? 3 - j : j;
+        positions[3 * n] = points[3 * src];
+        positions[3 * n + 1] = points[3 * src + 1];
+        positions[3 * n + 2] = points[3 * src + 2];
+
+        let p0 = starts[src], p1 = ends[src], ratio = ratios[src];
+        for (let d = 0; d < dataArrays.length; d++) {
+          let array = dataArrays[d];
+          outputArrays[d][n] = array[p0] + ratio * (array[p1] - array[p0]);
+        }
+        n++;
+      }
+    }
+  }
+
+  // Indices of the points: [0, 1, 2, ..., len-1]
+  let faces = new Uint32Array(3 * nbTriangles);
+  for (let i = 0; i < faces.length; i++) { faces[i] = i; }
+
+  return {
+    result: {
+      positions: positions,
+      faces: faces,
+      dataArrays: outputArrays,
+      min: min,
+      max: max
+    },
+    transfer: [positions.buffer, faces.buffer].concat(
+      outputArrays.map((array) => array.buffer))
+  };
+}
+
+/**
+ * Arrow glyphs of a vector field, drawn as line segments
+ * @param {Object} args - {coords, components, dataArrays, faces, sample,
+ * mode, distribution, pcVectors, lengthFactor}. components are the 3
+ * components of the vectors as point arrays or numbers, sample the ids of
+ * the displayed points when sampled by the kernel, null otherwise
+ * @return {Object} result holds the positions and indices of the glyphs,
+ * and the data arrays at their points
+ */
+function vectorField (args) {
+  let coords = args.coords;
+  let components = args.components;
+  let dataArrays = args.dataArrays;
+  let sample = args.sample;
+  let mode = args.mode;
+  let pcVectors = args.pcVectors;
+  let lengthFactor = args.lengthFactor;
+
+  let getRandomInt = (max) => Math.floor(Math.random() * (max + 1));
+  let getOrderedInt = (idx, pc, max) => Math.min(Math.floor(idx / pc), max);
+
+  // Vertices of the skin, without duplicates to avoid duplicated vectors
+  let surfaceIndexes = [];
+  if (sample === null && mode == 'surface') {
+    let seen = new Uint8Array(coords.length / 3);
+    for (let i = 0; i < args.faces.length; i++) {
+      if (!seen[args.faces[i]]) {
+        seen[args.faces[i]] = 1;
+        surfaceIndexes.push(args.faces[i]);
+      }
+    }
+  }
+
+  let nbVertices = mode == 'surface'
+    ? surfaceIndexes.length : coords.length / 3;
+  let nbVectors = sample === null
+    ? Math.round(pcVectors * nbVertices) : sample.length;
+
+  let positions = new Float32Array(12 * nbVectors);
+  let indices = new Uint32Array(6 * nbVectors);
+  let outputArrays = dataArrays.map(() => new Float32Array(4 * nbVectors));
+  let component = (axis, vertex) => typeof components[axis] == 'number'
+    ? components[axis] : components[axis][vertex];
+
+  let nx = 0, ny = 0, nz = 0;
+  for (let i = 0; i < nbVectors; i++) {
+    let vertex;
+    if (sample !== null) {
+      vertex = sample[i];
+    } else {
+      vertex = args.distribution == 'random'
+        ? getRandomInt(nbVertices - 1)
+        : getOrderedInt(i, pcVectors, nbVertices - 1);
+      if (mode == 'surface') { vertex = surfaceIndexes[vertex]; }
+    }
+
+    let x = coords[vertex * 3];
+    let y = coords[vertex * 3 + 1];
+    let z = coords[vertex * 3 + 2];
+
+    let dx = component(0, vertex) * lengthFactor;
+    let dy = component(1, vertex) * lengthFactor;
+    let dz = component(2, vertex) * lengthFactor;
+
+    // Dumb computation of a perpendicular vector
+    if (dy + dz != 0) {
+      nx = 0;
+      ny = 0.2 * dz;
+      nz = -0.2 * dy;
+    } else if (dx + dz != 0) {
+      nx = -0.2 * dz;
+      ny = 0;
+      nz = 0.2 * dx;
+    }
+
+    // Base, head, and the two branches of the head of the vector
+    positions.set([
+      x, y, z,
+      x + dx, y + dy, z + dz,
+      x + 0.8 * dx + nx, y + 0.8 * dy + ny, z + 0.8 * dz + nz,
+      x + 0.8 * dx - nx, y + 0.8 * dy - ny, z + 0.8 * dz - nz
+    ], 12 * i);
+
+    // Same data for each point of the vector
+    for (let d = 0; d < dataArrays.length; d++) {
+      outputArrays[d].fill(dataArrays[d][vertex], 4 * i, 4 * i + 4);
+    }
+
+    let v = 4 * i;
+    indices.set([v, v + 1, v + 1, v + 2, v + 1, v + 3], 6 * i);
+  }
+
+  return {
+    result: {
+      positions: positions,
+      indices: indices,
+      dataArrays: outputArrays
+    },
+    transfer: [positions.buffer, indices.buffer].concat(
+      outputArrays.map((array) => array.buffer))
+  };
+}
+
+module.exports = {
+  contour: contour,
+  vectorField: vectorField
+};
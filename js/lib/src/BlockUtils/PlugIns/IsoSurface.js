@@ -53,29 +53,23 @@ class IsoSurface extends PlugInBlock {
     this._isoSurfaceUtils = new IsoSurfaceUtils(this);
 
     // Set input for iso-surface
-    this._isoSurfaceUtils.updateInput(
-      this._inputComponentArrays[0],
-      this.inputDataMin,
-      this.inputDataMax
-    );
+    this._isoSurfaceUtils.updateInput(this._inputComponentArrays[0]);
 
-    // Create iso-surface geometry
-    let isoSurface = this._isoSurfaceUtils.createIsoSurface(this._value);
-
-    // Create iso-surface mesh
+    // Create iso-surface mesh, its geometry is computed by a worker
     this._surfaceMesh = new THREE.Mesh(
-      isoSurface.geometry, isoSurface.material);
+      new THREE.BufferGeometry(), this._isoSurfaceUtils.surfaceMaterial);
 
     // Disable frustum to fix display issues...
     this._surfaceMesh.frustumCulled = false;
 
-    // Update coordArray, facesArray, data
-    this.data = isoSurface.data;
-    this.coordArray = isoSurface.coordArray;
-    this.facesArray = isoSurface.facesArray;
+    // Empty until the first iso-surface is computed
+    this.coordArray = new Float32Array(0);
+    this.facesArray = new Uint32Array(0);
     this.tetraArray = undefined;
 
     this.addMesh(this._surfaceMesh);
+
+    this.updateGeometry();
   }
 
   /**
@@ -95,27 +89,27 @@ class IsoSurface extends PlugInBlock {
       this._inputComponentNames);
 
     if (this._isoSurfaceUtils !== undefined) {
-      this._isoSurfaceUtils.updateInput(
-        this._inputComponentArrays[0],
-        this.inputDataMin,
-        this.inputDataMax
-      );
+      this._isoSurfaceUtils.updateInput(this._inputComponentArrays[0]);
 
       this.updateGeometry();
     }
   }
 
   _updateGeometry () {
-    // Create a new iso-surface geometry
-    let isoSurface = this._isoSurfaceUtils.createIsoSurface(this._value);
-
-    // Update the geometry
-    this._surfaceMesh.geometry.copy(isoSurface.geometry);
-
-    // Update coordArray, facesArray, data
-    this.data = isoSurface.data;
-    this.coordArray = isoSurface.coordArray;
-    this.facesArray = isoSurface.facesArray;
+    // Compute a new iso-surface, only the last computation is applied
+    return this._isoSurfaceUtils.createIsoSurface(this._value)
+    .then((isoSurface) => {
+      if (isoSurface === null) { return false; }
+
+      // Update the geometry
+      IsoSurfaceUtils.updateGeometry(this._surfaceMesh.geometry, isoSurface);
+
+      // Update coordArray, facesArray, data
+      this.data = isoSurface.data;
+      this.coordArray = isoSurface.coordArray;
+      this.facesArray = isoSurface.facesArray;
+      return true;
+    });
   }
 }
 
@@ -47,16 +47,17 @@ class Points extends PlugInBlock {
       },
       'distribution': (distribution) => {
         this._checkDistribution(distribution);
-        this.updateGeometry();
+        this._updateSampling();
       },
       'pcPoints': (pcPoints) => {
         this._checkPcPoints(pcPoints);
-        this.updateGeometry();
+        this._updateSampling();
       },
       'mode': (mode) => {
         this._checkMode(mode);
-        this.updateGeometry();
-      }
+        this._updateSampling();
+      },
+      'sampleIndices': () => { this.updateGeometry(); }
     };
 
     super(parentBlock, setters);
@@ -72,6 +73,9 @@ class Points extends PlugInBlock {
 
     this._checkMode(mode);
     this._mode = mode;
+
+    // Ids of the displayed vertices when sampled by the kernel
+    this._sampleIndices = null;
   }
 
   _checkPointsSize (pointsSize) {
@@ -86,9 +90,10 @@ class Points extends PlugInBlock {
   }
 
   _checkDistribution (distribution) {
-    if (!(distribution == 'random' || distribution == 'ordered')) {
+    if (!(distribution == 'random' || distribution == 'ordered' ||
+          distribution == 'stratified')) {
       throw new Error(`Allowed values for Points distribution are ` +
-        `"random" and "ordered" but you gave "${distribution}"`);
+        `"random", "ordered" and "stratified" but you gave "${distribution}"`);
     }
   }
 
@@ -106,6 +111,16 @@ class Points extends PlugInBlock {
     }
   }
 
+  /**
+   * Update geometry after a change of the sampling parameters, unless the
+   * kernel samples the vertices, in which case it sends new sampleIndices
+   */
+  _updateSampling () {
+    if (this._sampleIndices === null) {
+      this.updateGeometry();
+    }
+  }
+
   _process () {
     // Check input parameters
     this._checkDistribution(this._distribution);
@@ -144,14 +159,18 @@ class Points extends PlugInBlock {
     let coordArray = this.parentBlock.coordArray;
     let facesArray = this.parentBlock.facesArray;
 
-    if (facesArray === undefined && this.mode == 'surface') {
+    let sample = this._sampleIndices;
+
+    if (sample === null && facesArray === undefined && this.mode == 'surface') {
       throw new Error('Cannot compute Points in surface mode without ' +
         'faces indices.');
     }
 
     // Delete duplicate indices
-    let surfaceIndexes = new Set(facesArray);
-    surfaceIndexes = Array.from(surfaceIndexes);
+    let surfaceIndexes = [];
+    if (sample === null && this._mode == 'surface') {
+      surfaceIndexes = Array.from(new Set(facesArray));
+    }
 
     let vertex, x, y, z;
 
@@ -170,7 +189,9 @@ class Points extends PlugInBlock {
     }
 
     // Compute the number of displayed points
-    this._nbPoints = Math.round(this._pcPoints * nbVertices);
+    this._nbPoints = sample === null
+      ? Math.round(this._pcPoints * nbVertices)
+      : sample.length;
 
     let pointsCoordArray = [];
 
@@ -190,8 +211,12 @@ class Points extends PlugInBlock {
     }
 
     for (let i = 0; i < this._nbPoints; i++) {
-      switch (this._distribution) {
+      switch (sample === null ? this._distribution : 'kernel') {
+        case 'kernel':
+          vertex = sample[i];
+          break;
         case 'ordered':
+        case 'stratified':
           switch (this._mode) {
             case 'volume':
               vertex = getOrderedInt(i, this._pcPoints, nbVertices - 1);
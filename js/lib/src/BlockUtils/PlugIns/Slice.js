@@ -3,7 +3,7 @@
  * **/
 
 let PlugInBlock = require('../PlugInBlock');
-let SliceUtils = require('./SliceUtils');
+let IsoSurfaceUtils = require('./IsoSurfaceUtils');
 
 /**
  * Slice class
@@ -44,14 +44,6 @@ class Slice extends PlugInBlock {
         }
 
         this.updateGeometry();
-
-        // Get normalized normal
-        this._sliceNormal = this._sliceUtils.abc;
-
-        // Get min and max values (unused but useful to
-        // know bounds of the mesh)
-        this.min = this._sliceUtils.posMin;
-        this.max = this._sliceUtils.posMax;
       },
       'slicePosition': () => { this.updateGeometry(); }
     };
@@ -61,62 +53,60 @@ class Slice extends PlugInBlock {
     this._sliceNormal = sliceNormal;
     this._slicePosition = slicePosition;
 
-    this._sliceUtils = undefined;
-    this._sliceIndex = undefined;
+    this._isoSurfaceUtils = undefined;
+    this._sliceMesh = undefined;
   }
 
   _process () {
-    // Creation of slice
-    this._sliceUtils = new SliceUtils(this);
+    this._isoSurfaceUtils = new IsoSurfaceUtils(this);
 
     // Remove all meshes from scene
     this.removeMeshes();
 
-    // Add mesh to scene and get its position in the array
-    let slice = this._sliceUtils.createSlice(
-      this._sliceNormal[0],
-      this._sliceNormal[1],
-      this._sliceNormal[2],
-      this._slicePosition,
-      true
-    );
-    this._sliceIndex = this.addMesh(slice.mesh);
+    // Create slice mesh, its geometry is computed by a worker
+    this._sliceMesh = new THREE.Mesh(
+      new THREE.BufferGeometry(), this._isoSurfaceUtils.surfaceMaterial);
+    this.addMesh(this._sliceMesh);
 
-    // Update coordArray, facesArray, data and tetrasArray
-    this.data = slice.data;
-    this.coordArray = slice.coordArray;
-    this.facesArray = slice.facesArray;
+    // Empty until the first slice is computed
+    this.coordArray = new Float32Array(0);
+    this.facesArray = new Uint32Array(0);
     this.tetraArray = undefined;
 
-    // Get normalized normal
-    this._sliceNormal = this._sliceUtils.abc;
-
-    // Get min and max values (unused but useful to
-    // know bounds of the mesh for slicePosition)
-    this.min = this._sliceUtils.posMin;
-    this.max = this._sliceUtils.posMax;
-
-    // Promise of process is rejected if the slice can't be computed
-    return this._sliceUtils._enableSlice;
+    this.updateGeometry();
   }
 
-  _updateGeometry(){
-    let slice = this._sliceUtils.createSlice(
-      this._sliceNormal[0],
-      this._sliceNormal[1],
-      this._sliceNormal[2],
-      this._slicePosition
-    );
-    let sliceGeometry = slice.mesh.geometry;
-
-    // Update coordArray, facesArray, data
-    this.data = slice.data;
-    this.coordArray = slice.coordArray;
-    this.facesArray = slice.facesArray;
-
-    if (this._sliceIndex != -1){
-      this._meshes[this._sliceIndex].geometry.copy(sliceGeometry);
+  _updateGeometry () {
+    let [a, b, c] = this._sliceNormal;
+    let norm = Math.sqrt(a * a + b * b + c * c);
+    if (norm == 0) {
+      throw new Error('Can\'t create Slice if normal vector have a ' +
+        'magnitude equal to 0');
     }
+
+    // Get normalized normal
+    this._sliceNormal = [a / norm, b / norm, c / norm];
+
+    // Compute a new slice, only the last computation is applied
+    return this._isoSurfaceUtils.createSlice(
+      this._sliceNormal, this._slicePosition
+    ).then((slice) => {
+      if (slice === null) { return false; }
+
+      // Update the geometry
+      IsoSurfaceUtils.updateGeometry(this._sliceMesh.geometry, slice);
+
+      // Update coordArray, facesArray, data
+      this.data = slice.data;
+      this.coordArray = slice.coordArray;
+      this.facesArray = slice.facesArray;
+
+      // Get min and max values (unused but useful to
+      // know bounds of the mesh for slicePosition)
+      this.min = slice.min;
+      this.max = slice.max;
+      return true;
+    });
   }
 
 }
@@ -0,0 +1,124 @@
+/**
+ * @author: Martin Renou / martin.renou@gmail.com
+ * **/
+
+let PlugInBlock = require('../PlugInBlock');
+
+/**
+ * Streamlines class
+ *
+ * Display streamlines of the input vector data. Lines are integrated by
+ * the kernel, this block only displays their segments and the data
+ * interpolated at their points.
+ *
+ * @extends PlugInBlock
+ */
+class Streamlines extends PlugInBlock {
+
+  /**
+   * Validate a parent
+   * return {Boolean} true if the parent is a potential parent for a
+   * Streamlines Block, false otherwise
+   */
+  static validate (parent) {
+    let valid = true;
+    // Check if one parent is a VectorField, a Points or a Streamlines
+    while (parent !== undefined) {
+      if (parent.blockType === 'VectorField' ||
+          parent.blockType === 'Points' ||
+          parent.blockType === 'Streamlines') { return false; }
+      parent = parent.parentBlock;
+    }
+    return valid;
+  }
+
+  /**
+   * Constructor for Streamlines block
+   *
+   * @param {Block} parentBlock - The block before this Streamlines one
+   */
+  constructor (parentBlock) {
+    let setters = {
+      'lines': () => { this.updateGeometry(); },
+      // LineWidth will have no effect for some GPU, as it's an obsolete
+      // feature of GLSL
+      'linesWidth': (width) => { this.updateLineWidth(width); }
+    };
+
+    super(parentBlock, setters);
+
+    // {vertices, indices, data} computed by the kernel
+    this._lines = {vertices: new Float32Array(0), indices: new Uint32Array(0), data: {}};
+    this._linesWidth = 1;
+
+    this.inputDataDim = 3;
+  }
+
+  _process () {
+    this._linesBufferGeometry = new THREE.BufferGeometry();
+    this._updateGeometry();
+
+    this._linesMaterial = this.getCurrentMaterial();
+
+    let lines = new THREE.LineSegments(
+      this._linesBufferGeometry,
+      this._linesMaterial
+    );
+
+    // Remove all other meshes from scene
+    this.removeMeshes();
+
+    this._linesIndex = this.addMesh(lines);
+
+    this._linesMaterial.linewidth = this._linesWidth;
+  }
+
+  /**
+   * Update geometry when needed
+   */
+  _updateGeometry () {
+    let vertices = this._lines.vertices || new Float32Array(0);
+    let indices = this._lines.indices || new Uint32Array(0);
+    let linesData = this._lines.data || {};
+    let nbPoints = vertices.length / 3;
+
+    this._linesBufferGeometry.setIndex(
+      new THREE.BufferAttribute(indices, 1)
+    );
+
+    this._linesBufferGeometry.removeAttribute('position');
+    this._linesBufferGeometry.addAttribute(
+      'position',
+      new THREE.BufferAttribute(vertices, 3)
+    );
+
+    // One buffer per data, interpolated by the kernel
+    Object.keys(this.data).forEach((dataName) => {
+      Object.keys(this.data[dataName]).forEach((componentName) => {
+        let component = this.data[dataName][componentName];
+        if (component.shaderName.endsWith('Magnitude')) {
+          return;
+        }
+
+        let array;
+        if (linesData[dataName] !== undefined &&
+            linesData[dataName][componentName] !== undefined) {
+          array = linesData[dataName][componentName].array;
+        } else {
+          array = new Float32Array(nbPoints);
+        }
+
+        this._linesBufferGeometry.removeAttribute(component.shaderName);
+        this._linesBufferGeometry.addAttribute(
+          component.shaderName,
+          new THREE.BufferAttribute(array, 1)
+        );
+      });
+    });
+
+    this.facesArray = undefined;
+    this.tetraArray = undefined;
+  }
+}
+
+module.exports = Streamlines;
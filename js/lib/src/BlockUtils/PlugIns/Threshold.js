@@ -122,23 +122,14 @@ class Threshold extends PlugInBlock {
       this._isoSurfaceUtils = new IsoSurfaceUtils(this);
 
       // Set input for iso-surface
-      this._isoSurfaceUtils.updateInput(
-        this._inputComponentArrays[0],
-        this.inputDataMin,
-        this.inputDataMax
-      );
-
-      // Create lowerbound/upperBound iso-surface geometry
-      let lbIsoSurface =
-        this._isoSurfaceUtils.createIsoSurface(this._lowerBound);
-      let ubIsoSurface =
-        this._isoSurfaceUtils.createIsoSurface(this._upperBound);
-
-      // Create lowerbound/upperBound iso-surface mesh
+      this._isoSurfaceUtils.updateInput(this._inputComponentArrays[0]);
+
+      // Create lowerbound/upperBound iso-surface meshes, their geometries
+      // are computed by workers
       this._lbSurfaceMesh = new THREE.Mesh(
-        lbIsoSurface.geometry, lbIsoSurface.material);
+        new THREE.BufferGeometry(), this._isoSurfaceUtils.surfaceMaterial);
       this._ubSurfaceMesh = new THREE.Mesh(
-        ubIsoSurface.geometry, ubIsoSurface.material);
+        new THREE.BufferGeometry(), this._isoSurfaceUtils.surfaceMaterial);
 
       // Disable frustum to fix display issues...
       this._lbSurfaceMesh.frustumCulled = false;
@@ -146,6 +137,9 @@ class Threshold extends PlugInBlock {
 
       this.addMesh(this._lbSurfaceMesh);
       this.addMesh(this._ubSurfaceMesh);
+
+      this._updateGeometryLowerBound();
+      this._updateGeometryUpperBound();
     }
   }
 
@@ -168,11 +162,7 @@ class Threshold extends PlugInBlock {
 
       // Update geometry
       if (this._CPUCompute) {
-        this._isoSurfaceUtils.updateInput(
-          this._inputComponentArrays[0],
-          this.inputDataMin,
-          this.inputDataMax
-        );
+        this._isoSurfaceUtils.updateInput(this._inputComponentArrays[0]);
 
         this._updateGeometryLowerBound();
         this._updateGeometryUpperBound();
@@ -181,21 +171,26 @@ class Threshold extends PlugInBlock {
   }
 
   _updateGeometryLowerBound () {
-    // Create a new iso-surface geometry
-    let isoSurface =
-      this._isoSurfaceUtils.createIsoSurface(this._lowerBound);
-
-    // Update the geometry
-    this._lbSurfaceMesh.geometry.copy(isoSurface.geometry);
+    return this._updateSurface(
+      this._lbSurfaceMesh, this._lowerBound, 'lowerBound');
   }
 
   _updateGeometryUpperBound () {
-    // Create a new iso-surface geometry
-    let isoSurface =
-      this._isoSurfaceUtils.createIsoSurface(this._upperBound);
+    return this._updateSurface(
+      this._ubSurfaceMesh, this._upperBound, 'upperBound');
+  }
 
-    // Update the geometry
-    this._ubSurfaceMesh.geometry.copy(isoSurface.geometry);
+  _updateSurface (surfaceMesh, value, name) {
+    // Compute a new iso-surface, only the last computation of each bound
+    // is applied
+    return this._isoSurfaceUtils.createIsoSurface(value, name)
+    .then((isoSurface) => {
+      if (isoSurface === null) { return false; }
+
+      // Update the geometry
+      IsoSurfaceUtils.updateGeometry(surfaceMesh.geometry, isoSurface);
+      return true;
+    });
   }
 }
 
@@ -3,6 +3,7 @@
  * **/
 
 let PlugInBlock = require('../PlugInBlock');
+let WorkerPool = require('../WorkerPool');
 
 /**
  * VectorField class
@@ -51,16 +52,17 @@ class VectorField extends PlugInBlock {
       'vectorsWidth': (width) => { this.updateLineWidth(width); },
       'distribution': (distribution) => {
         this._checkDistribution(distribution);
-        this.updateGeometry();
+        this._updateSampling();
       },
       'pcVectors': (pcVectors) => {
         this._checkPcVectors(pcVectors);
-        this.updateGeometry();
+        this._updateSampling();
       },
       'mode': (mode) => {
         this._checkMode(mode);
-        this.updateGeometry();
-      }
+        this._updateSampling();
+      },
+      'sampleIndices': () => { this.updateGeometry(); }
     };
 
     super(parentBlock, setters);
@@ -77,13 +79,17 @@ class VectorField extends PlugInBlock {
     this._checkMode(mode);
     this._mode = mode;
 
+    // Ids of the displayed vertices when sampled by the kernel
+    this._sampleIndices = null;
+
     this.inputDataDim = 3;
   }
 
   _checkDistribution (distribution) {
-    if (!(distribution == 'random' || distribution == 'ordered')) {
+    if (!(distribution == 'random' || distribution == 'ordered' ||
+          distribution == 'stratified')) {
       throw new Error(`Allowed values for VectorField distribution ` +
-        `are "random" and "ordered" but you gave "${distribution}"`);
+        `are "random", "ordered" and "stratified" but you gave "${distribution}"`);
     }
   }
 
@@ -101,6 +107,16 @@ class VectorField extends PlugInBlock {
     }
   }
 
+  /**
+   * Update geometry after a change of the sampling parameters, unless the
+   * kernel samples the vertices, in which case it sends new sampleIndices
+   */
+  _updateSampling () {
+    if (this._sampleIndices === null) {
+      this.updateGeometry();
+    }
+  }
+
   _process () {
     // Check input parameters
     this._checkDistribution(this._distribution);
@@ -109,7 +125,7 @@ class VectorField extends PlugInBlock {
 
     // Compute geometry
     this._vectorsBufferGeometry = new THREE.BufferGeometry();
-    this._updateGeometry();
+    this.updateGeometry();
 
     // Get material material
     this._vectorsMaterial = this.getCurrentMaterial();
@@ -139,48 +155,18 @@ class VectorField extends PlugInBlock {
   }
 
   /**
-   * Update geometry when needed
+   * Update geometry when needed, the vectors are computed by a worker
    */
   _updateGeometry () {
-    let nx, ny, nz;
-
-    let vertex, v,
-        x, y, z,
-        dx, dy, dz,
-        datax, datay, dataz;
-
-    // Get arrays containing positions of points and index of skin
-    // points
-    let coordArray = this.parentBlock.coordArray;
     let facesArray = this.parentBlock.facesArray;
+    let sample = this._sampleIndices;
 
-    if (facesArray === undefined && this.mode == 'surface') {
+    if (sample === null && facesArray === undefined && this._mode == 'surface') {
       throw new Error('Cannot compute VectorField in surface mode ' +
         'without faces indices.');
     }
 
-    // Delete duplicate indices (to avoid duplication of vectors)
-    let surfaceIndexes = new Set(facesArray);
-    surfaceIndexes = Array.from(surfaceIndexes);
-
-    let nbVertices;
-    switch (this._mode) {
-      case 'surface':
-        nbVertices = surfaceIndexes.length;
-        break;
-      case 'volume':
-        nbVertices = coordArray.length / 3;
-        break;
-      default:
-        nbVertices = coordArray.length / 3;
-        this._mode = 'volume';
-        break;
-    }
-
-    // Compute the number of displayed vectors
-    this._nbVectors = Math.round(this._pcVectors * nbVertices);
-
-    // Get input arrays and create vectorsDataArrays
+    // Get input arrays
     let inputDataArrays = [];
     Object.values(this.parentBlock.data).forEach((data) => {
       Object.keys(data).forEach((componentName) => {
@@ -189,168 +175,60 @@ class VectorField extends PlugInBlock {
         }
       });
     });
-    let len = inputDataArrays.length;
-    let vectorsDataArrays = new Array(len);
-    while (len--) {
-      vectorsDataArrays[len] = [];
-    }
-
-    let vectorsCoordArray = [];
-    let vectorsIndexArray = [];
-
-    for (let i = 0; i < this._nbVectors; i++) {
-      switch (this._distribution) {
-        case 'ordered':
-          switch (this._mode) {
-            case 'volume':
-              vertex = getOrderedInt(i, this._pcVectors, nbVertices - 1);
-              break;
-            case 'surface':
-              vertex = surfaceIndexes[getOrderedInt(i, this._pcVectors, nbVertices - 1)];
-              break;
-          }
-          break;
-        case 'random':
-          switch (this._mode) {
-            case 'volume':
-              vertex = getRandomInt(nbVertices - 1);
-              break;
-            case 'surface':
-              vertex = surfaceIndexes[getRandomInt(nbVertices - 1)];
-              break;
-          }
-          break;
-        default:
-          switch (this._mode) {
-            case 'volume':
-              vertex = getOrderedInt(i, this._pcVectors, nbVertices - 1);
-              break;
-            case 'surface':
-              vertex = surfaceIndexes[getOrderedInt(i, this._pcVectors, nbVertices - 1)];
-              break;
-          }
-          this._distribution = 'ordered';
-          break;
-      }
-
-      x = coordArray[vertex * 3];
-      y = coordArray[vertex * 3 + 1];
-      z = coordArray[vertex * 3 + 2];
-
-      datax = typeof this._inputComponentArrays[0] == 'number'
-        ? this._inputComponentArrays[0]
-        : this._inputComponentArrays[0][vertex];
-      datay = typeof this._inputComponentArrays[1] == 'number'
-        ? this._inputComponentArrays[1]
-        : this._inputComponentArrays[1][vertex];
-      dataz = typeof this._inputComponentArrays[2] == 'number'
-        ? this._inputComponentArrays[2]
-        : this._inputComponentArrays[2][vertex];
-
-      dx = datax * this._lengthFactor;
-      dy = datay * this._lengthFactor;
-      dz = dataz * this._lengthFactor;
-
-      // Dumb computation of a perpendicular vector
-      if (dy + dz != 0) {
-        nx = 0;
-        ny = 0.2 * dz;
-        nz = -0.2 * dy;
-      } else {
-        if (dx + dz != 0) {
-          nx = -0.2 * dz;
-          ny = 0;
-          nz = 0.2 * dx;
-        }
-      }
-
-      // Base of the vector
-      vectorsCoordArray.push(x);
-      vectorsCoordArray.push(y);
-      vectorsCoordArray.push(z);
-
-      // Head of the vector
-      vectorsCoordArray.push(x + dx);
-      vectorsCoordArray.push(y + dy);
-      vectorsCoordArray.push(z + dz);
-
-      // First branch of the head
-      vectorsCoordArray.push(x + 0.8 * dx + nx);
-      vectorsCoordArray.push(y + 0.8 * dy + ny);
-      vectorsCoordArray.push(z + 0.8 * dz + nz);
-
-      // Second branch of the head
-      vectorsCoordArray.push(x + 0.8 * dx - nx);
-      vectorsCoordArray.push(y + 0.8 * dy - ny);
-      vectorsCoordArray.push(z + 0.8 * dz - nz);
-
-      // Fill vectorsDataArrays
-      vectorsDataArrays.forEach((dataArray, dataIndex) => {
-        let dataValue = inputDataArrays[dataIndex][vertex];
-        // For each point of the vector
-        dataArray.push(dataValue, dataValue, dataValue, dataValue);
-      });
-
-      // Set indices
-      v = 4 * i;
-      vectorsIndexArray.push(v, v + 1, v + 1, v + 2, v + 1, v + 3);
-    }
-
-    // Create buffers
-    let indexAttributes = new THREE.BufferAttribute(
-      new Uint32Array(vectorsIndexArray),
-      1
-    );
-    this._vectorsBufferGeometry.setIndex(indexAttributes);
 
-    let coordAttributes = new THREE.BufferAttribute(
-      new Float32Array(vectorsCoordArray),
-      3
-    );
-    this._vectorsBufferGeometry.removeAttribute('position');
-    this._vectorsBufferGeometry.addAttribute(
-      'position',
-      coordAttributes
-    );
-
-    // One buffer per data
-    let dataIndex = 0;
-    Object.values(this.data).forEach((data) => {
-      Object.values(data).forEach((component) => {
-        if (!component.shaderName.endsWith('Magnitude')) {
-          let bufferArray = new Float32Array(
-            vectorsDataArrays[dataIndex]);
-          let dataAttribute = new THREE.BufferAttribute(
-            bufferArray,
-            1
-          );
-          this._vectorsBufferGeometry.removeAttribute(
-            component.shaderName);
-          this._vectorsBufferGeometry.addAttribute(
-            component.shaderName, dataAttribute);
-
-          dataIndex++;
-        }
-      });
-    });
+    let args = {
+      coords: this.parentBlock.coordArray,
+      components: this._inputComponentArrays.slice(0, 3),
+      dataArrays: inputDataArrays,
+      faces: sample === null && this._mode == 'surface' ? facesArray : null,
+      sample: sample,
+      mode: this._mode,
+      distribution: this._distribution,
+      pcVectors: this._pcVectors,
+      lengthFactor: this._lengthFactor
+    };
 
     this.facesArray = undefined;
     this.tetraArray = undefined;
-  }
-}
 
-function getRandomInt (max) {
-  let min = Math.ceil(0);
-  max = Math.floor(max);
-  return Math.floor(Math.random() * (max - min + 1)) + min;
-}
-
-function getOrderedInt (idx, pc, max) {
-  let value = Math.floor(idx / pc);
-  if (value > max) {
-    value = max;
+    // Only the last computation is applied
+    let key = `${this._plugInID}.vectors`;
+    return WorkerPool.shared().run('vectorField', args, key).then((vectors) => {
+      if (vectors === null) { return false; }
+
+      this._nbVectors = vectors.positions.length / 12;
+
+      // Swap buffers
+      this._vectorsBufferGeometry.setIndex(
+        new THREE.BufferAttribute(vectors.indices, 1)
+      );
+
+      this._vectorsBufferGeometry.removeAttribute('position');
+      this._vectorsBufferGeometry.addAttribute(
+        'position',
+        new THREE.BufferAttribute(vectors.positions, 3)
+      );
+
+      // One buffer per data
+      let dataIndex = 0;
+      Object.values(this.data).forEach((data) => {
+        Object.values(data).forEach((component) => {
+          if (!component.shaderName.endsWith('Magnitude')) {
+            this._vectorsBufferGeometry.removeAttribute(
+              component.shaderName);
+            this._vectorsBufferGeometry.addAttribute(
+              component.shaderName,
+              new THREE.BufferAttribute(vectors.dataArrays[dataIndex], 1)
+            );
+
+            dataIndex++;
+          }
+        });
+      });
+      this._vectorsBufferGeometry.boundingSphere = null;
+      return true;
+    });
   }
-  return value;
 }
 
 module.exports = VectorField;
@@ -0,0 +1,297 @@
+/**
+ * @author: Martin Renou / martin.renou@gmail.com
+ * **/
+
+let GeometryKernels = require('./PlugIns/GeometryKernels');
+
+// Bytes of the buffers kept by each worker, the least recently used buffers
+// being released above it
+const MAX_RESIDENT_BYTES = 256 * 1024 * 1024;
+
+/**
+ * Body of the workers, running the kernels they receive
+ */
+function workerMain () {
+  // Buffers sent by previous jobs, by id
+  let resident = new Map();
+
+  let resolve = (value) => {
+    if (Array.isArray(value)) { return value.map(resolve); }
+    if (value !== null && typeof value === 'object' &&
+        value.residentBuffer !== undefined) {
+      return resident.get(value.residentBuffer);
+    }
+    return value;
+  };
+
+  self.onmessage = (event) => {
+    let job = event.data;
+    job.release.forEach((id) => { resident.delete(id); });
+    job.buffers.forEach(([id, array]) => { resident.set(id, array); });
+
+    try {
+      let args = {};
+      Object.keys(job.args).forEach((name) => {
+        args[name] = resolve(job.args[name]);
+      });
+
+      let output = kernels[job.kernel](args);
+      self.postMessage({id: job.id, result: output.result}, output.transfer);
+    } catch (error) {
+      self.postMessage({id: job.id, error: error.message});
+    }
+  };
+}
+
+/**
+ * WorkerPool class
+ *
+ * Run the GeometryKernels in a pool of Web Workers, so that heavy geometry
+ * computations do not freeze the page. Workers are created from the source
+ * of the kernels, no separate bundle is needed.
+ *
+ * The typed arrays of the arguments, the buffers of the meshes, stay in the
+ * workers: a buffer is only copied to a worker the first time a job uses it,
+ * the following jobs only post their other arguments and a reference to the
+ * buffer. Arrays modified in place once used by a job must be invalidated.
+ * The result buffers are transferred back.
+ *
+ * Jobs are identified by a key, typically a block and the geometry it
+ * computes. Running a job cancels the queued or running job of the same key,
+ * whose promise resolves with null, so that a slider moving fast only
+ * computes and displays the last geometry. Without Web Workers, kernels run
+ * on the main thread, asynchronously so that stale jobs are still skipped.
+ */
+class WorkerPool {
+
+  /**
+   * Pool shared by the blocks, created on first use
+   */
+  static shared () {
+    if (WorkerPool._shared === undefined) {
+      let cores = (typeof navigator !== 'undefined' &&
+        navigator.hardwareConcurrency) || 2;
+      // Keep a core for the main thread
+      WorkerPool._shared = new WorkerPool(Math.min(Math.max(cores - 1, 1), 4));
+    }
+    return WorkerPool._shared;
+  }
+
+  /**
+   * Constructor for WorkerPool
+   * @param {number} size - Maximum number of workers
+   */
+  constructor (size) {
+    this._size = size;
+    this._slots = [];
+    this._queue = [];
+    this._nextId = 0;
+
+    // Ids of the typed arrays sent to the workers, by ArrayBuffer and range
+    this._bufferIds = new WeakMap();
+    this._nextBufferId = 0;
+
+    this._url = undefined;
+    this._useWorkers = typeof Worker !== 'undefined' &&
+      typeof Blob !== 'undefined' && typeof URL !== 'undefined';
+  }
+
+  /**
+   * Run a kernel
+   * @param {string} kernel - Name of the kernel in GeometryKernels
+   * @param {Object} args - Arguments of the kernel
+   * @param {string} key - Identifies the job, cancelling the previous job
+   * of the same key
+   * @return {Promise} resolved with the result of the kernel, or with null
+   * if the job was cancelled
+   */
+  run (kernel, args, key) {
+    this.cancel(key);
+
+    return new Promise((resolve, reject) => {
+      this._queue.push({
+        id: this._nextId++, kernel: kernel, args: args, key: key,
+        resolve: resolve, reject: reject
+      });
+      this._schedule();
+    });
+  }
+
+  /**
+   * Invalidate the copies of an array held by the workers, after it was
+   * modified in place. The array, and the other views on its ArrayBuffer,
+   * are sent again by the next jobs using them
+   * @param {TypedArray} array - The modified array
+   */
+  invalidate (array) {
+    this._bufferIds.delete(array.buffer);
+  }
+
+  /**
+   * Cancel the job of a key, its promise resolves with null
+   * @param {string} key - Key of the job
+   */
+  cancel (key) {
+    if (key === undefined) { return; }
+
+    this._queue = this._queue.filter((job) => {
+      if (job.key !== key) { return true; }
+      job.resolve(null);
+      return false;
+    });
+
+    // Kernels cannot be interrupted, the worker is replaced
+    this._slots.forEach((slot) => {
+      if (slot.job !== null && slot.job.key === key) {
+        slot.job.resolve(null);
+        slot.job = null;
+        if (slot.worker !== null) {
+          slot.worker.terminate();
+          slot.worker = this._createWorker(slot);
+        }
+      }
+    });
+  }
+
+  _schedule () {
+    while (this._queue.length !== 0) {
+      let slot = this._slots.find((slot) => slot.job === null);
+      if (slot === undefined) {
+        if (this._slots.length === this._size) { return; }
+
+        slot = {worker: null, job: null};
+        slot.worker = this._createWorker(slot);
+        this._slots.push(slot);
+      }
+
+      let job = this._queue.shift();
+      slot.job = job;
+      if (slot.worker !== null) {
+        slot.worker.postMessage(this._message(slot, job));
+      } else {
+        setTimeout(() => { this._runOnMainThread(slot, job); }, 0);
+      }
+    }
+  }
+
+  /**
+   * Message of a job, with the buffers the worker of the slot does not have
+   */
+  _message (slot, job) {
+    let message = {
+      id: job.id, kernel: job.kernel, args: {}, buffers: [], release: []
+    };
+
+    let used = new Set();
+    let reference = (value) => {
+      if (Array.isArray(value)) { return value.map(reference); }
+      if (!ArrayBuffer.isView(value)) { return value; }
+
+      let ids = this._bufferIds.get(value.buffer);
+      if (ids === undefined) {
+        ids = new Map();
+        this._bufferIds.set(value.buffer, ids);
+      }
+      let range = `${value.constructor.name}.${value.byteOffset}.${value.length}`;
+      let id = ids.get(range);
+      if (id === undefined) {
+        id = this._nextBufferId++;
+        ids.set(range, id);
+      }
+      used.add(id);
+
+      // Most recently used last
+      if (slot.resident.has(id)) {
+        slot.resident.delete(id);
+      } else {
+        message.buffers.push([id, value]);
+        slot.residentBytes += value.byteLength;
+      }
+      slot.resident.set(id, value.byteLength);
+
+      return {residentBuffer: id};
+    };
+
+    Object.keys(job.args).forEach((name) => {
+      message.args[name] = reference(job.args[name]);
+    });
+
+    for (let [id, byteLength] of slot.resident) {
+      if (slot.residentBytes <= MAX_RESIDENT_BYTES) { break; }
+      if (!used.has(id)) {
+        slot.resident.delete(id);
+        slot.residentBytes -= byteLength;
+        message.release.push(id);
+      }
+    }
+
+    return message;
+  }
+
+  _runOnMainThread (slot, job) {
+    if (slot.job !== job) { return; }
+
+    try {
+      this._finish(slot, job.id, GeometryKernels[job.kernel](job.args).result);
+    } catch (error) {
+      this._finish(slot, job.id, undefined, error);
+    }
+  }
+
+  _finish (slot, id, result, error) {
+    let job = slot.job;
+    if (job === null || job.id !== id) { return; }
+
+    slot.job = null;
+    if (error !== undefined) {
+      job.reject(error);
+    } else {
+      job.resolve(result);
+    }
+    this._schedule();
+  }
+
+  /**
+   * Create a worker running the kernels, or return null if Web Workers
+   * are not available
+   */
+  _createWorker (slot) {
+    if (!this._useWorkers) { return null; }
+
+    // Byte lengths of the buffers held by the worker, by id
+    slot.resident = new Map();
+    slot.residentBytes = 0;
+
+    try {
+      if (this._url === undefined) {
+        let kernels = Object.keys(GeometryKernels).map((name) => {
+          return `${name}: ${GeometryKernels[name].toString()}`;
+        });
+        let source = `let kernels = {\n${kernels.join(',\n')}\n};\n` +
+          `(${workerMain.toString()})();\n`;
+        this._url = URL.createObjectURL(
+          new Blob([source], {type: 'application/javascript'}));
+      }
+
+      let worker = new Worker(this._url);
+      worker.onmessage = (event) => {
+        let message = event.data;
+        this._finish(slot, message.id, message.result,
+          message.error !== undefined ? new Error(message.error) : undefined);
+      };
+      worker.onerror = (event) => {
+        event.preventDefault();
+        if (slot.job !== null) {
+          this._finish(slot, slot.job.id, undefined, new Error(event.message));
+        }
+      };
+      return worker;
+    } catch (error) {
+      // E.g. workers forbidden by the content security policy
+      this._useWorkers = false;
+      return null;
+    }
+  }
+}
+
+module.exports = WorkerPool;
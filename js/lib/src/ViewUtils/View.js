@@ -15,6 +15,8 @@ function registerBlockType (block) {
 }
 
 let DataBlock = require('../BlockUtils/DataBlock');
+let BrickedDataBlock = require('../BlockUtils/BrickedDataBlock');
+let MultiPartDataBlock = require('../BlockUtils/MultiPartDataBlock');
 
 let ColorMapping = require('../BlockUtils/PlugIns/ColorMapping');
 registerBlockType(ColorMapping);
@@ -40,9 +42,15 @@ registerBlockType(VectorField);
 let Points = require('../BlockUtils/PlugIns/Points');
 registerBlockType(Points);
 
+let Streamlines = require('../BlockUtils/PlugIns/Streamlines');
+registerBlockType(Streamlines);
+
 let IsoSurface = require('../BlockUtils/PlugIns/IsoSurface');
 registerBlockType(IsoSurface);
 
+let ContourSet = require('../BlockUtils/PlugIns/ContourSet');
+registerBlockType(ContourSet);
+
 /**
  * View class
  */
@@ -164,6 +172,43 @@ class View {
     );
   }
 
+  /**
+   * Create multi-part datablock method
+   */
+  addMultiPartDataBlock (vertices, faces, data, tetras, partData, partTable, colorParts) {
+    let block = new MultiPartDataBlock(
+      this.scene, vertices, faces, data, tetras, partData, partTable, colorParts);
+    return block.process().then(
+      () => {
+        // On fulfilled
+        this.blocks.push(block);
+        return block;
+      },
+      () => {
+        // On reject
+        return false;
+      }
+    );
+  }
+
+  /**
+   * Create bricked datablock method
+   */
+  addBrickedDataBlock (bricks, boundingBox) {
+    let block = new BrickedDataBlock(this.scene, bricks, boundingBox);
+    return block.process().then(
+      () => {
+        // On fulfilled
+        this.blocks.push(block);
+        return block;
+      },
+      () => {
+        // On reject
+        return false;
+      }
+    );
+  }
+
   /**
    * Create block method
    * @param {string} blockType - Type of the block that you want to
@@ -192,6 +237,32 @@ class View {
     }
   }
 
+  /**
+   * Apply changes on several blocks at once, each block processing its
+   * pending changes only once, parents first
+   * @param {function} callback - Function changing blocks parameters
+   */
+  batchUpdate (callback) {
+    this.blocks.forEach((block) => { block.holdUpdates(); });
+
+    try {
+      callback();
+    } finally {
+      let depth = (block) => {
+        let d = 0;
+        while (block.parentBlock !== undefined) {
+          block = block.parentBlock;
+          d++;
+        }
+        return d;
+      };
+
+      this.blocks.slice()
+        .sort((a, b) => { return depth(a) - depth(b); })
+        .forEach((block) => { block.releaseUpdates(); });
+    }
+  }
+
   /**
    * Remove block method
    * @param {Block} block - The block which you want to remove
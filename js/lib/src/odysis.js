@@ -3,6 +3,7 @@ let _ = require('lodash');
 let object_values = require('object.values');
 require('./three');
 let serialization = require('./serialization');
+let WorkerPool = require('./BlockUtils/WorkerPool');
 let slider = require('./slider');
 
 
@@ -25,7 +26,51 @@ let SceneModel = widgets.DOMWidgetModel.extend({
         _view_module_version : odysis_version,
         datablocks: [],
         background_color: '#fff'
-    })
+    }),
+
+    initialize: function () {
+        SceneModel.__super__.initialize.apply(this, arguments);
+
+        this.on('msg:custom', this.handle_message, this);
+    },
+
+    /**
+     * Apply a batch of block states, once, whether or not the scene is
+     * rendered. Each rendered view of the scene holds the updates of its
+     * blocks while the states are set, and then processes each block once
+     */
+    handle_message: function (content, buffers) {
+        if (content.event !== 'batch_update') {
+            return;
+        }
+
+        widgets.put_buffers(content.updates, content.buffer_paths, buffers);
+
+        let manager = this.widget_manager;
+        let updates = Promise.all(content.updates.map(([model_id, state]) => {
+            return manager.get_model(model_id).then((model) => {
+                return model.constructor._deserialize_state(state, manager).then((state) => {
+                    return [model, state];
+                });
+            });
+        }));
+        let views = Promise.all(Object.values(this.views || {}));
+
+        Promise.all([updates, views]).then(([updates, views]) => {
+            let apply = () => {
+                updates.forEach(([model, state]) => {
+                    model.set_state(state);
+                });
+            };
+
+            // Views which are not displayed yet will use the new states
+            views.filter((scene_view) => {
+                return scene_view.view !== undefined;
+            }).reduce((callback, scene_view) => {
+                return () => { scene_view.view.batchUpdate(callback); };
+            }, apply)();
+        });
+    }
 }, {
     serializers: _.extend({
         datablocks: { deserialize: widgets.unpack_models }
@@ -43,6 +88,8 @@ let SceneView = widgets.DOMWidgetView.extend({
         this.displayed.then(() => {
             this.el.style.height = '400px';
             this.el.style.overflow = 'hidden';
+            // Errors of the blocks are displayed over the scene
+            this.el.style.position = 'relative';
             this.el.style.flex = '1 1 auto';
             this.view = new View(this.el);
 
@@ -77,6 +124,39 @@ let SceneView = widgets.DOMWidgetView.extend({
     }
 });
 
+/**
+ * Apply the array deltas of a state update in place to the current arrays of
+ * the model. The state gets new views on the updated arrays, so that change
+ * events are triggered, and the deltas of the update are kept in
+ * model.array_deltas for the listeners which only update what changed
+ */
+function apply_array_deltas(model, state) {
+    model.array_deltas = {};
+    Object.keys(state).forEach((key) => {
+        let delta = state[key];
+        if (delta === null || delta === undefined || !delta.delta) {
+            return;
+        }
+
+        let array = model.get(key);
+        // Other models keep the shared array
+        if (serialization.is_shared(array)) {
+            array = array.slice();
+        }
+        let offset = 0;
+        for (let i = 0; i < delta.starts.length; i++) {
+            let length = delta.lengths[i];
+            array.set(delta.values.subarray(offset, offset + length), delta.starts[i]);
+            offset += length;
+        }
+        // The workers computing geometries hold copies of the array
+        WorkerPool.shared().invalidate(array);
+
+        model.array_deltas[key] = delta;
+        state[key] = new array.constructor(array.buffer, array.byteOffset, array.length);
+    });
+}
+
 let ComponentModel = widgets.WidgetModel.extend({
     defaults: _.extend({}, widgets.WidgetModel.prototype.defaults, {
         _model_name : 'ComponentModel',
@@ -89,7 +169,12 @@ let ComponentModel = widgets.WidgetModel.extend({
         array: [],
         min: undefined,
         max: undefined
-    })
+    }),
+
+    set_state: function (state) {
+        apply_array_deltas(this, state);
+        return ComponentModel.__super__.set_state.apply(this, arguments);
+    }
 }, {
     serializers: _.extend({
         array: serialization.float32array
@@ -122,6 +207,7 @@ let BlockModel = widgets.WidgetModel.extend({
         _model_module_version : odysis_version,
         _view_module_version : odysis_version,
         visible: true,
+        _profiling: false,
         _blocks: []
     })
 }, {
@@ -140,7 +226,9 @@ let BlockView = widgets.WidgetView.extend({
     },
 
     render: function () {
-        return Promise.resolve(this.create_block()).then(() => {
+        return this.profile('create_block', () => {
+            return this.create_block();
+        }).then(() => {
             this.model_events();
 
             this.block_views.update(this.model.get('_blocks'));
@@ -156,6 +244,29 @@ let BlockView = widgets.WidgetView.extend({
         });
     },
 
+    /**
+     * Run a processing step, reporting its duration to the kernel if
+     * profiling is enabled
+     * @param {string} stage - Name of the step
+     * @param {function} callback - The processing, may return a Promise
+     * @return {Promise} resolved with the result of the callback
+     */
+    profile: function (stage, callback) {
+        if (!this.model.get('_profiling')) {
+            return Promise.resolve(callback());
+        }
+
+        let start = performance.now();
+        return Promise.resolve(callback()).then((result) => {
+            this.send({
+                event: 'profile',
+                stage: stage,
+                wall_time: (performance.now() - start) / 1000
+            });
+            return result;
+        });
+    },
+
     add_block: function (block_model) {
         return this.create_child_view(block_model, {
             scene_view: this.scene_view,
@@ -173,6 +284,28 @@ let BlockView = widgets.WidgetView.extend({
     }
 });
 
+/**
+ * Convert Data models in the {dataName: {componentName: {array, min, max}}}
+ * description used by the blocks
+ */
+function data_models_to_data(data_models) {
+    let data = {};
+    data_models.forEach((data_model) => {
+        let data_name = data_model.get('name');
+        data[data_name] = {};
+        data_model.get('components').forEach((component_model) => {
+            let component_name = component_model.get('name');
+            data[data_name][component_name] = {
+                array: component_model.get('array'),
+                min: component_model.get('min'),
+                max: component_model.get('max')
+            };
+        });
+    });
+
+    return data;
+}
+
 let MeshModel = widgets.WidgetModel.extend({
     defaults: _.extend({}, widgets.WidgetModel.prototype.defaults, {
         _model_name : 'MeshModel',
@@ -188,22 +321,12 @@ let MeshModel = widgets.WidgetModel.extend({
     }),
 
     get_data: function() {
-        let mesh_data = this.get('data');
-        let data = {};
-        mesh_data.forEach((data_model) => {
-            let data_name = data_model.get('name');
-            data[data_name] = {};
-            data_model.get('components').forEach((component_model) => {
-                let component_name = component_model.get('name');
-                data[data_name][component_name] = {
-                    array: component_model.get('array'),
-                    min: component_model.get('min'),
-                    max: component_model.get('max')
-                };
-            });
-        });
+        return data_models_to_data(this.get('data'));
+    },
 
-        return data;
+    set_state: function (state) {
+        apply_array_deltas(this, state);
+        return MeshModel.__super__.set_state.apply(this, arguments);
     }
 }, {
     serializers: _.extend({
@@ -222,44 +345,334 @@ let DataBlockModel = BlockModel.extend({
         _view_module : 'odysis',
         _model_module_version : odysis_version,
         _view_module_version : odysis_version,
-        mesh: null
-    })
+        mesh: null,
+        coarse_mesh: null,
+        error: null
+    }),
+
+    get_mesh: function() {
+        return this.get('mesh') || this.get('coarse_mesh');
+    }
 }, {
     serializers: _.extend({
-        mesh: { deserialize: widgets.unpack_models }
+        mesh: { deserialize: widgets.unpack_models },
+        coarse_mesh: { deserialize: widgets.unpack_models }
     }, BlockModel.serializers)
 });
 
 let DataBlockView = BlockView.extend({
+    render: function () {
+        // The error may happen before the first mesh, which the block waits for
+        this.error_events();
+        return DataBlockView.__super__.render.apply(this, arguments);
+    },
+
+    /**
+     * Display the error which stopped the kernel from reading the grid
+     */
+    error_events: function () {
+        let show_error = () => {
+            if (this.error_el) {
+                this.error_el.remove();
+                this.error_el = undefined;
+            }
+
+            let error = this.model.get('error');
+            if (error) {
+                this.error_el = document.createElement('div');
+                this.error_el.textContent = error;
+                Object.assign(this.error_el.style, {
+                    position: 'absolute',
+                    top: '0',
+                    left: '0',
+                    padding: '4px',
+                    color: '#c00',
+                    background: 'rgba(255, 255, 255, 0.8)'
+                });
+                this.scene_view.el.appendChild(this.error_el);
+            }
+        };
+        this.listenTo(this.model, 'change:error', show_error);
+        show_error();
+    },
+
+    remove: function () {
+        if (this.error_el) {
+            this.error_el.remove();
+        }
+        return DataBlockView.__super__.remove.apply(this, arguments);
+    },
+
     create_block: function () {
+        return this.wait_for_mesh().then((mesh) => {
+            return this.add_data_block(mesh).then(((block) => {
+                this.block = block;
+                this.mesh = mesh;
+
+                // Compute scale
+                let bb = mesh.get('bounding_box');
+                let dx = bb[1] - bb[0];
+                let dy = bb[3] - bb[2];
+                let dz = bb[5] - bb[4];
+                let scale = 3 / (dx + dy + dz);
+                block.scale = [scale, scale, scale];
+            }));
+        });
+    },
+
+    /**
+     * The current mesh, waiting for the first level of detail while the
+     * kernel reads the grid
+     * @return {Promise} resolved with the mesh model
+     */
+    wait_for_mesh: function () {
+        let mesh = this.model.get_mesh();
+        if (mesh) {
+            return Promise.resolve(mesh);
+        }
+
+        return new Promise((resolve) => {
+            let on_change = () => {
+                let mesh = this.model.get_mesh();
+                if (mesh) {
+                    this.stopListening(this.model, 'change:mesh change:coarse_mesh', on_change);
+                    resolve(mesh);
+                }
+            };
+            this.listenTo(this.model, 'change:mesh change:coarse_mesh', on_change);
+        });
+    },
+
+    add_data_block: function (mesh) {
         return this.scene_view.view.addDataBlock(
-            this.model.get('mesh').get('vertices'),
-            this.model.get('mesh').get('triangles'),
-            this.model.get('mesh').get_data(),
-            this.model.get('mesh').get('tetrahedrons')
+            mesh.get('vertices'),
+            mesh.get('triangles'),
+            mesh.get_data(),
+            mesh.get('tetrahedrons')
+        );
+    },
+
+    model_events: function () {
+        DataBlockView.__super__.model_events.apply(this, arguments);
+
+        // Children blocks are updated once after the updates of several
+        // components
+        this.update_children = _.debounce(() => {
+            this.block.updateChildrenGeometry();
+        }, 0);
+
+        this.mesh_events();
+
+        // The full resolution mesh replaces the coarse one
+        this.model.on('change:mesh', () => {
+            this.set_mesh();
+        });
+        // It may have arrived while the block was created
+        if (this.model.get('mesh') && this.model.get('mesh') !== this.mesh) {
+            this.set_mesh();
+        }
+    },
+
+    set_mesh: function () {
+        this.stopListening(this.mesh);
+        this.mesh = this.model.get('mesh');
+
+        this.profile('set_mesh', () => {
+            this.block.setMesh(
+                this.mesh.get('vertices'),
+                this.mesh.get('triangles'),
+                this.mesh.get_data(),
+                this.mesh.get('tetrahedrons')
+            );
+        });
+        this.mesh_events();
+    },
+
+    mesh_events: function () {
+        this.listenTo(this.mesh, 'change:vertices', () => {
+            let delta = (this.mesh.array_deltas || {}).vertices;
+            if (delta) {
+                this.block.updateVertexRanges(this.mesh.get('vertices'), delta.starts, delta.lengths);
+            } else {
+                this.block.updateVertices(this.mesh.get('vertices'));
+            }
+        });
+        this.listenTo(this.mesh, 'change:data', () => {
+            this.block.updateData(this.mesh.get_data());
+            this.component_events();
+        });
+        this.component_events();
+        // TODO Update tetrahedrons, update triangles?
+        // TODO Try to update vertices and data at the same time?
+    },
+
+    /**
+     * Listen to the components updated in place, e.g. by Mesh.reload
+     */
+    component_events: function () {
+        (this.component_models || []).forEach((component_model) => {
+            this.stopListening(component_model);
+        });
+        this.component_models = [];
+
+        this.mesh.get('data').forEach((data_model) => {
+            data_model.get('components').forEach((component_model) => {
+                this.component_models.push(component_model);
+                this.listenTo(component_model, 'change:array', () => {
+                    let delta = (component_model.array_deltas || {}).array;
+                    this.block.updateComponent(
+                        data_model.get('name'), component_model.get('name'),
+                        component_model.get('array'),
+                        component_model.get('min'), component_model.get('max'),
+                        delta ? delta.starts : undefined, delta ? delta.lengths : undefined
+                    );
+                    this.update_children();
+                });
+            });
+        });
+    },
+
+});
+
+let MultiPartDataBlockModel = DataBlockModel.extend({
+    defaults: _.extend({}, DataBlockModel.prototype.defaults, {
+        _model_name : 'MultiPartDataBlockModel',
+        _view_name : 'MultiPartDataBlockView',
+        part_names: [],
+        part_field: 'part',
+        part_table: null,
+        color_parts: false
+    })
+}, {
+    serializers: _.extend({
+        part_table: serialization.uint8array
+    }, DataBlockModel.serializers)
+});
+
+let MultiPartDataBlockView = DataBlockView.extend({
+    add_data_block: function (mesh) {
+        return this.scene_view.view.addMultiPartDataBlock(
+            mesh.get('vertices'),
+            mesh.get('triangles'),
+            mesh.get_data(),
+            mesh.get('tetrahedrons'),
+            this.model.get('part_field'),
+            this.model.get('part_table'),
+            this.model.get('color_parts')
+        );
+    },
+
+    model_events: function () {
+        MultiPartDataBlockView.__super__.model_events.apply(this, arguments);
+
+        // Only the lookup table is sent, not the merged buffers
+        this.model.on('change:part_table', () => {
+            this.block.setPartTable(this.model.get('part_table'));
+        });
+        this.model.on('change:color_parts', () => {
+            this.block.colorParts = this.model.get('color_parts');
+        });
+    }
+});
+
+let BrickedDataBlockModel = BlockModel.extend({
+    defaults: _.extend({}, BlockModel.prototype.defaults, {
+        _model_name : 'BrickedDataBlockModel',
+        _view_name : 'BrickedDataBlockView',
+        _model_module : 'odysis',
+        _view_module : 'odysis',
+        _model_module_version : odysis_version,
+        _view_module_version : odysis_version,
+        bricks: [],
+        bounding_box: [],
+        max_loaded_bricks: 64
+    })
+});
+
+let BrickedDataBlockView = BlockView.extend({
+    create_block: function () {
+        let bb = this.model.get('bounding_box');
+
+        return this.scene_view.view.addBrickedDataBlock(
+            this.model.get('bricks'), bb
         ).then(((block) => {
             this.block = block;
+            this.requested_bricks = new Set();
 
             // Compute scale
-            let bb = this.model.get('mesh').get('bounding_box');
             let dx = bb[1] - bb[0];
             let dy = bb[3] - bb[2];
             let dz = bb[5] - bb[4];
             let scale = 3 / (dx + dy + dz);
             block.scale = [scale, scale, scale];
+
+            this.update_bricks();
         }));
     },
 
     model_events: function () {
-        DataBlockView.__super__.model_events.apply(this, arguments);
-        this.model.get('mesh').on('change:vertices', () => {
-            this.block.updateVertices(this.model.get('mesh').get('vertices'));
+        BrickedDataBlockView.__super__.model_events.apply(this, arguments);
+
+        this.model.on('msg:custom', this.handle_message, this);
+        this.model.on('change:max_loaded_bricks', this.update_bricks, this);
+
+        // Request bricks once the camera stopped moving
+        this.debounced_update_bricks = _.debounce(this.update_bricks.bind(this), 200);
+        this.scene_view.view.controls.addEventListener('change', this.debounced_update_bricks);
+    },
+
+    update_bricks: function () {
+        let ids = this.block.visibleBricks(
+            this.scene_view.view.camera,
+            this.model.get('max_loaded_bricks')
+        );
+
+        // Unload bricks which are not needed anymore
+        this.block.loadedBricks().forEach((id) => {
+            if (ids.indexOf(id) === -1) {
+                this.block.removeBrick(id);
+            }
         });
-        this.model.get('mesh').on('change:data', () => {
-            this.block.updateData(this.model.get('mesh').get_data());
+
+        let missing = ids.filter((id) => {
+            return !this.block.hasBrick(id) && !this.requested_bricks.has(id);
         });
-        // TODO Update tetrahedrons, update triangles?
-        // TODO Try to update vertices and data at the same time?
+        if (missing.length) {
+            missing.forEach((id) => { this.requested_bricks.add(id); });
+            this.send({event: 'request_bricks', ids: missing});
+        }
+    },
+
+    handle_message: function (content, buffers) {
+        if (content.event !== 'brick') {
+            return;
+        }
+        this.requested_bricks.delete(content.id);
+
+        let data = {};
+        content.components.forEach((component, index) => {
+            let [data_name, component_name, min, max] = component;
+            data[data_name] = data[data_name] || {};
+            data[data_name][component_name] = {
+                array: new Float32Array(buffers[index + 2].buffer),
+                min: min,
+                max: max
+            };
+        });
+
+        this.profile('add_brick', () => {
+            this.block.addBrick(
+                content.id,
+                new Float32Array(buffers[0].buffer),
+                new Uint32Array(buffers[1].buffer),
+                data
+            );
+        });
+    },
+
+    remove: function () {
+        this.scene_view.view.controls.removeEventListener('change', this.debounced_update_bricks);
+        BrickedDataBlockView.__super__.remove.apply(this, arguments);
     }
 });
 
@@ -269,6 +682,7 @@ let PluginBlockModel = BlockModel.extend({
         _view_name : 'PluginBlockView',
         input_data: '',
         input_components: [],
+        sync_rate: 20,
         _blocks: []
     })
 }, {
@@ -303,6 +717,25 @@ let PluginBlockView = BlockView.extend({
             this.block.inputComponents = this.model.get('input_components');
         });
     },
+
+    /**
+     * Listen to changes of parameters, processing them at most sync_rate
+     * times per second. Intermediate values are dropped, but the last change
+     * is always processed.
+     * @param {string|string[]} names - Names of the parameters
+     * @param {function} callback - Processing of the new values
+     */
+    on_parameter_change: function (names, callback) {
+        let stage = 'change:' + [].concat(names).join(',');
+        let profiled = () => { return this.profile(stage, callback); };
+
+        let rate = this.model.get('sync_rate');
+        let throttled = rate > 0 ? _.throttle(profiled, 1000 / rate) : profiled;
+
+        [].concat(names).forEach((name) => {
+            this.model.on('change:' + name, throttled, this);
+        });
+    }
 });
 
 let ColorMappingModel = PluginBlockModel.extend({
@@ -345,10 +778,10 @@ let ColorMappingView = PluginBlockView.extend({
         this.model.on('change:colormap', () => {
             this.block.colorMap = this.model.get('colormap');
         });
-        this.model.on('change:colormap_max', () => {
+        this.on_parameter_change('colormap_max', () => {
             this.block.colorMapMax = this.model.get('colormap_max');
         });
-        this.model.on('change:colormap_min', () => {
+        this.on_parameter_change('colormap_min', () => {
             this.block.colorMapMin = this.model.get('colormap_min');
         });
     }
@@ -429,7 +862,7 @@ let WarpView = PluginBlockView.extend({
 
     model_events: function () {
         WarpView.__super__.model_events.apply(this, arguments);
-        this.model.on('change:factor', () => {
+        this.on_parameter_change('factor', () => {
             this.block.warpFactor = this.model.get('factor');
         });
     }
@@ -443,8 +876,13 @@ let VectorFieldModel = PluginBlockModel.extend({
         width: 1,
         percentage_vectors: 1.0,
         distribution: 'ordered',
-        mode: 'volume'
+        mode: 'volume',
+        _sample: null
     })
+}, {
+    serializers: _.extend({
+        _sample: serialization.uint32array
+    }, PluginBlockModel.serializers)
 });
 
 let VectorFieldView = PluginBlockView.extend({
@@ -456,6 +894,7 @@ let VectorFieldView = PluginBlockView.extend({
             this.block.pcVectors = this.model.get('percentage_vectors');
             this.block.distribution = this.model.get('distribution');
             this.block.mode = this.model.get('mode');
+            this.block.sampleIndices = this.model.get('_sample');
         });
     },
 
@@ -467,7 +906,7 @@ let VectorFieldView = PluginBlockView.extend({
         this.model.on('change:width', () => {
             this.block.vectorsWidth = this.model.get('width');
         });
-        this.model.on('change:percentage_vectors', () => {
+        this.on_parameter_change('percentage_vectors', () => {
             this.block.pcVectors = this.model.get('percentage_vectors');
         });
         this.model.on('change:distribution', () => {
@@ -476,6 +915,9 @@ let VectorFieldView = PluginBlockView.extend({
         this.model.on('change:mode', () => {
             this.block.mode = this.model.get('mode');
         });
+        this.on_parameter_change('_sample', () => {
+            this.block.sampleIndices = this.model.get('_sample');
+        });
     }
 });
 
@@ -486,8 +928,13 @@ let PointCloudModel = PluginBlockModel.extend({
         points_size: 3,
         percentage_points: 1.0,
         distribution: 'ordered',
-        mode: 'volume'
+        mode: 'volume',
+        _sample: null
     })
+}, {
+    serializers: _.extend({
+        _sample: serialization.uint32array
+    }, PluginBlockModel.serializers)
 });
 
 let PointCloudView = PluginBlockView.extend({
@@ -498,6 +945,7 @@ let PointCloudView = PluginBlockView.extend({
             this.block.pcPoints = this.model.get('percentage_points');
             this.block.distribution = this.model.get('distribution');
             this.block.mode = this.model.get('mode');
+            this.block.sampleIndices = this.model.get('_sample');
         });
     },
 
@@ -506,7 +954,7 @@ let PointCloudView = PluginBlockView.extend({
         this.model.on('change:points_size', () => {
             this.block.pointsSize = this.model.get('points_size');
         });
-        this.model.on('change:percentage_points', () => {
+        this.on_parameter_change('percentage_points', () => {
             this.block.pcPoints = this.model.get('percentage_points');
         });
         this.model.on('change:distribution', () => {
@@ -515,6 +963,54 @@ let PointCloudView = PluginBlockView.extend({
         this.model.on('change:mode', () => {
             this.block.mode = this.model.get('mode');
         });
+        this.on_parameter_change('_sample', () => {
+            this.block.sampleIndices = this.model.get('_sample');
+        });
+    }
+});
+
+let StreamlinesModel = PluginBlockModel.extend({
+    defaults: _.extend({}, PluginBlockModel.prototype.defaults, {
+        _model_name : 'StreamlinesModel',
+        _view_name : 'StreamlinesView',
+        width: 1,
+        _vertices: null,
+        _indices: null,
+        _data: []
+    })
+}, {
+    serializers: _.extend({
+        _vertices: serialization.float32array,
+        _indices: serialization.uint32array,
+        _data: { deserialize: widgets.unpack_models }
+    }, PluginBlockModel.serializers)
+});
+
+let StreamlinesView = PluginBlockView.extend({
+    create_block: function () {
+        return this.scene_view.view.addBlock('Streamlines', this.parent_view.block).then((block) => {
+            this.block = block;
+            this.block.linesWidth = this.model.get('width');
+            this.block.lines = this.get_lines();
+        });
+    },
+
+    get_lines: function () {
+        return {
+            vertices: this.model.get('_vertices'),
+            indices: this.model.get('_indices'),
+            data: data_models_to_data(this.model.get('_data'))
+        };
+    },
+
+    model_events: function () {
+        StreamlinesView.__super__.model_events.apply(this, arguments);
+        this.model.on('change:width', () => {
+            this.block.linesWidth = this.model.get('width');
+        });
+        this.on_parameter_change(['_vertices', '_indices', '_data'], () => {
+            this.block.lines = this.get_lines();
+        });
     }
 });
 
@@ -538,7 +1034,7 @@ let ClipView = PluginBlockView.extend({
 
     model_events: function () {
         ClipView.__super__.model_events.apply(this, arguments);
-        this.model.on('change:plane_position', () => {
+        this.on_parameter_change('plane_position', () => {
             this.block.planePosition = this.model.get('plane_position');
         });
         this.model.on('change:plane_normal', () => {
@@ -567,7 +1063,7 @@ let SliceView = PluginBlockView.extend({
 
     model_events: function () {
         SliceView.__super__.model_events.apply(this, arguments);
-        this.model.on('change:slice_position', () => {
+        this.on_parameter_change('slice_position', () => {
             this.block.slicePosition = this.model.get('slice_position');
         });
         this.model.on('change:slice_normal', () => {
@@ -606,11 +1102,19 @@ let ThresholdView = PluginBlockView.extend({
 
     model_events: function () {
         ThresholdView.__super__.model_events.apply(this, arguments);
-        this.model.on('change:lower_bound', () => {
-            this.block.lowerBound = this.model.get('lower_bound');
-        });
-        this.model.on('change:upper_bound', () => {
-            this.block.upperBound = this.model.get('upper_bound');
+        // Both bounds are processed together, as intermediate values are
+        // dropped the new lower bound can be greater than the old upper bound
+        this.on_parameter_change(['lower_bound', 'upper_bound'], () => {
+            let lower_bound = this.model.get('lower_bound');
+            let upper_bound = this.model.get('upper_bound');
+
+            if (lower_bound > this.block.upperBound) {
+                this.block.upperBound = upper_bound;
+                this.block.lowerBound = lower_bound;
+            } else {
+                this.block.lowerBound = lower_bound;
+                this.block.upperBound = upper_bound;
+            }
         });
     }
 });
@@ -637,12 +1141,55 @@ let IsoSurfaceView = PluginBlockView.extend({
 
     model_events: function () {
         IsoSurfaceView.__super__.model_events.apply(this, arguments);
-        this.model.on('change:value', () => {
+        this.on_parameter_change('value', () => {
             this.block.value = this.model.get('value');
         });
     }
 });
 
+let ContourSetModel = PluginBlockModel.extend({
+    defaults: _.extend({}, PluginBlockModel.prototype.defaults, {
+        _model_name : 'ContourSetModel',
+        _view_name : 'ContourSetView',
+        _vertices: null,
+        _triangles: null,
+        _levels: null,
+        _data: []
+    })
+}, {
+    serializers: _.extend({
+        _vertices: serialization.float32array,
+        _triangles: serialization.uint32array,
+        _levels: serialization.uint32array,
+        _data: { deserialize: widgets.unpack_models }
+    }, PluginBlockModel.serializers)
+});
+
+let ContourSetView = PluginBlockView.extend({
+    create_block: function () {
+        return this.scene_view.view.addBlock('ContourSet', this.parent_view.block).then((block) => {
+            this.block = block;
+            this.block.surfaces = this.get_surfaces();
+        });
+    },
+
+    get_surfaces: function () {
+        return {
+            vertices: this.model.get('_vertices'),
+            triangles: this.model.get('_triangles'),
+            levels: this.model.get('_levels'),
+            data: data_models_to_data(this.model.get('_data'))
+        };
+    },
+
+    model_events: function () {
+        ContourSetView.__super__.model_events.apply(this, arguments);
+        this.on_parameter_change(['_vertices', '_triangles', '_levels', '_data'], () => {
+            this.block.surfaces = this.get_surfaces();
+        });
+    }
+});
+
 module.exports = {
     FixedFloatSliderModel: slider.FixedFloatSliderModel,
     FixedFloatSliderView: slider.FixedFloatSliderView,
@@ -658,6 +1205,10 @@ module.exports = {
     BlockView: BlockView,
     DataBlockModel: DataBlockModel,
     DataBlockView: DataBlockView,
+    MultiPartDataBlockModel: MultiPartDataBlockModel,
+    MultiPartDataBlockView: MultiPartDataBlockView,
+    BrickedDataBlockModel: BrickedDataBlockModel,
+    BrickedDataBlockView: BrickedDataBlockView,
     PluginBlockModel: PluginBlockModel,
     PluginBlockView: PluginBlockView,
     ColorMappingModel: ColorMappingModel,
@@ -670,6 +1221,8 @@ module.exports = {
     VectorFieldView: VectorFieldView,
     PointCloudModel: PointCloudModel,
     PointCloudView: PointCloudView,
+    StreamlinesModel: StreamlinesModel,
+    StreamlinesView: StreamlinesView,
     ClipModel: ClipModel,
     ClipView: ClipView,
     SliceModel: SliceModel,
@@ -678,4 +1231,6 @@ module.exports = {
     ThresholdView: ThresholdView,
     IsoSurfaceModel: IsoSurfaceModel,
     IsoSurfaceView: IsoSurfaceView,
+    ContourSetModel: ContourSetModel,
+    ContourSetView: ContourSetView,
 };
@@ -1,16 +1,132 @@
+let typed_arrays = {
+    float32: Float32Array,
+    uint32: Uint32Array,
+    int32: Int32Array,
+    uint16: Uint16Array,
+    int16: Int16Array,
+    uint8: Uint8Array,
+    int8: Int8Array
+};
+
+function typed_array(Type, view) {
+    return new Type(view.buffer, view.byteOffset, view.byteLength / Type.BYTES_PER_ELEMENT);
+}
+
+/**
+ * Deserialize the runs of changed values of an array, which the models apply
+ * in place to their current array (see apply_array_deltas)
+ */
+function deserialize_delta(data) {
+    return {
+        delta: true,
+        starts: typed_array(Uint32Array, data.starts),
+        lengths: typed_array(Uint32Array, data.lengths),
+        values: typed_array(typed_arrays[data.dtype], data.values)
+    };
+}
+
+// Fetches of the sidecar files, by url
+let sidecars = {};
+
+function fetch_sidecar(url) {
+    if (sidecars[url] === undefined) {
+        sidecars[url] = fetch(url).then((response) => {
+            if (!response.ok) {
+                throw new Error(`Cannot fetch the sidecar ${url}: ${response.status}`);
+            }
+            return response.arrayBuffer();
+        });
+    }
+    return sidecars[url];
+}
+
+/**
+ * Deserialize an array referring to a range of a sidecar file, written by
+ * Scene.export_html. The sidecar is fetched once for all of its arrays.
+ */
+function deserialize_sidecar(data) {
+    let Type = typed_arrays[data.dtype];
+    let length = data.shape.reduce((a, b) => a * b, 1);
+    return fetch_sidecar(data.sidecar).then((buffer) => {
+        return new Type(buffer, data.offset, length);
+    });
+}
+
+// Arrays shared by several models, which are copied before being updated in
+// place
+let shared_arrays = new WeakSet();
+
+function is_shared(array) {
+    return shared_arrays.has(array);
+}
+
+/**
+ * Deserialize a reference to the array of another model with the same
+ * content, sent once by the kernel (see odysis/buffers.py)
+ */
+function deserialize_reference(data, manager) {
+    return manager.get_model(data.ref.slice('IPY_MODEL_'.length)).then((model) => {
+        let array = model.get(data.key);
+        shared_arrays.add(array);
+        return array;
+    });
+}
+
 function deserialize_float32array(data, manager) {
+    if (data === null) {
+        return null;
+    }
+    if (data.delta) {
+        return deserialize_delta(data);
+    }
+    if (data.sidecar !== undefined) {
+        return deserialize_sidecar(data);
+    }
+    if (data.ref !== undefined) {
+        return deserialize_reference(data, manager);
+    }
     return new Float32Array(data.data.buffer);
 }
 
 function deserialize_uint32array(data, manager) {
+    if (data === null) {
+        return null;
+    }
+    if (data.delta) {
+        return deserialize_delta(data);
+    }
+    if (data.sidecar !== undefined) {
+        return deserialize_sidecar(data);
+    }
+    if (data.ref !== undefined) {
+        return deserialize_reference(data, manager);
+    }
     return new Uint32Array(data.data.buffer);
 }
 
+function deserialize_uint8array(data, manager) {
+    if (data === null) {
+        return null;
+    }
+    if (data.delta) {
+        return deserialize_delta(data);
+    }
+    if (data.sidecar !== undefined) {
+        return deserialize_sidecar(data);
+    }
+    if (data.ref !== undefined) {
+        return deserialize_reference(data, manager);
+    }
+    return new Uint8Array(data.data.buffer);
+}
+
 function serialize_array_or_json(obj, manager) {
     return obj;
 }
 
 module.exports = {
+    is_shared: is_shared,
     float32array: { deserialize: deserialize_float32array, serialize: serialize_array_or_json },
-    uint32array: { deserialize: deserialize_uint32array, serialize: serialize_array_or_json }
+    uint32array: { deserialize: deserialize_uint32array, serialize: serialize_array_or_json },
+    uint8array: { deserialize: deserialize_uint8array, serialize: serialize_array_or_json }
 }
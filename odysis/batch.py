@@ -0,0 +1,450 @@
+"""Headless evaluation of scenes, and batch export of their geometry to glTF.
+
+The blocks of a scene are evaluated kernel-side with NumPy, without
+front-end, and the geometry displayed by the blocks without children is
+written to a binary glTF file, one node per block. ``batch_export`` applies
+the blocks of a template scene to the mesh of each file of a list, the files
+being processed by a pool of worker processes.
+
+The geometry of each block is the one of the front-end, except that Clip and
+Threshold keep whole cells instead of cutting them:
+
+- DataBlock: the skin of the mesh.
+- Warp: points moved by ``factor`` times the input vector.
+- ColorMapping: colors of the geometry, and of the geometry of its children.
+- Clip: the skin of the cells with a point on the kept side of the plane.
+- Threshold: the skin of the cells whose points are all in the bounds.
+- Slice, IsoSurface, ContourSet: surfaces of the tetrahedrons.
+- Streamlines: lines, integrated in the tetrahedrons.
+- Grid: the geometry of its parent.
+
+VectorField and PointCloud blocks are not exported.
+"""
+from collections import OrderedDict
+import multiprocessing
+import os
+
+import numpy as np
+
+from ipywidgets import Widget
+
+from . import contouring, extraction, gltf, profiling, streamlines
+from .colormaps import map_colors
+from .odysis import DataBlock, Mesh, Scene, _restore_traits, _snapshot_traits
+from .probing import CellLocator
+
+FLOAT32 = np.float32
+
+# Blocks whose geometry is not exported
+SKIPPED_BLOCKS = ('VectorField', 'PointCloud')
+
+
+class _Geometry(object):
+    """The (N, 3) points, the cells and the point fields of the geometry of
+    a block, with the parameters of its color mapping."""
+
+    def __init__(self, vertices, fields, triangles=None, tetrahedrons=None,
+                 lines=None, colors=None):
+        self.vertices = vertices
+        # {data name: {component name: (N,) array}}
+        self.fields = fields
+        self.triangles = triangles
+        self.tetrahedrons = tetrahedrons
+        self.lines = lines
+        self.colors = colors
+
+    def replace(self, **kwargs):
+        attributes = dict(self.__dict__)
+        attributes.update(kwargs)
+        return _Geometry(**attributes)
+
+    def component(self, data_name, component_name):
+        # Components which are numbers are constant, like in the front-end
+        if isinstance(component_name, int):
+            return np.full(len(self.vertices), component_name, dtype=FLOAT32)
+        try:
+            return self.fields[data_name][component_name]
+        except KeyError:
+            raise RuntimeError('Unknown component {}.{}'.format(data_name, component_name))
+
+    def volume(self, block_type):
+        if self.tetrahedrons is None:
+            raise RuntimeError('Cannot apply a {} to non-volumetric mesh'.format(block_type))
+        return self.tetrahedrons
+
+    def part(self, name):
+        """The glTF part of the geometry."""
+        colors = None
+        if self.colors is not None:
+            data_name, component_name, colormap, vmin, vmax = self.colors
+            colors = map_colors(self.component(data_name, component_name), colormap, vmin, vmax)
+        lines = self.lines is not None
+        return {
+            'name': name,
+            'positions': self.vertices,
+            'mode': 'lines' if lines else 'triangles',
+            'indices': self.lines if lines else self.triangles,
+            'colors': colors
+        }
+
+
+def _mesh_geometry(mesh):
+    """The geometry of a DataBlock displaying ``mesh``."""
+    fields = OrderedDict(
+        (d.name, OrderedDict((c.name, c.array) for c in d.components))
+        for d in mesh.data
+    )
+    return _Geometry(
+        np.asarray(mesh.vertices, dtype=FLOAT32).reshape(-1, 3),
+        fields,
+        triangles=np.asarray(mesh.triangles).reshape(-1, 3),
+        tetrahedrons=np.asarray(mesh.tetrahedrons).reshape(-1, 4) if len(mesh.tetrahedrons) else None
+    )
+
+
+def _subset_geometry(geometry, mask):
+    """The skin of the kept cells, tetrahedrons or triangles."""
+    cells = geometry.tetrahedrons if geometry.tetrahedrons is not None else geometry.triangles
+    subset = extraction.Subset(cells, mask)
+    return geometry.replace(
+        vertices=subset.take(geometry.vertices),
+        fields=OrderedDict(
+            (name, OrderedDict((c, subset.take(array)) for c, array in components.items()))
+            for name, components in geometry.fields.items()
+        ),
+        triangles=subset.triangles.reshape(-1, 3),
+        tetrahedrons=subset.cells if geometry.tetrahedrons is not None else None
+    )
+
+
+def _surfaces_geometry(geometry, values, levels):
+    """The iso-surfaces of point values in the tetrahedrons."""
+    points, triangles, _, edges = contouring.contour_set(
+        geometry.vertices, geometry.tetrahedrons, values, levels
+    )
+    return geometry.replace(
+        vertices=points.astype(FLOAT32),
+        fields=OrderedDict(
+            (name, OrderedDict(
+                (c, contouring.interpolate(array, edges).astype(FLOAT32))
+                for c, array in components.items()
+            ))
+            for name, components in geometry.fields.items()
+        ),
+        triangles=triangles,
+        tetrahedrons=None
+    )
+
+
+def _warp(geometry, traits):
+    vectors = np.column_stack([
+        geometry.component(traits['input_data'], c) for c in traits['input_components']
+    ])
+    return geometry.replace(vertices=(geometry.vertices + traits['factor'] * vectors).astype(FLOAT32))
+
+
+def _color_mapping(geometry, traits):
+    return geometry.replace(colors=(
+        traits['input_data'], traits['input_components'][0], traits['colormap'],
+        traits['colormap_min'], traits['colormap_max']
+    ))
+
+
+def _clip(geometry, traits):
+    cells = geometry.tetrahedrons if geometry.tetrahedrons is not None else geometry.triangles
+    mask = extraction.clip_mask(
+        geometry.vertices, cells, traits['plane_normal'] or [1., 0., 0.], traits['plane_position']
+    )
+    return _subset_geometry(geometry, mask)
+
+
+def _threshold(geometry, traits):
+    cells = geometry.tetrahedrons if geometry.tetrahedrons is not None else geometry.triangles
+    values = geometry.component(traits['input_data'], traits['input_components'][0])
+    mask = extraction.threshold_mask(cells, values, traits['lower_bound'], traits['upper_bound'])
+    return _subset_geometry(geometry, mask)
+
+
+def _slice(geometry, traits):
+    geometry.volume('Slice')
+    normal = np.asarray(traits['slice_normal'] or [1., 0., 0.], dtype=np.float64)
+    values = geometry.vertices.dot(normal / np.linalg.norm(normal))
+    return _surfaces_geometry(geometry, values, [traits['slice_position']])
+
+
+def _iso_surface(geometry, traits):
+    geometry.volume('IsoSurface')
+    values = geometry.component(traits['input_data'], traits['input_components'][0])
+    return _surfaces_geometry(geometry, values, [traits['value']])
+
+
+def _contour_set(geometry, traits):
+    geometry.volume('ContourSet')
+    values = geometry.component(traits['input_data'], traits['input_components'][0])
+    return _surfaces_geometry(geometry, values, traits['values'])
+
+
+def _streamlines(geometry, traits):
+    tetrahedrons = geometry.volume('Streamlines')
+    vertices = geometry.vertices
+    components = [
+        c if isinstance(c, int) else geometry.component(traits['input_data'], c)
+        for c in traits['input_components']
+    ]
+
+    step_size = traits['step_size']
+    if step_size is None:
+        step_size = np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0)) / 500.
+    seeds = streamlines.seeds(
+        vertices, traits['seed_type'], traits['seed_origin'], traits['seed_normal'],
+        traits['seed_size'], traits['seed_resolution'], traits['seed_points']
+    )
+
+    locator = CellLocator(vertices.reshape(-1), tetrahedrons.reshape(-1))
+    positions, segments, cell_ids, weights = streamlines.integrate(
+        locator, components, seeds, step_size, traits['max_steps'], traits['direction']
+    )
+    return geometry.replace(
+        vertices=positions.astype(FLOAT32),
+        fields=OrderedDict(
+            (name, OrderedDict(
+                (c, locator.interpolate(array, cell_ids, weights).astype(FLOAT32))
+                for c, array in fields.items()
+            ))
+            for name, fields in geometry.fields.items()
+        ),
+        triangles=None,
+        tetrahedrons=None,
+        lines=segments
+    )
+
+
+# Geometry of each block type, from the geometry of its parent and its traits
+_EVALUATORS = {
+    'Warp': _warp,
+    'ColorMapping': _color_mapping,
+    'Grid': lambda geometry, traits: geometry,
+    'Clip': _clip,
+    'Threshold': _threshold,
+    'Slice': _slice,
+    'IsoSurface': _iso_surface,
+    'ContourSet': _contour_set,
+    'Streamlines': _streamlines
+}
+
+
+class _InlineArrays(object):
+    """Keep the arrays of block descriptions in the description itself."""
+
+    @staticmethod
+    def add(ar):
+        return ar
+
+    @staticmethod
+    def array(ar):
+        return ar
+
+
+def _describe(block):
+    """Picklable description of the type and the parameters of a block and
+    of its children."""
+    return {
+        'type': type(block).__name__,
+        'traits': _restore_traits(_snapshot_traits(block, Widget, _InlineArrays), _InlineArrays),
+        'blocks': [_describe(child) for child in block._blocks]
+    }
+
+
+def _evaluate(description, geometry, name, parts):
+    """Append the parts of the leaves of a block description, ``name``
+    being the path of its parent, empty for DataBlocks."""
+    block_type = description['type']
+    if block_type in SKIPPED_BLOCKS:
+        return
+    if name:
+        if block_type not in _EVALUATORS:
+            raise RuntimeError('Cannot export {} blocks'.format(block_type))
+        with profiling.stage(block_type):
+            geometry = _EVALUATORS[block_type](geometry, description['traits'])
+    name = '{}/{}'.format(name, block_type) if name else block_type
+
+    if not description['blocks']:
+        parts.append(geometry.part(name))
+    for child in description['blocks']:
+        _evaluate(child, geometry, name, parts)
+
+
+def _datablocks(template):
+    if isinstance(template, Scene):
+        return list(template.datablocks)
+    if isinstance(template, DataBlock):
+        return [template]
+    raise TypeError('Expected a Scene or a DataBlock, got {}'.format(type(template).__name__))
+
+
+def export_gltf(scene, path):
+    """Evaluate the geometry of the blocks of a scene and write it to a
+    binary glTF file, one node per block without children.
+
+    Parameters
+    ----------
+    scene : Scene or DataBlock
+        The blocks to export.
+    path : str
+        The path of the ``.glb`` file.
+    """
+    with profiling.stage('export_gltf'):
+        parts = []
+        for datablock in _datablocks(scene):
+            _evaluate(_describe(datablock), _mesh_geometry(datablock.current_mesh), '', parts)
+        gltf.write_glb(path, parts)
+
+
+def load_mesh(path):
+    """Load the Mesh of a file, XDMF files being read with
+    ``Mesh.from_xdmf`` and other files with ``Mesh.from_vtk``."""
+    if os.path.splitext(path)[1].lower() in ('.xdmf', '.xmf'):
+        return Mesh.from_xdmf(path)
+    return Mesh.from_vtk(path)
+
+
+def _export_file(task):
+    descriptions, path, output, load = task
+    mesh = load(path)
+    try:
+        geometry = _mesh_geometry(mesh)
+    finally:
+        for d in mesh.data:
+            for component in d.components:
+                component.close()
+            d.close()
+        mesh.close()
+
+    parts = []
+    for description in descriptions:
+        _evaluate(description, geometry, '', parts)
+    gltf.write_glb(output, parts)
+    return output
+
+
+class BatchExportError(RuntimeError):
+    """Raised by ``batch_export`` once all the files are processed, when
+    some of them failed.
+
+    Attributes
+    ----------
+    failures : list of tuple
+        The ``(path, exception)`` of the files which failed.
+    outputs : list of str
+        The paths of the output files, None for the files which failed.
+    """
+
+    def __init__(self, failures, outputs):
+        super(BatchExportError, self).__init__('{} of {} files failed, first {}: {!r}'.format(
+            len(failures), len(outputs), failures[0][0], failures[0][1]
+        ))
+        self.failures = failures
+        self.outputs = outputs
+
+
+def _output_paths(paths, output_dir):
+    """The output file of each input file, keeping the directories of the
+    inputs relative to their common directory."""
+    directories = [os.path.dirname(os.path.abspath(path)) for path in paths]
+    root = os.path.commonpath(directories) if directories else ''
+
+    outputs = []
+    inputs = {}
+    for path in paths:
+        relative = os.path.relpath(os.path.abspath(path), root)
+        output = os.path.join(output_dir, os.path.splitext(relative)[0] + '.glb')
+        if output in inputs:
+            raise ValueError('{} and {} would both be exported to {}'.format(inputs[output], path, output))
+        inputs[output] = path
+        outputs.append(output)
+    return outputs
+
+
+def batch_export(template, paths, output_dir, processes=None,
+                 max_tasks_per_child=None, load=load_mesh):
+    """Apply the blocks of a template to the mesh of each file, and export
+    their geometry to binary glTF files, see ``export_gltf``.
+
+    Files are processed by a pool of ``processes`` worker processes, each
+    file being loaded, evaluated and written by one worker, which only
+    keeps the mesh of the file it processes. Workers are started with the
+    ``spawn`` method, scripts calling this function must guard it with
+    ``if __name__ == '__main__':``.
+
+    Parameters
+    ----------
+    template : Scene or DataBlock
+        The blocks applied to each mesh, the mesh of each file replacing the
+        mesh of every DataBlock. Blocks keep their parameters, e.g. the
+        bounds of the colormaps.
+    paths : list of str
+        The files to export.
+    output_dir : str
+        The directory of the output files, named after the input files with
+        a ``.glb`` extension, in the directories of the input files relative
+        to their common directory (e.g. ``run1/result.vtu`` and
+        ``run2/result.vtu`` are exported to ``run1/result.glb`` and
+        ``run2/result.glb``).
+    processes : int, optional
+        Number of worker processes, the number of CPUs by default. With one
+        process, files are processed in the current process.
+    max_tasks_per_child : int, optional
+        Number of files processed by a worker before it is replaced,
+        releasing its memory, workers are kept by default.
+    load : callable
+        Function loading the Mesh of a file, which must be picklable (e.g.
+        defined at the top level of a module).
+
+    Returns
+    -------
+    list of str
+        The paths of the output files, in the order of ``paths``.
+
+    Raises
+    ------
+    BatchExportError
+        When files failed, once the other files are exported.
+    ValueError
+        When two files would be exported to the same output file.
+    """
+    descriptions = [_describe(datablock) for datablock in _datablocks(template)]
+    outputs = _output_paths(paths, output_dir)
+    for directory in set(os.path.dirname(output) for output in outputs):
+        os.makedirs(directory, exist_ok=True)
+    tasks = [(descriptions, path, output, load) for path, output in zip(paths, outputs)]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+
+    with profiling.stage('batch_export', nb_files=len(tasks)):
+        if processes <= 1:
+            results = _results(map(_export_file, tasks), paths)
+        else:
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(processes, maxtasksperchild=max_tasks_per_child) as pool:
+                results = _results(pool.imap(_export_file, tasks, chunksize=1), paths)
+
+    failures = [(path, result) for path, result in zip(paths, results) if isinstance(result, Exception)]
+    if failures:
+        raise BatchExportError(failures, [
+            None if isinstance(result, Exception) else result for result in results
+        ])
+    return results
+
+
+def _results(iterator, paths):
+    """The results of the tasks, or the exception of the ones which failed,
+    the next tasks being processed."""
+    results = []
+    for _ in paths:
+        try:
+            results.append(next(iterator))
+        except Exception as error:
+            results.append(error)
+    return results
@@ -0,0 +1,142 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+def octree_partition(centroids, bounding_box, max_cells=50000, max_depth=6):
+    """Partition cells in spatial bricks using an octree over the bounding box.
+
+    Parameters
+    ----------
+    centroids : numpy.ndarray
+        (N, 3) array containing the center of each cell.
+    bounding_box : list
+        [xmin, xmax, ymin, ymax, zmin, zmax] bounds of the mesh.
+    max_cells : int
+        A brick is not split any further if it contains less cells.
+    max_depth : int
+        Maximum depth of the octree.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        The cell ids of each non-empty brick.
+    """
+    bounds = np.asarray(bounding_box, dtype=np.float64).reshape(3, 2)
+    bricks = []
+
+    def split(cell_ids, bmin, bmax, depth):
+        if len(cell_ids) == 0:
+            return
+        if len(cell_ids) <= max_cells or depth == max_depth:
+            bricks.append(cell_ids)
+            return
+
+        center = (bmin + bmax) / 2.
+        above = centroids[cell_ids] > center
+        octants = above[:, 0] | (above[:, 1] << 1) | (above[:, 2] << 2)
+
+        for octant in range(8):
+            mask = np.array([(octant >> axis) & 1 for axis in range(3)], dtype=bool)
+            split(
+                cell_ids[octants == octant],
+                np.where(mask, center, bmin),
+                np.where(mask, bmax, center),
+                depth + 1
+            )
+
+    split(np.arange(len(centroids)), bounds[:, 0], bounds[:, 1], 0)
+
+    return bricks
+
+
+def extract_brick(vertices, triangles, data, cell_ids):
+    """Extract a compact brick from the mesh arrays.
+
+    Parameters
+    ----------
+    vertices : numpy.ndarray
+        Flat float32 array of vertex coordinates.
+    triangles : numpy.ndarray
+        Flat uint32 array of triangle indices.
+    data : dict
+        ``{data_name: {component_name: numpy.ndarray}}`` point data.
+    cell_ids : numpy.ndarray
+        Ids of the triangles belonging to the brick.
+
+    Returns
+    -------
+    tuple
+        (vertices, triangles, data) of the brick, with triangle indices
+        remapped on the brick vertices.
+    """
+    brick_triangles = triangles.reshape(-1, 3)[cell_ids]
+    vertex_ids, remapped = np.unique(brick_triangles, return_inverse=True)
+
+    brick_data = OrderedDict()
+    for data_name, components in data.items():
+        brick_data[data_name] = OrderedDict(
+            (component_name, array[vertex_ids])
+            for component_name, array in components.items()
+        )
+
+    return (
+        vertices.reshape(-1, 3)[vertex_ids].ravel(),
+        remapped.ravel().astype(np.uint32),
+        brick_data
+    )
+
+
+def brick_bounds(vertices):
+    """Compute [xmin, xmax, ymin, ymax, zmin, zmax] of flat vertices."""
+    vertices = vertices.reshape(-1, 3)
+    bmin = vertices.min(axis=0)
+    bmax = vertices.max(axis=0)
+    return [float(v) for axis in range(3) for v in (bmin[axis], bmax[axis])]
+
+
+def _payload_nbytes(payload):
+    vertices, triangles, data = payload
+    return vertices.nbytes + triangles.nbytes + sum(
+        array.nbytes for components in data.values() for array in components.values()
+    )
+
+
+class BrickCache(object):
+    """Least recently used cache of brick payloads, bounded in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def items(self):
+        return list(self._entries.items())
+
+    def get(self, key, compute):
+        """Return the cached payload for ``key``, calling ``compute`` on a miss."""
+        if key in self._entries:
+            payload = self._entries.pop(key)
+            self._entries[key] = payload
+            return payload
+
+        payload = compute()
+        self._entries[key] = payload
+        self.nbytes += _payload_nbytes(payload)
+
+        # Always keep the last payload, even if bigger than max_bytes
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= _payload_nbytes(evicted)
+
+        return payload
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
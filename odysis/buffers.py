@@ -0,0 +1,86 @@
+"""Content-addressed registry of the arrays sent to the front-end.
+
+Arrays are identified by a digest of their content, dtype and shape, computed
+at each serialization as arrays may be modified in place. The first widget
+trait sending a content owns it and sends it in full, other traits holding
+the same content send a reference to the owner trait, which the front-end
+resolves to the owner's typed array, so that identical buffers are sent and
+stored once.
+
+Holders are counted: when the owner closes or changes its array, another
+holder becomes the owner and sends the content to new front-ends, and the
+content is forgotten when its last holder goes away. Front-ends free the
+buffer when no model refers to it anymore.
+"""
+import hashlib
+import threading
+
+import numpy as np
+
+from ipywidgets import Widget
+
+
+def digest(ar):
+    """Digest of the content, dtype and shape of an array."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update('{}{}'.format(ar.dtype.str, ar.shape).encode())
+    h.update(memoryview(np.ascontiguousarray(ar)).cast('B'))
+    return h.hexdigest()
+
+
+class BufferRegistry(object):
+    """Owners and holders of the contents sent to the front-end, holders
+    being ``(model_id, trait)`` pairs. Widgets need their ``_model_id``
+    before their first serialization, which happens before their comm is
+    opened."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Digest held by each holder
+        self._held = {}
+        # Holders of each digest, the first one being the owner
+        self._holders = {}
+
+    def reference(self, widget, trait, ar):
+        """Register that ``widget.trait`` holds ``ar``, the serialized (and
+        possibly converted) trait value.
+
+        Returns None if the trait owns the content and must send it, the
+        ``(model_id, trait)`` of the owner otherwise.
+        """
+        holder = (widget._model_id, trait)
+        key = digest(ar)
+        with self._lock:
+            if self._held.get(holder) != key:
+                self._release(holder)
+                self._held[holder] = key
+                self._holders.setdefault(key, []).append(holder)
+
+            holders = self._holders[key]
+            # Closed owners are skipped
+            while holders[0] != holder and holders[0][0] not in Widget.widgets:
+                self._release(holders[0])
+            return None if holders[0] == holder else holders[0]
+
+    def _release(self, holder):
+        key = self._held.pop(holder, None)
+        if key is None:
+            return
+        holders = self._holders[key]
+        holders.remove(holder)
+        if not holders:
+            del self._holders[key]
+
+    def release(self, widget):
+        """Forget the contents held by a closed widget."""
+        with self._lock:
+            for holder in [h for h in self._held if h[0] == widget._model_id]:
+                self._release(holder)
+
+    def stats(self):
+        """Number of distinct contents and of holders."""
+        with self._lock:
+            return {'contents': len(self._holders), 'holders': len(self._held)}
+
+
+registry = BufferRegistry()
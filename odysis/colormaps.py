@@ -0,0 +1,88 @@
+"""Color maps of the ColorMapping block, for coloring geometry kernel-side.
+
+The tables are the 99 colors of the textures of the front-end, which are
+sampled with linear interpolation between the texel centers.
+"""
+import numpy as np
+
+# Colors of each color map, as hexadecimal RGB triplets
+_TABLES = {
+    'viridis': (
+        '440255450659460a5d470d6047116448156748196b481c6e481f70482374482676482979'
+        '472d7b472f7d46337f453681443983433c84423f854142874045883f48893e4b8a3d4e8a'
+        '3b518b3a538b39568c385a8c365c8d355f8d34618d32648e31668e30698e2f6c8e2e6e8e'
+        '2d718e2c728e2b758e2a788e297a8e287d8e277f8e26828e25848e24868e23898e228b8d'
+        '218e8d21918c20928c1f958b1f978b1f9a8a1e9c891f9f881fa18720a38621a68523a884'
+        '25ab8227ad8129af7f2db27d30b47b34b67938b9773cbb7540bd7244bf704ac16d4fc36b'
+        '54c56859c7645ec96164cb5e6acd5b70cf5776d1537dd24f83d44b8ad54790d74397d83f'
+        '9ed93aa4db36abdc32b2dd2db9de28c0df25c7e020cee11dd4e21adbe318e2e418e9e51a'
+        'efe51cf6e61ffbe723'
+    ),
+    'plasma': (
+        '0f078817078b1d068e2306902805922d05953205973604993b049b3f049c43039e48039f'
+        '4c02a15002a25402a45801a55c01a66100a76500a76800a86d00a87100a87501a87901a8'
+        '7c03a88004a88405a78807a68b0aa58f0da4930fa29613a19a169f9d189da11b9ba41e99'
+        'a72197aa2495ad2793b12a90b32d8eb6308bb93289bc3587bf3984c13b82c43e7fc6417d'
+        'c9447acb4779cd4a76d04d73d25071d5536fd6556dd9586adb5c68dd5e66df6263e16462'
+        'e3685fe56b5de76e5be87158ea7456ec7754ee7b52ef7e50f1814df2844bf48849f58b46'
+        'f68f44f79242f89640f9993efa9d3cfba139fca437fca835fdac33fdb031fdb42ffeb82d'
+        'febb2bfebf29fdc428fdc827fdcc26fcd025fbd424fad924f9dd25f8e125f6e626f5ea27'
+        'f3ef27f1f326f0f723'
+    ),
+    'magma': (
+        '01000501010802020d04031306051808061d0a08220d0a28100c2e130d33160f39191040'
+        '1d114620114c2312522812592c115f301164351069390f6e3e0f72420f754610774b1079'
+        '4f127b53137c57157e5b167e5f187f631980671b806b1d816f1e817320817722817b2382'
+        '7f25828326818827818c2981902a81942c80982d809c2e7fa1307fa5317ea9337dad347c'
+        'b1357bb6367aba3878be3a77c23b75c63d73cb3f72cf4070d3436ed7456cda476ade4968'
+        'e24d66e55064e85362eb5761ed5a5ff05e5ef2635cf4675cf56c5cf7705cf8765cf97a5d'
+        'fa7f5efb8460fc8961fc8d64fd9366fd9869fe9c6cfea16efea672feab75feb078feb57c'
+        'feb97ffebe83fec387fec88bfecd90fed194fed698fdda9dfde0a1fde4a6fde9aafcedaf'
+        'fcf2b4fcf7b9fcfbbd'
+    ),
+    'inferno': (
+        '01000501010802020e04031306041909061e0b07250e092b120a31150b36180c3d1c0c43'
+        '210c49250c4f290b552e0a5a330a5e3709623b0964400a67440a69490b6a4d0d6c510e6c'
+        '550f6d59116e5d126e61146e66156e6a176e6e186e721a6e761b6e7a1d6d7e1e6d82206c'
+        '87216b8b226a8f24699326679727669b29649f2a63a32c61a72d5fab2f5eaf315bb3335a'
+        'b73557bb3654bf3952c23b4fc63d4dc9404acd4248d04545d44842d74b3fda4e3cdd5139'
+        'e05536e35833e55c30e85f2dea632aec6727ee6b23f07020f2741cf47819f57c16f78112'
+        'f8850ff98a0bf98e09fa9407fb9806fb9d07fca209fca70cfcab10fcb115fbb61afbbb20'
+        'fac026fac52cf9c933f8cf3af7d442f5d949f4de52f3e35af2e864f1ec6ff1f179f3f484'
+        'f4f88ff7fb99fbfea2'
+    )
+}
+
+
+def _table(name):
+    hexs = _TABLES[name]
+    return np.frombuffer(bytes.fromhex(hexs), dtype=np.uint8).reshape(-1, 3)
+
+
+COLORMAPS = dict((name, _table(name)) for name in _TABLES)
+
+
+def map_colors(values, colormap, vmin, vmax):
+    """Colors of values, as a (N, 3) uint8 array.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        (N,) values.
+    colormap : str
+        ``viridis``, ``plasma``, ``magma`` or ``inferno``.
+    vmin, vmax : float
+        The values mapped to the first and the last colors.
+    """
+    table = COLORMAPS[colormap].astype(np.float32)
+    scale = (vmax - vmin) if vmax != vmin else 1.
+    u = np.clip((np.asarray(values, dtype=np.float64) - vmin) / scale, 0., 1.)
+    # NaNs get the first color
+    u = np.nan_to_num(u, nan=0.)
+
+    # Texel centers are at (i + 0.5) / nb_colors
+    position = np.clip(u * len(table) - 0.5, 0., len(table) - 1.)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, len(table) - 1)
+    t = (position - lower)[:, np.newaxis]
+    return np.rint(table[lower] * (1. - t) + table[upper] * t).astype(np.uint8)
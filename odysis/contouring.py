@@ -0,0 +1,165 @@
+"""Extraction of several iso-surfaces of a tetrahedral mesh in one pass.
+
+The levels are sorted, so that the levels crossing a tetrahedron are the
+ones between the min and the max of its point values, found by binary
+search. Only the crossing (tetrahedron, level) pairs are processed, the cost
+is proportional to the output whatever the number of levels. Each pair is
+classified by the points above the level, which gives the edges of its one
+or two triangles (marching tetrahedrons). Triangle points are shared by
+tetrahedrons through their (level, edge) key.
+"""
+import numpy as np
+
+# Number of tetrahedrons classified at once, bounding the temporaries
+CHUNK_SIZE = 1 << 16
+
+# Edges of a tetrahedron, as point indices
+_EDGES = np.array([[0, 1], [0, 2], [0, 3], [1, 2], [1, 3], [2, 3]])
+
+
+def _edge(a, b):
+    return int(np.flatnonzero((_EDGES == sorted((a, b))).all(axis=1))[0])
+
+
+def _triangle_table():
+    """Edges of the triangles of each case, a case being the bit mask of
+    the points above the level. Cases where all points are on the same side
+    have no triangle."""
+    counts = np.zeros(16, dtype=np.int64)
+    table = np.zeros((16, 2, 3), dtype=np.int64)
+    for case in range(1, 15):
+        above = [i for i in range(4) if case & (1 << i)]
+        below = [i for i in range(4) if not case & (1 << i)]
+        if len(above) == 2:
+            (a0, a1), (b0, b1) = above, below
+            quad = [_edge(a0, b0), _edge(a0, b1), _edge(a1, b1), _edge(a1, b0)]
+            table[case] = [quad[:3], [quad[0], quad[2], quad[3]]]
+            counts[case] = 2
+        else:
+            single, others = (above[0], below) if len(above) == 1 else (below[0], above)
+            table[case, 0] = [_edge(single, other) for other in others]
+            counts[case] = 1
+    return counts, table
+
+
+_COUNTS, _TABLE = _triangle_table()
+
+
+def _crossings(values, tetrahedrons, levels):
+    """(tetrahedron, level) pairs where the level crosses the tetrahedron,
+    i.e. some points are above or at it and some are below."""
+    cell_ids = []
+    level_ids = []
+    for start in range(0, len(tetrahedrons), CHUNK_SIZE):
+        corners = values[tetrahedrons[start:start + CHUNK_SIZE]]
+        lower = np.minimum(np.minimum(corners[:, 0], corners[:, 1]), np.minimum(corners[:, 2], corners[:, 3]))
+        upper = np.maximum(np.maximum(corners[:, 0], corners[:, 1]), np.maximum(corners[:, 2], corners[:, 3]))
+
+        # Levels l such that lower < l <= upper
+        first = np.searchsorted(levels, lower, side='right')
+        counts = np.searchsorted(levels, upper, side='right') - first
+        crossed = np.flatnonzero(counts > 0)
+        counts = counts[crossed]
+
+        ids = np.repeat(crossed, counts)
+        ranks = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_ids.append(ids + start)
+        level_ids.append(first[ids] + ranks)
+
+    if not cell_ids:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(cell_ids), np.concatenate(level_ids)
+
+
+def contour_set(vertices, tetrahedrons, values, levels):
+    """Extract the iso-surfaces of a point field for several levels.
+
+    Parameters
+    ----------
+    vertices : numpy.ndarray
+        Flat array of point coordinates.
+    tetrahedrons : numpy.ndarray
+        Flat array of the 4 point ids of each tetrahedron.
+    values : numpy.ndarray
+        (nb_points,) field values.
+    levels : list of float
+        The iso-values.
+
+    Returns
+    -------
+    tuple
+        The (M, 3) points of the surfaces, the (K, 3) point ids of their
+        triangles, the (M,) index of the level of each point in the sorted
+        levels, and the edges the points are on, as the (M,) start and end
+        point ids and the (M,) position on the edge, for interpolating data
+        with ``interpolate``.
+    """
+    vertices = np.asarray(vertices).reshape(-1, 3)
+    tetrahedrons = np.asarray(tetrahedrons).reshape(-1, 4)
+    values = np.asarray(values)
+    levels = np.sort(np.asarray(levels, dtype=values.dtype))
+
+    cell_ids, level_ids = _crossings(values, tetrahedrons, levels)
+    points = tetrahedrons[cell_ids]
+    cases = np.zeros(len(cell_ids), dtype=np.int64)
+    for i in range(4):
+        cases |= (values[points[:, i]] >= levels[level_ids]).astype(np.int64) << i
+
+    # Triangles of each pair, as (level, edge) of their points
+    counts = _COUNTS[cases]
+    pair_ids = np.repeat(np.arange(len(cases)), counts)
+    ranks = np.arange(len(pair_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+    edges = _TABLE[cases[pair_ids], ranks]
+    del counts, ranks
+
+    # Edge ends, sorted so that tetrahedrons sharing an edge agree on them
+    triangle_points = points[pair_ids]
+    starts = np.take_along_axis(triangle_points, _EDGES[edges, 0], axis=1)
+    ends = np.take_along_axis(triangle_points, _EDGES[edges, 1], axis=1)
+    starts, ends = np.minimum(starts, ends), np.maximum(starts, ends)
+    triangle_levels = np.repeat(level_ids[pair_ids], 3).reshape(-1, 3)
+
+    # Points shared by the triangles
+    nb_points = len(vertices)
+    if len(levels) * nb_points < 2 ** 63 // max(nb_points, 1):
+        keys = (triangle_levels.astype(np.int64) * nb_points + starts) * nb_points + ends
+        keys, first, inverse = np.unique(keys.reshape(-1), return_index=True, return_inverse=True)
+    else:
+        keys = np.column_stack((triangle_levels.reshape(-1), starts.reshape(-1), ends.reshape(-1)))
+        keys, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    triangles = inverse.reshape(-1, 3).astype(np.uint32)
+    starts = starts.reshape(-1)[first]
+    ends = ends.reshape(-1)[first]
+    point_levels = triangle_levels.reshape(-1)[first]
+    del keys, first, inverse, triangle_levels
+
+    start_values = values[starts].astype(np.float64)
+    positions = (levels[point_levels] - start_values) / (values[ends] - start_values)
+    surface_points = interpolate(vertices, (starts, ends, positions))
+
+    # Triangles facing increasing values, the first point of the case being
+    # on the upper side
+    above = np.argmax(cases[:, np.newaxis] & (1 << np.arange(4)) > 0, axis=1)
+    above = vertices[points[pair_ids, above[pair_ids]]]
+    corners = surface_points[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    flipped = np.einsum('ni,ni->n', normals, above - corners[:, 0]) < 0
+    triangles[flipped] = triangles[flipped][:, [0, 2, 1]]
+
+    return surface_points, triangles, point_levels, (starts, ends, positions)
+
+
+def interpolate(values, edges):
+    """Interpolate point values at the points of the surfaces.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        (nb_points,) or (nb_points, nb_components) point values.
+    edges : tuple
+        As returned by ``contour_set``.
+    """
+    starts, ends, positions = edges
+    start_values = values[starts].astype(np.float64)
+    positions = positions.reshape((-1,) + (1,) * (start_values.ndim - 1))
+    return start_values + positions * (values[ends] - start_values)
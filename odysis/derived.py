@@ -0,0 +1,104 @@
+"""Evaluation of derived fields from NumPy expressions.
+
+Expressions are evaluated over chunks of points, so that the temporaries
+they create are bounded by the chunk size whatever the mesh size. Fields
+are referred to by their name, the components of multi-component fields as
+attributes (e.g. ``velocity.X1``). The point coordinates are available as
+``x``, ``y`` and ``z``, and common NumPy functions by their name, e.g.
+``sqrt(velocity.X1**2 + velocity.X2**2)`` or ``(temperature - 273.15) * 1.8``.
+"""
+import numpy as np
+
+# Number of points evaluated at once
+CHUNK_SIZE = 1 << 16
+
+_FUNCTIONS = (
+    'abs', 'sqrt', 'exp', 'log', 'log10', 'sin', 'cos', 'tan', 'arcsin',
+    'arccos', 'arctan', 'arctan2', 'sinh', 'cosh', 'tanh', 'minimum',
+    'maximum', 'clip', 'where', 'floor', 'ceil', 'sign', 'hypot', 'pi'
+)
+
+
+class _Components(object):
+    """Chunk of a multi-component field, components being attributes."""
+
+    def __init__(self, components):
+        self.__dict__.update(components)
+        self._columns = list(components.values())
+
+    def __getitem__(self, index):
+        return self._columns[index]
+
+    def __len__(self):
+        return len(self._columns)
+
+
+def magnitude(field):
+    """Euclidean norm of the components of a field."""
+    return np.sqrt(sum(column.astype(np.float64) ** 2 for column in field))
+
+
+def _namespace(fields, vertices, chunk):
+    namespace = dict((name, getattr(np, name)) for name in _FUNCTIONS)
+    namespace['np'] = np
+    namespace['magnitude'] = magnitude
+
+    coordinates = vertices.reshape(-1, 3)[chunk]
+    namespace['x'] = coordinates[:, 0]
+    namespace['y'] = coordinates[:, 1]
+    namespace['z'] = coordinates[:, 2]
+
+    for name, components in fields.items():
+        if len(components) == 1:
+            namespace[name] = next(iter(components.values()))[chunk]
+        else:
+            namespace[name] = _Components(dict(
+                (component_name, array[chunk])
+                for component_name, array in components.items()
+            ))
+    return namespace
+
+
+def evaluate(expression, fields, vertices, chunk_size=CHUNK_SIZE):
+    """Evaluate an expression over point fields.
+
+    Parameters
+    ----------
+    expression : str
+        A Python expression using NumPy operations.
+    fields : dict
+        ``{name: {component_name: array}}`` of point fields.
+    vertices : numpy.ndarray
+        The flat array of point coordinates.
+    chunk_size : int
+        Number of points evaluated at once.
+
+    Returns
+    -------
+    tuple
+        The float32 result, its min and max (None for empty meshes).
+    """
+    code = compile(expression, '<derived field>', 'eval')
+    nb_points = len(vertices) // 3
+
+    out = np.empty(nb_points, dtype=np.float32)
+    minimum = np.inf
+    maximum = -np.inf
+    for start in range(0, nb_points, chunk_size):
+        chunk = slice(start, min(start + chunk_size, nb_points))
+        result = eval(code, {'__builtins__': {}}, _namespace(fields, vertices, chunk))
+
+        if np.ndim(result) > 1 or (np.ndim(result) == 1 and len(result) != chunk.stop - chunk.start):
+            raise ValueError('{} does not evaluate to one value per point'.format(expression))
+        out[chunk] = result
+
+        # Min and max are computed while the chunk is in cache
+        values = out[chunk]
+        finite = values[np.isfinite(values)]
+        if len(finite):
+            minimum = min(minimum, float(finite.min()))
+            maximum = max(maximum, float(finite.max()))
+
+    if minimum > maximum:
+        return out, None, None
+    return out, minimum, maximum
@@ -0,0 +1,84 @@
+"""Extraction of a subset of the cells of a mesh as a compact mesh.
+
+Cells are kept by a boolean mask. The points of the kept cells are gathered
+and renumbered by binary search in the sorted kept point ids, so that once
+the mask is known the cost is proportional to the size of the subset. The
+mapping from the subset to the full mesh is kept in a ``Subset``, which
+extracts the point fields of a new version of the full mesh with one gather
+per array.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from .unstructured import VTK_TETRA, extract_surface
+
+
+def threshold_mask(cells, values, lower, upper, all_points=True):
+    """Cells whose point values are in ``[lower, upper]``.
+
+    Parameters
+    ----------
+    cells : numpy.ndarray
+        (nb_cells, nb_cell_points) point ids of the cells.
+    values : numpy.ndarray
+        (nb_points,) point values.
+    lower, upper : float
+        Bounds of the kept values.
+    all_points : bool
+        Whether all the points of a cell must be in the bounds, instead of
+        any of them.
+    """
+    inside = (values >= lower) & (values <= upper)
+    inside = inside[cells]
+    return inside.all(axis=1) if all_points else inside.any(axis=1)
+
+
+def clip_mask(vertices, cells, normal, position):
+    """Cells with at least one point on the kept side of a plane, where
+    ``dot(point, normal) <= position`` like the Clip block. Cells are kept
+    whole, not cut by the plane."""
+    normal = np.asarray(normal, dtype=np.float64)
+    normal = normal / np.linalg.norm(normal)
+    below = vertices.reshape(-1, 3).dot(normal.astype(vertices.dtype)) <= position
+    return below[cells].any(axis=1)
+
+
+class Subset(object):
+    """The kept cells of a mesh, renumbered over their points.
+
+    Parameters
+    ----------
+    cells : numpy.ndarray
+        (nb_cells, nb_cell_points) point ids of the cells of the mesh,
+        tetrahedrons or, for surface meshes, triangles.
+    mask : numpy.ndarray
+        (nb_cells,) boolean mask of the kept cells.
+    """
+
+    def __init__(self, cells, mask):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (len(cells), ):
+            raise ValueError('Expected a mask of {} cells, got shape {}'.format(len(cells), mask.shape))
+
+        kept = cells[mask]
+        # Ids of the kept points in the mesh, sorted
+        self.point_ids = np.unique(kept)
+        self.cells = np.searchsorted(self.point_ids, kept).astype(np.uint32)
+
+        # The skin of the kept tetrahedrons, the kept triangles otherwise
+        if cells.shape[1] == 4:
+            self.triangles = extract_surface(OrderedDict([(VTK_TETRA, (None, self.cells))]))
+        else:
+            self.triangles = self.cells.reshape(-1)
+
+    def take(self, values):
+        """Values of the kept points, from (nb_points, ...) values."""
+        return values[self.point_ids]
+
+    def vertices(self, vertices):
+        """Flat coordinates of the kept points, from flat coordinates."""
+        return self.take(vertices.reshape(-1, 3)).reshape(-1)
+
+    def arrays(self):
+        return {'point_ids': self.point_ids, 'cells': self.cells}
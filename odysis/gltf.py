@@ -0,0 +1,127 @@
+"""Minimal writer of binary glTF 2.0 (``.glb``) files.
+
+Each part is a mesh node with a single primitive: triangles, lines or
+points, with optional per-point colors. All the arrays are stored in the
+binary chunk of the file, aligned on 4 bytes.
+"""
+import json
+import struct
+
+import numpy as np
+
+GLB_MAGIC = 0x46546C67
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# glTF constants
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+UNSIGNED_BYTE = 5121
+UNSIGNED_INT = 5125
+FLOAT = 5126
+MODES = {'points': 0, 'lines': 1, 'triangles': 4}
+
+
+class _Builder(object):
+
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+        self.buffer_views = []
+        self.accessors = []
+
+    def add(self, ar, component_type, element_type, target, normalized=False, bounds=False):
+        """Append an array to the binary chunk, returns its accessor index."""
+        ar = np.ascontiguousarray(ar)
+        data = ar.tobytes()
+        self.buffer_views.append({
+            'buffer': 0, 'byteOffset': self.offset, 'byteLength': len(data), 'target': target
+        })
+        self.chunks.append(data)
+        self.chunks.append(b'\0' * (-len(data) % 4))
+        self.offset += len(data) + (-len(data) % 4)
+
+        accessor = {
+            'bufferView': len(self.buffer_views) - 1,
+            'componentType': component_type,
+            'count': len(ar),
+            'type': element_type
+        }
+        if normalized:
+            accessor['normalized'] = True
+        if bounds and len(ar):
+            accessor['min'] = ar.min(axis=0).tolist()
+            accessor['max'] = ar.max(axis=0).tolist()
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+
+def write_glb(path, parts):
+    """Write parts to a ``.glb`` file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+    parts : list of dict
+        The parts, with a ``name``, the (N, 3) ``positions`` of the points,
+        the ``mode`` (``triangles``, ``lines`` or ``points``), the (M, 3) or
+        (M, 2) point ids of the ``indices`` (unused for points), and
+        optionally the (N, 3) uint8 ``colors`` of the points. Empty parts
+        are skipped.
+    """
+    builder = _Builder()
+    meshes = []
+    for part in parts:
+        positions = np.asarray(part['positions'], dtype=np.float32).reshape(-1, 3)
+        if not len(positions) or (part['mode'] != 'points' and not len(part['indices'])):
+            continue
+        primitive = {
+            'attributes': {
+                'POSITION': builder.add(positions, FLOAT, 'VEC3', ARRAY_BUFFER, bounds=True)
+            },
+            'mode': MODES[part['mode']],
+            'material': 0
+        }
+        if part.get('colors') is not None:
+            primitive['attributes']['COLOR_0'] = builder.add(
+                np.asarray(part['colors'], dtype=np.uint8).reshape(-1, 3),
+                UNSIGNED_BYTE, 'VEC3', ARRAY_BUFFER, normalized=True
+            )
+        if part['mode'] != 'points':
+            primitive['indices'] = builder.add(
+                np.asarray(part['indices'], dtype=np.uint32).reshape(-1),
+                UNSIGNED_INT, 'SCALAR', ELEMENT_ARRAY_BUFFER
+            )
+        meshes.append({'name': part['name'], 'primitives': [primitive]})
+
+    document = {
+        'asset': {'version': '2.0', 'generator': 'odysis'},
+        'scene': 0,
+        'scenes': [{'nodes': list(range(len(meshes)))}],
+        'nodes': [{'mesh': i, 'name': mesh['name']} for i, mesh in enumerate(meshes)],
+        'meshes': meshes,
+        # Surfaces like slices are seen from both sides
+        'materials': [{
+            'doubleSided': True,
+            'pbrMetallicRoughness': {'metallicFactor': 0., 'roughnessFactor': 1.}
+        }],
+        'accessors': builder.accessors,
+        'bufferViews': builder.buffer_views,
+        'buffers': [{'byteLength': builder.offset}]
+    }
+    if not builder.buffer_views:
+        del document['accessors'], document['bufferViews'], document['buffers']
+
+    content = json.dumps(document, separators=(',', ':')).encode()
+    content += b' ' * (-len(content) % 4)
+
+    with open(path, 'wb') as f:
+        length = 12 + 8 + len(content) + (8 + builder.offset if builder.offset else 0)
+        f.write(struct.pack('<III', GLB_MAGIC, 2, length))
+        f.write(struct.pack('<II', len(content), CHUNK_JSON))
+        f.write(content)
+        if builder.offset:
+            f.write(struct.pack('<II', builder.offset, CHUNK_BIN))
+            for chunk in builder.chunks:
+                f.write(chunk)
@@ -0,0 +1,152 @@
+"""Cache of the coarse levels of detail of VTK files.
+
+The decimated skin displayed by ``DataBlock.from_vtk`` while the full
+resolution mesh is extracted is saved in ``CACHE_DIR``, the ``odysis``
+directory of the user cache by default, with the size and modification time
+of the file. Opening the file again displays the memory-mapped cache without
+reading the file.
+
+The cache is an optimization: it is not used when it cannot be read or
+written, e.g. next to files in read-only directories when ``CACHE_DIR`` is
+set to None.
+"""
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import uuid
+
+from .snapshot import SidecarReader, SidecarWriter
+
+
+def _user_cache_dir():
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'odysis', 'lod')
+
+
+# Directory of the caches, next to the files if None
+CACHE_DIR = _user_cache_dir()
+
+# Version of the cache format
+VERSION = 1
+
+
+def cache_path(path, target_reduction):
+    """Path of the description of the cached level of detail of a file."""
+    path = os.path.abspath(path)
+    name = '{}.lod{:g}.json'.format(os.path.basename(path), target_reduction)
+    if CACHE_DIR is None:
+        return os.path.join(os.path.dirname(path), '.' + name)
+    digest = hashlib.blake2b(path.encode(), digest_size=8).hexdigest()
+    return os.path.join(CACHE_DIR, digest + '-' + name)
+
+
+def source_key(path):
+    """Size and modification time of a file, which invalidate its cache."""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+def read(path, target_reduction):
+    """The cached level of detail of a file, None if there is no up-to-date
+    cache.
+
+    Returns
+    -------
+    tuple
+        The memory-mapped ``{vertices, triangles, tetrahedrons, data,
+        bounding_box}`` of the level of detail, data being in the
+        ``get_ugrid_data`` format, and whether the grid is volumetric.
+    """
+    cache = cache_path(path, target_reduction)
+    try:
+        with open(cache) as f:
+            description = json.load(f)
+        if description.get('version') != VERSION or description['source'] != source_key(path):
+            return None
+
+        sidecar = os.path.join(os.path.dirname(cache), description['sidecar'])
+        if os.path.getsize(sidecar) != description['sidecar_size']:
+            return None
+        reader = SidecarReader(sidecar)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    data = OrderedDict()
+    for name, components in description['data']:
+        data[name] = OrderedDict(
+            (component, {'array': reader.array(reference), 'min': min, 'max': max})
+            for component, reference, min, max in components
+        )
+    arrays = {
+        'vertices': reader.array(description['vertices']),
+        'triangles': reader.array(description['triangles']),
+        'tetrahedrons': reader.array(description['tetrahedrons']),
+        'data': data,
+        'bounding_box': description['bounding_box']
+    }
+    return arrays, description['volumetric']
+
+
+def write(path, target_reduction, source, arrays, volumetric):
+    """Cache a level of detail of a file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+    target_reduction : float
+        The decimation of the level of detail.
+    source : dict
+        The ``source_key`` of the file before it was read.
+    arrays : dict
+        The level of detail, see ``read``.
+    volumetric : bool
+        Whether the grid is volumetric.
+    """
+    cache = cache_path(path, target_reduction)
+    directory = os.path.dirname(cache)
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+        # A new sidecar, as the previous one may be mapped by other readers
+        sidecar = '{}.{}.bin'.format(os.path.splitext(os.path.basename(cache))[0], uuid.uuid4().hex[:8])
+        with SidecarWriter(os.path.join(directory, sidecar)) as writer:
+            description = {
+                'version': VERSION,
+                'source': source,
+                'volumetric': bool(volumetric),
+                'sidecar': sidecar,
+                'vertices': writer.add(arrays['vertices']),
+                'triangles': writer.add(arrays['triangles']),
+                'tetrahedrons': writer.add(arrays['tetrahedrons']),
+                'data': [
+                    [name, [
+                        [component, writer.add(c['array']), _float(c['min']), _float(c['max'])]
+                        for component, c in components.items()
+                    ]]
+                    for name, components in arrays['data'].items()
+                ],
+                'bounding_box': [float(value) for value in arrays['bounding_box']]
+            }
+        description['sidecar_size'] = os.path.getsize(os.path.join(directory, sidecar))
+
+        previous = None
+        try:
+            with open(cache) as f:
+                previous = json.load(f).get('sidecar')
+        except (OSError, ValueError):
+            pass
+
+        with open(cache + '.tmp', 'w') as f:
+            json.dump(description, f)
+        os.replace(cache + '.tmp', cache)
+
+        if previous is not None and previous != sidecar:
+            os.remove(os.path.join(directory, previous))
+    except OSError:
+        pass
@@ -0,0 +1,211 @@
+"""Memory footprint accounting of widgets.
+
+The arrays held by a widget are found by walking its synchronized traits,
+recursing into child widgets. Widgets may hold arrays outside of their
+traits by implementing ``_memory_arrays()`` (returning ``{name: array}``)
+and release caches or redundant copies by implementing ``_compact()``.
+"""
+import hashlib
+import mmap
+from array import array
+
+import numpy as np
+
+from ipywidgets import Widget
+
+
+def _root(buffer):
+    """Return the object owning the memory of a numpy array."""
+    while isinstance(buffer, np.ndarray) and buffer.base is not None:
+        buffer = buffer.base
+    return buffer
+
+
+def _resident_bytes(root):
+    """Bytes pinned in memory by a buffer owner, memory-mapped files are not
+    counted as they can be paged out."""
+    if isinstance(root, (mmap.mmap, np.memmap)):
+        return 0
+    if isinstance(root, array):
+        return root.buffer_info()[1] * root.itemsize
+    try:
+        return memoryview(root).nbytes
+    except (TypeError, ValueError):
+        return 0
+
+
+def _digest(ar):
+    return hashlib.blake2b(memoryview(np.ascontiguousarray(ar)).cast('B')).hexdigest()
+
+
+def _iter_arrays(widget, seen):
+    """Yield (widget, name, array) for all arrays of widget and its children."""
+    if id(widget) in seen:
+        return
+    seen.add(id(widget))
+
+    children = []
+    for key in widget.keys:
+        value = getattr(widget, key)
+        if isinstance(value, np.ndarray):
+            yield widget, key, value
+        elif isinstance(value, Widget):
+            children.append(value)
+        elif isinstance(value, (list, tuple)):
+            children.extend(v for v in value if isinstance(v, Widget))
+
+    if hasattr(widget, '_memory_arrays'):
+        for name, value in widget._memory_arrays().items():
+            yield widget, name, value
+
+    for child in children:
+        for item in _iter_arrays(child, seen):
+            yield item
+
+
+def _iter_widgets(widget, seen):
+    if id(widget) in seen:
+        return
+    seen.add(id(widget))
+    yield widget
+
+    for key in widget.keys:
+        value = getattr(widget, key)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for child in values:
+            if isinstance(child, Widget):
+                for item in _iter_widgets(child, seen):
+                    yield item
+
+
+def _model_id(widget):
+    """The model id of a widget, None once it is closed."""
+    if not isinstance(widget, Widget) or widget.comm is None:
+        return None
+    return widget.model_id
+
+
+def memory_usage(widget, find_duplicates=True):
+    """Report the memory held by a widget and its children.
+
+    Parameters
+    ----------
+    widget : ipywidgets.Widget
+        E.g. a Scene, a DataBlock or a Mesh.
+    find_duplicates : bool
+        Whether to look for arrays with the same content in different
+        buffers, this hashes every array.
+
+    Returns
+    -------
+    dict
+        - ``arrays``: one record per array with the keys ``widget``,
+          ``model_id`` (None for closed widgets), ``name``, ``dtype``, ``nbytes`` (size of the array),
+          ``resident`` (bytes of its buffer, counted for the first array
+          using it only), ``mapped`` (whether its buffer is a memory-mapped
+          file) and ``duplicate_of`` (name of a previous array with the same
+          content in another buffer, or None)
+        - ``resident``: total resident bytes
+        - ``duplicated``: resident bytes of duplicated arrays
+        - ``sent``: one record per widget with the keys ``widget``,
+          ``model_id`` and ``bytes_sent``, the bytes of binary buffers sent
+          to the front-end
+    """
+    records = []
+    roots = set()
+    digests = {}
+
+    for owner, name, ar in _iter_arrays(widget, set()):
+        root = _root(ar)
+        first_use = id(root) not in roots
+        roots.add(id(root))
+
+        full_name = '{}.{}'.format(type(owner).__name__, name)
+        record = {
+            'widget': type(owner).__name__,
+            'model_id': _model_id(owner),
+            'name': name,
+            'dtype': str(ar.dtype),
+            'nbytes': ar.nbytes,
+            'resident': _resident_bytes(root) if first_use else 0,
+            'mapped': isinstance(root, (mmap.mmap, np.memmap)),
+            'duplicate_of': None
+        }
+
+        if find_duplicates and first_use and ar.nbytes:
+            key = (str(ar.dtype), ar.shape, _digest(ar))
+            record['duplicate_of'] = digests.get(key)
+            digests.setdefault(key, full_name)
+
+        records.append(record)
+
+    sent = [
+        {
+            'widget': type(w).__name__,
+            'model_id': _model_id(w),
+            'bytes_sent': getattr(w, '_bytes_sent', 0)
+        }
+        for w in _iter_widgets(widget, set())
+    ]
+
+    return {
+        'arrays': records,
+        'resident': sum(r['resident'] for r in records),
+        'duplicated': sum(r['resident'] for r in records if r['duplicate_of'] is not None),
+        'sent': sent
+    }
+
+
+def _compact_array(ar):
+    """Return the most compact equivalent of what the front-end receives."""
+    if isinstance(_root(ar), (mmap.mmap, np.memmap)):
+        return ar
+
+    # Same conversions as array_to_binary
+    if ar.dtype == np.float64:
+        return ar.astype(np.float32)
+    if ar.dtype == np.int64:
+        return ar.astype(np.int32)
+
+    # Do not keep a bigger buffer alive for a view on a part of it
+    if not ar.flags['C_CONTIGUOUS'] or _resident_bytes(_root(ar)) > ar.nbytes:
+        return np.ascontiguousarray(ar).copy()
+
+    return ar
+
+
+def compact(widget):
+    """Drop redundant copies held by a widget and its children.
+
+    Arrays are converted to the dtype the front-end receives, views keeping
+    bigger buffers alive are copied, arrays with the same content share one
+    buffer, and widgets release their caches. The front-end already holds
+    the same values, so nothing is sent.
+
+    Returns
+    -------
+    int
+        The resident bytes released, if no other reference to the previous
+        buffers exists.
+    """
+    before = memory_usage(widget, find_duplicates=False)['resident']
+
+    shared = {}
+    for owner, name, ar in list(_iter_arrays(widget, set())):
+        if not owner.has_trait(name):
+            continue
+
+        compacted = _compact_array(ar)
+        if compacted.nbytes:
+            key = (str(compacted.dtype), compacted.shape, _digest(compacted))
+            compacted = shared.setdefault(key, compacted)
+
+        if compacted is not ar:
+            # Bypass change notifications, the front-end values do not change
+            owner._trait_values[name] = compacted
+
+    for w in list(_iter_widgets(widget, set())):
+        if hasattr(w, '_compact'):
+            w._compact()
+
+    return before - memory_usage(widget, find_duplicates=False)['resident']
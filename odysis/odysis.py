@@ -1,12 +1,23 @@
-from array import array
+import asyncio
+import json
+import os
+import time
+import uuid
+import warnings
+from collections import OrderedDict
+from contextlib import contextmanager, ExitStack
+from threading import Thread
+
+import numpy as np
 
 from IPython.display import display
 
 from traitlets import (
     Unicode, List, Instance, Float,
-    Int, Bool, Union, Enum, observe
+    Int, Bool, Union, Enum, observe, default
 )
 from traittypes import Array
+from ipywidgets.widgets.widget import _remove_buffers
 from ipywidgets import (
     widget_serialization,
     DOMWidget, Widget, register,
@@ -16,20 +27,129 @@ from ipywidgets import (
     link,
     VBox, HBox
 )
-import vtk
-
-from .serialization import array_serialization
+from . import buffers, contouring, derived, extraction, lod_cache, memory, parts, profiling, sampling, snapshot, streamlines
+from .serialization import array_serialization, array_delta, sidecar_references
+from .bricking import octree_partition, extract_brick, brick_bounds, BrickCache
 from .vtk_loader import (
-    load_vtk, FLOAT32, UINT32,
+    load_vtk, decimate_grid, is_unstructured_grid, is_volumetric, FLOAT32, UINT32,
     get_ugrid_vertices, get_ugrid_triangles, get_ugrid_tetrahedrons, get_ugrid_data
 )
+from .unstructured import (
+    group_cells, tetrahedralize, extract_surface, cell_to_point_data, fields_to_data
+)
+from .xdmf_loader import XdmfReader
+from .probing import CellLocator, polyline_samples
 from .slider import FloatSlider, FloatRangeSlider
 
 odysis_version = '^0.1.0'
 
 
+class _InstrumentedWidget(object):
+    """Record comm opening and messages as profiling stages, and account
+    for the memory held and the bytes sent by the widget."""
+
+    # Bytes of binary buffers sent to the front-end
+    _bytes_sent = 0
+
+    def open(self):
+        # The model id is known before the first serialization, for
+        # referring to the buffers of this widget
+        if self.comm is None and self._model_id is None:
+            self._model_id = uuid.uuid4().hex
+        with profiling.stage('comm_open', widget=type(self).__name__):
+            super(_InstrumentedWidget, self).open()
+
+    def close(self):
+        super(_InstrumentedWidget, self).close()
+        buffers.registry.release(self)
+
+    def get_state(self, key=None, drop_defaults=False):
+        state = super(_InstrumentedWidget, self).get_state(key=key, drop_defaults=drop_defaults)
+        # The initial state is sent with the comm opening, not with _send
+        if self.comm is None:
+            self._bytes_sent += profiling.nbytes(state)
+        return state
+
+    def _send(self, msg, buffers=None):
+        nbytes = profiling.nbytes(buffers)
+        self._bytes_sent += nbytes
+        with profiling.stage('comm_send', widget=type(self).__name__) as record:
+            record['nbytes'] = nbytes
+            super(_InstrumentedWidget, self)._send(msg, buffers=buffers)
+
+    def memory_usage(self, find_duplicates=True):
+        """Report the memory held by this widget and its children, see
+        ``odysis.memory.memory_usage``."""
+        return memory.memory_usage(self, find_duplicates=find_duplicates)
+
+    def compact(self):
+        """Drop redundant copies held by this widget and its children, see
+        ``odysis.memory.compact``."""
+        return memory.compact(self)
+
+
+class _DeltaArrayWidget(object):
+    """Send the changes of the ``_delta_arrays`` traits as deltas against
+    the previously sent value, when smaller than the full array.
+
+    The value sent last is the old value of the first change since the last
+    send. Full states, requested by new front-ends, are always sent in full.
+    Delta arrays must not be modified in place.
+    """
+
+    # Names of the array traits sent as deltas
+    _delta_arrays = ()
+
+    def __init__(self, *args, **kwargs):
+        # Last sent value of the delta arrays changed since
+        self._delta_bases = {}
+        super(_DeltaArrayWidget, self).__init__(*args, **kwargs)
+
+    def notify_change(self, change):
+        # Like Widget.notify_change, the change is only sent with a comm
+        if change['name'] in self._delta_arrays and self.comm is not None and \
+                getattr(self.comm, 'kernel', True) is not None:
+            self._delta_bases.setdefault(change['name'], change['old'])
+        super(_DeltaArrayWidget, self).notify_change(change)
+
+    def get_state(self, key=None, drop_defaults=False):
+        state = super(_DeltaArrayWidget, self).get_state(key=key, drop_defaults=drop_defaults)
+        if key is None:
+            self._delta_bases.clear()
+            return state
+
+        for name in self._delta_arrays:
+            base = self._delta_bases.pop(name, None)
+            if name in state and base is not None:
+                delta = array_delta(base, getattr(self, name), self)
+                if delta is not None:
+                    state[name] = delta
+        return state
+
+
+def _profiled(stage, function, *args):
+    """Call function, recording it as a profiling stage."""
+    with profiling.stage(stage) as record:
+        out = function(*args)
+        record['nbytes'] = profiling.nbytes(out)
+    return out
+
+
+def _mesh_arrays(mesh):
+    """The geometry and data arrays of a mesh, which plugin blocks computing
+    from the mesh compare by identity to know whether it changed."""
+    return [mesh.vertices, mesh.tetrahedrons] + [
+        c.array for d in mesh.data for c in d.components
+    ]
+
+
+def _same_arrays(arrays, other):
+    return other is not None and len(arrays) == len(other) and \
+        all(a is b for a, b in zip(arrays, other))
+
+
 @register
-class Component(Widget):
+class Component(_DeltaArrayWidget, _InstrumentedWidget, Widget):
     """A data component widget."""
     # _view_name = Unicode('ComponentView').tag(sync=True)
     _model_name = Unicode('ComponentModel').tag(sync=True)
@@ -40,13 +160,15 @@ class Component(Widget):
 
     name = Unicode().tag(sync=True)
     # TODO: validate data as being 1-D array, and validate dtype
-    array = Array(default_value=array(FLOAT32)).tag(sync=True, **array_serialization)
+    array = Array(default_value=np.zeros(0, dtype=FLOAT32)).tag(sync=True, **array_serialization)
     min = Float(allow_none=True, default_value=None).tag(sync=True)
     max = Float(allow_none=True, default_value=None).tag(sync=True)
 
+    _delta_arrays = ('array', )
+
 
 @register
-class Data(Widget):
+class Data(_InstrumentedWidget, Widget):
     """A data widget."""
     # _view_name = Unicode('DataView').tag(sync=True)
     _model_name = Unicode('DataModel').tag(sync=True)
@@ -59,12 +181,62 @@ class Data(Widget):
     components = List(Instance(Component)).tag(sync=True, **widget_serialization)
 
 
+# Version of the format of the scenes saved by Scene.save
+SNAPSHOT_VERSION = 1
+
+
+def _snapshot_traits(widget, base, writer):
+    """The public traits of a widget, other than the traits of ``base`` and
+    the widget traits, as JSON values and as references to the arrays
+    written to the sidecar."""
+    excluded = set(base.class_trait_names())
+    values = {}
+    arrays = {}
+    for name, trait in widget.traits().items():
+        if name.startswith('_') or name in excluded:
+            continue
+        if isinstance(trait, List):
+            trait = trait._trait
+        if isinstance(trait, Instance):
+            continue
+
+        value = getattr(widget, name)
+        if isinstance(value, np.ndarray):
+            arrays[name] = writer.add(value)
+        else:
+            values[name] = value
+    return {'values': values, 'arrays': arrays}
+
+
+def _restore_traits(traits, reader):
+    values = dict(traits['values'])
+    values.update((name, reader.array(reference)) for name, reference in traits['arrays'].items())
+    return values
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('{} is not JSON serializable'.format(type(value).__name__))
+
+
+def _block_types():
+    """Block classes by name."""
+    types = {}
+    classes = [Block]
+    while classes:
+        cls = classes.pop()
+        types[cls.__name__] = cls
+        classes.extend(cls.__subclasses__())
+    return types
+
+
 class BlockType():
     pass
 
 
 @register
-class Block(Widget, BlockType):
+class Block(_InstrumentedWidget, Widget, BlockType):
     _view_name = Unicode('BlockView').tag(sync=True)
     _model_name = Unicode('BlockModel').tag(sync=True)
     _view_module = Unicode('odysis').tag(sync=True)
@@ -76,6 +248,13 @@ class Block(Widget, BlockType):
 
     visible = Bool(True).tag(sync=True)
 
+    # Whether the front-end should report its processing times
+    _profiling = Bool().tag(sync=True)
+
+    @default('_profiling')
+    def _default_profiling(self):
+        return profiling.is_enabled()
+
     def apply(self, block):
         block._validate_parent(self)
 
@@ -114,6 +293,11 @@ class Block(Widget, BlockType):
         self.apply(effect)
         return effect
 
+    def streamlines(self, *args, **kwargs):
+        effect = Streamlines(*args, **kwargs)
+        self.apply(effect)
+        return effect
+
     def clip(self, *args, **kwargs):
         effect = Clip(*args, **kwargs)
         self.apply(effect)
@@ -134,14 +318,54 @@ class Block(Widget, BlockType):
         self.apply(effect)
         return effect
 
+    def contour_set(self, *args, **kwargs):
+        effect = ContourSet(*args, **kwargs)
+        self.apply(effect)
+        return effect
+
     def __init__(self, *args, **kwargs):
         super(Block, self).__init__(*args, **kwargs)
         self.colormap_wid = None
         self.colormapslider_wid = None
 
+        self.on_msg(self._handle_profile_message)
+
+    def _handle_profile_message(self, widget, content, buffers):
+        if content.get('event') == 'profile':
+            profiling.add_record(
+                content['stage'], source='frontend',
+                widget=type(self).__name__, wall_time=content['wall_time']
+            )
+
+    # Whether the block needs the tetrahedrons of the mesh
+    _volumetric_only = False
+
     def _validate_parent(self, parent):
         pass
 
+    def _snapshot(self, writer):
+        """Describe this block and its children for Scene.save, arrays
+        being written to the sidecar."""
+        return {
+            'type': type(self).__name__,
+            'traits': _snapshot_traits(self, Widget, writer),
+            'blocks': [block._snapshot(writer) for block in self._blocks]
+        }
+
+    @classmethod
+    def _from_snapshot(cls, description, reader, parent=None):
+        """Create a block and its children from their description."""
+        block = cls(**_restore_traits(description['traits'], reader))
+        if parent is not None:
+            parent.apply(block)
+        block._restore_children(description, reader)
+        return block
+
+    def _restore_children(self, description, reader):
+        block_types = _block_types()
+        for child in description['blocks']:
+            block_types[child['type']]._from_snapshot(child, reader, self)
+
 
 def _grid_data_to_data_widget(grid_data):
     data = []
@@ -158,8 +382,53 @@ def _grid_data_to_data_widget(grid_data):
     return data
 
 
+def _bounding_box(vertices):
+    """[xmin, xmax, ymin, ymax, zmin, zmax] of flat coordinates, like VTK."""
+    if not len(vertices):
+        return []
+    coordinates = vertices.reshape(-1, 3)
+    return [
+        float(value)
+        for axis in range(3)
+        for value in (coordinates[:, axis].min(), coordinates[:, axis].max())
+    ]
+
+
+def _vtk_mesh_arrays(grid, target_reduction=None):
+    """The arrays of the Mesh of a grid, see ``Mesh.from_vtk``. No widget
+    is created, so that it can run in a background thread."""
+    grid.ComputeBounds()
+    bounding_box = grid.GetBounds()
+
+    if target_reduction is not None:
+        grid = _profiled('decimate_grid', decimate_grid, grid, target_reduction)
+        tetrahedrons = np.zeros(0, dtype=UINT32)
+    else:
+        tetrahedrons = _profiled('get_ugrid_tetrahedrons', get_ugrid_tetrahedrons, grid)
+
+    return {
+        'vertices': _profiled('get_ugrid_vertices', get_ugrid_vertices, grid),
+        'triangles': _profiled('get_ugrid_triangles', get_ugrid_triangles, grid),
+        'tetrahedrons': tetrahedrons,
+        'data': _profiled('get_ugrid_data', get_ugrid_data, grid),
+        'bounding_box': bounding_box
+    }
+
+
+def _get_grid(path):
+    if isinstance(path, str):
+        return _profiled('load_vtk', load_vtk, path)
+    elif is_unstructured_grid(path):
+        return path
+    elif hasattr(path, "cast_to_unstructured_grid"):
+        # Allows support for any PyVista mesh
+        return path.cast_to_unstructured_grid()
+    else:
+        raise TypeError("Only unstructured grids supported at this time.")
+
+
 @register
-class Mesh(Widget):
+class Mesh(_DeltaArrayWidget, _InstrumentedWidget, Widget):
     """A 3-D Mesh widget."""
     _model_name = Unicode('MeshModel').tag(sync=True)
     _view_module = Unicode('odysis').tag(sync=True)
@@ -168,14 +437,29 @@ class Mesh(Widget):
     _model_module_version = Unicode(odysis_version).tag(sync=True)
 
     # TODO: validate vertices/triangles/tetrahedrons as being 1-D array, and validate dtype
-    vertices = Array(default_value=array(FLOAT32)).tag(sync=True, **array_serialization)
-    triangles = Array(default_value=array(UINT32)).tag(sync=True, **array_serialization)
-    tetrahedrons = Array(default_value=array(UINT32)).tag(sync=True, **array_serialization)
+    vertices = Array(default_value=np.zeros(0, dtype=FLOAT32)).tag(sync=True, **array_serialization)
+    triangles = Array(default_value=np.zeros(0, dtype=UINT32)).tag(sync=True, **array_serialization)
+    tetrahedrons = Array(default_value=np.zeros(0, dtype=UINT32)).tag(sync=True, **array_serialization)
     data = List(Instance(Data), default_value=[]).tag(sync=True, **widget_serialization)
     bounding_box = List().tag(sync=True)
 
+    _delta_arrays = ('vertices', )
+
+    def __init__(self, *args, **kwargs):
+        super(Mesh, self).__init__(*args, **kwargs)
+        # Expressions of the derived fields, by name
+        self._derived = OrderedDict()
+        self._locator = None
+        # Meshes extracted from this one, refreshed when it is reloaded
+        self._extracts = []
+        # For an extracted mesh, the full mesh, the selection of the cells
+        # and the current Subset
+        self._source = None
+        self._selection = None
+        self._subset = None
+
     @staticmethod
-    def from_vtk(path):
+    def from_vtk(path, target_reduction=None):
         """ Pass a path to a VTK Unstructured Grid file (``.vtu``) or pass a
         ```vtkUnstructuredGrid`` object to use.
 
@@ -183,43 +467,499 @@ class Mesh(Widget):
         ----------
         path : str or vtk.vtkUnstructuredGrid
             The path to the VTK file or an unstructured grid in memory.
+        target_reduction : float, optional
+            If specified, only a decimated skin of the grid is extracted,
+            ``target_reduction`` being the fraction of vertices to remove
+            (e.g. 0.9 keeps about 10% of the surface vertices). The resulting
+            Mesh has no tetrahedrons.
         """
-        if isinstance(path, str):
-            grid = load_vtk(path)
-        elif isinstance(path, vtk.vtkUnstructuredGrid):
-            grid = path
-        elif hasattr(path, "cast_to_unstructured_grid"):
-            # Allows support for any PyVista mesh
-            grid = path.cast_to_unstructured_grid()
-        else:
-            raise TypeError("Only unstructured grids supported at this time.")
-
-        grid.ComputeBounds()
-        bounding_box = grid.GetBounds()
+        with profiling.stage('Mesh.from_vtk'):
+            return Mesh._from_vtk_arrays(_vtk_mesh_arrays(_get_grid(path), target_reduction))
 
+    @staticmethod
+    def _from_vtk_arrays(arrays):
+        """Create a Mesh from the output of ``_vtk_mesh_arrays``."""
         return Mesh(
-            vertices=get_ugrid_vertices(grid),
-            triangles=get_ugrid_triangles(grid),
-            tetrahedrons=get_ugrid_tetrahedrons(grid),
-            data=_grid_data_to_data_widget(get_ugrid_data(grid)),
-            bounding_box=bounding_box
+            vertices=arrays['vertices'],
+            triangles=arrays['triangles'],
+            tetrahedrons=arrays['tetrahedrons'],
+            data=_grid_data_to_data_widget(arrays['data']),
+            bounding_box=list(arrays['bounding_box'])
         )
 
+    @staticmethod
+    def from_arrays(points, connectivity, offsets, cell_types,
+                    point_data=None, cell_data=None):
+        """Create a Mesh from NumPy arrays, without going through VTK.
+
+        Buffers which already have the expected dtype (float32 contiguous
+        points and one dimensional point fields) are used without copy.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            (nb_points, 3) or flat array of point coordinates.
+        connectivity : numpy.ndarray
+            Flat array of the point ids of each cell.
+        offsets : numpy.ndarray
+            Offset of each cell in ``connectivity``, optionally followed by
+            the connectivity length (VTK 9 layout).
+        cell_types : numpy.ndarray
+            VTK type of each cell. Triangles, quads, tetrahedrons, voxels,
+            hexahedrons, wedges and pyramids are supported, vertices and lines
+            are ignored.
+        point_data : dict, optional
+            ``{name: array}`` of (nb_points,) or (nb_points, nb_components)
+            fields.
+        cell_data : dict, optional
+            ``{name: array}`` of (nb_cells,) or (nb_cells, nb_components)
+            fields, which are averaged on points.
+        """
+        with profiling.stage('Mesh.from_arrays'):
+            vertices = np.ascontiguousarray(points, dtype=np.float32).reshape(-1)
+            if len(vertices) % 3:
+                raise ValueError('points must be 3-D')
+            nb_points = len(vertices) // 3
+
+            groups = group_cells(connectivity, offsets, cell_types)
+
+            fields = OrderedDict(point_data or {})
+            for name, values in (cell_data or {}).items():
+                if name in fields:
+                    raise ValueError('{} is both a point and a cell field'.format(name))
+                fields[name] = cell_to_point_data(values, groups, nb_points)
+
+            return Mesh(
+                vertices=vertices,
+                triangles=_profiled('extract_surface', extract_surface, groups),
+                tetrahedrons=_profiled('tetrahedralize', tetrahedralize, groups),
+                data=_grid_data_to_data_widget(fields_to_data(fields)),
+                bounding_box=_bounding_box(vertices)
+            )
+
+    @staticmethod
+    def from_xdmf(path, fields=None, step=0, mmap=True):
+        """Create a Mesh from a XDMF file, with data in XML or HDF5 format.
+
+        Only the geometry, the topology and the requested fields of the
+        requested step are read.
+
+        Parameters
+        ----------
+        path : str
+            The path to the ``.xdmf`` or ``.xmf`` file.
+        fields : list of str, optional
+            Names of the fields to load, all fields of the step by default.
+        step : int
+            Index of the time step, for temporal collections.
+        mmap : bool
+            Whether contiguous uncompressed HDF5 datasets should be
+            memory-mapped instead of being read in memory.
+        """
+        with profiling.stage('Mesh.from_xdmf'), XdmfReader(path, mmap=mmap) as reader:
+            available = reader.fields(step)
+            if fields is None:
+                fields = list(available)
+
+            point_data = OrderedDict()
+            cell_data = OrderedDict()
+            for name in fields:
+                if name not in available:
+                    raise KeyError('No field {} at step {} in {}'.format(name, step, path))
+                values = _profiled('read_field', reader.read_field, name, step)
+                if available[name] == 'Cell':
+                    cell_data[name] = values
+                else:
+                    point_data[name] = values
+
+            connectivity, offsets, cell_types = _profiled('read_topology', reader.read_topology, step)
+
+            return Mesh.from_arrays(
+                _profiled('read_geometry', reader.read_geometry, step),
+                connectivity, offsets, cell_types,
+                point_data=point_data, cell_data=cell_data
+            )
+
+    @staticmethod
+    def merge(meshes, part_field='part'):
+        """Merge meshes, the parts, in a single Mesh.
+
+        Points, triangles and tetrahedrons of the parts are concatenated, so
+        that the parts are sent in one message and drawn with one draw call.
+        Only the fields that all the parts have, with the same components,
+        are kept, and a ``part_field`` field gives the index of the part of
+        each point.
+
+        Parameters
+        ----------
+        meshes : list of Mesh
+            The parts.
+        part_field : str
+            Name of the field of the part indices.
+        """
+        meshes = list(meshes)
+        if not meshes:
+            raise ValueError('Cannot merge an empty list of meshes')
+
+        with profiling.stage('Mesh.merge', parts=len(meshes)):
+            offsets = parts.point_offsets([mesh.vertices for mesh in meshes])
+            vertices = np.concatenate([mesh.vertices for mesh in meshes]).astype(FLOAT32, copy=False)
+
+            fields = [
+                OrderedDict((d.name, OrderedDict((c.name, c) for c in d.components)) for d in mesh.data)
+                for mesh in meshes
+            ]
+            if any(part_field in f for f in fields):
+                raise ValueError('The meshes already have a {} field'.format(part_field))
+
+            data = OrderedDict()
+            for name, components in fields[0].items():
+                if any(list(f.get(name, {})) != list(components) for f in fields[1:]):
+                    continue
+                data[name] = OrderedDict()
+                for component_name in components:
+                    merged = [f[name][component_name] for f in fields]
+                    mins = [c.min for c in merged if len(c.array)]
+                    maxs = [c.max for c in merged if len(c.array)]
+                    data[name][component_name] = {
+                        'array': np.concatenate([c.array for c in merged]).astype(FLOAT32, copy=False),
+                        'min': None if None in mins or not mins else min(mins),
+                        'max': None if None in maxs or not maxs else max(maxs)
+                    }
+            ids = parts.part_ids(offsets)
+            data[part_field] = {'X1': {'array': ids, 'min': 0., 'max': float(len(meshes) - 1)}}
+
+            return Mesh(
+                vertices=vertices,
+                triangles=parts.merge_cells([mesh.triangles for mesh in meshes], offsets),
+                tetrahedrons=parts.merge_cells([mesh.tetrahedrons for mesh in meshes], offsets),
+                data=_grid_data_to_data_widget(data),
+                bounding_box=_bounding_box(vertices)
+            )
 
     def reload(self, path,
                reload_vertices=False, reload_triangles=False,
                reload_data=True, reload_tetrahedrons=False):
-        grid = load_vtk(path)
+        with profiling.stage('Mesh.reload'):
+            grid = _profiled('load_vtk', load_vtk, path)
+
+            # Blocks computing from the arrays are notified once they are all
+            # set, so that they only compute once. Syncs are held around the
+            # notifications, which send the changes
+            widgets = [self] + [c for d in self.data for c in d.components]
+            with ExitStack() as stack:
+                for widget in widgets:
+                    stack.enter_context(widget.hold_sync())
+                for widget in widgets:
+                    stack.enter_context(widget.hold_trait_notifications())
+
+                if reload_vertices:
+                    self.vertices = _profiled('get_ugrid_vertices', get_ugrid_vertices, grid)
+                if reload_triangles:
+                    self.triangles = _profiled('get_ugrid_triangles', get_ugrid_triangles, grid)
+                if reload_tetrahedrons:
+                    self.tetrahedrons = _profiled('get_ugrid_tetrahedrons', get_ugrid_tetrahedrons, grid)
+                if reload_data:
+                    self._update_data(_profiled('get_ugrid_data', get_ugrid_data, grid))
+
+                # The inputs of derived fields may have changed
+                if reload_data or reload_vertices:
+                    for name, expression in self._derived.items():
+                        self._evaluate_derived(name, expression)
+
+            self._refresh_extracts(reload_tetrahedrons or reload_triangles)
+
+    def _update_data(self, grid_data):
+        """Set new data, updating the Component widgets in place when the
+        fields are the same, so that only the changes of their arrays are
+        sent."""
+        grid_data = OrderedDict(grid_data)
+        for name in self._derived:
+            grid_data.pop(name, None)
+        fields = [
+            (d.name, [c.name for c in d.components])
+            for d in self.data if d.name not in self._derived
+        ]
+        if fields != [(name, list(components)) for name, components in grid_data.items()]:
+            self.data = _grid_data_to_data_widget(grid_data)
+            return
 
-        with self.hold_sync():
-            if reload_vertices:
-                self.vertices = get_ugrid_vertices(grid)
-            if reload_triangles:
-                self.triangles = get_ugrid_triangles(grid)
-            if reload_tetrahedrons:
-                self.tetrahedrons = get_ugrid_tetrahedrons(grid)
-            if reload_data:
-                self.data = _grid_data_to_data_widget(get_ugrid_data(grid))
+        for d in self.data:
+            if d.name in self._derived:
+                continue
+            for component in d.components:
+                new = grid_data[d.name][component.name]
+                with component.hold_sync():
+                    component.array = new['array']
+                    component.min = new['min']
+                    component.max = new['max']
+
+    def add_derived(self, name, expression):
+        """Add a field computed from the other fields of the Mesh.
+
+        The expression is evaluated with NumPy by chunks of points, only the
+        new field is sent to the front-end. The result is kept until the
+        Mesh is reloaded, which evaluates the expression again.
+
+        Parameters
+        ----------
+        name : str
+            The name of the new field.
+        expression : str
+            A Python expression over the fields, referred to by name, the
+            components of multi-component fields being attributes (e.g.
+            ``velocity.X1``). The point coordinates ``x``, ``y`` and ``z``,
+            ``magnitude`` and common NumPy functions are available, e.g.
+            ``magnitude(velocity)`` or ``(temperature - 273.15) * 1.8``.
+
+        Returns
+        -------
+        Data
+            The Data widget of the new field.
+        """
+        existing = [d for d in self.data if d.name == name]
+        if existing and name not in self._derived:
+            raise ValueError('{} is not a derived field and cannot be replaced'.format(name))
+        if existing and self._derived[name] == expression:
+            return existing[0]
+
+        data = self._evaluate_derived(name, expression)
+        self._derived.pop(name, None)
+        self._derived[name] = expression
+        return data
+
+    def _evaluate_derived(self, name, expression):
+        fields = OrderedDict(
+            (d.name, OrderedDict((c.name, c.array) for c in d.components))
+            for d in self.data if d.name != name
+        )
+
+        with profiling.stage('Mesh.add_derived', field=name):
+            array, array_min, array_max = derived.evaluate(expression, fields, self.vertices)
+
+        # A previous version of the field is updated in place, sending the
+        # changes of its array only
+        previous = [d for d in self.data if d.name == name]
+        if previous and [c.name for c in previous[0].components] == ['X1']:
+            component = previous[0].components[0]
+            with component.hold_sync():
+                component.array = array
+                component.min = array_min
+                component.max = array_max
+            return previous[0]
+
+        data = Data(
+            name=name,
+            components=[Component(name='X1', array=array, min=array_min, max=array_max)]
+        )
+
+        # Only the new Data widget is sent, the other ones are referred to
+        previous = [d for d in self.data if d.name == name]
+        self.data = [d for d in self.data if d.name != name] + [data]
+        for d in previous:
+            for component in d.components:
+                component.close()
+            d.close()
+        return data
+
+    @observe('vertices', 'tetrahedrons')
+    def _reset_locator(self, change):
+        self._locator = None
+
+    def _get_locator(self):
+        if self._locator is None:
+            with profiling.stage('CellLocator'):
+                self._locator = CellLocator(self.vertices, self.tetrahedrons)
+        return self._locator
+
+    def probe(self, points, fields=None):
+        """Interpolate fields at arbitrary points.
+
+        Points are located in the tetrahedrons, the locator being built on
+        the first call and kept until the geometry changes, and the point
+        values of the tetrahedrons are interpolated linearly.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            (N, 3) query points.
+        fields : list of str, optional
+            Names of the fields to sample, all fields by default.
+
+        Returns
+        -------
+        OrderedDict
+            ``{name: values}`` where values are (N,) arrays for one component
+            fields and (N, nb_components) arrays otherwise, NaN for points
+            outside of the Mesh.
+        """
+        with profiling.stage('Mesh.probe'):
+            locator = self._get_locator()
+            cell_ids, weights = locator.locate(points)
+
+            out = OrderedDict()
+            for data in self.data:
+                if fields is not None and data.name not in fields:
+                    continue
+                columns = [
+                    locator.interpolate(component.array, cell_ids, weights)
+                    for component in data.components
+                ]
+                out[data.name] = columns[0] if len(columns) == 1 else np.column_stack(columns)
+
+            missing = set(fields or []) - set(out)
+            if missing:
+                raise KeyError('No field {} in the Mesh'.format(', '.join(sorted(missing))))
+            return out
+
+    def sample_line(self, polyline, resolution=100, fields=None):
+        """Interpolate fields at evenly spaced points along a polyline.
+
+        Parameters
+        ----------
+        polyline : numpy.ndarray
+            (nb_points, 3) polyline points, e.g. the two ends of a line.
+        resolution : int
+            Number of samples.
+        fields : list of str, optional
+            Names of the fields to sample, all fields by default.
+
+        Returns
+        -------
+        tuple
+            The (resolution, 3) samples, their distances along the polyline
+            and the values as returned by ``probe``.
+        """
+        samples, distances = polyline_samples(polyline, resolution)
+        return samples, distances, self.probe(samples, fields)
+
+    def extract(self, selection):
+        """Extract a subset of the cells as a new, compact Mesh.
+
+        The kept tetrahedrons (or triangles, for surface meshes) and their
+        points are renumbered, and the fields are gathered on the kept
+        points, so that blocks applied to the new Mesh only process the
+        subset. The mapping to this Mesh is kept: when this Mesh is reloaded,
+        the new Mesh gets the new vertices and fields of its points without
+        selecting the cells again, unless the cells are reloaded.
+
+        Parameters
+        ----------
+        selection : numpy.ndarray or callable
+            (nb_cells,) boolean mask of the kept cells, or a function taking
+            this Mesh and returning the mask, which is called again when
+            the cells are reloaded.
+
+        Returns
+        -------
+        Mesh
+            The extracted Mesh, whose surface is the skin of the kept
+            tetrahedrons.
+        """
+        mesh = Mesh()
+        mesh._source = self
+        mesh._selection = selection
+        mesh._refresh(True)
+        self._extracts.append(mesh)
+        return mesh
+
+    def _cells(self):
+        if len(self.tetrahedrons):
+            return self.tetrahedrons.reshape(-1, 4)
+        return self.triangles.reshape(-1, 3)
+
+    def _refresh(self, select):
+        """Extract the points and fields of the subset from the full mesh,
+        selecting the cells again if ``select``."""
+        source = self._source
+        with profiling.stage('Mesh.extract', select=select):
+            if select:
+                selection = self._selection
+                mask = selection(source) if callable(selection) else selection
+                self._subset = extraction.Subset(source._cells(), mask)
+            subset = self._subset
+
+            vertices = subset.vertices(source.vertices)
+            data = OrderedDict()
+            for d in source.data:
+                data[d.name] = OrderedDict()
+                for c in d.components:
+                    array = subset.take(c.array)
+                    data[d.name][c.name] = {
+                        'array': array,
+                        'min': float(array.min()) if len(array) else c.min,
+                        'max': float(array.max()) if len(array) else c.max
+                    }
+
+            with self.hold_sync():
+                if select:
+                    volumetric = len(source.tetrahedrons) != 0
+                    self.tetrahedrons = subset.cells.reshape(-1) if volumetric else np.zeros(0, dtype=UINT32)
+                    self.triangles = subset.triangles
+                self.vertices = vertices
+                self.bounding_box = _bounding_box(vertices)
+                self._update_data(data)
+                for name, expression in self._derived.items():
+                    self._evaluate_derived(name, expression)
+
+        self._refresh_extracts(select)
+
+    def _refresh_extracts(self, select):
+        # Closed extracts are forgotten
+        self._extracts = [mesh for mesh in self._extracts if mesh.comm is not None]
+        for mesh in self._extracts:
+            mesh._refresh(select)
+
+    def _memory_arrays(self):
+        arrays = {}
+        if self._locator is not None:
+            arrays.update(
+                ('_locator.' + name, ar) for name, ar in self._locator.arrays().items()
+            )
+        if self._subset is not None:
+            arrays.update(
+                ('_subset.' + name, ar) for name, ar in self._subset.arrays().items()
+            )
+        return arrays
+
+    def _compact(self):
+        self._locator = None
+
+    def _snapshot(self, writer):
+        """Describe this mesh for Scene.save, arrays being written to the
+        sidecar."""
+        return {
+            'vertices': writer.add(self.vertices),
+            'triangles': writer.add(self.triangles),
+            'tetrahedrons': writer.add(self.tetrahedrons),
+            'bounding_box': list(self.bounding_box),
+            'data': [
+                {'name': d.name, 'components': [
+                    {'name': c.name, 'array': writer.add(c.array), 'min': c.min, 'max': c.max}
+                    for c in d.components
+                ]}
+                for d in self.data
+            ],
+            'derived': list(self._derived.items())
+        }
+
+    @staticmethod
+    def _from_snapshot(description, reader):
+        mesh = Mesh(
+            vertices=reader.array(description['vertices']),
+            triangles=reader.array(description['triangles']),
+            tetrahedrons=reader.array(description['tetrahedrons']),
+            bounding_box=description['bounding_box'],
+            data=[
+                Data(name=d['name'], components=[
+                    Component(name=c['name'], array=reader.array(c['array']), min=c['min'], max=c['max'])
+                    for c in d['components']
+                ])
+                for d in description['data']
+            ]
+        )
+        mesh._derived = OrderedDict(description['derived'])
+        return mesh
 
 
 @register
@@ -227,7 +967,380 @@ class DataBlock(Block):
     _view_name = Unicode('DataBlockView').tag(sync=True)
     _model_name = Unicode('DataBlockModel').tag(sync=True)
 
-    mesh = Instance(Mesh).tag(sync=True, **widget_serialization)
+    mesh = Instance(Mesh, allow_none=True, default_value=None).tag(sync=True, **widget_serialization)
+    # Coarse level of detail displayed until ``mesh`` is available
+    coarse_mesh = Instance(Mesh, allow_none=True, default_value=None).tag(sync=True, **widget_serialization)
+    # Error which stopped the grid from being read in the background,
+    # displayed by the views
+    error = Unicode(allow_none=True, default_value=None).tag(sync=True)
+
+    @property
+    def current_mesh(self):
+        """The full resolution mesh if available, the coarse one otherwise."""
+        return self.mesh if self.mesh is not None else self.coarse_mesh
+
+    def __init__(self, *args, **kwargs):
+        super(DataBlock, self).__init__(*args, **kwargs)
+        self._refine_thread = None
+        # Whether the grid has 3-D cells, known before the full mesh
+        self._volumetric = None
+
+    @property
+    def volumetric(self):
+        """Whether the grid has tetrahedrons, None while it is unknown. It
+        does not depend on the displayed level, the coarse mesh being a
+        skin."""
+        if self.mesh is not None:
+            return len(self.mesh.tetrahedrons) != 0
+        return self._volumetric
+
+    @staticmethod
+    def from_vtk(path, target_reduction=0.9, cache=True):
+        """ Create a DataBlock that first displays a decimated skin of the
+        grid, the full resolution mesh replacing it when ready.
+
+        Reading the grid and extracting both levels run in a background
+        thread, the meshes being created on the event loop of the kernel, so
+        that the DataBlock is returned at once and displays the skin as soon
+        as it is extracted. Without running event loop, e.g. in scripts, both
+        levels are extracted before returning. Errors, e.g. an unreadable
+        file, are then raised, or otherwise kept in the ``error`` trait of
+        the DataBlock, displayed by the views, and issued as warnings.
+
+        Parameters
+        ----------
+        path : str or vtk.vtkUnstructuredGrid
+            The path to the VTK file or an unstructured grid in memory.
+        target_reduction : float
+            Fraction of the surface vertices removed for the coarse mesh.
+        cache : bool
+            Whether the skin of a file is cached in the user cache directory
+            (see ``odysis.lod_cache``), so that opening the file again
+            displays it without reading the file.
+        """
+        block = DataBlock()
+
+        cached = None
+        if isinstance(path, str) and cache:
+            cached = _profiled('read_lod_cache', lod_cache.read, path, target_reduction)
+        if cached is not None:
+            block._set_coarse_mesh(*cached)
+
+        loop = _get_running_loop()
+        if loop is None:
+            block._extract_levels(path, target_reduction, cache and cached is None, lambda f, *args: f(*args))
+            return block
+
+        block._refine_thread = Thread(
+            target=block._refine,
+            args=(path, target_reduction, cache and cached is None, loop.call_soon_threadsafe)
+        )
+        block._refine_thread.daemon = True
+        block._refine_thread.start()
+
+        return block
+
+    def _refine(self, path, target_reduction, write_cache, callback):
+        """Extract the levels of detail of a grid in a background thread,
+        errors being reported on the event loop."""
+        try:
+            self._extract_levels(path, target_reduction, write_cache, callback)
+        except Exception as error:
+            callback(self._refine_failed, error)
+
+    def _extract_levels(self, path, target_reduction, write_cache, callback):
+        """Extract the levels of detail of a grid, handing the arrays to
+        ``callback(function, *args)`` which calls the function on the event
+        loop, as widgets must only be created and updated there."""
+        source = lod_cache.source_key(path) if isinstance(path, str) else None
+        grid = _get_grid(path)
+
+        if self.coarse_mesh is None:
+            with profiling.stage('Mesh.from_vtk', level='coarse'):
+                arrays = _vtk_mesh_arrays(grid, target_reduction)
+            volumetric = is_volumetric(grid)
+            callback(self._set_coarse_mesh, arrays, volumetric)
+            if write_cache and source is not None:
+                _profiled('write_lod_cache', lod_cache.write, path, target_reduction, source, arrays, volumetric)
+
+        with profiling.stage('Mesh.from_vtk', level='full'):
+            arrays = _vtk_mesh_arrays(grid)
+        callback(self._set_mesh, arrays)
+
+    def _refine_failed(self, error):
+        self.error = '{}: {}'.format(type(error).__name__, error)
+        warnings.warn('The grid of the DataBlock could not be read: {}'.format(self.error))
+
+    def _set_coarse_mesh(self, arrays, volumetric):
+        # The full resolution mesh may have been set
+        if self.mesh is None:
+            self._volumetric = volumetric
+            self.coarse_mesh = Mesh._from_vtk_arrays(arrays)
+            self._update_children_input()
+            self._remove_volumetric_blocks()
+
+    def _set_mesh(self, arrays):
+        had_mesh = self.current_mesh is not None
+        self.mesh = Mesh._from_vtk_arrays(arrays)
+        if not had_mesh:
+            self._update_children_input()
+        self._remove_volumetric_blocks()
+
+    def _remove_volumetric_blocks(self):
+        """Remove the blocks which need tetrahedrons, applied while it was
+        unknown whether the grid has some."""
+        if self.volumetric is not False:
+            return
+        blocks = list(self._blocks)
+        while blocks:
+            block = blocks.pop()
+            if block._volumetric_only:
+                warnings.warn('{} removed, the mesh is not volumetric'.format(type(block).__name__))
+                block._parent_block.remove(block)
+            else:
+                blocks.extend(block._blocks)
+
+    def _update_children_input(self):
+        """Set the input of the blocks applied before the first mesh."""
+        blocks = list(self._blocks)
+        while blocks:
+            block = blocks.pop()
+            if isinstance(block, PluginBlock) and not block._available_input_data:
+                block._update_input_data({'new': block._parent_block})
+            blocks.extend(block._blocks)
+
+    def _snapshot(self, writer):
+        description = super(DataBlock, self)._snapshot(writer)
+        for name in ('mesh', 'coarse_mesh'):
+            mesh = getattr(self, name)
+            description[name] = mesh._snapshot(writer) if mesh is not None else None
+        description['volumetric'] = self.volumetric
+        return description
+
+    @classmethod
+    def _from_snapshot(cls, description, reader, parent=None):
+        meshes = dict(
+            (name, Mesh._from_snapshot(description[name], reader))
+            for name in ('mesh', 'coarse_mesh') if description[name] is not None
+        )
+        block = cls(**dict(_restore_traits(description['traits'], reader), **meshes))
+        block._volumetric = description.get('volumetric')
+        block._restore_children(description, reader)
+        return block
+
+    def _compact(self):
+        # The coarse mesh is not displayed anymore once the full one is there
+        if self.mesh is not None and self.coarse_mesh is not None:
+            coarse_mesh = self.coarse_mesh
+            self.coarse_mesh = None
+            coarse_mesh.close()
+
+
+@register
+class BrickedDataBlock(DataBlock):
+    """A DataBlock which partitions its mesh in spatial bricks. Only the
+    bricks in the camera frustum are requested by the front-end, nearest
+    first, and brick payloads are cached kernel-side in an LRU cache.
+
+    Effects cannot be applied on a BrickedDataBlock.
+    """
+    _view_name = Unicode('BrickedDataBlockView').tag(sync=True)
+    _model_name = Unicode('BrickedDataBlockModel').tag(sync=True)
+
+    bricks = List().tag(sync=True)
+    bounding_box = List().tag(sync=True)
+    max_loaded_bricks = Int(64).tag(sync=True)
+
+    def __init__(self, *args, **kwargs):
+        super(BrickedDataBlock, self).__init__(*args, **kwargs)
+        self._vertices = None
+        self._triangles = None
+        self._data = {}
+        self._ranges = {}
+        self._brick_cells = []
+        self._cache = BrickCache(512 * 1024 ** 2)
+
+        self.on_msg(self._handle_message)
+
+    @staticmethod
+    def from_vtk(path, max_cells=50000, max_depth=6, cache_size=512 * 1024 ** 2):
+        """ Create a BrickedDataBlock from a VTK Unstructured Grid.
+
+        Parameters
+        ----------
+        path : str or vtk.vtkUnstructuredGrid
+            The path to the VTK file or an unstructured grid in memory.
+        max_cells : int
+            Maximum number of triangles per brick.
+        max_depth : int
+            Maximum depth of the octree.
+        cache_size : int
+            Size in bytes of the kernel-side brick cache.
+        """
+        grid = _get_grid(path)
+        grid.ComputeBounds()
+
+        block = BrickedDataBlock(bounding_box=grid.GetBounds())
+        block._cache = BrickCache(cache_size)
+
+        block._vertices = get_ugrid_vertices(grid)
+        block._triangles = get_ugrid_triangles(grid)
+        for data_name, components in get_ugrid_data(grid).items():
+            block._data[data_name] = {}
+            for component_name, component in components.items():
+                block._data[data_name][component_name] = component['array']
+                block._ranges[(data_name, component_name)] = (component['min'], component['max'])
+
+        centroids = block._vertices.reshape(-1, 3)[block._triangles.reshape(-1, 3)].mean(axis=1)
+        block._brick_cells = octree_partition(centroids, block.bounding_box, max_cells, max_depth)
+        block.bricks = [
+            brick_bounds(block._vertices.reshape(-1, 3)[np.unique(block._triangles.reshape(-1, 3)[cells])])
+            for cells in block._brick_cells
+        ]
+
+        return block
+
+    def apply(self, block):
+        raise RuntimeError('Cannot apply effects on a BrickedDataBlock')
+
+    def _snapshot(self, writer):
+        raise RuntimeError('Cannot save a BrickedDataBlock')
+
+    def _memory_arrays(self):
+        arrays = {'_vertices': self._vertices, '_triangles': self._triangles}
+        for data_name, components in self._data.items():
+            for component_name, ar in components.items():
+                arrays['_data.{}.{}'.format(data_name, component_name)] = ar
+        for brick_id, (vertices, triangles, data) in self._cache.items():
+            arrays['_cache.{}.vertices'.format(brick_id)] = vertices
+            arrays['_cache.{}.triangles'.format(brick_id)] = triangles
+            for data_name, components in data.items():
+                for component_name, ar in components.items():
+                    arrays['_cache.{}.{}.{}'.format(brick_id, data_name, component_name)] = ar
+        return dict((name, ar) for name, ar in arrays.items() if ar is not None)
+
+    def _compact(self):
+        super(BrickedDataBlock, self)._compact()
+        self._cache.clear()
+
+    def _get_brick(self, brick_id):
+        return self._cache.get(brick_id, lambda: extract_brick(
+            self._vertices, self._triangles, self._data, self._brick_cells[brick_id]
+        ))
+
+    def _send_brick(self, brick_id):
+        vertices, triangles, data = self._get_brick(brick_id)
+
+        components = []
+        buffers = [memoryview(vertices), memoryview(triangles)]
+        for data_name, brick_components in data.items():
+            for component_name, array in brick_components.items():
+                min, max = self._ranges[(data_name, component_name)]
+                components.append([data_name, component_name, min, max])
+                buffers.append(memoryview(array))
+
+        self.send({'event': 'brick', 'id': brick_id, 'components': components}, buffers=buffers)
+
+    def _handle_message(self, widget, content, buffers):
+        if content.get('event') == 'request_bricks':
+            for brick_id in content['ids']:
+                # Negative ids would silently index from the end
+                if not isinstance(brick_id, int) or not 0 <= brick_id < len(self._brick_cells):
+                    warnings.warn('Request of an unknown brick {!r}'.format(brick_id))
+                    continue
+                self._send_brick(brick_id)
+
+
+@register
+class MultiPartDataBlock(DataBlock):
+    """A DataBlock displaying many meshes, its parts, merged in a single
+    Mesh (see ``Mesh.merge``), so that they are sent in one message and
+    drawn with one draw call instead of one DataBlock per part.
+
+    Parts are shown, hidden and colored through ``part_table``, a small
+    lookup table indexed by the part field of the points, which effects
+    also follow.
+    """
+    _view_name = Unicode('MultiPartDataBlockView').tag(sync=True)
+    _model_name = Unicode('MultiPartDataBlockModel').tag(sync=True)
+
+    part_names = List(Unicode()).tag(sync=True)
+    # Name of the field of the part indices
+    part_field = Unicode('part').tag(sync=True)
+    # (nb_parts, 4) RGBA of the parts, A being 0 for hidden parts
+    part_table = Array(default_value=np.zeros((0, 4), dtype=np.uint8)).tag(sync=True, **array_serialization)
+    # Whether the parts are displayed with their color, which effects like
+    # ColorMapping replace
+    color_parts = Bool(False).tag(sync=True)
+
+    @staticmethod
+    def from_meshes(meshes, names=None, colors=None):
+        """ Create a MultiPartDataBlock from meshes.
+
+        Parameters
+        ----------
+        meshes : list of Mesh
+            The parts.
+        names : list of str, optional
+            Names of the parts, their index by default.
+        colors : list, optional
+            Colors of the parts, as ``'#rrggbb'`` strings or tuples of floats
+            in [0, 1]. Parts are displayed with their color if given.
+        """
+        meshes = list(meshes)
+        names = [str(i) for i in range(len(meshes))] if names is None else list(names)
+        if len(names) != len(meshes):
+            raise ValueError('Expected {} names, got {}'.format(len(meshes), len(names)))
+
+        return MultiPartDataBlock(
+            mesh=Mesh.merge(meshes),
+            part_names=names,
+            part_table=parts.part_table(len(meshes), colors),
+            color_parts=colors is not None
+        )
+
+    def _part_indices(self, part):
+        """Indices of a part name or index, or of a list of them."""
+        selection = part if isinstance(part, (list, tuple)) else [part]
+        indices = []
+        for p in selection:
+            if isinstance(p, str):
+                if p not in self.part_names:
+                    raise ValueError('Unknown part {!r}'.format(p))
+                p = self.part_names.index(p)
+            indices.append(int(p))
+        return indices
+
+    def _set_table(self, indices, columns, values):
+        # A new array, so that the change is synced
+        table = self.part_table.copy()
+        table[np.ix_(indices, columns)] = values
+        self.part_table = table
+
+    def set_visible(self, part, visible=True):
+        """Show or hide parts, given by name or index."""
+        self._set_table(self._part_indices(part), [3], 255 if visible else 0)
+
+    def set_color(self, part, color):
+        """Set the color of parts, given by name or index, as a
+        ``'#rrggbb'`` string or a tuple of floats in [0, 1]."""
+        self._set_table(self._part_indices(part), [0, 1, 2], parts.rgb(color))
+        self.color_parts = True
+
+    def show_only(self, part):
+        """Show the given parts and hide the others."""
+        visible = np.zeros(len(self.part_table), dtype=bool)
+        visible[self._part_indices(part)] = True
+        table = self.part_table.copy()
+        table[:, 3] = np.where(visible, 255, 0)
+        self.part_table = table
+
+
+def _get_running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
 
 
 @register
@@ -245,14 +1358,75 @@ class PluginBlock(Block):
     input_data = Unicode(allow_none=True, default_value=None).tag(sync=True)
     input_components = List(Union((Unicode(), Int()))).tag(sync=True)
 
+    # Maximum number of updates per second of the parameters tagged with
+    # ``throttle=True``, intermediate values are dropped. 0 disables it.
+    sync_rate = Float(20.).tag(sync=True)
+
     def __init__(self, *args, **kwargs):
+        self._throttled_states = set()
+        self._throttle_handle = None
+        self._last_throttled_sync = 0.
+        # Widgets observed by _observe_mesh_arrays, with the observed names
+        self._observed_arrays = []
+
         super(PluginBlock, self).__init__(*args, **kwargs)
         self.input_data_wid = None
         self.input_components_wid = None
 
+    def _should_send_property(self, key, value):
+        if not super(PluginBlock, self)._should_send_property(key, value):
+            return False
+        if not self.trait_metadata(key, 'throttle', False) or self.sync_rate <= 0:
+            return True
+
+        delay = self._last_throttled_sync + 1. / self.sync_rate - time.time()
+        if delay <= 0:
+            self._last_throttled_sync = time.time()
+            return True
+
+        # Without event loop, we cannot guarantee that the last value is sent
+        loop = _get_running_loop()
+        if loop is None:
+            return True
+
+        self._throttled_states.add(key)
+        if self._throttle_handle is None:
+            self._throttle_handle = loop.call_later(delay, self._send_throttled_states)
+        return False
+
+    def _send_throttled_states(self):
+        self._throttle_handle = None
+        self._last_throttled_sync = time.time()
+
+        states, self._throttled_states = self._throttled_states, set()
+        self.send_state(states)
+
     def _ipython_display_(self, *args, **kwargs):
         display(self.interact())
 
+    @classmethod
+    def _from_snapshot(cls, description, reader, parent=None):
+        # The input is only known once the block is applied
+        traits = _restore_traits(description['traits'], reader)
+        input_data = traits.pop('input_data')
+        input_components = traits.pop('input_components')
+
+        block = cls()
+        for name, value in traits.items():
+            setattr(block, name, value)
+        parent.apply(block)
+
+        # Setting the input resets some parameters (e.g. colormap bounds),
+        # which are set again after it
+        with block.hold_sync():
+            block.input_data = input_data
+            block.input_components = input_components
+            for name, value in traits.items():
+                setattr(block, name, value)
+
+        block._restore_children(description, reader)
+        return block
+
     def interact(self):
         pass
 
@@ -260,7 +1434,34 @@ class PluginBlock(Block):
         block = parent
         while not isinstance(block, DataBlock):
             block = block._parent_block
-        return block.mesh.data
+        # No data while the grid is read
+        return block.current_mesh.data if block.current_mesh is not None else []
+
+    def _get_data_block(self):
+        block = self._parent_block
+        while block is not None and not isinstance(block, DataBlock):
+            block = block._parent_block
+        return block
+
+    def _observe_mesh_arrays(self, mesh, handler):
+        """Call handler when the geometry or the data arrays of mesh are set,
+        e.g. by ``Mesh.reload`` which keeps the Mesh and Component widgets."""
+        widgets = []
+        if mesh is not None:
+            widgets.append((mesh, ['vertices', 'tetrahedrons', 'data']))
+            widgets.extend((c, ['array']) for d in mesh.data for c in d.components)
+
+        for widget, names in self._observed_arrays:
+            widget.unobserve(handler, names=names)
+        for widget, names in widgets:
+            widget.observe(handler, names=names)
+        self._observed_arrays = widgets
+
+    def _extract(self, selection):
+        data_block = self._get_data_block()
+        if data_block is None or data_block.current_mesh is None:
+            raise RuntimeError('Cannot extract cells before the block is applied to a DataBlock')
+        return data_block.current_mesh.extract(selection)
 
     @observe('_parent_block')
     def _update_input_data(self, change):
@@ -271,15 +1472,15 @@ class PluginBlock(Block):
         data = self._get_data(parent)
 
         self._available_input_data = [d.name for d in data]
-        self.input_data = self._available_input_data[0]
+        if self._available_input_data:
+            self.input_data = self._available_input_data[0]
 
     @observe('input_data')
     def _update_available_components(self, change):
         data = self._get_data(self._parent_block)
         for d in data:
             if d.name == change['new']:
-                current_data = d
-        self._available_input_components = [c.name for c in current_data.components] + [0]
+                self._available_input_components = [c.name for c in d.components] + [0]
 
     @observe('_available_input_components')
     def _update_input_components(self, change):
@@ -372,8 +1573,8 @@ class ColorMapping(PluginBlock):
     _input_data_dim = Int(1)
 
     colormap = Enum(('viridis', 'plasma', 'magma', 'inferno'), default_value='viridis').tag(sync=True)
-    colormap_min = Float().tag(sync=True)
-    colormap_max = Float().tag(sync=True)
+    colormap_min = Float().tag(sync=True, throttle=True)
+    colormap_max = Float().tag(sync=True, throttle=True)
 
     def interact(self):
         if not self.initialized_widgets:
@@ -492,7 +1693,7 @@ class Warp(PluginBlock):
 
     _input_data_dim = Int(3)
 
-    factor = Float(0.0).tag(sync=True)
+    factor = Float(0.0).tag(sync=True, throttle=True)
     factor_min = Float(-10.0)
     factor_max = Float(10.0)
 
@@ -535,7 +1736,7 @@ class Clip(PluginBlock):
     _view_name = Unicode('ClipView').tag(sync=True)
     _model_name = Unicode('ClipModel').tag(sync=True)
 
-    plane_position = Float(0.0).tag(sync=True)
+    plane_position = Float(0.0).tag(sync=True, throttle=True)
     plane_position_min = Float(-10)
     plane_position_max = Float(10)
     plane_normal = List(Float()).tag(sync=True)
@@ -573,6 +1774,22 @@ class Clip(PluginBlock):
         link((self, 'plane_position_max'), (self.plane_position_wid, 'max'))
         link((self, 'plane_position_max'), (self.plane_position_max_wid, 'value'))
 
+    def extract(self):
+        """Extract the cells of the DataBlock mesh on the kept side of the
+        plane as a new Mesh, see ``Mesh.extract``.
+
+        Cells crossing the plane are kept whole. The current plane is used,
+        later changes of the Clip do not change the extracted Mesh, and the
+        blocks between the DataBlock and the Clip are not taken into
+        account.
+        """
+        normal = self.plane_normal or [1.0, 0.0, 0.0]
+        position = self.plane_position
+
+        def selection(mesh):
+            return extraction.clip_mask(mesh.vertices, mesh._cells(), normal, position)
+        return self._extract(selection)
+
     def _validate_parent(self, parent):
         block = parent
         while not isinstance(block, DataBlock):
@@ -586,7 +1803,9 @@ class Slice(PluginBlock):
     _view_name = Unicode('SliceView').tag(sync=True)
     _model_name = Unicode('SliceModel').tag(sync=True)
 
-    slice_position = Float(0.0).tag(sync=True)
+    _volumetric_only = True
+
+    slice_position = Float(0.0).tag(sync=True, throttle=True)
     slice_position_min = Float(-10)
     slice_position_max = Float(10)
     slice_normal = List(Float()).tag(sync=True)
@@ -630,12 +1849,115 @@ class Slice(PluginBlock):
             if isinstance(block, Warp):
                 raise RuntimeError('Cannot apply a Slice after a Warp effect')
             block = block._parent_block
-        if len(block.mesh.tetrahedrons) == 0:
+        # Checked again when the grid is known, if applied while it is read
+        if block.volumetric is False:
             raise RuntimeError('Cannot apply a Slice to non-volumetric mesh')
 
 
+class _SampledPluginBlock(PluginBlock):
+    """A PluginBlock displaying a subsample of the vertices of its DataBlock.
+
+    The sample is computed kernel-side and only the ids of the sampled
+    vertices are sent. Orderings and samples are cached, so that going back
+    to a previous percentage or distribution is instant. Samples are only
+    computed when the blocks between the DataBlock and this one do not
+    change the vertices, the front-end samples the vertices itself otherwise.
+    """
+    # None when the front-end samples the vertices itself
+    _sample = Array(allow_none=True, default_value=None).tag(sync=True, throttle=True, **array_serialization)
+
+    # Name of the percentage trait
+    _percentage_name = None
+
+    # Number of samples kept in cache
+    _max_cached_samples = 32
+
+    def __init__(self, *args, **kwargs):
+        self._orderings = {}
+        self._samples = OrderedDict()
+        self._observed_block = None
+        self._observed_mesh = None
+
+        super(_SampledPluginBlock, self).__init__(*args, **kwargs)
+
+        self.observe(self._update_sample, names=['_parent_block', self._percentage_name, 'distribution', 'mode'])
+
+    def _get_sampled_mesh(self):
+        block = self._parent_block
+        while block is not None and not isinstance(block, DataBlock):
+            if not isinstance(block, (ColorMapping, Grid, Warp, Clip)):
+                return None, None
+            block = block._parent_block
+        if block is None or isinstance(block, BrickedDataBlock):
+            return None, None
+        return block, block.current_mesh
+
+    def _update_sample(self, change=None):
+        data_block, mesh = self._get_sampled_mesh()
+
+        # The full resolution mesh replaces the coarse one
+        if data_block is not self._observed_block:
+            if self._observed_block is not None:
+                self._observed_block.unobserve(self._update_sample, names=['mesh', 'coarse_mesh'])
+            if data_block is not None:
+                data_block.observe(self._update_sample, names=['mesh', 'coarse_mesh'])
+            self._observed_block = data_block
+
+        # Orderings and samples are keyed on the mesh, not on its arrays
+        if mesh is not self._observed_mesh:
+            if self._observed_mesh is not None:
+                self._observed_mesh.unobserve(self._clear_samples, names=['vertices', 'triangles'])
+            if mesh is not None:
+                mesh.observe(self._clear_samples, names=['vertices', 'triangles'])
+            self._observed_mesh = mesh
+
+        if mesh is None:
+            self._sample = None
+            return
+
+        percentage = getattr(self, self._percentage_name)
+        key = (mesh.model_id, self.mode, self.distribution)
+        sample_key = key + (percentage, )
+
+        if sample_key in self._samples:
+            self._samples.move_to_end(sample_key)
+        else:
+            if key not in self._orderings:
+                # Orderings of a previous mesh are not needed anymore
+                self._orderings = dict(
+                    (k, v) for k, v in self._orderings.items() if k[0] == mesh.model_id
+                )
+                with profiling.stage('sampling', distribution=self.distribution):
+                    candidates = sampling.candidate_vertices(mesh, self.mode)
+                    self._orderings[key] = sampling.ordering(candidates, self.distribution, mesh.vertices)
+
+            self._samples[sample_key] = sampling.sample(self._orderings[key], percentage, self.distribution)
+            while len(self._samples) > self._max_cached_samples:
+                self._samples.popitem(last=False)
+
+        self._sample = self._samples[sample_key]
+
+    def _clear_samples(self, change):
+        """Resample the mesh, its vertices or triangles have changed."""
+        self._orderings = {}
+        self._samples = OrderedDict()
+        self._update_sample()
+
+    def _memory_arrays(self):
+        arrays = {}
+        for key, ordering in self._orderings.items():
+            arrays['_orderings.{}.{}'.format(*key[1:])] = ordering
+        for key, sample in self._samples.items():
+            arrays['_samples.{}.{}.{}'.format(*key[1:])] = sample
+        return arrays
+
+    def _compact(self):
+        self._orderings = {}
+        self._samples = OrderedDict([(k, v) for k, v in self._samples.items() if v is self._sample])
+
+
 @register
-class VectorField(PluginBlock):
+class VectorField(_SampledPluginBlock):
     _view_name = Unicode('VectorFieldView').tag(sync=True)
     _model_name = Unicode('VectorFieldModel').tag(sync=True)
 
@@ -643,8 +1965,10 @@ class VectorField(PluginBlock):
 
     length_factor = Float(1.).tag(sync=True)
     width = Int(1).tag(sync=True)
-    percentage_vectors = Float(1.).tag(sync=True)
-    distribution = Enum(('ordered', 'random'), default_value='ordered').tag(sync=True)
+    percentage_vectors = Float(1.).tag(sync=True, throttle=True)
+    distribution = Enum(sampling.DISTRIBUTIONS, default_value='ordered').tag(sync=True)
+
+    _percentage_name = 'percentage_vectors'
     mode = Enum(('volume', 'surface'), default_value='volume').tag(sync=True)
 
     def interact(self):
@@ -689,7 +2013,7 @@ class VectorField(PluginBlock):
         )
         self.distribution_wid = ToggleButtons(
             description='Distribution',
-            options=['ordered', 'random'],
+            options=list(sampling.DISTRIBUTIONS),
             value=self.distribution
         )
 
@@ -697,7 +2021,7 @@ class VectorField(PluginBlock):
         block = self
         while not isinstance(block, DataBlock):
             block = block._parent_block
-        if len(block.mesh.tetrahedrons) != 0:
+        if block.volumetric is not False:
             self.mode_wid = ToggleButtons(
                 description='Mode',
                 options=['volume', 'surface'],
@@ -720,13 +2044,15 @@ class VectorField(PluginBlock):
 
 
 @register
-class PointCloud(PluginBlock):
+class PointCloud(_SampledPluginBlock):
     _view_name = Unicode('PointCloudView').tag(sync=True)
     _model_name = Unicode('PointCloudModel').tag(sync=True)
 
     points_size = Float(3.).tag(sync=True)
-    percentage_points = Float(1.).tag(sync=True)
-    distribution = Enum(('ordered', 'random'), default_value='ordered').tag(sync=True)
+    percentage_points = Float(1.).tag(sync=True, throttle=True)
+    distribution = Enum(sampling.DISTRIBUTIONS, default_value='ordered').tag(sync=True)
+
+    _percentage_name = 'percentage_points'
     mode = Enum(('volume', 'surface'), default_value='volume').tag(sync=True)
 
     def interact(self):
@@ -766,7 +2092,7 @@ class PointCloud(PluginBlock):
         )
         self.distribution_wid = ToggleButtons(
             description='Distribution',
-            options=['ordered', 'random'],
+            options=list(sampling.DISTRIBUTIONS),
             value=self.distribution
         )
 
@@ -774,7 +2100,7 @@ class PointCloud(PluginBlock):
         block = self
         while not isinstance(block, DataBlock):
             block = block._parent_block
-        if len(block.mesh.tetrahedrons) != 0:
+        if block.volumetric is not False:
             self.mode_wid = ToggleButtons(
                 description='Mode',
                 options=['volume', 'surface'],
@@ -795,6 +2121,194 @@ class PointCloud(PluginBlock):
             block = block._parent_block
 
 
+@register
+class Streamlines(PluginBlock):
+    """Streamlines of the input vector data.
+
+    Lines are integrated kernel-side in the tetrahedrons of the DataBlock
+    mesh, all seeds being advanced together, and only their points,
+    segments and the data interpolated at their points are sent.
+    """
+    _view_name = Unicode('StreamlinesView').tag(sync=True)
+    _model_name = Unicode('StreamlinesModel').tag(sync=True)
+
+    _input_data_dim = Int(3)
+
+    width = Int(1).tag(sync=True)
+
+    # Seeds on a plane of normal ``seed_normal``, on a line of direction
+    # ``seed_normal``, or given as ``seed_points``. The origin defaults to the
+    # center of the mesh and the size to half of its largest extent
+    seed_type = Enum(('plane', 'line', 'points'), default_value='plane')
+    seed_origin = List(Float(), allow_none=True, default_value=None)
+    seed_normal = List(Float(), default_value=[1., 0., 0.])
+    seed_size = Float(allow_none=True, default_value=None)
+    seed_resolution = Int(10)
+    seed_points = Array(allow_none=True, default_value=None)
+
+    # The step size defaults to 1/500 of the mesh diagonal
+    step_size = Float(allow_none=True, default_value=None)
+    max_steps = Int(500)
+    direction = Enum(('forward', 'backward', 'both'), default_value='both')
+
+    _vertices = Array(default_value=np.zeros(0, dtype=FLOAT32)).tag(sync=True, **array_serialization)
+    _indices = Array(default_value=np.zeros(0, dtype=UINT32)).tag(sync=True, **array_serialization)
+    _data = List(Instance(Data)).tag(sync=True, **widget_serialization)
+
+    def __init__(self, *args, **kwargs):
+        self._observed_block = None
+        # Parameters and mesh arrays of the current lines
+        self._lines_key = None
+        self._lines_arrays = None
+
+        super(Streamlines, self).__init__(*args, **kwargs)
+        self.initialized_widgets = False
+        self.width_wid = None
+        self.seed_resolution_wid = None
+        self.max_steps_wid = None
+        self.direction_wid = None
+
+        self.observe(self._update_lines, names=[
+            '_parent_block', 'input_data', 'input_components', 'seed_type', 'seed_origin',
+            'seed_normal', 'seed_size', 'seed_resolution', 'seed_points',
+            'step_size', 'max_steps', 'direction'
+        ])
+
+    def interact(self):
+        if not self.initialized_widgets:
+            self._init_streamlines_widgets()
+            self.initialized_widgets = True
+
+        return HBox(
+            self._interact() + (VBox((
+                self.width_wid, self.seed_resolution_wid,
+                self.max_steps_wid, self.direction_wid
+            )), )
+        )
+
+    def _init_streamlines_widgets(self):
+        self.width_wid = IntSlider(
+            description='Width',
+            min=1, max=10, value=self.width
+        )
+        self.seed_resolution_wid = IntSlider(
+            description='Seeds',
+            min=1, max=100, value=self.seed_resolution
+        )
+        self.max_steps_wid = IntSlider(
+            description='Max steps',
+            min=1, max=5000, value=self.max_steps
+        )
+        self.direction_wid = ToggleButtons(
+            description='Direction',
+            options=['forward', 'backward', 'both'],
+            value=self.direction
+        )
+
+        link((self, 'width'), (self.width_wid, 'value'))
+        link((self, 'seed_resolution'), (self.seed_resolution_wid, 'value'))
+        link((self, 'max_steps'), (self.max_steps_wid, 'value'))
+        link((self, 'direction'), (self.direction_wid, 'value'))
+
+    def _seeds(self, vertices):
+        return streamlines.seeds(
+            vertices, self.seed_type, self.seed_origin, self.seed_normal,
+            self.seed_size, self.seed_resolution, self.seed_points
+        )
+
+    def _update_lines(self, change=None):
+        data_block = self._get_data_block()
+
+        # The full resolution mesh replaces the coarse one
+        if data_block is not self._observed_block:
+            if self._observed_block is not None:
+                self._observed_block.unobserve(self._update_lines, names=['mesh', 'coarse_mesh'])
+            if data_block is not None:
+                data_block.observe(self._update_lines, names=['mesh', 'coarse_mesh'])
+            self._observed_block = data_block
+
+        mesh = data_block.current_mesh if data_block is not None else None
+        self._observe_mesh_arrays(mesh, self._update_lines)
+        arrays = {} if mesh is None else dict(
+            (c.name, c.array)
+            for d in mesh.data if d.name == self.input_data
+            for c in d.components
+        )
+        components = [
+            c if isinstance(c, int) else arrays.get(c)
+            for c in self.input_components
+        ]
+
+        # Nothing to integrate until the input and the tetrahedrons are known
+        if mesh is None or len(mesh.tetrahedrons) == 0 or len(components) != 3 or \
+                any(c is None for c in components):
+            self._lines_key = None
+            self._lines_arrays = None
+            self._set_lines(np.zeros((0, 3)), np.zeros((0, 2)), [])
+            return
+
+        # Changing the input data usually changes the components too
+        seed_points = self.seed_points
+        key = (
+            mesh.model_id, self.input_data, tuple(self.input_components),
+            self.seed_type, tuple(self.seed_origin or ()), tuple(self.seed_normal),
+            self.seed_size, self.seed_resolution,
+            None if seed_points is None else (seed_points.shape, seed_points.tobytes()),
+            self.step_size, self.max_steps, self.direction
+        )
+        mesh_arrays = _mesh_arrays(mesh)
+        if key == self._lines_key and _same_arrays(mesh_arrays, self._lines_arrays):
+            return
+        self._lines_key = key
+        self._lines_arrays = mesh_arrays
+
+        with profiling.stage('Streamlines'):
+            vertices = mesh.vertices.reshape(-1, 3)
+            step_size = self.step_size
+            if step_size is None:
+                step_size = np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0)) / 500.
+
+            locator = mesh._get_locator()
+            positions, segments, cell_ids, weights = streamlines.integrate(
+                locator, components, self._seeds(vertices),
+                step_size, self.max_steps, self.direction
+            )
+
+            # Data are interpolated at the points, keeping the range of the
+            # mesh data so that colors match
+            data = [
+                Data(name=d.name, components=[
+                    Component(
+                        name=c.name,
+                        array=locator.interpolate(c.array, cell_ids, weights).astype(FLOAT32),
+                        min=c.min, max=c.max
+                    )
+                    for c in d.components
+                ])
+                for d in mesh.data
+            ]
+
+        self._set_lines(positions, segments, data)
+
+    def _set_lines(self, positions, segments, data):
+        previous = self._data
+        with self.hold_sync():
+            self._vertices = positions.astype(FLOAT32).reshape(-1)
+            self._indices = segments.astype(UINT32).reshape(-1)
+            self._data = data
+        for d in previous:
+            for component in d.components:
+                component.close()
+            d.close()
+
+    def _validate_parent(self, parent):
+        block = parent
+        while not isinstance(block, DataBlock):
+            if isinstance(block, (VectorField, PointCloud, Streamlines)):
+                raise RuntimeError('Cannot apply Streamlines after a VectorField, a PointCloud or a Streamlines effect')
+            block = block._parent_block
+
+
 @register
 class Threshold(PluginBlock):
     _view_name = Unicode('ThresholdView').tag(sync=True)
@@ -802,8 +2316,8 @@ class Threshold(PluginBlock):
 
     _input_data_dim = Int(1)
 
-    lower_bound = Float().tag(sync=True)
-    upper_bound = Float().tag(sync=True)
+    lower_bound = Float().tag(sync=True, throttle=True)
+    upper_bound = Float().tag(sync=True, throttle=True)
 
     def __init__(self, *args, **kwargs):
         super(Threshold, self).__init__(*args, **kwargs)
@@ -832,6 +2346,34 @@ class Threshold(PluginBlock):
         self.lower_bound = change['new'][0]
         self.upper_bound = change['new'][1]
 
+    def extract(self, all_points=True):
+        """Extract the cells of the DataBlock mesh whose input values are in
+        the bounds as a new Mesh, see ``Mesh.extract``.
+
+        The current input and bounds are used, later changes of the
+        Threshold do not change the extracted Mesh, and the blocks between
+        the DataBlock and the Threshold are not taken into account.
+
+        Parameters
+        ----------
+        all_points : bool
+            Whether all the points of a cell must be in the bounds for the
+            cell to be kept, instead of any of them.
+        """
+        data_name = self.input_data
+        component_name = self.input_components[0] if self.input_components else None
+        lower, upper = self.lower_bound, self.upper_bound
+
+        def selection(mesh):
+            for d in mesh.data:
+                for c in d.components:
+                    if d.name == data_name and c.name == component_name:
+                        return extraction.threshold_mask(
+                            mesh._cells(), c.array, lower, upper, all_points=all_points
+                        )
+            raise RuntimeError('Unknown component {}.{}'.format(data_name, component_name))
+        return self._extract(selection)
+
     @observe('lower_bound', 'upper_bound')
     def _on_bound_change(self, change):
         if self.initialized_widgets:
@@ -855,9 +2397,11 @@ class IsoSurface(PluginBlock):
     _view_name = Unicode('IsoSurfaceView').tag(sync=True)
     _model_name = Unicode('IsoSurfaceModel').tag(sync=True)
 
+    _volumetric_only = True
+
     _input_data_dim = Int(1)
 
-    value = Float().tag(sync=True)
+    value = Float().tag(sync=True, throttle=True)
 
     def __init__(self, *args, **kwargs):
         super(IsoSurface, self).__init__(*args, **kwargs)
@@ -901,12 +2445,158 @@ class IsoSurface(PluginBlock):
         block = parent
         while not isinstance(block, DataBlock):
             block = block._parent_block
-        if len(block.mesh.tetrahedrons) == 0:
+        # Checked again when the grid is known, if applied while it is read
+        if block.volumetric is False:
             raise RuntimeError('Cannot apply an IsoSurface to non-volumetric mesh')
 
 
 @register
-class Scene(DOMWidget):
+class ContourSet(PluginBlock):
+    """Iso-surfaces of the input data for a list of values.
+
+    All the surfaces are extracted kernel-side in one pass over the
+    tetrahedrons of the DataBlock mesh, and sent as one geometry whose
+    points have the index of their level in the sorted values.
+    """
+    _view_name = Unicode('ContourSetView').tag(sync=True)
+    _model_name = Unicode('ContourSetModel').tag(sync=True)
+
+    _volumetric_only = True
+
+    _input_data_dim = Int(1)
+
+    values = List(Float())
+
+    _vertices = Array(default_value=np.zeros(0, dtype=FLOAT32)).tag(sync=True, **array_serialization)
+    _triangles = Array(default_value=np.zeros(0, dtype=UINT32)).tag(sync=True, **array_serialization)
+    _levels = Array(default_value=np.zeros(0, dtype=UINT32)).tag(sync=True, **array_serialization)
+    _data = List(Instance(Data)).tag(sync=True, **widget_serialization)
+
+    def __init__(self, *args, **kwargs):
+        self._observed_block = None
+        # Parameters and mesh arrays of the current surfaces
+        self._surfaces_key = None
+        self._surfaces_arrays = None
+
+        super(ContourSet, self).__init__(*args, **kwargs)
+        self.initialized_widgets = False
+        self.nb_values_wid = None
+
+        self.observe(self._update_surfaces, names=['_parent_block', 'input_data', 'input_components', 'values'])
+
+    def interact(self):
+        if not self.initialized_widgets:
+            self._init_contourset_widgets()
+            self.initialized_widgets = True
+
+        return HBox(
+            self._interact() + (VBox((self.nb_values_wid, )), )
+        )
+
+    def _init_contourset_widgets(self):
+        self.nb_values_wid = IntSlider(
+            description='Nb values',
+            min=1, max=50, value=max(len(self.values), 1)
+        )
+        self.nb_values_wid.observe(self._on_nb_values_change, 'value')
+
+    def _on_nb_values_change(self, change):
+        self.values = self._spread_values(change['new'])
+
+    def _spread_values(self, nb_values):
+        """Values evenly spread in the range of the input component."""
+        min, max = self._get_component_min_max(
+            self.input_data, self.input_components[0])
+        return list(np.linspace(min, max, nb_values + 2)[1:-1])
+
+    @observe('input_components')
+    def _on_input_components_change(self, change):
+        # Values given by the user are kept when the input is first set
+        if change['old'] or not self.values:
+            self.values = self._spread_values(len(self.values) or 10)
+
+        if self.initialized_widgets:
+            self.nb_values_wid.value = len(self.values)
+
+    def _update_surfaces(self, change=None):
+        block = self._parent_block
+        while block is not None and not isinstance(block, DataBlock):
+            block = block._parent_block
+
+        # The full resolution mesh replaces the coarse one
+        if block is not self._observed_block:
+            if self._observed_block is not None:
+                self._observed_block.unobserve(self._update_surfaces, names=['mesh', 'coarse_mesh'])
+            if block is not None:
+                block.observe(self._update_surfaces, names=['mesh', 'coarse_mesh'])
+            self._observed_block = block
+
+        mesh = block.current_mesh if block is not None else None
+        self._observe_mesh_arrays(mesh, self._update_surfaces)
+        arrays = {} if mesh is None else dict(
+            (c.name, c.array)
+            for d in mesh.data if d.name == self.input_data
+            for c in d.components
+        )
+        array = arrays.get(self.input_components[0]) if self.input_components else None
+
+        # Nothing to extract until the input and the tetrahedrons are known
+        if mesh is None or len(mesh.tetrahedrons) == 0 or array is None:
+            self._surfaces_key = None
+            self._surfaces_arrays = None
+            self._set_surfaces(np.zeros((0, 3)), np.zeros((0, 3)), np.zeros(0), [])
+            return
+
+        key = (mesh.model_id, self.input_data, self.input_components[0], tuple(self.values))
+        mesh_arrays = _mesh_arrays(mesh)
+        if key == self._surfaces_key and _same_arrays(mesh_arrays, self._surfaces_arrays):
+            return
+        self._surfaces_key = key
+        self._surfaces_arrays = mesh_arrays
+
+        with profiling.stage('ContourSet', nb_values=len(self.values)):
+            points, triangles, levels, edges = contouring.contour_set(
+                mesh.vertices, mesh.tetrahedrons, array, self.values
+            )
+
+            # Data keep the range of the mesh data so that colors match
+            data = [
+                Data(name=d.name, components=[
+                    Component(
+                        name=c.name,
+                        array=contouring.interpolate(c.array, edges).astype(FLOAT32),
+                        min=c.min, max=c.max
+                    )
+                    for c in d.components
+                ])
+                for d in mesh.data
+            ]
+
+        self._set_surfaces(points, triangles, levels, data)
+
+    def _set_surfaces(self, points, triangles, levels, data):
+        previous = self._data
+        with self.hold_sync():
+            self._vertices = points.astype(FLOAT32).reshape(-1)
+            self._triangles = triangles.astype(UINT32).reshape(-1)
+            self._levels = levels.astype(UINT32)
+            self._data = data
+        for d in previous:
+            for component in d.components:
+                component.close()
+            d.close()
+
+    def _validate_parent(self, parent):
+        block = parent
+        while not isinstance(block, DataBlock):
+            block = block._parent_block
+        # Checked again when the grid is known, if applied while it is read
+        if block.volumetric is False:
+            raise RuntimeError('Cannot apply a ContourSet to non-volumetric mesh')
+
+
+@register
+class Scene(_InstrumentedWidget, DOMWidget):
     """A 3-D Scene widget."""
     _view_name = Unicode('SceneView').tag(sync=True)
     _model_name = Unicode('SceneModel').tag(sync=True)
@@ -918,3 +2608,156 @@ class Scene(DOMWidget):
     datablocks = List(Instance(DataBlock)).tag(sync=True, **widget_serialization)
 
     background_color = Color('#fff').tag(sync=True)
+
+    def _get_blocks(self):
+        """Return all the blocks of the scene, parents first."""
+        blocks = []
+
+        def add_block(block):
+            blocks.append(block)
+            for child in block._blocks:
+                add_block(child)
+
+        for datablock in self.datablocks:
+            add_block(datablock)
+
+        return blocks
+
+    @contextmanager
+    def batch_update(self):
+        """ Context manager deferring the changes of all the blocks of the
+        scene. Observers are called when exiting the context, and all the
+        resulting changes are sent to the front-end in one message. The
+        front-end then processes each block once, parents first. If the body
+        raises, no batch is sent and the changes already made are synced
+        block by block.
+
+        Examples
+        --------
+        >>> with scene.batch_update():
+        ...     threshold1.lower_bound = 0.2
+        ...     threshold2.lower_bound = 0.4
+        ...     colormapping.colormap = 'magma'
+        """
+        blocks = self._get_blocks()
+
+        # Restored on exit, so that a surrounding hold_sync keeps working
+        previous = []
+        for block in blocks:
+            previous.append((block._holding_sync, set(block._states_to_send)))
+            block._holding_sync = True
+            block._states_to_send.clear()
+
+        succeeded = False
+        try:
+            with ExitStack() as stack:
+                for block in blocks:
+                    stack.enter_context(block.hold_trait_notifications())
+                yield
+            succeeded = True
+        finally:
+            updates = []
+            for block, (holding_sync, states_to_send) in zip(blocks, previous):
+                pending = set(block._states_to_send)
+                block._holding_sync = holding_sync
+                block._states_to_send.clear()
+                block._states_to_send.update(states_to_send)
+
+                if not pending:
+                    continue
+                if succeeded:
+                    updates.append([block.model_id, block.get_state(pending)])
+                elif holding_sync:
+                    block._states_to_send.update(pending)
+                else:
+                    # No batch on failure, the changes already made are
+                    # synced as they would be outside of the context
+                    block.send_state(pending)
+
+            if updates:
+                updates, buffer_paths, buffers = _remove_buffers(updates)
+                self.send({
+                    'event': 'batch_update',
+                    'updates': updates,
+                    'buffer_paths': buffer_paths
+                }, buffers=buffers)
+
+    def save(self, path):
+        """ Save the scene, to be restored with ``Scene.load``.
+
+        The meshes and the parameters of the blocks are written as JSON to
+        ``path``, and every array to a binary sidecar file next to it, with
+        the same name and a ``.bin`` extension. Arrays computed from the
+        meshes, e.g. streamlines, are computed again when loading.
+
+        Parameters
+        ----------
+        path : str
+            The path of the JSON file.
+        """
+        sidecar = snapshot.sidecar_path(path)
+        with profiling.stage('Scene.save'), snapshot.SidecarWriter(sidecar) as writer:
+            description = {
+                'version': SNAPSHOT_VERSION,
+                'sidecar': os.path.basename(sidecar),
+                'traits': _snapshot_traits(self, DOMWidget, writer),
+                'datablocks': [datablock._snapshot(writer) for datablock in self.datablocks]
+            }
+
+            with open(path, 'w') as f:
+                json.dump(description, f, default=_json_default)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """ Load a scene saved with ``Scene.save``.
+
+        Parameters
+        ----------
+        path : str
+            The path of the JSON file.
+        mmap : bool
+            Whether the arrays should be memory-mapped from the sidecar file
+            instead of being read in memory. Memory-mapped arrays are read
+            only, and the sidecar must not be modified while they are used.
+        """
+        with profiling.stage('Scene.load'):
+            with open(path) as f:
+                description = json.load(f)
+            if description.get('version') != SNAPSHOT_VERSION:
+                raise ValueError('Unsupported scene version {} in {}'.format(description.get('version'), path))
+
+            reader = snapshot.SidecarReader(
+                os.path.join(os.path.dirname(path), description['sidecar']), mmap=mmap
+            )
+            block_types = _block_types()
+            datablocks = [
+                block_types[datablock['type']]._from_snapshot(datablock, reader)
+                for datablock in description['datablocks']
+            ]
+            return Scene(datablocks=datablocks, **_restore_traits(description['traits'], reader))
+
+    def export_html(self, path, title='Odysis export', drop_defaults=True, **kwargs):
+        """ Export the scene as a standalone HTML page, see
+        ``ipywidgets.embed.embed_minimal_html``.
+
+        Instead of being inlined in the page as base64, arrays are written
+        to a binary sidecar file next to it, with the same name and a
+        ``.bin`` extension, which the page fetches. The page and its sidecar
+        must be served over HTTP.
+
+        Parameters
+        ----------
+        path : str
+            The path of the HTML file.
+        title : str
+            The title of the page.
+        """
+        from ipywidgets.embed import dependency_state, embed_minimal_html
+
+        sidecar = snapshot.sidecar_path(path)
+        with profiling.stage('Scene.export_html'):
+            with snapshot.SidecarWriter(sidecar) as writer, \
+                    sidecar_references(writer, os.path.basename(sidecar)):
+                state = dependency_state(self, drop_defaults=drop_defaults)
+
+            embed_minimal_html(path, views=[self], title=title, state=state, drop_defaults=drop_defaults, **kwargs)
@@ -0,0 +1,62 @@
+"""Merging of many meshes, the parts, in shared buffers.
+
+Each displayed mesh costs a message, a geometry and a draw call, which
+dominate for scenes made of many small meshes. Merged, the points, cells and
+fields of the parts are concatenated, the point ids of each part being
+offset by the number of points of the previous parts, and the part index of
+each point tells the parts apart. Parts are then shown, hidden or colored
+through a small per-part lookup table, without touching the merged buffers.
+"""
+import numpy as np
+
+# Default color of the parts, the default color of the blocks
+DEFAULT_COLOR = (0xEE, 0xEE, 0xEE)
+
+
+def point_offsets(vertices):
+    """(nb_parts + 1,) offsets of the points of each part in the merged
+    points, from the flat coordinates of the parts."""
+    counts = [len(v) // 3 for v in vertices]
+    return np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+
+
+def merge_cells(cells, offsets):
+    """Concatenate the flat point ids of the cells of the parts, offset by
+    the first point of their part."""
+    sizes = [len(c) for c in cells]
+    merged = np.concatenate([np.asarray(c, dtype=np.uint32) for c in cells] or [np.zeros(0, dtype=np.uint32)])
+    merged += np.repeat(offsets[:-1], sizes).astype(np.uint32)
+    return merged
+
+
+def part_ids(offsets):
+    """(nb_points,) float32 part index of the merged points."""
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.float32), np.diff(offsets))
+
+
+def rgb(color):
+    """(r, g, b) uint8 values of a ``'#rrggbb'`` string or of a tuple of
+    floats in [0, 1]."""
+    if isinstance(color, str):
+        value = color.lstrip('#')
+        if len(value) != 6:
+            raise ValueError('Expected a "#rrggbb" color, got {!r}'.format(color))
+        return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+    values = np.asarray(color, dtype=np.float64)
+    if values.shape != (3, ) or values.min() < 0 or values.max() > 1:
+        raise ValueError('Expected three values in [0, 1], got {!r}'.format(color))
+    return tuple(int(round(v * 255)) for v in values)
+
+
+def part_table(nb_parts, colors=None):
+    """(nb_parts, 4) uint8 lookup table of the parts, RGB being the color of
+    a part and A its visibility (0 or 255)."""
+    table = np.empty((nb_parts, 4), dtype=np.uint8)
+    table[:, :3] = DEFAULT_COLOR
+    table[:, 3] = 255
+    if colors is not None:
+        if len(colors) != nb_parts:
+            raise ValueError('Expected {} colors, got {}'.format(nb_parts, len(colors)))
+        table[:, :3] = [rgb(color) for color in colors]
+    return table
@@ -0,0 +1,248 @@
+"""Location of points in tetrahedral meshes and interpolation of point fields.
+
+The locator sorts the tetrahedrons in a uniform grid of bins, each bin
+listing the tetrahedrons whose bounding box overlaps it. A query point is
+only tested against the tetrahedrons of its bin, using the inverse of the
+tetrahedron edge matrices which are computed once, in rounds: at the n-th
+round, the points which are not located yet are tested against the n-th
+tetrahedron of their bin.
+"""
+import numpy as np
+
+# Number of query points processed at once, bounding the temporaries
+CHUNK_SIZE = 1 << 16
+
+# Tolerance on barycentric coordinates for points on faces
+EPSILON = 1e-5
+
+
+def _expand(lower, upper):
+    """Enumerate the bins of the (lower, upper) inclusive index boxes,
+    returns the box id and the bin (i, j, k) indices of each pair."""
+    sizes = upper - lower + 1
+    counts = np.prod(sizes, axis=1)
+    box_ids = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    sizes = sizes[box_ids]
+    k = local % sizes[:, 2]
+    local //= sizes[:, 2]
+    j = local % sizes[:, 1]
+    i = local // sizes[:, 1]
+    indices = lower[box_ids] + np.column_stack((i, j, k))
+    return box_ids, indices
+
+
+class CellLocator(object):
+    """Locator of points in a tetrahedral mesh.
+
+    Parameters
+    ----------
+    vertices : numpy.ndarray
+        Flat array of point coordinates.
+    tetrahedrons : numpy.ndarray
+        Flat array of the 4 point ids of each tetrahedron.
+    """
+
+    def __init__(self, vertices, tetrahedrons):
+        vertices = np.asarray(vertices).reshape(-1, 3)
+        self.tetrahedrons = np.asarray(tetrahedrons).reshape(-1, 4)
+        nb_cells = len(self.tetrahedrons)
+        if nb_cells == 0:
+            raise ValueError('The mesh has no tetrahedrons to locate points in')
+
+        self.origins = vertices[self.tetrahedrons[:, 0]]
+        self.inverses = np.empty((nb_cells, 3, 3), dtype=np.float32)
+        box_lower = np.empty((nb_cells, 3), dtype=vertices.dtype)
+        box_upper = np.empty((nb_cells, 3), dtype=vertices.dtype)
+        for start in range(0, nb_cells, CHUNK_SIZE):
+            chunk = slice(start, start + CHUNK_SIZE)
+            corners = vertices[self.tetrahedrons[chunk]].astype(np.float64)
+            box_lower[chunk] = np.minimum(
+                np.minimum(corners[:, 0], corners[:, 1]), np.minimum(corners[:, 2], corners[:, 3]))
+            box_upper[chunk] = np.maximum(
+                np.maximum(corners[:, 0], corners[:, 1]), np.maximum(corners[:, 2], corners[:, 3]))
+
+            # Inverse edge matrices, whose rows are the cross products of the
+            # edges over the determinant, degenerate tetrahedrons never
+            # contain points
+            edges = corners[:, 1:] - corners[:, :1]
+            cofactors = np.stack((
+                np.cross(edges[:, 1], edges[:, 2]),
+                np.cross(edges[:, 2], edges[:, 0]),
+                np.cross(edges[:, 0], edges[:, 1])
+            ), axis=1)
+            determinants = np.einsum('ni,ni->n', edges[:, 0], cofactors[:, 0])
+            sizes = box_upper[chunk] - box_lower[chunk]
+            scale = np.maximum(np.maximum(sizes[:, 0], sizes[:, 1]), sizes[:, 2]) ** 3
+            valid = np.abs(determinants) > 1e-12 * scale
+            determinants[~valid] = np.nan
+            self.inverses[chunk] = cofactors / determinants[:, np.newaxis, np.newaxis]
+
+        # Bins of the median tetrahedron size, so that tetrahedrons overlap
+        # few bins, without making more than 8 bins per tetrahedron
+        self.lower = box_lower.min(axis=0)
+        extent = box_upper.max(axis=0) - self.lower
+        size = np.maximum(np.median(box_upper - box_lower, axis=0), extent / nb_cells)
+        size = np.where(size > 0, size, 1.)
+        self.shape = np.maximum(np.ceil(extent / size), 1).astype(np.int64)
+        while np.prod(self.shape) > 8 * nb_cells:
+            self.shape = np.maximum(self.shape // 2, 1)
+        self.bin_size = np.where(extent > 0, extent / self.shape, 1.)
+
+        # (bin, tetrahedron) pairs sorted by bin, the tetrahedrons whose
+        # center is in the bin first as they are the most likely to contain
+        # the points of the bin
+        key_type = np.int32 if 2 * np.prod(self.shape) < 2 ** 31 else np.int64
+        keys = []
+        cells = []
+        for start in range(0, nb_cells, CHUNK_SIZE):
+            chunk = slice(start, start + CHUNK_SIZE)
+            cell_ids, indices = _expand(
+                self._bin_indices(box_lower[chunk]), self._bin_indices(box_upper[chunk])
+            )
+            bins = np.ravel_multi_index(indices.T, self.shape)
+            centers = np.ravel_multi_index(
+                self._bin_indices((box_lower[chunk] + box_upper[chunk]) / 2).T, self.shape
+            )
+            keys.append((2 * bins + (bins != centers[cell_ids])).astype(key_type))
+            cells.append((cell_ids + start).astype(np.uint32))
+        del box_lower, box_upper
+        keys = np.concatenate(keys)
+
+        order = np.argsort(keys, kind='stable')
+        self.cells = np.concatenate(cells)[order]
+        del order
+        self.starts = np.concatenate(([0], np.cumsum(np.bincount(keys // 2, minlength=np.prod(self.shape)))))
+
+    def _bin_indices(self, points):
+        indices = np.floor((points - self.lower) / self.bin_size).astype(np.int64)
+        return np.clip(indices, 0, self.shape - 1)
+
+    def arrays(self):
+        """The arrays held by the locator, by name."""
+        return {
+            'origins': self.origins,
+            'inverses': self.inverses,
+            'cells': self.cells,
+            'starts': self.starts
+        }
+
+    def _weights(self, points, cell_ids):
+        """Barycentric coordinates of points in tetrahedrons."""
+        offsets = (points - self.origins[cell_ids]).astype(np.float32)
+        coordinates = np.einsum('nij,nj->ni', self.inverses[cell_ids], offsets)
+        return np.column_stack((1 - coordinates.sum(axis=1), coordinates))
+
+    def _locate_chunk(self, points):
+        points = points.astype(np.float64)
+        indices = np.floor((points - self.lower) / self.bin_size).astype(np.int64)
+        inside_grid = np.all((indices >= 0) & (indices <= self.shape), axis=1)
+        indices = np.clip(indices, 0, self.shape - 1)
+        bins = np.ravel_multi_index(indices.T, self.shape)
+        firsts = self.starts[bins]
+        counts = np.where(inside_grid, self.starts[bins + 1] - firsts, 0)
+
+        cell_ids = np.full(len(points), -1, dtype=np.int64)
+        weights = np.zeros((len(points), 4))
+
+        # Points are tested against the n-th tetrahedron of their bin at the
+        # n-th round, until the tetrahedron containing them is found
+        remaining = np.flatnonzero(counts)
+        rank = 0
+        while len(remaining):
+            candidates = self.cells[firsts[remaining] + rank]
+            candidate_weights = self._weights(points[remaining], candidates)
+            inside = np.all(candidate_weights >= -EPSILON, axis=1)
+
+            found = remaining[inside]
+            cell_ids[found] = candidates[inside]
+            weights[found] = candidate_weights[inside]
+
+            rank += 1
+            remaining = remaining[~inside]
+            remaining = remaining[counts[remaining] > rank]
+
+        return cell_ids, weights
+
+    def locate(self, points, hint=None):
+        """Find the tetrahedrons containing points.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            (N, 3) query points.
+        hint : numpy.ndarray, optional
+            (N,) tetrahedron ids tested first, e.g. the previous positions
+            of moving points, -1 for no hint.
+
+        Returns
+        -------
+        tuple
+            The (N,) tetrahedron ids, -1 for points outside of the mesh, and
+            the (N, 4) barycentric coordinates of the points in them.
+        """
+        points = np.asarray(points).reshape(-1, 3)
+        cell_ids = np.full(len(points), -1, dtype=np.int64)
+        weights = np.zeros((len(points), 4))
+
+        remaining = np.arange(len(points))
+        if hint is not None:
+            hinted = np.flatnonzero(hint >= 0)
+            hinted_weights = self._weights(points[hinted].astype(np.float64), hint[hinted])
+            inside = np.all(hinted_weights >= -EPSILON, axis=1)
+            cell_ids[hinted[inside]] = hint[hinted[inside]]
+            weights[hinted[inside]] = hinted_weights[inside]
+            remaining = np.flatnonzero(cell_ids < 0)
+
+        for start in range(0, len(remaining), CHUNK_SIZE):
+            chunk = remaining[start:start + CHUNK_SIZE]
+            cell_ids[chunk], weights[chunk] = self._locate_chunk(points[chunk])
+        return cell_ids, weights
+
+    def interpolate(self, values, cell_ids, weights):
+        """Interpolate point values at located points, NaN outside of the mesh.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            (nb_points,) or (nb_points, nb_components) point values.
+        cell_ids, weights : numpy.ndarray
+            As returned by ``locate``.
+        """
+        values = np.asarray(values)
+        found = cell_ids >= 0
+        out = np.full((len(cell_ids),) + values.shape[1:], np.nan)
+
+        point_ids = self.tetrahedrons[cell_ids[found]]
+        out[found] = np.einsum('nk,nk...->n...', weights[found], values[point_ids])
+        return out
+
+
+def polyline_samples(polyline, resolution):
+    """Sample a polyline at evenly spaced points.
+
+    Parameters
+    ----------
+    polyline : numpy.ndarray
+        (nb_points, 3) polyline points.
+    resolution : int
+        Number of samples.
+
+    Returns
+    -------
+    tuple
+        The (resolution, 3) samples and their distances along the polyline.
+    """
+    polyline = np.asarray(polyline, dtype=np.float64).reshape(-1, 3)
+    if len(polyline) < 2:
+        raise ValueError('A polyline needs at least two points')
+
+    lengths = np.linalg.norm(np.diff(polyline, axis=0), axis=1)
+    cumulated = np.concatenate(([0], np.cumsum(lengths)))
+    distances = np.linspace(0, cumulated[-1], resolution)
+
+    samples = np.column_stack([
+        np.interp(distances, cumulated, polyline[:, axis]) for axis in range(3)
+    ])
+    return samples, distances
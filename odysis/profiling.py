@@ -0,0 +1,199 @@
+"""Built-in profiling of the loading, extraction, serialization and sync
+stages.
+
+Profiling is disabled by default, it is enabled with ``enable()`` or by
+setting the ``ODYSIS_PROFILE`` environment variable to a non-zero value.
+Each stage is recorded as a dict with the following keys:
+
+- ``stage``: name of the stage
+- ``parent``: name of the enclosing stage, if any
+- ``source``: ``'kernel'`` or ``'frontend'``
+- ``widget``: widget class name for sync stages
+- ``wall_time``: duration in seconds
+- ``nbytes``: bytes produced by the stage, if relevant
+- ``peak_memory``: peak of memory allocated during the stage in bytes
+  (kernel stages only)
+
+Only the last ``max_records()`` records are kept, 100000 by default or the
+value of the ``ODYSIS_PROFILE_MAX_RECORDS`` environment variable, so that
+memory does not grow when profiling a long running kernel. Stages may run
+in several threads, e.g. in the refinement thread of ``DataBlock.from_vtk``,
+parents being the enclosing stages of the same thread. Allocations are traced
+for the whole process, so the peak of a stage includes the allocations of the
+stages running at the same time in other threads.
+"""
+from collections import deque
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_enabled = False
+_records = deque(maxlen=int(os.environ.get('ODYSIS_PROFILE_MAX_RECORDS', 100000)))
+# Stack of the open stages of each thread, for their parents
+_local = threading.local()
+# Open stages of all threads, whose peaks are updated before resetting the
+# process-wide peak of tracemalloc
+_open_entries = []
+_lock = threading.Lock()
+
+
+def enable():
+    """Enable profiling, memory allocations are traced with tracemalloc."""
+    global _enabled
+    _enabled = True
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    """Disable profiling."""
+    global _enabled
+    _enabled = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget all records."""
+    _records.clear()
+
+
+def max_records():
+    """Maximum number of kept records."""
+    return _records.maxlen
+
+
+def set_max_records(maxlen):
+    """Set the maximum number of kept records, the oldest records being
+    dropped first."""
+    global _records
+    if maxlen < 1:
+        raise ValueError('Expected a positive number of records, got {}'.format(maxlen))
+    _records = deque(_records, maxlen=maxlen)
+
+
+def get_records():
+    """Return the list of records, oldest first."""
+    return list(_records)
+
+
+def to_dataframe():
+    """Return the records as a pandas DataFrame."""
+    try:
+        import pandas
+    except ImportError:
+        raise RuntimeError('pandas is needed in order to get the profiling records as a DataFrame')
+
+    return pandas.DataFrame(get_records(), columns=[
+        'stage', 'parent', 'source', 'widget', 'wall_time', 'nbytes', 'peak_memory'
+    ])
+
+
+def nbytes(obj):
+    """Compute the size in bytes of buffers, or dicts/lists of buffers."""
+    if obj is None:
+        return 0
+    if isinstance(obj, dict):
+        return sum(nbytes(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(nbytes(value) for value in obj)
+    try:
+        return memoryview(obj).nbytes
+    except (TypeError, ValueError):
+        # ValueError is raised by objects exposing the buffer protocol
+        # without any buffer, e.g. VTK grids
+        return 0
+
+
+def add_record(stage, **info):
+    """Add a record which has been measured elsewhere, e.g. in the front-end."""
+    if not _enabled:
+        return
+
+    record = _new_record(stage)
+    record.update(info)
+    _records.append(record)
+
+
+def _open_records():
+    """Open stages of the current thread."""
+    if not hasattr(_local, 'open_records'):
+        _local.open_records = []
+    return _local.open_records
+
+
+def _new_record(stage):
+    open_records = _open_records()
+    return {
+        'stage': stage,
+        'parent': open_records[-1][0]['stage'] if open_records else None,
+        'source': 'kernel',
+        'widget': None,
+        'wall_time': None,
+        'nbytes': None,
+        'peak_memory': None
+    }
+
+
+def _update_open_peaks():
+    # Resetting the peak for a nested stage would hide the peak of the
+    # enclosing ones, so keep track of it before
+    _, peak = tracemalloc.get_traced_memory()
+    for entry in _open_entries:
+        entry[2] = max(entry[2], peak)
+
+
+@contextmanager
+def stage(name, **info):
+    """Context manager recording a stage, the yielded record can be updated,
+    e.g. with the number of bytes produced.
+
+    Examples
+    --------
+    >>> with stage('get_ugrid_vertices') as record:
+    ...     vertices = get_ugrid_vertices(grid)
+    ...     record['nbytes'] = nbytes(vertices)
+    """
+    if not _enabled:
+        yield {}
+        return
+
+    record = _new_record(name)
+    record.update(info)
+
+    tracing = tracemalloc.is_tracing()
+    with _lock:
+        if tracing:
+            _update_open_peaks()
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+        else:
+            current = 0
+        entry = [record, current, current]
+        _open_entries.append(entry)
+
+    open_records = _open_records()
+    open_records.append(entry)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['wall_time'] = time.perf_counter() - start
+        with _lock:
+            if tracing and tracemalloc.is_tracing():
+                _update_open_peaks()
+                record['peak_memory'] = entry[2] - entry[1]
+            # By identity, records of concurrent stages may be equal
+            del _open_entries[next(i for i, e in enumerate(_open_entries) if e is entry)]
+        open_records.pop()
+        _records.append(record)
+
+
+if os.environ.get('ODYSIS_PROFILE', '0') not in ('', '0'):
+    enable()
@@ -0,0 +1,115 @@
+"""Subsampling of mesh vertices for PointCloud and VectorField.
+
+Samples are taken from an ordering of the candidate vertices, which is
+computed once for all percentages:
+
+- ``ordered``: vertices taken at regular intervals of their ids, like the
+  front-end does
+- ``random``: a random permutation
+- ``stratified``: a progressive voxel sampling, each prefix of the ordering
+  being spread over space. The first vertices are one vertex per voxel of a
+  2x2x2 grid, then one vertex per voxel of a 4x4x4 grid which has none yet,
+  taken in turn from each voxel of the 2x2x2 grid, and so on.
+"""
+import numpy as np
+
+DISTRIBUTIONS = ('ordered', 'random', 'stratified')
+
+# Maximum number of levels of the stratified ordering, the finest grid
+# having 2 ** MAX_LEVELS voxels along each axis
+MAX_LEVELS = 10
+
+
+def candidate_vertices(mesh, mode):
+    """Ids of the vertices which can be sampled, all of them in volume mode
+    and the vertices of the triangles in surface mode."""
+    if mode == 'surface':
+        return np.unique(mesh.triangles).astype(np.uint32)
+    return np.arange(len(mesh.vertices) // 3, dtype=np.uint32)
+
+
+def stratified_order(points, seed=0):
+    """Order points so that every prefix is spatially stratified.
+
+    Parameters
+    ----------
+    points : numpy.ndarray
+        (N, 3) point coordinates.
+    seed : int
+        Seed of the choice of the points inside the voxels.
+
+    Returns
+    -------
+    numpy.ndarray
+        The permutation of the point ids.
+    """
+    nb_points = len(points)
+    shuffled = np.random.RandomState(seed).permutation(nb_points)
+    if nb_points == 0:
+        return shuffled
+
+    lower = points.min(axis=0)
+    extent = points.max(axis=0) - lower
+    extent[extent == 0] = 1.
+    normalized = (points[shuffled] - lower) / extent
+
+    ordered = np.zeros(nb_points, dtype=bool)
+    order = []
+    for level in range(1, MAX_LEVELS + 1):
+        resolution = 2 ** level
+        voxels = np.minimum((normalized * resolution).astype(np.int64), resolution - 1)
+        keys = (voxels[:, 0] * resolution + voxels[:, 1]) * resolution + voxels[:, 2]
+
+        # First point, in the shuffled order, of each voxel which has no
+        # point from a coarser level
+        free = np.flatnonzero(~ordered)
+        free = free[~np.isin(keys[free], keys[ordered])]
+        _, firsts = np.unique(keys[free], return_index=True)
+        firsts = np.sort(free[firsts])
+
+        # New points are taken in turn from the voxels of the coarser level,
+        # so that prefixes cover them evenly
+        parents = np.minimum((normalized[firsts] * (resolution // 2)).astype(np.int64), resolution // 2 - 1)
+        parents = (parents[:, 0] * resolution + parents[:, 1]) * resolution + parents[:, 2]
+        by_parent = np.argsort(parents, kind='stable')
+        sorted_parents = parents[by_parent]
+        group_starts = np.flatnonzero(np.concatenate(([True], sorted_parents[1:] != sorted_parents[:-1])))
+        ranks = np.empty(len(firsts), dtype=np.int64)
+        ranks[by_parent] = np.arange(len(firsts)) - np.repeat(group_starts, np.diff(np.append(group_starts, len(firsts))))
+        firsts = firsts[np.argsort(ranks, kind='stable')]
+
+        order.append(firsts)
+        ordered[firsts] = True
+        if ordered.all():
+            break
+
+    order.append(np.flatnonzero(~ordered))
+    return shuffled[np.concatenate(order)]
+
+
+def sample(order, percentage, distribution):
+    """Sample of an ordering for a percentage in [0, 1].
+
+    The ``ordered`` distribution takes vertices at regular intervals, like
+    the front-end does, the other ones take a prefix of the ordering.
+    """
+    count = int(np.floor(percentage * len(order) + 0.5))
+    if distribution == 'ordered':
+        if count == 0:
+            return order[:0]
+        ids = np.minimum((np.arange(count) / percentage).astype(np.int64), len(order) - 1)
+        return order[ids]
+    return order[:count]
+
+
+def ordering(candidates, distribution, vertices, seed=0):
+    """Ordering of the candidate vertices for a distribution, samples of the
+    ``random`` and ``stratified`` distributions being prefixes of it."""
+    if distribution == 'ordered':
+        return candidates
+    if distribution == 'random':
+        return candidates[np.random.RandomState(seed).permutation(len(candidates))]
+    if distribution == 'stratified':
+        points = vertices.reshape(-1, 3)[candidates]
+        return candidates[stratified_order(points, seed)]
+    raise ValueError('Unknown distribution {}'.format(distribution))
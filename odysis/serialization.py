@@ -1,20 +1,106 @@
+from contextlib import contextmanager
+import threading
+
 import numpy as np
 
+from . import buffers, profiling
+
+# Sidecar receiving the serialized arrays, see sidecar_references
+_local = threading.local()
+
+
+@contextmanager
+def sidecar_references(writer, url):
+    """Serialize arrays as references to the sidecar file written by
+    ``writer`` (a ``snapshot.SidecarWriter``), fetched by the front-end from
+    ``url``, instead of binary buffers. Used for exporting widget states."""
+    _local.sidecar = (writer, url)
+    try:
+        yield
+    finally:
+        _local.sidecar = None
+
+
+def _trait_name(obj, ar):
+    """Name of the synchronized trait of obj holding ar."""
+    for name in getattr(obj, 'keys', ()):
+        if getattr(obj, name, None) is ar:
+            return name
+    return None
+
 
 def array_to_binary(ar, obj=None, force_contiguous=True):
     if ar is None:
         return None
-    if ar.dtype.kind not in ['u', 'i', 'f']:  # ints and floats
-        raise ValueError("unsupported dtype: %s" % (ar.dtype))
-    if ar.dtype == np.float64:  # WebGL does not support float64, case it here
-        ar = ar.astype(np.float32)
-    if ar.dtype == np.int64:  # JS does not support int64
-        ar = ar.astype(np.int32)
-    if force_contiguous and not ar.flags["C_CONTIGUOUS"]:  # make sure it's contiguous
-        ar = np.ascontiguousarray(ar)
+    source = ar
+    with profiling.stage('array_to_binary', widget=type(obj).__name__) as record:
+        if ar.dtype.kind not in ['u', 'i', 'f']:  # ints and floats
+            raise ValueError("unsupported dtype: %s" % (ar.dtype))
+        if ar.dtype == np.float64:  # WebGL does not support float64, case it here
+            ar = ar.astype(np.float32)
+        if ar.dtype == np.int64:  # JS does not support int64
+            ar = ar.astype(np.int32)
+        if force_contiguous and not ar.flags["C_CONTIGUOUS"]:  # make sure it's contiguous
+            ar = np.ascontiguousarray(ar)
+        record['nbytes'] = ar.nbytes
+
+        sidecar = getattr(_local, 'sidecar', None)
+        if sidecar is not None:
+            writer, url = sidecar
+            reference = writer.add(ar)
+            return {'sidecar': url, 'offset': reference['offset'], 'dtype': str(ar.dtype), 'shape': ar.shape}
+
+        # Contents already sent by another widget are referred to
+        trait = _trait_name(obj, source)
+        if trait is not None and getattr(obj, '_model_id', None) is not None:
+            owner = buffers.registry.reference(obj, trait, ar)
+            if owner is not None:
+                record['nbytes'] = 0
+                return {'ref': 'IPY_MODEL_' + owner[0], 'key': owner[1], 'dtype': str(ar.dtype), 'shape': ar.shape}
     return {'data': memoryview(ar), 'dtype': str(ar.dtype), 'shape': ar.shape}
 
 
+def array_delta(old, new, obj=None):
+    """Encode the changes from ``old`` to ``new`` as runs of changed values.
+
+    Values are compared bitwise, and runs separated by less unchanged
+    values than the size of a run header are merged. Returns None when the
+    arrays cannot be compared or when the delta is not smaller than ``new``.
+    """
+    if old is None or new is None or old.shape != new.shape or old.dtype != new.dtype:
+        return None
+    # Only the dtypes sent without conversion by array_to_binary
+    if new.dtype.kind not in ['u', 'i', 'f'] or new.dtype.itemsize > 4:
+        return None
+
+    with profiling.stage('array_delta', widget=type(obj).__name__) as record:
+        bits = np.dtype('u{}'.format(new.dtype.itemsize))
+        new = np.ascontiguousarray(new).reshape(-1)
+        changed = np.flatnonzero(np.ascontiguousarray(old).reshape(-1).view(bits) != new.view(bits))
+
+        # Runs of changed values, as (start, length), a run header costing
+        # 8 bytes
+        gaps = np.flatnonzero(np.diff(changed) > max(8 // new.itemsize, 1))
+        starts = changed[np.concatenate(([0], gaps + 1))] if len(changed) else changed
+        ends = changed[np.concatenate((gaps, [len(changed) - 1]))] + 1 if len(changed) else changed
+        lengths = ends - starts
+
+        nbytes = 8 * len(starts) + int(lengths.sum()) * new.itemsize
+        record['nbytes'] = nbytes
+        if nbytes >= new.nbytes:
+            return None
+
+        indices = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return {
+            'delta': True,
+            'starts': memoryview(starts.astype(np.uint32)),
+            'lengths': memoryview(lengths.astype(np.uint32)),
+            'values': memoryview(new[indices]),
+            'dtype': str(new.dtype),
+            'shape': new.shape
+        }
+
+
 def json_to_array(json, obj=None):
     return np.array(json)
 
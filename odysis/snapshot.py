@@ -0,0 +1,85 @@
+"""Binary sidecar files of scene snapshots.
+
+All the arrays of a snapshot are written one after the other in a single
+sidecar file, each one aligned on ``ALIGNMENT`` bytes, and are referred to
+from the JSON description of the scene by their offset, dtype and shape.
+Loading memory-maps the sidecar, so arrays are only read when used.
+"""
+import os
+
+import numpy as np
+
+# Alignment of the arrays in the sidecar, enough for any dtype and for the
+# typed arrays of the front-end
+ALIGNMENT = 64
+
+
+def sidecar_path(path):
+    """Path of the sidecar of the snapshot ``path``."""
+    return os.path.splitext(path)[0] + '.bin'
+
+
+class SidecarWriter(object):
+    """Write arrays to a sidecar file, returning their references.
+
+    An array given several times is written once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'wb')
+        self._offset = 0
+        # References by array id, the arrays being kept so that ids are not
+        # reused
+        self._references = {}
+
+    def add(self, ar):
+        """Write an array, returns its ``{'offset', 'dtype', 'shape'}``."""
+        if id(ar) in self._references:
+            return self._references[id(ar)][1]
+
+        contiguous = np.ascontiguousarray(ar)
+        padding = -self._offset % ALIGNMENT
+        self._file.write(b'\0' * padding)
+        self._offset += padding
+
+        reference = {
+            'offset': self._offset,
+            'dtype': contiguous.dtype.str,
+            'shape': list(contiguous.shape)
+        }
+        self._file.write(memoryview(contiguous.reshape(-1)).cast('B'))
+        self._offset += contiguous.nbytes
+
+        self._references[id(ar)] = (ar, reference)
+        return reference
+
+    def close(self):
+        self._file.close()
+        self._references = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class SidecarReader(object):
+    """Read the arrays of a sidecar file from their references."""
+
+    def __init__(self, path, mmap=True):
+        if os.path.getsize(path) == 0:
+            self._buffer = np.zeros(0, dtype=np.uint8)
+        elif mmap:
+            # Plain views of the map, which traits take without copy
+            self._buffer = np.asarray(np.memmap(path, dtype=np.uint8, mode='r'))
+        else:
+            self._buffer = np.fromfile(path, dtype=np.uint8)
+
+    def array(self, reference):
+        dtype = np.dtype(reference['dtype'])
+        shape = tuple(reference['shape'])
+        start = reference['offset']
+        end = start + int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        return self._buffer[start:end].view(dtype).reshape(shape)
@@ -0,0 +1,171 @@
+"""Integration of streamlines in tetrahedral meshes.
+
+All seeds are advanced together with a fourth order Runge-Kutta scheme on
+the normalized vector field, so that points are evenly spaced along the
+lines. Each evaluation of the field locates the points in the tetrahedrons
+using the cell they were in at the previous evaluation as hint, which is
+almost always the right one.
+"""
+import numpy as np
+
+# Norm under which the vector field is considered null, relative to its
+# maximum norm at the seeds
+STAGNATION = 1e-6
+
+
+def _orthonormal_basis(normal):
+    normal = np.asarray(normal, dtype=np.float64)
+    normal = normal / np.linalg.norm(normal)
+    helper = np.eye(3)[np.argmin(np.abs(normal))]
+    u = np.cross(normal, helper)
+    u /= np.linalg.norm(u)
+    return normal, u, np.cross(normal, u)
+
+
+def line_seeds(origin, direction, size, resolution):
+    """``resolution`` seeds on the segment of half-length ``size`` centered
+    on ``origin``."""
+    direction, _, _ = _orthonormal_basis(direction)
+    steps = np.linspace(-size, size, resolution)
+    return np.asarray(origin, dtype=np.float64) + steps[:, np.newaxis] * direction
+
+
+def plane_seeds(origin, normal, size, resolution):
+    """``resolution`` x ``resolution`` seeds on the square of half-width
+    ``size`` centered on ``origin``."""
+    _, u, v = _orthonormal_basis(normal)
+    steps = np.linspace(-size, size, resolution)
+    su, sv = np.meshgrid(steps, steps, indexing='ij')
+    return (
+        np.asarray(origin, dtype=np.float64) +
+        su.reshape(-1, 1) * u + sv.reshape(-1, 1) * v
+    )
+
+
+def seeds(vertices, seed_type, origin=None, normal=(1., 0., 0.), size=None,
+          resolution=10, points=None):
+    """Seeds of the Streamlines block, on a plane or a line of the mesh
+    ``vertices``, or given as ``points``. The origin defaults to the center
+    of the mesh and the size to half of its largest extent."""
+    lower = vertices.min(axis=0)
+    upper = vertices.max(axis=0)
+    origin = origin if origin is not None else (lower + upper) / 2.
+    size = size if size is not None else (upper - lower).max() / 2.
+
+    if seed_type == 'plane':
+        return plane_seeds(origin, normal, size, resolution)
+    if seed_type == 'line':
+        return line_seeds(origin, normal, size, resolution)
+    if points is None:
+        return np.zeros((0, 3))
+    return points
+
+
+class _Field(object):
+    """Normalized vector field interpolated in a tetrahedral mesh."""
+
+    def __init__(self, locator, components):
+        self.locator = locator
+        self.components = components
+        self.stagnation = 0.
+
+    def interpolate(self, points, hint):
+        cell_ids, weights = self.locator.locate(points, hint)
+        found = cell_ids >= 0
+
+        vectors = np.zeros((len(points), 3))
+        point_ids = self.locator.tetrahedrons[cell_ids[found]]
+        for axis, component in enumerate(self.components):
+            if np.isscalar(component):
+                vectors[found, axis] = component
+            else:
+                vectors[found, axis] = np.einsum('nk,nk->n', weights[found], component[point_ids])
+        return vectors, cell_ids, weights
+
+    def __call__(self, points, hint):
+        vectors, cell_ids, weights = self.interpolate(points, hint)
+
+        norms = np.linalg.norm(vectors, axis=1)
+        valid = (cell_ids >= 0) & (norms > self.stagnation)
+        vectors[valid] /= norms[valid, np.newaxis]
+        return vectors, valid, cell_ids, weights
+
+
+def _advect(field, seeds, step_size, max_steps):
+    """Advect all seeds, returns the (seed id, step, position, cell id,
+    weights) of every point of the lines."""
+    seed_ids = np.arange(len(seeds))
+    positions = seeds
+    vectors, valid, cell_ids, weights = field(positions, None)
+
+    records = []
+    for step in range(max_steps + 1):
+        seed_ids, positions, vectors, cell_ids, weights = (
+            seed_ids[valid], positions[valid], vectors[valid], cell_ids[valid], weights[valid]
+        )
+        records.append((seed_ids, np.full(len(seed_ids), step), positions, cell_ids, weights))
+        if step == max_steps or len(seed_ids) == 0:
+            break
+
+        # Runge-Kutta 4, lines stop as soon as they leave the mesh
+        k2, valid2, hint2, _ = field(positions + step_size / 2 * vectors, cell_ids)
+        k3, valid3, hint3, _ = field(positions + step_size / 2 * k2, hint2)
+        k4, valid4, _, _ = field(positions + step_size * k3, hint3)
+        positions = positions + step_size / 6 * (vectors + 2 * k2 + 2 * k3 + k4)
+
+        vectors, valid, cell_ids, weights = field(positions, cell_ids)
+        valid &= valid2 & valid3 & valid4
+
+    return [np.concatenate(columns) for columns in zip(*records)]
+
+
+def integrate(locator, components, seeds, step_size, max_steps=500, direction='both'):
+    """Integrate streamlines from seeds.
+
+    Parameters
+    ----------
+    locator : odysis.probing.CellLocator
+        The locator of the mesh.
+    components : list
+        The 3 components of the vector field, as point arrays or numbers.
+    seeds : numpy.ndarray
+        (N, 3) seed points, seeds outside of the mesh are ignored.
+    step_size : float
+        Distance between consecutive points of the lines.
+    max_steps : int
+        Maximum number of steps in each direction.
+    direction : str
+        ``forward``, ``backward`` or ``both``.
+
+    Returns
+    -------
+    tuple
+        The (M, 3) points of the lines, the (K, 2) point ids of their
+        segments, and the (M,) cell ids and (M, 4) barycentric coordinates
+        of the points, for interpolating data on them.
+    """
+    seeds = np.asarray(seeds, dtype=np.float64).reshape(-1, 3)
+    field = _Field(locator, components)
+
+    # Stagnation threshold relative to the field magnitude at the seeds
+    if len(seeds):
+        vectors, _, _ = field.interpolate(seeds, None)
+        field.stagnation = STAGNATION * np.linalg.norm(vectors, axis=1).max()
+
+    parts = []
+    if direction in ('forward', 'both'):
+        parts.append(_advect(field, seeds, step_size, max_steps))
+    if direction in ('backward', 'both'):
+        seed_ids, steps, positions, cell_ids, weights = _advect(field, seeds, -step_size, max_steps)
+        # The seeds are already in the forward lines
+        keep = steps > 0 if direction == 'both' else slice(None)
+        parts.append((seed_ids[keep], -steps[keep], positions[keep], cell_ids[keep], weights[keep]))
+
+    seed_ids, steps, positions, cell_ids, weights = [np.concatenate(columns) for columns in zip(*parts)]
+
+    order = np.lexsort((steps, seed_ids))
+    seed_ids, positions, cell_ids, weights = seed_ids[order], positions[order], cell_ids[order], weights[order]
+
+    starts = np.flatnonzero(seed_ids[1:] == seed_ids[:-1])
+    segments = np.column_stack((starts, starts + 1))
+    return positions, segments, cell_ids, weights
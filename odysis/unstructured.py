@@ -0,0 +1,274 @@
+"""Vectorized processing of unstructured meshes given as NumPy arrays.
+
+Cells are described the same way as in VTK: a flat connectivity array, the
+offsets of each cell in it, and the VTK type of each cell.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+# VTK cell types
+VTK_VERTEX = 1
+VTK_POLY_VERTEX = 2
+VTK_LINE = 3
+VTK_POLY_LINE = 4
+VTK_TRIANGLE = 5
+VTK_QUAD = 9
+VTK_TETRA = 10
+VTK_VOXEL = 11
+VTK_HEXAHEDRON = 12
+VTK_WEDGE = 13
+VTK_PYRAMID = 14
+
+# Number of points of fixed size cells
+CELL_SIZES = {
+    VTK_VERTEX: 1,
+    VTK_LINE: 2,
+    VTK_TRIANGLE: 3,
+    VTK_QUAD: 4,
+    VTK_TETRA: 4,
+    VTK_VOXEL: 8,
+    VTK_HEXAHEDRON: 8,
+    VTK_WEDGE: 6,
+    VTK_PYRAMID: 5
+}
+
+# Cells which are not displayed
+IGNORED_CELLS = (VTK_VERTEX, VTK_POLY_VERTEX, VTK_LINE, VTK_POLY_LINE)
+
+# Voxel points in hexahedron order
+_VOXEL_TO_HEXAHEDRON = [0, 1, 3, 2, 4, 5, 7, 6]
+
+# Split of 3-D cells in tetrahedrons, the one of the VTK cells Triangulate
+# method with index 0, which only splits hexahedrons in 5 tetrahedrons.
+# VTK alternates the parity of the split on the (i, j, k) index of structured
+# cells, which unstructured grids do not have
+_TETRAHEDRONS = {
+    VTK_TETRA: [[0, 1, 2, 3]],
+    VTK_HEXAHEDRON: [
+        [2, 1, 5, 0], [0, 2, 3, 7], [2, 5, 6, 7], [0, 7, 4, 5], [0, 2, 7, 5]
+    ],
+    VTK_WEDGE: [[0, 1, 2, 3], [1, 4, 5, 3], [1, 3, 5, 2]],
+    VTK_PYRAMID: [[0, 1, 3, 4], [1, 2, 3, 4]]
+}
+
+# Triangle and quad faces of 3-D cells
+_FACES = {
+    VTK_TETRA: ([[0, 1, 3], [1, 2, 3], [2, 0, 3], [0, 2, 1]], []),
+    VTK_HEXAHEDRON: ([], [
+        [0, 4, 7, 3], [1, 2, 6, 5], [0, 1, 5, 4],
+        [3, 7, 6, 2], [0, 3, 2, 1], [4, 5, 6, 7]
+    ]),
+    VTK_WEDGE: (
+        [[0, 1, 2], [3, 5, 4]],
+        [[0, 3, 4, 1], [1, 4, 5, 2], [2, 5, 3, 0]]
+    ),
+    VTK_PYRAMID: (
+        [[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]],
+        [[0, 3, 2, 1]]
+    )
+}
+
+
+def group_cells(connectivity, offsets, cell_types):
+    """Group cells by type.
+
+    Parameters
+    ----------
+    connectivity : numpy.ndarray
+        Flat array of point ids.
+    offsets : numpy.ndarray
+        Offset of each cell in the connectivity, optionally followed by the
+        connectivity length (VTK 9 layout).
+    cell_types : numpy.ndarray
+        VTK type of each cell.
+
+    Returns
+    -------
+    OrderedDict
+        ``{cell_type: (cell_ids, (N, nb_points) point ids)}``, voxels being
+        converted to hexahedrons. Vertices and lines are left out.
+    """
+    connectivity = np.asarray(connectivity)
+    offsets = np.asarray(offsets)
+    cell_types = np.asarray(cell_types)
+
+    if len(offsets) not in (len(cell_types), len(cell_types) + 1):
+        raise ValueError('offsets must have one value per cell, optionally followed by '
+                         'the connectivity length')
+
+    groups = OrderedDict()
+
+    # Cells of one type: the connectivity is used in place
+    unique_types = np.unique(cell_types)
+    if len(unique_types) == 1 and int(unique_types[0]) in _TETRAHEDRONS:
+        cell_type = int(unique_types[0])
+        size = CELL_SIZES[cell_type]
+        if len(connectivity) == len(cell_types) * size:
+            groups[cell_type] = (
+                np.arange(len(cell_types)),
+                connectivity.reshape(len(cell_types), size)
+            )
+            return groups
+
+    for cell_type in unique_types:
+        cell_type = int(cell_type)
+        if cell_type in IGNORED_CELLS:
+            continue
+        if cell_type not in CELL_SIZES:
+            raise ValueError('Unsupported VTK cell type {}'.format(cell_type))
+
+        cell_ids = np.flatnonzero(cell_types == cell_type)
+        size = CELL_SIZES[cell_type]
+        points = connectivity[offsets[cell_ids][:, np.newaxis] + np.arange(size)]
+
+        if cell_type == VTK_VOXEL:
+            cell_type = VTK_HEXAHEDRON
+            points = points[:, _VOXEL_TO_HEXAHEDRON]
+
+        if cell_type in groups:
+            previous_ids, previous_points = groups[cell_type]
+            cell_ids = np.concatenate((previous_ids, cell_ids))
+            points = np.concatenate((previous_points, points))
+        groups[cell_type] = (cell_ids, points)
+
+    return groups
+
+
+def tetrahedralize(groups):
+    """Split the 3-D cells in tetrahedrons, returns a flat uint32 array.
+
+    The output is filled column by column so that no temporary copy of the
+    connectivity is made.
+    """
+    splits = [
+        (points, _TETRAHEDRONS[cell_type])
+        for cell_type, (_, points) in groups.items()
+        if cell_type in _TETRAHEDRONS
+    ]
+    out = np.empty(sum(len(points) * len(split) * 4 for points, split in splits), dtype=np.uint32)
+
+    position = 0
+    for points, split in splits:
+        size = len(points) * len(split) * 4
+        tetrahedrons = out[position:position + size].reshape(len(points), len(split), 4)
+        for i, tetrahedron in enumerate(split):
+            for j, point in enumerate(tetrahedron):
+                tetrahedrons[:, i, j] = points[:, point]
+        position += size
+
+    return out
+
+
+def _boundary_faces(faces):
+    """Return the faces which belong to only one cell."""
+    if len(faces) == 0:
+        return faces
+    keys = np.sort(faces, axis=1)
+    _, index, counts = np.unique(keys, axis=0, return_index=True, return_counts=True)
+    return faces[np.sort(index[counts == 1])]
+
+
+def extract_surface(groups):
+    """Compute the skin of the mesh, returns a flat uint32 array of triangles.
+
+    Like vtkGeometryFilter, the skin is made of the faces of 3-D cells which
+    are not shared with another cell, and of the 2-D cells.
+    """
+    triangles = []
+    quads = []
+    # Faces of the 3-D cells of all types, as a face may be shared by cells
+    # of different types
+    triangle_faces = []
+    quad_faces = []
+    for cell_type, (_, points) in groups.items():
+        if cell_type == VTK_TRIANGLE:
+            triangles.append(points)
+        elif cell_type == VTK_QUAD:
+            quads.append(points)
+        else:
+            cell_triangle_faces, cell_quad_faces = _FACES[cell_type]
+            if cell_triangle_faces:
+                triangle_faces.append(points[:, cell_triangle_faces].reshape(-1, 3))
+            if cell_quad_faces:
+                quad_faces.append(points[:, cell_quad_faces].reshape(-1, 4))
+
+    if triangle_faces:
+        triangles.append(_boundary_faces(np.concatenate(triangle_faces)))
+    if quad_faces:
+        quads.append(_boundary_faces(np.concatenate(quad_faces)))
+
+    # Quads are split in two triangles
+    for quad in quads:
+        triangles.append(quad[:, [0, 1, 2]])
+        triangles.append(quad[:, [0, 2, 3]])
+
+    if not triangles:
+        return np.zeros(0, dtype=np.uint32)
+    return np.concatenate(triangles).reshape(-1).astype(np.uint32)
+
+
+def cell_to_point_data(values, groups, nb_points):
+    """Average cell values on points, like vtkCellDataToPointData.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        (nb_cells,) or (nb_cells, nb_components) cell values.
+    groups : OrderedDict
+        Cells as returned by ``group_cells``.
+    nb_points : int
+        Number of points of the mesh.
+    """
+    values = np.asarray(values)
+    columns = values.reshape(len(values), -1)
+
+    sums = np.zeros((nb_points, columns.shape[1]))
+    counts = np.zeros(nb_points)
+    for cell_ids, points in groups.values():
+        point_ids = points.reshape(-1)
+        nb_cell_points = points.shape[1]
+        counts += np.bincount(point_ids, minlength=nb_points)
+        for i in range(columns.shape[1]):
+            sums[:, i] += np.bincount(
+                point_ids, weights=np.repeat(columns[cell_ids, i], nb_cell_points),
+                minlength=nb_points
+            )
+
+    # Points which do not belong to any cell get 0
+    point_values = sums / np.maximum(counts, 1)[:, np.newaxis]
+    return point_values.reshape((nb_points,) + values.shape[1:])
+
+
+def _bound(function, column):
+    """Minimum or maximum of a column, ignoring NaNs like
+    vtkDataArray.GetRange. None if there is no value to compare."""
+    if not len(column):
+        return None
+    value = float(function.reduce(column))
+    return None if np.isnan(value) else value
+
+
+def fields_to_data(fields):
+    """Convert point fields in the ``get_ugrid_data`` format.
+
+    One dimensional float32 contiguous fields are used without copy, each
+    column of a (nb_points, nb_components) field is copied in its own
+    component array.
+    """
+    out = OrderedDict()
+    for name, field in fields.items():
+        field = np.asarray(field)
+        columns = [field] if field.ndim == 1 else [field[:, i] for i in range(field.shape[1])]
+
+        components = OrderedDict()
+        for i, column in enumerate(columns):
+            column = np.ascontiguousarray(column, dtype=np.float32)
+            components['X' + str(i + 1)] = {
+                'array': column,
+                'min': _bound(np.fmin, column),
+                'max': _bound(np.fmax, column)
+            }
+        out[name] = components
+
+    return out
@@ -1,14 +1,24 @@
+import os
 import os.path as osp
 from array import array
-import vtk
+from concurrent.futures import ThreadPoolExecutor
 
-FLOAT32 = 'f'
-UINT32 = 'I'
+import numpy as np
 
-# TODO
-# We can try to convert the grid to vtkPolyData and use vtkQuadricClustering
-# in order to simplify it and then reduce data communication between back-end
-# and front-end and optimize the rendering
+from .unstructured import group_cells, tetrahedralize, CELL_SIZES, IGNORED_CELLS
+
+FLOAT32 = np.float32
+UINT32 = np.uint32
+
+# Number of threads extracting the point data components in get_ugrid_data,
+# the number of CPUs if None
+WORKERS = None
+
+# Number of point data values under which components are extracted serially
+MIN_PARALLEL_VALUES = 1 << 20
+
+# Cell types handled by the vectorized tetrahedralization
+SUPPORTED_CELLS = list(CELL_SIZES) + list(IGNORED_CELLS)
 
 
 def filter_grid(grid, filter_function):
@@ -21,42 +31,92 @@ def filter_grid(grid, filter_function):
 
 
 def geometry_filter(grid):
+    import vtk
     # TODO Use vtkDataSetSurfaceFilter? (Supposed to be faster)
     return filter_grid(grid, vtk.vtkGeometryFilter)
 
 
 def append_filter(grid):
+    import vtk
     return filter_grid(grid, vtk.vtkAppendFilter)
 
 
+def decimate_grid(grid, target_reduction):
+    """Compute a decimated triangulated skin of the grid.
+
+    Decimation only removes vertices, so the point data of the remaining
+    vertices is kept as-is and data names do not change.
+    """
+    import vtk
+
+    surface = filter_grid(geometry_filter(grid), vtk.vtkTriangleFilter)
+
+    decimate = vtk.vtkDecimatePro()
+    decimate.SetInputData(surface)
+    decimate.SetTargetReduction(target_reduction)
+    decimate.PreserveTopologyOn()
+    decimate.Update()
+
+    return decimate.GetOutput()
+
+
+def is_unstructured_grid(obj):
+    """Whether obj is a vtkUnstructuredGrid, without importing vtk for
+    objects which do not come from it."""
+    if not type(obj).__module__.startswith('vtk'):
+        return False
+
+    import vtk
+    return isinstance(obj, vtk.vtkUnstructuredGrid)
+
+
+def _to_numpy(vtk_array, dtype):
+    """Copy a VTK array in a new contiguous numpy array of the given dtype,
+    so that it does not depend on the VTK object lifetime."""
+    from vtk.util.numpy_support import vtk_to_numpy
+    return np.array(vtk_to_numpy(vtk_array), dtype=dtype, order='C')
+
+
+def _cell_types(grid):
+    try:
+        # VTK >= 9.6
+        types = grid.GetCellTypes()
+    except TypeError:
+        types = grid.GetCellTypesArray()
+    return _to_numpy(types, np.uint8)
+
+
+def is_volumetric(grid):
+    """Whether the grid has 3-D cells, which are split in tetrahedrons."""
+    import vtk
+    # VTK >= 9.6
+    utilities = getattr(vtk, 'vtkCellTypeUtilities', vtk.vtkCellTypes)
+    return any(utilities.GetDimension(int(t)) == 3 for t in np.unique(_cell_types(grid)))
+
+
 def get_ugrid_vertices(grid):
-    dtype = FLOAT32
-    nb_vertices = grid.GetNumberOfPoints()
     vertices = grid.GetPoints()
     if not vertices:
         raise Exception('No vertices specified, nothing to display')
 
-    out = array(dtype)
-    for i in range(nb_vertices):
-        out.extend(vertices.GetPoint(i))
-    return out
+    return _to_numpy(vertices.GetData(), FLOAT32).ravel()
 
 
-def get_ugrid_tetrahedrons(grid):
-    dtype = UINT32
+def _triangulate_cells(grid):
+    """Generate tetrahedrons using VTK, whatever the Cell type is."""
+    import vtk
 
     # vtkCellIterator
     iterator = grid.NewCellIterator()
     iterator.InitTraversal()
 
-    out = array(dtype)
+    out = array('I')
     while not iterator.IsDoneWithTraversal():
         # Ignore 0D, 1D and 2D cells
         if iterator.GetCellDimension() != 3:
             iterator.GoToNextCell()
             continue
 
-        # Generate tetrahedrons, whatever the Cell type is
         cell = grid.GetCell(iterator.GetCellId())
         ids = vtk.vtkIdList()
         cell.Triangulate(0, ids, vtk.vtkPoints())
@@ -64,75 +124,136 @@ def get_ugrid_tetrahedrons(grid):
 
         iterator.GoToNextCell()
 
-    return out
+    return np.array(out, dtype=UINT32)
 
 
-def get_ugrid_triangles(grid):
-    dtype = UINT32
+def get_ugrid_tetrahedrons(grid):
+    from vtk.util.numpy_support import vtk_to_numpy
 
-    filtered = geometry_filter(grid)
+    cells = grid.GetCells()
+    cell_types = _cell_types(grid)
 
-    nb_polys = filtered.GetNumberOfPolys()
-    polys = filtered.GetPolys()
-    out = array(dtype)
-    if not polys:
-        return out
-    points = vtk.vtkIdList()
+    # Linear cells are split in vectorized form, other cells (quadratic
+    # cells, polyhedrons...) are triangulated by VTK
+    if not np.isin(cell_types, SUPPORTED_CELLS).all():
+        return _triangulate_cells(grid)
 
-    for _ in range(nb_polys):
-        polys.GetNextCell(points)
-        nb_points = points.GetNumberOfIds()
+    # The connectivity is read in place, only the tetrahedrons are copied
+    groups = group_cells(
+        vtk_to_numpy(cells.GetConnectivityArray()),
+        vtk_to_numpy(cells.GetOffsetsArray()),
+        cell_types
+    )
+    return tetrahedralize(groups)
 
-        if nb_points == 4:
-            out.extend([points.GetId(0), points.GetId(1), points.GetId(2)])
-            out.extend([points.GetId(0), points.GetId(2), points.GetId(3)])
-        else:
-            out.extend(map(points.GetId, range(nb_points)))
 
-    return out
+def get_ugrid_triangles(grid):
+    filtered = geometry_filter(grid)
 
+    polys = filtered.GetPolys()
+    if not polys or not polys.GetNumberOfCells():
+        return np.zeros(0, dtype=UINT32)
+
+    connectivity = _to_numpy(polys.GetConnectivityArray(), UINT32)
+    offsets = _to_numpy(polys.GetOffsetsArray(), np.int64)
+
+    # Fan triangulation of polygons, quads giving [0, 1, 2] and [0, 2, 3]
+    nb_triangles = np.maximum(np.diff(offsets) - 2, 0)
+    firsts = np.repeat(offsets[:-1], nb_triangles)
+    local_ids = np.arange(len(firsts)) - np.repeat(np.cumsum(nb_triangles) - nb_triangles, nb_triangles)
+
+    out = np.empty((len(firsts), 3), dtype=UINT32)
+    out[:, 0] = connectivity[firsts]
+    out[:, 1] = connectivity[firsts + local_ids + 1]
+    out[:, 2] = connectivity[firsts + local_ids + 2]
+    return out.ravel()
+
+
+def _extract_component(column):
+    """One contiguous float32 copy of a component and its range, computed on
+    the original values like vtkDataArray.GetRange (NaNs are ignored).
+
+    Only NumPy operations releasing the GIL are used, so that components are
+    extracted in parallel by threads.
+    """
+    return (
+        np.array(column, dtype=FLOAT32, order='C'),
+        float(np.fmin.reduce(column)),
+        float(np.fmax.reduce(column))
+    )
+
+
+def get_ugrid_data(grid, workers=None):
+    """Extract the point data of the grid, one float32 array per component.
+
+    Parameters
+    ----------
+    grid : vtk.vtkUnstructuredGrid
+        The grid.
+    workers : int, optional
+        Number of threads extracting the components, ``WORKERS`` by default.
+        Components are extracted serially with one worker or for small
+        grids, the result is the same in any case.
+    """
+    from vtk.util.numpy_support import vtk_to_numpy
 
-def get_ugrid_data(grid):
-    dtype = FLOAT32
     # Get data from the grid
     data = grid.GetPointData()
     out = {}
     if not data:
         return out
-    nb_values = data.GetNumberOfTuples()
 
-    # Export each array of data, and export the data description
+    # Components of each array of data, as (array name, component name,
+    # values), VTK objects being only accessed from this thread
+    components = []
+    ranges = {}
     nb_arr = data.GetNumberOfArrays()
     for i_arr in range(nb_arr):
         arr = data.GetArray(i_arr)
         arr_name = arr.GetName()
-        components = {}
         nb_components = arr.GetNumberOfComponents()
+        values = vtk_to_numpy(arr).reshape(-1, nb_components)
 
-        # Get magnitude min and max
-        mag_min, mag_max = arr.GetRange(-1)
-
-        # For each component of the array of data
+        out[arr_name] = {}
         for i_comp in range(nb_components):
             component_name = arr.GetComponentName(i_comp)
             component_name = 'X' + str(i_comp+1) if component_name is None else component_name
-            component_min, component_max = arr.GetRange(i_comp)
-
-            values = (arr.GetComponent(i_value, i_comp) for i_value in range(nb_values))
+            components.append((arr_name, component_name, values[:, i_comp]))
+            # Ranges of empty arrays are VTK's conventions
+            if not len(values):
+                ranges[arr_name, component_name] = arr.GetRange(i_comp)
+
+    if workers is None:
+        workers = WORKERS or os.cpu_count() or 1
+    nb_values = sum(len(column) for _, _, column in components)
+    columns = [column for _, _, column in components if len(column)]
+    if workers > 1 and len(columns) > 1 and nb_values >= MIN_PARALLEL_VALUES:
+        with ThreadPoolExecutor(max_workers=min(workers, len(columns))) as executor:
+            extracted = iter(list(executor.map(_extract_component, columns)))
+    else:
+        extracted = map(_extract_component, columns)
 
-            components[component_name] = {
-              'array': array(dtype, values),
-              'min': component_min,
-              'max': component_max
-            }
+    # One contiguous float32 copy per component, in the order of the grid
+    for arr_name, component_name, column in components:
+        if len(column):
+            array, component_min, component_max = next(extracted)
+        else:
+            array = np.array(column, dtype=FLOAT32, order='C')
+            component_min, component_max = ranges[arr_name, component_name]
 
-        out[arr_name] = components
+        out[arr_name][component_name] = {
+          'array': array,
+          'min': component_min,
+          'max': component_max
+        }
 
     # Export the data description
     return out
 
 
 def load_vtk(filepath):
+    import vtk
+
     file_extension = osp.splitext(filepath)[1]
     if file_extension == '.vtu':
         reader = vtk.vtkXMLUnstructuredGridReader()
@@ -0,0 +1,329 @@
+"""Reader of XDMF files, with heavy data stored in HDF5 files.
+
+Only the datasets which are needed are read: the geometry, the topology and
+the requested fields of the requested time step. HDF5 datasets are read by
+chunks of rows, or memory-mapped when they are stored contiguously and
+uncompressed.
+"""
+import os.path as osp
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from .unstructured import (
+    VTK_VERTEX, VTK_LINE, VTK_TRIANGLE, VTK_QUAD, VTK_TETRA,
+    VTK_PYRAMID, VTK_WEDGE, VTK_HEXAHEDRON, CELL_SIZES
+)
+
+# XDMF topology names to VTK cell types
+_TOPOLOGY_TYPES = {
+    'polyvertex': VTK_VERTEX,
+    'polyline': VTK_LINE,
+    'triangle': VTK_TRIANGLE,
+    'quadrilateral': VTK_QUAD,
+    'tetrahedron': VTK_TETRA,
+    'pyramid': VTK_PYRAMID,
+    'wedge': VTK_WEDGE,
+    'hexahedron': VTK_HEXAHEDRON
+}
+
+# XDMF cell type ids, used in mixed topologies, to VTK cell types
+_MIXED_TYPES = {
+    1: VTK_VERTEX,
+    2: VTK_LINE,
+    4: VTK_TRIANGLE,
+    5: VTK_QUAD,
+    6: VTK_TETRA,
+    7: VTK_PYRAMID,
+    8: VTK_WEDGE,
+    9: VTK_HEXAHEDRON
+}
+
+_NUMBER_TYPES = {
+    ('float', '4'): np.float32,
+    ('float', '8'): np.float64,
+    ('int', '4'): np.int32,
+    ('int', '8'): np.int64,
+    ('uint', '4'): np.uint32,
+    ('uint', '8'): np.uint64,
+    ('char', '1'): np.int8,
+    ('uchar', '1'): np.uint8
+}
+
+# Number of rows read at once from HDF5 datasets
+CHUNK_ROWS = 1 << 20
+
+
+def _import_h5py():
+    try:
+        import h5py
+    except ImportError:
+        raise RuntimeError('h5py is needed in order to read XDMF files with HDF5 data')
+    return h5py
+
+
+def _memmap(dataset):
+    """Memory-map a h5py dataset if it is stored contiguously and uncompressed,
+    return None otherwise."""
+    if dataset.chunks is not None or dataset.compression is not None:
+        return None
+
+    offset = dataset.id.get_offset()
+    if offset is None:
+        return None
+    return np.memmap(
+        dataset.file.filename, mode='r', dtype=dataset.dtype,
+        offset=offset, shape=dataset.shape
+    )
+
+
+def _read_hdf5(dataset, chunk_rows=CHUNK_ROWS):
+    """Read a h5py dataset by hyperslabs of ``chunk_rows`` rows into a
+    preallocated array."""
+    out = np.empty(dataset.shape, dtype=dataset.dtype)
+    if out.size == 0:
+        return out
+    for start in range(0, dataset.shape[0], chunk_rows):
+        selection = np.s_[start:min(start + chunk_rows, dataset.shape[0])]
+        dataset.read_direct(out, source_sel=selection, dest_sel=selection)
+    return out
+
+
+class XdmfReader(object):
+    """Lazy reader of a XDMF file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the ``.xdmf`` or ``.xmf`` file.
+    mmap : bool
+        Whether contiguous HDF5 datasets should be memory-mapped instead of
+        being read in memory.
+    """
+
+    def __init__(self, path, mmap=True):
+        self.path = path
+        self.mmap = mmap
+        self._directory = osp.dirname(osp.abspath(path))
+        self._h5files = {}
+
+        root = ET.parse(path).getroot()
+        domain = root.find('Domain')
+        if domain is None:
+            raise RuntimeError('No Domain in XDMF file {}'.format(path))
+        grid = domain.find('Grid')
+        if grid is None:
+            raise RuntimeError('No Grid in XDMF file {}'.format(path))
+
+        # A temporal collection contains one grid per time step
+        if grid.get('GridType', 'Uniform') == 'Collection':
+            self._grids = grid.findall('Grid')
+        else:
+            self._grids = [grid]
+
+        self.times = []
+        for i, step in enumerate(self._grids):
+            time = step.find('Time')
+            self.times.append(float(time.get('Value')) if time is not None else float(i))
+
+    def close(self):
+        for h5file in self._h5files.values():
+            h5file.close()
+        self._h5files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _grid(self, step):
+        return self._grids[step]
+
+    def _find(self, step, tag):
+        """Find an element of a step, falling back on the first step, as
+        the mesh is often written only once in time series."""
+        element = self._grid(step).find(tag)
+        if element is None:
+            element = self._grids[0].find(tag)
+        if element is None:
+            raise RuntimeError('No {} in XDMF file {}'.format(tag, self.path))
+        return element
+
+    def _source(self, item):
+        """Return the data of a DataItem, HDF5 data is returned as a h5py
+        dataset or a memory map which are only read when sliced."""
+        number_type = item.get('NumberType', item.get('DataType', 'Float')).lower()
+        precision = item.get('Precision', '4')
+        dtype = _NUMBER_TYPES.get((number_type, precision), np.float64)
+
+        data_format = item.get('Format', 'XML')
+        if data_format == 'XML':
+            dimensions = tuple(int(d) for d in item.get('Dimensions').split())
+            return np.array(item.text.split(), dtype=dtype).reshape(dimensions)
+        if data_format == 'HDF':
+            filename, dataset_path = item.text.strip().split(':', 1)
+            h5file = self._h5files.get(filename)
+            if h5file is None:
+                h5py = _import_h5py()
+                h5file = h5py.File(osp.join(self._directory, filename), 'r')
+                self._h5files[filename] = h5file
+
+            dataset = h5file[dataset_path]
+            memmap = _memmap(dataset) if self.mmap else None
+            return memmap if memmap is not None else dataset
+
+        raise RuntimeError('Unsupported XDMF data format {}'.format(data_format))
+
+    def _read_data_item(self, item):
+        dimensions = tuple(int(d) for d in item.get('Dimensions').split())
+
+        # Time series often store all steps in one dataset, only the slab of
+        # the step is read
+        if item.get('ItemType') == 'HyperSlab':
+            selection_item, source_item = item.findall('DataItem')
+            source = self._source(source_item)
+            start, stride, count = self._read_data_item(selection_item).reshape(3, -1).astype(int)
+            selection = tuple(
+                slice(b, b + s * c, s) for b, s, c in zip(start, stride, count)
+            )
+            return np.asarray(source[selection]).reshape(dimensions)
+
+        source = self._source(item)
+        if isinstance(source, np.ndarray):
+            return source.reshape(dimensions)
+        return _read_hdf5(source).reshape(dimensions)
+
+    def fields(self, step=0):
+        """Return ``{name: center}`` of the fields available at a step,
+        without reading them."""
+        return dict(
+            (attribute.get('Name'), attribute.get('Center', 'Node'))
+            for attribute in self._grid(step).findall('Attribute')
+        )
+
+    def read_geometry(self, step=0):
+        """Return the (nb_points, 3) point coordinates."""
+        geometry = self._find(step, 'Geometry')
+        geometry_type = geometry.get('GeometryType', geometry.get('Type', 'XYZ'))
+        items = geometry.findall('DataItem')
+
+        if geometry_type == 'XYZ':
+            return self._read_data_item(items[0]).reshape(-1, 3)
+        if geometry_type == 'XY':
+            points = self._read_data_item(items[0]).reshape(-1, 2)
+            return np.column_stack((points, np.zeros(len(points), dtype=points.dtype)))
+        if geometry_type == 'X_Y_Z':
+            return np.column_stack([self._read_data_item(item).ravel() for item in items])
+
+        raise RuntimeError('Unsupported XDMF geometry type {}'.format(geometry_type))
+
+    def read_topology(self, step=0):
+        """Return the cells as (connectivity, offsets, cell_types) VTK arrays."""
+        topology = self._find(step, 'Topology')
+        topology_type = topology.get('TopologyType', topology.get('Type')).lower()
+        connectivity = self._read_data_item(topology.find('DataItem')).ravel()
+
+        if topology_type == 'mixed':
+            return _parse_mixed(connectivity)
+
+        if topology_type not in _TOPOLOGY_TYPES:
+            raise RuntimeError('Unsupported XDMF topology type {}'.format(topology_type))
+        cell_type = _TOPOLOGY_TYPES[topology_type]
+        size = int(topology.get('NodesPerElement', CELL_SIZES[cell_type]))
+        nb_cells = len(connectivity) // size
+
+        return (
+            connectivity,
+            np.arange(nb_cells + 1) * size,
+            np.full(nb_cells, cell_type, dtype=np.uint8)
+        )
+
+    def read_field(self, name, step=0):
+        """Read one field of a step, other fields are not read."""
+        for attribute in self._grid(step).findall('Attribute'):
+            if attribute.get('Name') == name:
+                return self._read_data_item(attribute.find('DataItem'))
+        raise KeyError('No field {} at step {}'.format(name, step))
+
+
+def _mixed_tables():
+    """Header size, point count and VTK type of each XDMF cell type id."""
+    headers = np.zeros(max(_MIXED_TYPES) + 1, dtype=np.int64)
+    sizes = np.zeros_like(headers)
+    vtk_types = np.zeros(len(headers), dtype=np.uint8)
+    for xdmf_type, cell_type in _MIXED_TYPES.items():
+        # Poly-vertices and poly-lines store their number of points after the type
+        poly = xdmf_type in (1, 2)
+        headers[xdmf_type] = 2 if poly else 1
+        sizes[xdmf_type] = 0 if poly else CELL_SIZES[cell_type]
+        vtk_types[xdmf_type] = cell_type
+    return headers, sizes, vtk_types
+
+
+def _parse_mixed(mixed):
+    """Convert a XDMF mixed topology to VTK arrays.
+
+    Every position holding a supported type id may start a cell, and would be
+    followed by the cell after it. The cells are the chain of those positions
+    starting at the first one, which is followed with NumPy in a logarithmic
+    number of steps by doubling the jumps. The connectivity is gathered at once.
+    """
+    mixed = np.asarray(mixed)
+    length = len(mixed)
+    if not length:
+        return mixed[:0], np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+
+    headers, sizes, vtk_types = _mixed_tables()
+
+    # Fast path for a single fixed-size cell type
+    first = int(mixed[0])
+    if 0 <= first < len(headers) and headers[first] == 1:
+        stride = sizes[first] + 1
+        if length % stride == 0 and np.all(mixed[::stride] == first):
+            cells = mixed.reshape(-1, stride)
+            return (
+                cells[:, 1:].ravel(),
+                np.arange(len(cells) + 1, dtype=np.int64) * sizes[first],
+                np.full(len(cells), vtk_types[first], dtype=np.uint8)
+            )
+
+    values = mixed.astype(np.int64)
+    candidates = np.flatnonzero((values >= 0) & (values < len(headers)))
+    candidates = candidates[headers[values[candidates]] > 0]
+    if not len(candidates) or candidates[0] != 0:
+        raise RuntimeError('Unsupported XDMF cell type {}'.format(first))
+
+    candidate_types = values[candidates]
+    cell_sizes = sizes[candidate_types]
+    poly = headers[candidate_types] == 2
+    cell_sizes[poly] = np.maximum(values[np.minimum(candidates[poly] + 1, length - 1)], 0)
+    ends = candidates + headers[candidate_types] + cell_sizes
+
+    # Index of the candidate following each candidate, len(candidates) past
+    # the end of the array or on anything else than a supported type id
+    ranks = np.full(length + 1, len(candidates), dtype=np.int64)
+    ranks[candidates] = np.arange(len(candidates))
+    jumps = np.append(ranks[np.minimum(ends, length)], len(candidates))
+
+    chain = np.zeros(1, dtype=np.int64)
+    while True:
+        following = jumps[chain]
+        following = following[following < len(candidates)]
+        if not len(following):
+            break
+        chain = np.concatenate((chain, following))
+        jumps = jumps[jumps]
+
+    end = ends[chain[-1]]
+    if end > length:
+        raise RuntimeError('Truncated XDMF mixed topology')
+    if end < length:
+        raise RuntimeError('Unsupported XDMF cell type {}'.format(values[end]))
+
+    starts = candidates[chain] + headers[candidate_types[chain]]
+    cell_sizes = cell_sizes[chain]
+    offsets = np.concatenate(([0], np.cumsum(cell_sizes)))
+    ids = np.repeat(starts - offsets[:-1], cell_sizes) + np.arange(offsets[-1])
+
+    return mixed[ids], offsets, vtk_types[candidate_types[chain]]
@@ -142,9 +142,9 @@ setup_args = {
         'ipywidgets>=7.0.0',
         'traittypes',
         'numpy',
-        'vtk'
+        'vtk>=9'
     ],
-    'packages': find_packages(),
+    'packages': find_packages(exclude=['benchmarks']),
     'zip_safe': False,
     'cmdclass': {
         'build_py': js_prerelease(build_py),
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+# Conforming split of a voxel in 6 tetrahedrons around its 0-7 diagonal,
+# corners being numbered x + 2 * y + 4 * z
+_VOXEL_TO_TETRAHEDRONS = np.array([
+    [0, 1, 3, 7], [0, 3, 2, 7], [0, 2, 6, 7],
+    [0, 6, 4, 7], [0, 4, 5, 7], [0, 5, 1, 7]
+])
+
+
+@pytest.fixture
+def cube():
+    """Tetrahedrons of the unit cube, as flat float32 vertices and uint32
+    point ids."""
+    side = 6
+    n = side + 1
+    x, y, z = np.meshgrid(*(np.linspace(0., 1., n), ) * 3, indexing='ij')
+    vertices = np.column_stack((x.ravel(), y.ravel(), z.ravel())).astype(np.float32)
+
+    i, j, k = np.meshgrid(*(np.arange(side), ) * 3, indexing='ij')
+    origins = np.column_stack((i.ravel(), j.ravel(), k.ravel()))
+    offsets = np.array([[c & 1, (c >> 1) & 1, (c >> 2) & 1] for c in range(8)])
+    corners = origins[:, np.newaxis, :] + offsets[np.newaxis, :, :]
+    # Point ids of the meshgrid 'ij' ordering
+    corner_ids = (corners[..., 0] * n + corners[..., 1]) * n + corners[..., 2]
+    tetrahedrons = corner_ids[:, _VOXEL_TO_TETRAHEDRONS].reshape(-1).astype(np.uint32)
+
+    return vertices.reshape(-1), tetrahedrons
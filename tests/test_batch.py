@@ -0,0 +1,165 @@
+import json
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from odysis import ColorMapping, DataBlock, Mesh
+from odysis import gltf
+from odysis.batch import BatchExportError, batch_export, export_gltf
+
+from benchmarks.generators import hexahedron_grid, write_grid
+
+# Number of values of the glTF accessor types
+COMPONENTS = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3}
+
+
+def _read_glb(path):
+    """The JSON document and binary chunk of a .glb file, checking its
+    header and chunk lengths."""
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    magic, version, length = struct.unpack('<III', content[:12])
+    assert (magic, version, length) == (gltf.GLB_MAGIC, 2, len(content))
+
+    json_length, json_type = struct.unpack('<II', content[12:20])
+    assert json_type == gltf.CHUNK_JSON and json_length % 4 == 0
+    document = json.loads(content[20:20 + json_length].decode())
+
+    binary = b''
+    if 20 + json_length < length:
+        bin_length, bin_type = struct.unpack('<II', content[20 + json_length:28 + json_length])
+        assert bin_type == gltf.CHUNK_BIN
+        assert 28 + json_length + bin_length == length
+        binary = content[28 + json_length:]
+        assert document['buffers'] == [{'byteLength': bin_length}]
+    return document, binary
+
+
+def _accessor(document, binary, index, dtype):
+    accessor = document['accessors'][index]
+    view = document['bufferViews'][accessor['bufferView']]
+    count = accessor['count'] * COMPONENTS[accessor['type']]
+    offset = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    return accessor, np.frombuffer(binary, dtype=dtype, count=count, offset=offset)
+
+
+def test_write_glb_round_trip(tmp_path):
+    positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+    triangles = np.array([[0, 1, 2], [0, 1, 3]])
+    colors = np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255], [0, 0, 0]])
+    path = str(tmp_path / 'parts.glb')
+
+    gltf.write_glb(path, [
+        {'name': 'surface', 'positions': positions, 'mode': 'triangles', 'indices': triangles, 'colors': colors},
+        {'name': 'lines', 'positions': positions, 'mode': 'lines', 'indices': [[0, 1], [1, 2], [2, 3]]},
+        {'name': 'empty', 'positions': np.zeros((0, 3)), 'mode': 'triangles', 'indices': []}
+    ])
+
+    document, binary = _read_glb(path)
+    assert [node['name'] for node in document['nodes']] == ['surface', 'lines']
+
+    surface, lines = [mesh['primitives'][0] for mesh in document['meshes']]
+    assert (surface['mode'], lines['mode']) == (4, 1)
+
+    accessor, values = _accessor(document, binary, surface['attributes']['POSITION'], np.float32)
+    assert accessor['count'] == 4
+    assert accessor['min'] == [0, 0, 0] and accessor['max'] == [1, 1, 1]
+    np.testing.assert_array_equal(values.reshape(-1, 3), positions)
+
+    accessor, values = _accessor(document, binary, surface['indices'], np.uint32)
+    assert accessor['count'] == 6
+    np.testing.assert_array_equal(values, triangles.reshape(-1))
+
+    accessor, values = _accessor(document, binary, surface['attributes']['COLOR_0'], np.uint8)
+    assert accessor['count'] == 4 and accessor['normalized']
+    np.testing.assert_array_equal(values.reshape(-1, 3), colors)
+
+    assert document['accessors'][lines['indices']]['count'] == 6
+
+
+def _template():
+    block = DataBlock(mesh=Mesh.from_vtk(hexahedron_grid(125)))
+    block.apply(ColorMapping())
+    return block
+
+
+def test_export_gltf(tmp_path):
+    block = _template()
+    path = str(tmp_path / 'block.glb')
+
+    export_gltf(block, path)
+
+    document, binary = _read_glb(path)
+    primitive, = [mesh['primitives'][0] for mesh in document['meshes']]
+    assert document['nodes'][0]['name'] == 'DataBlock/ColorMapping'
+    counts = dict(
+        (name, document['accessors'][index]['count'])
+        for name, index in dict(primitive['attributes'], indices=primitive['indices']).items()
+    )
+    assert counts == {
+        'POSITION': len(block.mesh.vertices) // 3,
+        'COLOR_0': len(block.mesh.vertices) // 3,
+        'indices': len(block.mesh.triangles)
+    }
+
+
+def _runs(tmp_path, names):
+    grid = hexahedron_grid(125)
+    paths = []
+    for name in names:
+        directory = tmp_path / 'runs' / name
+        directory.mkdir(parents=True)
+        paths.append(write_grid(grid, str(directory), 'result'))
+    return paths
+
+
+def test_batch_export_keeps_directories(tmp_path):
+    paths = _runs(tmp_path, ['run1', 'run2'])
+    output_dir = str(tmp_path / 'out')
+
+    outputs = batch_export(_template(), paths, output_dir, processes=1)
+
+    assert outputs == [
+        os.path.join(output_dir, 'run1', 'result.glb'),
+        os.path.join(output_dir, 'run2', 'result.glb')
+    ]
+    for output in outputs:
+        document, _ = _read_glb(output)
+        assert len(document['meshes']) == 1
+
+
+def test_batch_export_collision(tmp_path):
+    paths = _runs(tmp_path, ['run1'])
+    other = os.path.splitext(paths[0])[0] + '.xdmf'
+
+    with pytest.raises(ValueError):
+        batch_export(_template(), paths + [other], str(tmp_path / 'out'), processes=1)
+
+
+def test_batch_export_reports_failures(tmp_path):
+    paths = _runs(tmp_path, ['run1', 'run2'])
+    missing = str(tmp_path / 'runs' / 'missing' / 'result.vtk')
+    output_dir = str(tmp_path / 'out')
+
+    with pytest.raises(BatchExportError) as info:
+        batch_export(_template(), [paths[0], missing, paths[1]], output_dir, processes=1)
+
+    # The other files are exported
+    assert [path for path, _ in info.value.failures] == [missing]
+    assert info.value.outputs[1] is None
+    for output in (info.value.outputs[0], info.value.outputs[2]):
+        assert os.path.isfile(output)
+
+
+def test_batch_export_pool(tmp_path):
+    paths = _runs(tmp_path, ['run1', 'run2'])
+    missing = str(tmp_path / 'runs' / 'missing' / 'result.vtk')
+
+    with pytest.raises(BatchExportError) as info:
+        batch_export(_template(), [missing] + paths, str(tmp_path / 'out'), processes=2)
+
+    assert [path for path, _ in info.value.failures] == [missing]
+    assert all(os.path.isfile(output) for output in info.value.outputs[1:])
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from odysis import BrickedDataBlock
+from odysis.bricking import BrickCache, extract_brick, octree_partition
+
+from benchmarks.generators import hexahedron_grid
+
+
+def test_octree_partition():
+    centroids = np.random.RandomState(0).rand(1000, 3)
+
+    bricks = octree_partition(centroids, [0, 1, 0, 1, 0, 1], max_cells=50)
+
+    # Every cell is in exactly one brick
+    np.testing.assert_array_equal(np.sort(np.concatenate(bricks)), np.arange(1000))
+    assert all(0 < len(cells) <= 50 for cells in bricks)
+
+    # The bricks are octants: their cells are in a box of side 1 / 2 ** depth
+    for cells in bricks:
+        extent = centroids[cells].max(axis=0) - centroids[cells].min(axis=0)
+        assert np.all(extent <= 0.5)
+
+
+def test_octree_partition_max_depth():
+    centroids = np.random.RandomState(0).rand(1000, 3)
+
+    bricks = octree_partition(centroids, [0, 1, 0, 1, 0, 1], max_cells=1, max_depth=1)
+
+    assert len(bricks) == 8
+    assert sum(len(cells) for cells in bricks) == 1000
+
+
+def test_extract_brick():
+    vertices = np.arange(18, dtype=np.float32)
+    triangles = np.array([0, 1, 2, 2, 3, 4, 3, 4, 5], dtype=np.uint32)
+    data = {'pressure': {'X1': np.arange(6.) * 10}}
+
+    brick_vertices, brick_triangles, brick_data = extract_brick(vertices, triangles, data, np.array([1, 2]))
+
+    np.testing.assert_array_equal(brick_vertices, vertices[6:])
+    assert brick_triangles.dtype == np.uint32
+    np.testing.assert_array_equal(brick_triangles, [0, 1, 2, 1, 2, 3])
+    np.testing.assert_array_equal(brick_data['pressure']['X1'], [20., 30., 40., 50.])
+
+
+def _payload(nbytes):
+    return np.zeros(nbytes, dtype=np.uint8), np.zeros(0, dtype=np.uint32), {}
+
+
+def test_brick_cache_evicts_least_recently_used():
+    cache = BrickCache(max_bytes=250)
+
+    cache.get(0, lambda: _payload(100))
+    cache.get(1, lambda: _payload(100))
+    # A hit does not compute the payload and makes it the most recently used
+    cache.get(0, lambda: pytest.fail('Brick 0 is cached'))
+    cache.get(2, lambda: _payload(100))
+
+    assert 0 in cache and 2 in cache and 1 not in cache
+    assert cache.nbytes == 200
+
+
+def test_brick_cache_keeps_a_payload_bigger_than_the_limit():
+    cache = BrickCache(max_bytes=250)
+    cache.get(0, lambda: _payload(100))
+
+    cache.get(1, lambda: _payload(300))
+
+    assert len(cache) == 1 and 1 in cache
+    assert cache.nbytes == 300
+
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+@pytest.fixture
+def bricked_block():
+    block = BrickedDataBlock.from_vtk(hexahedron_grid(125), max_cells=100)
+
+    sent = []
+    block.send = lambda content, buffers=None: sent.append((content, buffers))
+    return block, sent
+
+
+def test_request_bricks(bricked_block):
+    block, sent = bricked_block
+    assert len(block.bricks) == len(block._brick_cells) > 1
+
+    block._handle_message(block, {'event': 'request_bricks', 'ids': [1, 0]}, [])
+
+    assert [content['id'] for content, _ in sent] == [1, 0]
+    content, buffers = sent[0]
+    assert content['event'] == 'brick'
+    # The vertices, the triangles and one buffer per component
+    assert len(buffers) == 2 + len(content['components'])
+
+    vertices, triangles, _ = block._get_brick(1)
+    assert bytes(buffers[0]) == vertices.tobytes()
+    assert bytes(buffers[1]) == triangles.tobytes()
+    assert len(block._cache) == 2
+
+
+def test_request_unknown_bricks(bricked_block):
+    block, sent = bricked_block
+    nb_bricks = len(block._brick_cells)
+
+    with pytest.warns(UserWarning):
+        block._handle_message(block, {'event': 'request_bricks', 'ids': [-1, nb_bricks, '0', 0]}, [])
+
+    assert [content['id'] for content, _ in sent] == [0]
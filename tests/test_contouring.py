@@ -0,0 +1,50 @@
+import numpy as np
+
+from odysis.contouring import contour_set, interpolate
+
+GRADIENT = np.array([1., 2., 3.])
+
+
+def _field(vertices):
+    return vertices.reshape(-1, 3).astype(np.float64) @ GRADIENT
+
+
+def test_points_are_on_their_level(cube):
+    vertices, tetrahedrons = cube
+    values = _field(vertices)
+    levels = [4.5, 1., 2.5]
+
+    points, triangles, point_levels, edges = contour_set(vertices, tetrahedrons, values, levels)
+
+    assert len(triangles) and triangles.max() < len(points)
+    assert set(point_levels.tolist()) == {0, 1, 2}
+    # The field is linear, so interpolation on the edges is exact
+    np.testing.assert_allclose(points @ GRADIENT, np.sort(levels)[point_levels], atol=1e-5)
+    np.testing.assert_allclose(interpolate(values, edges), points @ GRADIENT, atol=1e-5)
+
+
+def test_triangles_face_increasing_values(cube):
+    vertices, tetrahedrons = cube
+    points, triangles, _, _ = contour_set(vertices, tetrahedrons, _field(vertices), [3.05])
+
+    corners = points[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    assert np.all(normals @ GRADIENT > 0)
+
+
+def test_surface_area(cube):
+    vertices, tetrahedrons = cube
+    # The plane z = 0.5 crosses the cube on a unit square
+    values = vertices.reshape(-1, 3)[:, 2].astype(np.float64)
+    points, triangles, _, _ = contour_set(vertices, tetrahedrons, values, [0.5])
+
+    corners = points[triangles]
+    areas = np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1) / 2
+    assert abs(areas.sum() - 1.) < 1e-5
+
+
+def test_levels_out_of_range(cube):
+    vertices, tetrahedrons = cube
+    points, triangles, point_levels, _ = contour_set(vertices, tetrahedrons, _field(vertices), [-1., 7.])
+
+    assert len(points) == len(triangles) == len(point_levels) == 0
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from odysis import Mesh
+from odysis.derived import evaluate
+
+from benchmarks.generators import hexahedron_grid, write_grid
+
+
+def _fields(nb_points=10):
+    rng = np.random.RandomState(0)
+    return OrderedDict([
+        ('pressure', {'X1': rng.rand(nb_points).astype(np.float32)}),
+        ('velocity', OrderedDict([('X1', rng.rand(nb_points)), ('X2', rng.rand(nb_points))]))
+    ]), rng.rand(nb_points * 3).astype(np.float32)
+
+
+def test_evaluate_across_chunks():
+    fields, vertices = _fields()
+    velocity = fields['velocity']
+
+    # 10 points in chunks of 3
+    out, minimum, maximum = evaluate(
+        'hypot(velocity.X1, velocity[1]) * pressure + x', fields, vertices, chunk_size=3
+    )
+
+    expected = np.hypot(velocity['X1'], velocity['X2']) * fields['pressure']['X1'] + vertices[::3]
+    assert out.dtype == np.float32
+    np.testing.assert_allclose(out, expected, rtol=1e-6)
+    assert (minimum, maximum) == (out.min(), out.max())
+
+
+def test_evaluate_scalar():
+    fields, vertices = _fields()
+
+    out, minimum, maximum = evaluate('pi', fields, vertices, chunk_size=3)
+
+    np.testing.assert_array_equal(out, np.full(10, np.pi, dtype=np.float32))
+    assert minimum == maximum == float(np.float32(np.pi))
+
+
+def test_evaluate_bounds_ignore_nans():
+    fields, vertices = _fields()
+    pressure = np.arange(10.)
+    pressure[[0, 1, 2, 9]] = np.nan
+    fields['pressure'] = {'X1': pressure}
+
+    # The first chunk only holds NaNs
+    out, minimum, maximum = evaluate('pressure * 2', fields, vertices, chunk_size=3)
+
+    assert np.isnan(out[[0, 1, 2, 9]]).all()
+    assert (minimum, maximum) == (6., 16.)
+
+    fields['pressure'] = {'X1': np.full(10, np.nan)}
+    out, minimum, maximum = evaluate('pressure', fields, vertices, chunk_size=3)
+    assert np.isnan(out).all()
+    assert minimum is None and maximum is None
+
+
+@pytest.mark.parametrize('expression', ['pressure[:1]', 'velocity', 'np.ones((3, 3))'])
+def test_evaluate_one_value_per_point(expression):
+    fields, vertices = _fields()
+
+    with pytest.raises(ValueError, match='one value per point'):
+        evaluate(expression, fields, vertices, chunk_size=3)
+
+
+@pytest.fixture
+def grid_files(tmp_path):
+    """Two files of the same grid, the velocity being doubled in the second."""
+    grid = hexahedron_grid(125)
+    first = write_grid(grid, str(tmp_path), 'first')
+
+    velocity = grid.GetPointData().GetArray('velocity')
+    for i in range(velocity.GetNumberOfTuples()):
+        velocity.SetTuple3(i, *(2 * value for value in velocity.GetTuple3(i)))
+    second = write_grid(grid, str(tmp_path), 'second')
+
+    return first, second
+
+
+def _component(mesh, name):
+    return next(d for d in mesh.data if d.name == name).components[0]
+
+
+def test_derived_field_follows_reload(grid_files):
+    first, second = grid_files
+    mesh = Mesh.from_vtk(first)
+
+    data = mesh.add_derived('speed', 'magnitude(velocity)')
+    initial = data.components[0].array.copy()
+    assert data.name == 'speed' and data in mesh.data
+
+    mesh.reload(second)
+
+    # Updated in place
+    assert _component(mesh, 'speed') is data.components[0]
+    np.testing.assert_allclose(data.components[0].array, 2 * initial, rtol=1e-6)
+    assert data.components[0].max == pytest.approx(2 * initial.max(), rel=1e-6)
+
+
+def test_replace_derived_field(grid_files):
+    mesh = Mesh.from_vtk(grid_files[0])
+    velocity = _component(mesh, 'velocity').array
+
+    data = mesh.add_derived('speed', 'velocity.X1')
+    # The same expression is not evaluated again
+    assert mesh.add_derived('speed', 'velocity.X1') is data
+
+    mesh.add_derived('speed', 'velocity.X1 * 3')
+    np.testing.assert_allclose(_component(mesh, 'speed').array, 3 * velocity, rtol=1e-6)
+    assert [d.name for d in mesh.data].count('speed') == 1
+
+    with pytest.raises(ValueError, match='not a derived field'):
+        mesh.add_derived('velocity', 'velocity.X1 * 2')
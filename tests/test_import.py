@@ -0,0 +1,9 @@
+import subprocess
+import sys
+
+
+def test_import_does_not_import_vtk():
+    # In a new interpreter, as vtk may already be imported by other tests
+    subprocess.check_call([
+        sys.executable, '-c', "import odysis, sys; assert 'vtk' not in sys.modules"
+    ])
@@ -0,0 +1,52 @@
+import asyncio
+import os
+
+import pytest
+
+from odysis import DataBlock, lod_cache
+
+from benchmarks.generators import hexahedron_grid, write_grid
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'cache'
+    monkeypatch.setattr(lod_cache, 'CACHE_DIR', str(directory))
+    return directory
+
+
+def test_cache_is_not_written_next_to_the_file(tmp_path, cache_dir):
+    data_directory = tmp_path / 'data'
+    data_directory.mkdir()
+    path = write_grid(hexahedron_grid(125), str(data_directory), 'grid')
+
+    DataBlock.from_vtk(path)
+
+    assert os.listdir(str(data_directory)) == ['grid.vtu']
+    assert os.listdir(str(cache_dir))
+    assert lod_cache.read(path, 0.9) is not None
+
+
+def test_user_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert lod_cache._user_cache_dir() == os.path.join(str(tmp_path), 'odysis', 'lod')
+
+
+def test_missing_file_raises(tmp_path, cache_dir):
+    with pytest.raises(OSError):
+        DataBlock.from_vtk(str(tmp_path / 'missing.vtu'))
+
+
+def test_missing_file_is_reported_on_the_block(tmp_path, cache_dir):
+    async def load():
+        block = DataBlock.from_vtk(str(tmp_path / 'missing.vtu'))
+        block._refine_thread.join()
+        # Let the loop run the callbacks of the thread
+        await asyncio.sleep(0.1)
+        return block
+
+    with pytest.warns(UserWarning, match='could not be read'):
+        block = asyncio.run(load())
+
+    assert block.current_mesh is None
+    assert block.error.startswith('FileNotFoundError')
@@ -0,0 +1,24 @@
+import numpy as np
+
+import vtk
+
+from odysis import DataBlock, Mesh
+from odysis.memory import memory_usage
+
+
+def test_memory_usage_of_closed_widgets():
+    points = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    mesh = Mesh.from_arrays(
+        points, np.array([0, 1, 2, 3]), np.array([0]), np.array([vtk.VTK_TETRA]),
+        point_data={'pressure': np.arange(4.)}
+    )
+    block = DataBlock(mesh=mesh)
+    component = mesh.data[0].components[0]
+    component.close()
+
+    usage = memory_usage(block)
+
+    records = dict((r['widget'], r) for r in usage['arrays'])
+    assert records['Component']['model_id'] is None
+    assert records['Mesh']['model_id'] == mesh.model_id
+    assert usage['resident'] >= mesh.vertices.nbytes + component.array.nbytes
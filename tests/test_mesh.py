@@ -0,0 +1,66 @@
+import numpy as np
+
+import vtk
+
+from odysis import DataBlock, Mesh, Threshold
+
+
+POINTS = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1]])
+
+
+def _two_tetrahedrons():
+    return Mesh.from_arrays(
+        POINTS, np.array([0, 1, 2, 3, 1, 2, 3, 4]), np.array([0, 4]), np.array([vtk.VTK_TETRA] * 2),
+        point_data={'pressure': np.arange(5.)}
+    )
+
+
+def test_extract():
+    points = POINTS
+    mesh = _two_tetrahedrons()
+
+    extracted = mesh.extract(np.array([False, True]))
+
+    # The points of the kept tetrahedron, renumbered
+    vertices = extracted.vertices.reshape(-1, 3)
+    assert len(vertices) == 4 and len(extracted.tetrahedrons) == 4
+    np.testing.assert_array_equal(vertices[extracted.tetrahedrons], points[[1, 2, 3, 4]])
+    np.testing.assert_array_equal(
+        extracted.data[0].components[0].array[extracted.tetrahedrons], [1, 2, 3, 4]
+    )
+    assert len(extracted.triangles) == 4 * 3
+
+
+def test_threshold_extract():
+    block = DataBlock(mesh=_two_tetrahedrons())
+    threshold = Threshold()
+    block.apply(threshold)
+    threshold.input_data = 'pressure'
+    threshold.lower_bound = 0.5
+
+    # Only the second tetrahedron has all its points above 0.5
+    extracted = threshold.extract()
+    assert len(extracted.tetrahedrons) == 4
+    np.testing.assert_array_equal(extracted.vertices.reshape(-1, 3)[extracted.tetrahedrons], POINTS[[1, 2, 3, 4]])
+
+    # Any point in the bounds
+    assert len(threshold.extract(all_points=False).tetrahedrons) == 8
+
+
+def test_merge():
+    meshes = [
+        Mesh.from_arrays(
+            np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]) + offset,
+            np.array([0, 1, 2, 3]), np.array([0]), np.array([vtk.VTK_TETRA]),
+            point_data={'pressure': np.full(4, offset)}
+        )
+        for offset in (0., 2.)
+    ]
+
+    merged = Mesh.merge(meshes)
+
+    np.testing.assert_array_equal(merged.vertices, np.concatenate([m.vertices for m in meshes]))
+    np.testing.assert_array_equal(merged.tetrahedrons, [0, 1, 2, 3, 4, 5, 6, 7])
+    data = dict((d.name, d.components[0].array) for d in merged.data)
+    np.testing.assert_array_equal(data['pressure'], [0] * 4 + [2] * 4)
+    np.testing.assert_array_equal(data['part'], [0] * 4 + [1] * 4)
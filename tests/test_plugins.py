@@ -0,0 +1,138 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import odysis.odysis as odysis_module
+from odysis import Clip, ContourSet, DataBlock, Mesh, Streamlines
+
+from benchmarks.generators import hexahedron_grid, write_grid
+
+
+@pytest.fixture
+def grid_files(tmp_path):
+    """Two files of the same grid, the velocity being rotated in the second."""
+    grid = hexahedron_grid(125)
+    first = write_grid(grid, str(tmp_path), 'first')
+
+    velocity = grid.GetPointData().GetArray('velocity')
+    for i in range(velocity.GetNumberOfTuples()):
+        x, y, z = velocity.GetTuple3(i)
+        velocity.SetTuple3(i, y, -x, z)
+    second = write_grid(grid, str(tmp_path), 'second')
+
+    return first, second
+
+
+def _apply(grid, block, **traits):
+    data_block = DataBlock(mesh=Mesh.from_vtk(grid))
+    data_block.apply(block)
+    for name, value in traits.items():
+        setattr(block, name, value)
+    return data_block.mesh
+
+
+def _count_calls(monkeypatch, module, name):
+    calls = []
+    function = getattr(module, name)
+
+    def counted(*args):
+        calls.append(args)
+        return function(*args)
+
+    monkeypatch.setattr(module, name, counted)
+    return calls
+
+
+def test_streamlines_follow_reload(grid_files, monkeypatch):
+    first, second = grid_files
+    lines = Streamlines(direction='forward')
+    mesh = _apply(first, lines, input_data='velocity', input_components=['X1', 'X2', 'X3'])
+    initial = lines._vertices
+
+    calls = _count_calls(monkeypatch, odysis_module.streamlines, 'integrate')
+    mesh.reload(second)
+
+    # Integrated once, with all the reloaded components
+    assert len(calls) == 1
+
+    expected = Streamlines(direction='forward')
+    _apply(second, expected, input_data='velocity', input_components=['X1', 'X2', 'X3'])
+    assert not np.array_equal(lines._vertices, initial)
+    np.testing.assert_array_equal(lines._vertices, expected._vertices)
+
+
+def test_streamlines_compare_seed_points():
+    lines = Streamlines(direction='forward', seed_type='points')
+    _apply(hexahedron_grid(125), lines, input_data='velocity', input_components=['X1', 'X2', 'X3'])
+
+    seeds = np.array([[0.5, 0.5, 0.5]])
+    lines.seed_points = seeds
+    initial = lines._vertices
+
+    # Same contents in a new array: the lines are kept
+    lines.seed_points = seeds.copy()
+    assert lines._vertices is initial
+
+    lines.seed_points = seeds * 0.5
+    assert not np.array_equal(lines._vertices, initial)
+
+
+def test_contour_set_follows_reload(grid_files, monkeypatch):
+    first, second = grid_files
+    contours = ContourSet()
+    mesh = _apply(first, contours, input_data='velocity', input_components=['X1'])
+    initial = contours._vertices
+
+    calls = _count_calls(monkeypatch, odysis_module.contouring, 'contour_set')
+    mesh.reload(second)
+
+    # Extracted once, with the reloaded component
+    assert len(calls) == 1
+
+    expected = ContourSet()
+    _apply(second, expected, input_data='velocity', input_components=['X1'])
+    assert not np.array_equal(contours._vertices, initial)
+    np.testing.assert_array_equal(contours._vertices, expected._vertices)
+
+
+def _record_states(block):
+    sent = []
+
+    def send_state(key=None):
+        keys = [key] if isinstance(key, str) else key
+        sent.append(dict((name, getattr(block, name)) for name in keys))
+
+    block.send_state = send_state
+    return sent
+
+
+def test_throttled_traits_send_the_last_value():
+    clip = Clip(sync_rate=10.)
+    sent = _record_states(clip)
+
+    async def move():
+        # The first change is sent at once, the others in one trailing update
+        for position in (0.1, 0.2, 0.3, 0.4):
+            clip.plane_position = position
+        assert sent == [{'plane_position': 0.1}]
+
+        await asyncio.sleep(0.2)
+
+    asyncio.run(move())
+
+    assert sent == [{'plane_position': 0.1}, {'plane_position': 0.4}]
+    assert clip._throttle_handle is None and not clip._throttled_states
+
+
+def test_throttling_disabled():
+    clip = Clip(sync_rate=0.)
+    sent = _record_states(clip)
+
+    async def move():
+        for position in (0.1, 0.2, 0.3):
+            clip.plane_position = position
+
+    asyncio.run(move())
+
+    assert sent == [{'plane_position': 0.1}, {'plane_position': 0.2}, {'plane_position': 0.3}]
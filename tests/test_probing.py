@@ -0,0 +1,64 @@
+import numpy as np
+
+from odysis.probing import CellLocator
+
+
+def _random_points(nb_points):
+    return np.random.RandomState(0).uniform(0., 1., (nb_points, 3))
+
+
+def test_locate_points_inside(cube):
+    vertices, tetrahedrons = cube
+    locator = CellLocator(vertices, tetrahedrons)
+    points = _random_points(1000)
+
+    cell_ids, weights = locator.locate(points)
+
+    assert np.all(cell_ids >= 0)
+    assert np.all(weights >= -1e-5)
+    np.testing.assert_allclose(weights.sum(axis=1), 1., atol=1e-5)
+    # The barycentric coordinates give the points back
+    corners = vertices.reshape(-1, 3)[tetrahedrons.reshape(-1, 4)[cell_ids]]
+    np.testing.assert_allclose(np.einsum('nk,nki->ni', weights, corners), points, atol=1e-5)
+
+
+def test_locate_points_outside(cube):
+    vertices, tetrahedrons = cube
+    locator = CellLocator(vertices, tetrahedrons)
+    points = np.array([[-0.1, 0.5, 0.5], [0.5, 1.2, 0.5], [2., 2., 2.]])
+
+    cell_ids, _ = locator.locate(points)
+    assert np.all(cell_ids == -1)
+    assert np.all(np.isnan(locator.interpolate(np.ones(len(vertices) // 3), cell_ids, np.zeros((3, 4)))))
+
+
+def test_locate_with_hint(cube):
+    vertices, tetrahedrons = cube
+    locator = CellLocator(vertices, tetrahedrons)
+    points = _random_points(100)
+    cell_ids, weights = locator.locate(points)
+
+    # Wrong hints are checked, missing ones ignored
+    hint = np.roll(cell_ids, 1)
+    hint[::3] = -1
+    hinted_ids, hinted_weights = locator.locate(points, hint)
+
+    np.testing.assert_allclose(
+        np.einsum('nk,nki->ni', hinted_weights,
+                  vertices.reshape(-1, 3)[tetrahedrons.reshape(-1, 4)[hinted_ids]]),
+        points, atol=1e-5
+    )
+    assert np.all(hinted_ids >= 0)
+
+
+def test_interpolate_linear_field(cube):
+    vertices, tetrahedrons = cube
+    locator = CellLocator(vertices, tetrahedrons)
+    field = vertices.reshape(-1, 3).astype(np.float64) @ np.array([1., -2., 0.5])
+    points = _random_points(500)
+
+    cell_ids, weights = locator.locate(points)
+
+    np.testing.assert_allclose(
+        locator.interpolate(field, cell_ids, weights), points @ np.array([1., -2., 0.5]), atol=1e-5
+    )
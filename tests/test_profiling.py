@@ -0,0 +1,125 @@
+import importlib
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+from odysis import profiling
+
+COLUMNS = ['stage', 'parent', 'source', 'widget', 'wall_time', 'nbytes', 'peak_memory']
+
+
+@pytest.fixture
+def enabled():
+    maxlen = profiling.max_records()
+    profiling.reset()
+    profiling.enable()
+    yield
+    profiling.disable()
+    profiling.reset()
+    profiling.set_max_records(maxlen)
+
+
+def _stages():
+    return [(record['stage'], record['parent']) for record in profiling.get_records()]
+
+
+def test_disabled():
+    profiling.reset()
+
+    with profiling.stage('load') as record:
+        assert record == {}
+    profiling.add_record('render', source='frontend')
+
+    assert profiling.get_records() == []
+
+
+def test_nested_stages(enabled):
+    with profiling.stage('load', widget='DataBlock') as record:
+        with profiling.stage('read'):
+            data = np.ones(1 << 16)
+        record['nbytes'] = profiling.nbytes(data)
+    profiling.add_record('render', source='frontend', wall_time=0.5)
+
+    # Records are added when the stages end
+    assert _stages() == [('read', 'load'), ('load', None), ('render', None)]
+    read, load, render = profiling.get_records()
+    assert set(load) == set(COLUMNS)
+    assert load['widget'] == 'DataBlock' and load['nbytes'] == data.nbytes
+    assert load['wall_time'] >= read['wall_time'] >= 0
+    # The peak of the enclosing stage includes the one of the nested stage
+    assert load['peak_memory'] >= read['peak_memory'] >= data.nbytes
+    assert render['source'] == 'frontend' and render['wall_time'] == 0.5
+
+
+def test_stages_per_thread(enabled):
+    started = threading.Barrier(2)
+
+    def run(name):
+        with profiling.stage(name):
+            started.wait()
+            with profiling.stage(name + '.nested'):
+                started.wait()
+
+    threads = [threading.Thread(target=run, args=(name, )) for name in ('first', 'second')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Parents are the enclosing stages of the same thread
+    assert sorted(_stages(), key=lambda stage: stage[0]) == [
+        ('first', None), ('first.nested', 'first'), ('second', None), ('second.nested', 'second')
+    ]
+
+
+def test_max_records(enabled):
+    profiling.set_max_records(3)
+    for i in range(5):
+        profiling.add_record(str(i))
+
+    # The oldest records are dropped first
+    assert [record['stage'] for record in profiling.get_records()] == ['2', '3', '4']
+
+    with pytest.raises(ValueError):
+        profiling.set_max_records(0)
+
+
+def test_max_records_environment(monkeypatch):
+    maxlen = profiling.max_records()
+    monkeypatch.setenv('ODYSIS_PROFILE_MAX_RECORDS', '7')
+    try:
+        assert importlib.reload(profiling).max_records() == 7
+    finally:
+        monkeypatch.undo()
+        importlib.reload(profiling)
+    assert profiling.max_records() == maxlen
+
+
+def test_nbytes():
+    array = np.zeros(10, dtype=np.float32)
+
+    assert profiling.nbytes(None) == 0
+    assert profiling.nbytes(array) == 40
+    assert profiling.nbytes(b'abc') == 3
+    assert profiling.nbytes({'a': array, 'b': [array, (b'abc', None)]}) == 83
+    assert profiling.nbytes(object()) == 0
+
+
+def test_to_dataframe(enabled):
+    pandas = pytest.importorskip('pandas')
+    profiling.add_record('render', source='frontend')
+
+    frame = profiling.to_dataframe()
+
+    assert isinstance(frame, pandas.DataFrame)
+    assert list(frame.columns) == COLUMNS
+    assert frame['stage'].tolist() == ['render']
+
+
+def test_to_dataframe_without_pandas(enabled, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pandas', None)
+
+    with pytest.raises(RuntimeError):
+        profiling.to_dataframe()
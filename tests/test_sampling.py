@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import vtk
+
+from odysis import DataBlock, Mesh, PointCloud
+from odysis.sampling import ordering, sample, stratified_order
+
+
+def _voxels(points, resolution):
+    """Voxel ids of points of the unit cube."""
+    voxels = np.minimum((points * resolution).astype(np.int64), resolution - 1)
+    return (voxels[:, 0] * resolution + voxels[:, 1]) * resolution + voxels[:, 2]
+
+
+def test_stratified_prefixes_cover_the_voxels():
+    points = np.random.RandomState(0).rand(20000, 3)
+    # The bounds of the points are the unit cube
+    points[:2] = [[0., 0., 0.], [1., 1., 1.]]
+
+    order = stratified_order(points)
+
+    np.testing.assert_array_equal(np.sort(order), np.arange(len(points)))
+    # The first 8 ** level points hit every voxel of the 2 ** level grid
+    for level, count in ((1, 8), (2, 64), (3, 512)):
+        assert len(np.unique(_voxels(points[order[:count]], 2 ** level))) == count
+
+
+def test_stratified_order_of_degenerate_points():
+    assert len(stratified_order(np.zeros((0, 3)))) == 0
+    # Flat along z
+    points = np.column_stack((np.random.RandomState(0).rand(100, 2), np.zeros(100)))
+    np.testing.assert_array_equal(np.sort(stratified_order(points)), np.arange(100))
+
+
+def test_sample():
+    order = np.arange(10, 20)
+
+    np.testing.assert_array_equal(sample(order, 0.5, 'ordered'), [10, 12, 14, 16, 18])
+    np.testing.assert_array_equal(sample(order, 0.3, 'stratified'), [10, 11, 12])
+    assert len(sample(order, 0., 'ordered')) == 0
+    np.testing.assert_array_equal(sample(order, 1., 'random'), order)
+
+
+def test_ordering():
+    candidates = np.array([3, 1, 2], dtype=np.uint32)
+    vertices = np.random.RandomState(0).rand(12)
+
+    assert ordering(candidates, 'ordered', vertices) is candidates
+    for distribution in ('random', 'stratified'):
+        np.testing.assert_array_equal(np.sort(ordering(candidates, distribution, vertices)), [1, 2, 3])
+    with pytest.raises(ValueError):
+        ordering(candidates, 'uniform', vertices)
+
+
+def test_sample_follows_the_mesh_vertices(cube):
+    vertices, tetrahedrons = cube
+    nb_cells = len(tetrahedrons) // 4
+    mesh = Mesh.from_arrays(
+        vertices.reshape(-1, 3), tetrahedrons, np.arange(nb_cells + 1) * 4,
+        np.full(nb_cells, vtk.VTK_TETRA)
+    )
+    block = DataBlock(mesh=mesh)
+    cloud = PointCloud(distribution='stratified', percentage_points=0.25)
+    block.apply(cloud)
+
+    candidates = np.arange(len(vertices) // 3, dtype=np.uint32)
+    np.testing.assert_array_equal(
+        cloud._sample, sample(ordering(candidates, 'stratified', vertices), 0.25, 'stratified')
+    )
+
+    # The points are moved: the cached ordering is not valid anymore
+    moved = vertices.reshape(-1, 3) ** 3
+    mesh.vertices = moved.ravel()
+
+    expected = sample(ordering(candidates, 'stratified', moved), 0.25, 'stratified')
+    assert not np.array_equal(expected, sample(ordering(candidates, 'stratified', vertices), 0.25, 'stratified'))
+    np.testing.assert_array_equal(cloud._sample, expected)
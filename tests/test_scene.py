@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from odysis import DataBlock, Mesh, Scene, Threshold
+
+import vtk
+
+
+def _scene():
+    points = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    mesh = Mesh.from_arrays(
+        points, np.array([0, 1, 2, 3]), np.array([0]), np.array([vtk.VTK_TETRA]),
+        point_data={'pressure': np.arange(4.)}
+    )
+    block = DataBlock(mesh=mesh)
+    scene = Scene(datablocks=[block])
+
+    sent = []
+    scene.send = lambda content, buffers=None: sent.append(('batch', content))
+    block.send_state = lambda key=None: sent.append(('state', set(key)))
+    return scene, block, sent
+
+
+def test_batch_update_sends_one_message():
+    scene, block, sent = _scene()
+
+    with scene.batch_update():
+        block.visible = False
+        block._profiling = True
+
+    assert len(sent) == 1
+    kind, content = sent[0]
+    assert kind == 'batch'
+    assert content['updates'] == [[block.model_id, {'visible': False, '_profiling': True}]]
+    assert not block._holding_sync
+    assert not block._states_to_send
+
+
+def test_batch_update_does_not_send_a_batch_on_error():
+    scene, block, sent = _scene()
+
+    with pytest.raises(RuntimeError):
+        with scene.batch_update():
+            block.visible = False
+            raise RuntimeError
+
+    assert sent == [('state', {'visible'})]
+    assert not block._holding_sync
+
+
+def test_batch_update_in_hold_sync():
+    scene, block, sent = _scene()
+
+    with block.hold_sync():
+        block._profiling = True
+        with scene.batch_update():
+            block.visible = False
+
+        # The changes made before the batch are still held
+        assert block._holding_sync
+        assert block._states_to_send == {'_profiling'}
+        assert [kind for kind, _ in sent] == ['batch']
+
+    assert sent[1] == ('state', {'_profiling'})
+
+
+def test_save_load_round_trip(tmp_path):
+    scene, block, _ = _scene()
+    threshold = Threshold()
+    block.apply(threshold)
+    threshold.input_data = 'pressure'
+    threshold.lower_bound = 1.5
+    block.visible = False
+
+    path = str(tmp_path / 'scene.json')
+    scene.save(path)
+    loaded = Scene.load(path)
+
+    loaded_block = loaded.datablocks[0]
+    assert not loaded_block.visible
+    for name in ('vertices', 'triangles', 'tetrahedrons'):
+        np.testing.assert_array_equal(getattr(loaded_block.mesh, name), getattr(block.mesh, name))
+    np.testing.assert_array_equal(
+        loaded_block.mesh.data[0].components[0].array, block.mesh.data[0].components[0].array
+    )
+
+    loaded_threshold, = loaded_block._blocks
+    assert isinstance(loaded_threshold, Threshold)
+    assert loaded_threshold.input_data == 'pressure'
+    assert loaded_threshold.lower_bound == 1.5
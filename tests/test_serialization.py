@@ -0,0 +1,180 @@
+import base64
+import json
+import os.path as osp
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from ipywidgets import Widget
+
+from odysis import Component
+from odysis.serialization import array_delta, array_to_binary
+
+SERIALIZATION_JS = osp.join(osp.dirname(__file__), '..', 'js', 'lib', 'src', 'serialization.js')
+
+# Applies deltas like apply_array_deltas in js/lib/src/odysis.js
+APPLY_DELTA_JS = """
+let serialization = require(process.argv[1]);
+let input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+let bytes = (b64) => new Uint8Array(Buffer.from(b64, 'base64'));
+
+let array = serialization.float32array.deserialize({data: bytes(input.array)}).slice();
+let delta = serialization.float32array.deserialize({
+    delta: true, dtype: 'float32',
+    starts: bytes(input.starts), lengths: bytes(input.lengths), values: bytes(input.values)
+});
+let offset = 0;
+for (let i = 0; i < delta.starts.length; i++) {
+    let length = delta.lengths[i];
+    array.set(delta.values.subarray(offset, offset + length), delta.starts[i]);
+    offset += length;
+}
+process.stdout.write(JSON.stringify(Array.from(array)));
+"""
+
+
+def _apply_delta(old, delta):
+    """Apply a delta like the front-end."""
+    out = np.array(old).reshape(-1)
+    starts = np.frombuffer(delta['starts'], dtype=np.uint32)
+    lengths = np.frombuffer(delta['lengths'], dtype=np.uint32)
+    values = np.frombuffer(delta['values'], dtype=delta['dtype'])
+    offset = 0
+    for start, length in zip(starts, lengths):
+        out[start:start + length] = values[offset:offset + length]
+        offset += length
+    return out.reshape(delta['shape'])
+
+
+def _changed(old, nb_changes, seed=0):
+    random = np.random.RandomState(seed)
+    new = old.copy()
+    indices = random.choice(len(old), nb_changes, replace=False)
+    new[indices] = (new[indices] + random.randint(1, 100, nb_changes)).astype(old.dtype)
+    return new
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.uint32, np.int16, np.uint8])
+@pytest.mark.parametrize('nb_changes', [0, 1, 50, 500])
+def test_delta_round_trip(dtype, nb_changes):
+    old = np.arange(5000).astype(dtype)
+    new = _changed(old, nb_changes)
+
+    delta = array_delta(old, new)
+
+    assert delta['delta'] and delta['dtype'] == np.dtype(dtype).name
+    np.testing.assert_array_equal(_apply_delta(old, delta), new)
+
+
+def test_delta_round_trip_special_values():
+    # Values are compared bitwise, so NaNs and signed zeros are sent
+    old = np.zeros(1000, dtype=np.float32)
+    new = old.copy()
+    new[3] = np.nan
+    new[500] = -0.
+
+    delta = array_delta(old, new)
+
+    decoded = _apply_delta(old, delta)
+    assert np.isnan(decoded[3]) and np.signbit(decoded[500])
+
+
+def test_delta_not_smaller():
+    old = np.arange(100, dtype=np.float32)
+
+    assert array_delta(old, old + 1) is None
+    assert array_delta(old, np.arange(99, dtype=np.float32)) is None
+    assert array_delta(old, old.astype(np.uint32)) is None
+    assert array_delta(old.astype(np.float64), old.astype(np.float64)) is None
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_delta_front_end_round_trip():
+    old = np.arange(3000, dtype=np.float32)
+    new = _changed(old, 40)
+    delta = array_delta(old, new)
+
+    def encode(buffer):
+        return base64.b64encode(bytes(buffer)).decode()
+
+    output = subprocess.check_output(
+        ['node', '-e', APPLY_DELTA_JS, osp.abspath(SERIALIZATION_JS)],
+        input=json.dumps({
+            'array': encode(memoryview(old)),
+            'starts': encode(delta['starts']),
+            'lengths': encode(delta['lengths']),
+            'values': encode(delta['values'])
+        }).encode()
+    )
+
+    np.testing.assert_array_equal(np.array(json.loads(output), dtype=np.float32), new)
+
+
+def _unique(size):
+    """An array with a content of its own, as widgets of other tests may
+    hold the same content in the registry."""
+    return np.random.random(size).astype(np.float32)
+
+
+def _resolve(sent):
+    """The content of a serialized array, references being resolved like
+    the front-end does."""
+    if 'ref' in sent:
+        owner = Widget.widgets[sent['ref'][len('IPY_MODEL_'):]]
+        return np.asarray(getattr(owner, sent['key']), dtype=sent['dtype'])
+    return np.frombuffer(sent['data'], dtype=sent['dtype']).reshape(sent['shape'])
+
+
+def test_identical_arrays_are_sent_once():
+    content = _unique(10)
+    owner = Component(array=content)
+    holder = Component(array=content.copy())
+
+    assert 'data' in array_to_binary(owner.array, owner)
+    assert array_to_binary(holder.array, holder)['ref'] == 'IPY_MODEL_' + owner.model_id
+
+
+def test_mutated_array_is_resent():
+    content = _unique(10)
+    owner = Component(array=content)
+    holder = Component(array=content.copy())
+    array_to_binary(owner.array, owner)
+    assert 'ref' in array_to_binary(holder.array, holder)
+
+    array = holder.array
+    array[:] = -1
+    holder.array = array
+
+    sent = array_to_binary(holder.array, holder)
+    assert 'ref' not in sent
+    np.testing.assert_array_equal(np.frombuffer(sent['data'], dtype=np.float32), -1)
+
+
+def test_reference_round_trip():
+    # float64 contents are sent as float32, and compared after conversion
+    content = _unique(100)
+    owner = Component(array=content)
+    holder = Component(array=content.astype(np.float64))
+
+    sent = [array_to_binary(w.array, w) for w in (owner, holder)]
+
+    assert 'data' in sent[0] and 'ref' in sent[1]
+    for widget, serialized in zip((owner, holder), sent):
+        np.testing.assert_array_equal(_resolve(serialized), widget.array.astype(np.float32))
+
+
+def test_reference_owner_closed():
+    content = _unique(10)
+    owner = Component(array=content)
+    holder = Component(array=content.copy())
+    array_to_binary(owner.array, owner)
+    assert 'ref' in array_to_binary(holder.array, holder)
+
+    owner.close()
+
+    # The holder owns the content and sends it to new front-ends
+    sent = array_to_binary(holder.array, holder)
+    assert 'data' in sent
+    np.testing.assert_array_equal(_resolve(sent), holder.array)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from odysis import streamlines
+from odysis.probing import CellLocator
+
+
+def test_uniform_field(cube):
+    vertices, tetrahedrons = cube
+    locator = CellLocator(vertices, tetrahedrons)
+    seeds = np.array([[0.1, 0.3, 0.4], [0.2, 0.7, 0.6]])
+
+    positions, segments, cell_ids, _ = streamlines.integrate(
+        locator, [1., 0., 0.], seeds, 0.05, max_steps=100, direction='forward'
+    )
+
+    assert np.all(cell_ids >= 0)
+    # Straight lines along x, stopping at the side of the cube
+    for seed in seeds:
+        line = positions[np.all(positions[:, 1:] == seed[1:], axis=1)]
+        np.testing.assert_allclose(np.diff(line[:, 0]), 0.05)
+        assert line[0, 0] == seed[0] and 0.95 <= line[-1, 0] <= 1. + 1e-6
+    assert len(segments) == len(positions) - len(seeds)
+
+
+def test_rotation_field(cube):
+    vertices, tetrahedrons = cube
+    locator = CellLocator(vertices, tetrahedrons)
+    points = vertices.reshape(-1, 3).astype(np.float64)
+    # Rotation around the (0.5, 0.5) vertical axis, interpolated exactly
+    components = [0.5 - points[:, 1], points[:, 0] - 0.5, np.zeros(len(points))]
+    seeds = np.array([[0.8, 0.5, 0.2], [0.5, 0.2, 0.7]])
+
+    positions, segments, _, _ = streamlines.integrate(
+        locator, components, seeds, 0.01, max_steps=200, direction='both'
+    )
+
+    radii = np.linalg.norm(positions[:, :2] - 0.5, axis=1)
+    np.testing.assert_allclose(radii, 0.3, atol=1e-4)
+    np.testing.assert_allclose(np.linalg.norm(positions[segments[:, 1]] - positions[segments[:, 0]], axis=1), 0.01, rtol=1e-3)
+    # Each seed once, with 200 steps in each direction
+    assert len(positions) == 2 * (2 * 200 + 1)
+
+
+def test_seeds_outside_are_ignored(cube):
+    vertices, tetrahedrons = cube
+    locator = CellLocator(vertices, tetrahedrons)
+
+    positions, segments, _, _ = streamlines.integrate(
+        locator, [1., 0., 0.], np.array([[2., 0.5, 0.5]]), 0.05
+    )
+    assert len(positions) == len(segments) == 0
@@ -0,0 +1,53 @@
+import numpy as np
+
+from odysis.unstructured import (
+    VTK_HEXAHEDRON, VTK_PYRAMID, VTK_TETRA, VTK_WEDGE,
+    extract_surface, fields_to_data, group_cells
+)
+
+
+def _surface(cells):
+    connectivity = np.concatenate([points for _, points in cells])
+    offsets = np.cumsum([0] + [len(points) for _, points in cells])
+    cell_types = np.array([cell_type for cell_type, _ in cells])
+    triangles = extract_surface(group_cells(connectivity, offsets, cell_types))
+    return sorted(map(tuple, np.sort(triangles.reshape(-1, 3), axis=1).tolist()))
+
+
+def test_surface_of_mixed_cells_sharing_a_triangle():
+    triangles = _surface([
+        (VTK_PYRAMID, [0, 1, 2, 3, 4]),
+        (VTK_TETRA, [1, 2, 4, 5])
+    ])
+
+    # The shared face is interior: 3 side faces and the base (split in 2)
+    # of the pyramid, 3 faces of the tetrahedron
+    assert len(triangles) == 3 + 2 + 3
+    assert (1, 2, 4) not in triangles
+    assert len(set(triangles)) == len(triangles)
+
+
+def test_surface_of_mixed_cells_sharing_a_quad():
+    triangles = _surface([
+        (VTK_HEXAHEDRON, [0, 1, 2, 3, 4, 5, 6, 7]),
+        (VTK_WEDGE, [1, 8, 2, 5, 9, 6])
+    ])
+
+    # 5 quads of the hexahedron, 2 quads and 2 triangles of the wedge
+    assert len(triangles) == 5 * 2 + 2 * 2 + 2
+    assert not {(1, 2, 5), (2, 5, 6), (1, 2, 6), (1, 5, 6)} & set(triangles)
+
+
+def test_fields_to_data_ignores_nans():
+    data = fields_to_data({
+        'pressure': np.array([np.nan, 1., -2., 3.]),
+        'velocity': np.array([[1., np.nan], [np.nan, np.nan], [-1., np.nan], [0., np.nan]])
+    })
+
+    pressure = data['pressure']['X1']
+    assert (pressure['min'], pressure['max']) == (-2., 3.)
+    assert pressure['array'].dtype == np.float32 and np.isnan(pressure['array'][0])
+
+    assert (data['velocity']['X1']['min'], data['velocity']['X1']['max']) == (-1., 1.)
+    # No value to compare
+    assert data['velocity']['X2']['min'] is None and data['velocity']['X2']['max'] is None
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+import vtk
+from vtk.util.numpy_support import vtk_to_numpy
+
+from odysis.vtk_loader import (
+    append_filter, get_ugrid_data, get_ugrid_tetrahedrons, get_ugrid_vertices
+)
+
+from benchmarks.generators import GENERATORS
+
+# Linear 3-D cells and a point ordering of each, with an irregular geometry
+# so that a split depending on the shape of the cell would be noticed
+CELLS = {
+    vtk.VTK_TETRA: [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]],
+    vtk.VTK_VOXEL: [
+        [0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0],
+        [0, 0, 1], [1, 0, 1], [0, 1, 1], [1, 1, 1]
+    ],
+    vtk.VTK_HEXAHEDRON: [
+        [0, 0, 0], [1.2, 0, 0], [1, 1, 0], [0, 0.8, 0],
+        [0, 0, 1], [1, 0, 1.3], [1.1, 1, 1], [0, 1, 0.9]
+    ],
+    vtk.VTK_WEDGE: [
+        [0, 0, 0], [1, 0, 0], [0, 1.1, 0], [0, 0, 1], [0.9, 0, 1], [0, 1, 1.2]
+    ],
+    vtk.VTK_PYRAMID: [[0, 0, 0], [1.3, 0, 0], [1, 1, 0], [0, 0.7, 0], [0.5, 0.5, 1]]
+}
+
+
+def _grid(cell_types, nb_cells=3):
+    """Grid of nb_cells cells of each type, sharing no points."""
+    grid = vtk.vtkUnstructuredGrid()
+    points = vtk.vtkPoints()
+    for i in range(nb_cells):
+        for cell_type in cell_types:
+            ids = [
+                points.InsertNextPoint(x + 2 * i, y, z + 2 * cell_type)
+                for x, y, z in CELLS[cell_type]
+            ]
+            grid.InsertNextCell(cell_type, len(ids), ids)
+    grid.SetPoints(points)
+    return grid
+
+
+def _vtk_tetrahedrons(grid):
+    """Tetrahedrons of vtkCell.Triangulate, cell by cell."""
+    out = []
+    for cell_id in range(grid.GetNumberOfCells()):
+        cell = grid.GetCell(cell_id)
+        if cell.GetCellDimension() != 3:
+            continue
+        ids = vtk.vtkIdList()
+        cell.Triangulate(0, ids, vtk.vtkPoints())
+        out.extend(ids.GetId(i) for i in range(ids.GetNumberOfIds()))
+    return np.array(out, dtype=np.uint32)
+
+
+def _sorted_tetrahedrons(tetrahedrons):
+    return sorted(map(tuple, np.sort(tetrahedrons.reshape(-1, 4), axis=1).tolist()))
+
+
+@pytest.mark.parametrize('cell_type', sorted(CELLS), ids=str)
+def test_tetrahedrons_match_vtk(cell_type):
+    grid = _grid([cell_type])
+    tetrahedrons = get_ugrid_tetrahedrons(grid)
+
+    assert tetrahedrons.dtype == np.uint32
+    np.testing.assert_array_equal(tetrahedrons, _vtk_tetrahedrons(grid))
+
+
+def test_mixed_tetrahedrons_match_vtk():
+    grid = _grid(sorted(CELLS))
+    tetrahedrons = get_ugrid_tetrahedrons(grid)
+
+    # Cells are split by type, the tetrahedrons are the same in another order
+    assert _sorted_tetrahedrons(tetrahedrons) == _sorted_tetrahedrons(_vtk_tetrahedrons(grid))
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_generators_match_vtk(name):
+    grid = GENERATORS[name](500)
+    if not isinstance(grid, vtk.vtkUnstructuredGrid):
+        grid = append_filter(grid)
+
+    tetrahedrons = get_ugrid_tetrahedrons(grid)
+    assert _sorted_tetrahedrons(tetrahedrons) == _sorted_tetrahedrons(_vtk_tetrahedrons(grid))
+
+
+def test_vertices_and_data():
+    grid = GENERATORS['tetrahedron'](500)
+
+    vertices = get_ugrid_vertices(grid)
+    assert vertices.dtype == np.float32
+    np.testing.assert_allclose(vertices, vtk_to_numpy(grid.GetPoints().GetData()).ravel(), rtol=1e-6)
+
+    data = get_ugrid_data(grid)
+    assert list(data) == ['pressure', 'velocity']
+    assert list(data['velocity']) == ['X1', 'X2', 'X3']
+
+    velocity = grid.GetPointData().GetArray('velocity')
+    for i, component in enumerate(data['velocity'].values()):
+        assert component['array'].dtype == np.float32
+        np.testing.assert_allclose(component['array'], vtk_to_numpy(velocity)[:, i], rtol=1e-6)
+        assert (component['min'], component['max']) == pytest.approx(velocity.GetRange(i))
+
+
+def test_parallel_data_extraction_matches_serial(monkeypatch):
+    import odysis.vtk_loader as vtk_loader
+    monkeypatch.setattr(vtk_loader, 'MIN_PARALLEL_VALUES', 0)
+    grid = GENERATORS['hexahedron'](500)
+
+    serial = get_ugrid_data(grid, workers=1)
+    parallel = get_ugrid_data(grid, workers=4)
+    for name, components in serial.items():
+        for component, description in components.items():
+            np.testing.assert_array_equal(parallel[name][component]['array'], description['array'])
+            assert parallel[name][component]['min'] == description['min']
+            assert parallel[name][component]['max'] == description['max']
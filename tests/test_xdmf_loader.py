@@ -0,0 +1,186 @@
+import numpy as np
+import pytest
+
+from odysis import Mesh
+from odysis.unstructured import VTK_HEXAHEDRON, VTK_LINE, VTK_TETRA, VTK_TRIANGLE
+from odysis.xdmf_loader import XdmfReader, _parse_mixed
+
+h5py = pytest.importorskip('h5py')
+
+POINTS = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.float64)
+TETRAHEDRONS = np.array([[0, 1, 2, 3], [1, 2, 3, 4]], dtype=np.int32)
+PRESSURE = np.array([np.arange(5.), 10 + np.arange(5.)])
+MATERIAL = np.array([0., 2.])
+
+
+def _xml(values):
+    return ' '.join(str(value) for value in np.ravel(values))
+
+
+def _hyperslab(step):
+    return '''
+      <DataItem ItemType="HyperSlab" Dimensions="5">
+        <DataItem Dimensions="3 2" Format="XML">{} 0 1 1 1 5</DataItem>
+        <DataItem Dimensions="2 5" NumberType="Float" Precision="8" Format="HDF">data.h5:/pressure</DataItem>
+      </DataItem>'''.format(step)
+
+
+@pytest.fixture
+def time_series(tmp_path):
+    """A temporal collection of two steps, with its heavy data in HDF5, the
+    mesh being only written in the first step."""
+    with h5py.File(str(tmp_path / 'data.h5'), 'w') as h5file:
+        h5file['geometry'] = POINTS
+        # Chunked, so that it is not memory-mapped
+        h5file.create_dataset('topology', data=TETRAHEDRONS, chunks=(1, 4))
+        h5file['pressure'] = PRESSURE
+        h5file['material'] = MATERIAL
+
+    path = tmp_path / 'series.xdmf'
+    path.write_text('''<?xml version="1.0" ?>
+<Xdmf Version="3.0">
+  <Domain>
+    <Grid Name="series" GridType="Collection" CollectionType="Temporal">
+      <Grid Name="step0">
+        <Time Value="0.5"/>
+        <Geometry GeometryType="XYZ">
+          <DataItem Dimensions="5 3" NumberType="Float" Precision="8" Format="HDF">data.h5:/geometry</DataItem>
+        </Geometry>
+        <Topology TopologyType="Tetrahedron" NumberOfElements="2">
+          <DataItem Dimensions="2 4" NumberType="Int" Precision="4" Format="HDF">data.h5:/topology</DataItem>
+        </Topology>
+        <Attribute Name="pressure" Center="Node">{}
+        </Attribute>
+        <Attribute Name="material" Center="Cell">
+          <DataItem Dimensions="2" NumberType="Float" Precision="8" Format="HDF">data.h5:/material</DataItem>
+        </Attribute>
+      </Grid>
+      <Grid Name="step1">
+        <Time Value="1.5"/>
+        <Attribute Name="pressure" Center="Node">{}
+        </Attribute>
+      </Grid>
+    </Grid>
+  </Domain>
+</Xdmf>
+'''.format(_hyperslab(0), _hyperslab(1)))
+    return str(path)
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_hdf_data_items(time_series, mmap):
+    with XdmfReader(time_series, mmap=mmap) as reader:
+        assert reader.times == [0.5, 1.5]
+        assert reader.fields(0) == {'pressure': 'Node', 'material': 'Cell'}
+
+        np.testing.assert_array_equal(reader.read_geometry(), POINTS)
+        connectivity, offsets, cell_types = reader.read_topology()
+        np.testing.assert_array_equal(connectivity, TETRAHEDRONS.ravel())
+        np.testing.assert_array_equal(offsets, [0, 4, 8])
+        np.testing.assert_array_equal(cell_types, [VTK_TETRA, VTK_TETRA])
+
+
+def test_hyperslab_time_steps(time_series):
+    with XdmfReader(time_series) as reader:
+        np.testing.assert_array_equal(reader.read_field('pressure', 0), PRESSURE[0])
+        np.testing.assert_array_equal(reader.read_field('pressure', 1), PRESSURE[1])
+
+        # The mesh of the first step is used
+        np.testing.assert_array_equal(reader.read_geometry(1), POINTS)
+
+        with pytest.raises(KeyError):
+            reader.read_field('material', 1)
+
+
+def test_mesh_from_xdmf_fields(time_series):
+    mesh = Mesh.from_xdmf(time_series, fields=['pressure'], step=1)
+
+    assert [data.name for data in mesh.data] == ['pressure']
+    np.testing.assert_array_equal(mesh.data[0].components[0].array, PRESSURE[1])
+    np.testing.assert_array_equal(mesh.vertices, POINTS.ravel())
+    np.testing.assert_array_equal(mesh.tetrahedrons, TETRAHEDRONS.ravel())
+
+    with pytest.raises(KeyError):
+        Mesh.from_xdmf(time_series, fields=['material'], step=1)
+
+
+def test_mesh_from_xdmf_cell_fields(time_series):
+    mesh = Mesh.from_xdmf(time_series)
+
+    assert sorted(data.name for data in mesh.data) == ['material', 'pressure']
+    material = next(data for data in mesh.data if data.name == 'material')
+
+    # Averaged on the points: only the first and last points are in one cell
+    np.testing.assert_allclose(material.components[0].array, [0., 1., 1., 1., 2.])
+
+
+def _mixed_file(tmp_path, mixed, points):
+    path = tmp_path / 'mixed.xmf'
+    path.write_text('''<?xml version="1.0" ?>
+<Xdmf Version="3.0">
+  <Domain>
+    <Grid Name="mesh">
+      <Geometry GeometryType="XYZ">
+        <DataItem Dimensions="{} 3" NumberType="Float" Precision="4" Format="XML">{}</DataItem>
+      </Geometry>
+      <Topology TopologyType="Mixed">
+        <DataItem Dimensions="{}" NumberType="Int" Precision="4" Format="XML">{}</DataItem>
+      </Topology>
+      <Attribute Name="temperature">
+        <DataItem Dimensions="{}" Format="XML">{}</DataItem>
+      </Attribute>
+    </Grid>
+  </Domain>
+</Xdmf>
+'''.format(len(points), _xml(points), len(mixed), _xml(mixed), len(points), _xml(np.arange(len(points)))))
+    return str(path)
+
+
+def test_xml_mixed_topology(tmp_path):
+    points = np.random.RandomState(0).rand(12, 3).astype(np.float32)
+    mixed = [
+        6, 0, 1, 2, 3,
+        9, 4, 5, 6, 7, 8, 9, 10, 11,
+        2, 3, 0, 4, 9,
+        4, 1, 2, 3,
+    ]
+
+    with XdmfReader(_mixed_file(tmp_path, mixed, points)) as reader:
+        assert reader.times == [0.]
+        assert reader.fields() == {'temperature': 'Node'}
+        np.testing.assert_array_equal(reader.read_geometry(), points)
+        np.testing.assert_array_equal(reader.read_field('temperature'), np.arange(12.))
+
+        connectivity, offsets, cell_types = reader.read_topology()
+
+    np.testing.assert_array_equal(connectivity, [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0, 4, 9, 1, 2, 3])
+    np.testing.assert_array_equal(offsets, [0, 4, 12, 15, 18])
+    np.testing.assert_array_equal(cell_types, [VTK_TETRA, VTK_HEXAHEDRON, VTK_LINE, VTK_TRIANGLE])
+
+
+def test_parse_mixed_single_type():
+    tetrahedrons = np.arange(12).reshape(3, 4) % 7
+    mixed = np.column_stack((np.full(3, 6), tetrahedrons)).ravel()
+
+    connectivity, offsets, cell_types = _parse_mixed(mixed)
+
+    np.testing.assert_array_equal(connectivity, tetrahedrons.ravel())
+    np.testing.assert_array_equal(offsets, [0, 4, 8, 12])
+    np.testing.assert_array_equal(cell_types, [VTK_TETRA] * 3)
+
+
+def test_parse_mixed_point_ids_looking_like_types():
+    # Point ids which are also cell type ids, and an empty poly-line
+    mixed = np.array([6, 9, 2, 1, 6, 2, 0, 9, 6, 2, 9, 8, 7, 6, 5, 4, 6, 4, 2, 2, 1])
+
+    connectivity, offsets, cell_types = _parse_mixed(mixed)
+
+    np.testing.assert_array_equal(connectivity, [9, 2, 1, 6, 6, 2, 9, 8, 7, 6, 5, 4, 4, 2, 2, 1])
+    np.testing.assert_array_equal(offsets, [0, 4, 4, 12, 16])
+    np.testing.assert_array_equal(cell_types, [VTK_TETRA, VTK_LINE, VTK_HEXAHEDRON, VTK_TETRA])
+
+
+@pytest.mark.parametrize('mixed', [[3, 0, 1, 2], [6, 0, 1, 2, 3, 3], [6, 0, 1, 2, 3, 9, 0, 1]])
+def test_parse_mixed_errors(mixed):
+    with pytest.raises(RuntimeError):
+        _parse_mixed(np.array(mixed))